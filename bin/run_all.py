@@ -11,33 +11,46 @@ Flujo de ejecución:
   5. (Opcional) Generar MDF4 industrial
   6. Mostrar resumen de resultados
 
+Todos los pasos se ejecutan en el mismo proceso: el dataset generado en el
+paso 1 pasa en memoria a tablas, verificación y figuras.
+
 Uso:
   python run_all.py                    # Ejecutar todo
   python run_all.py --data-only        # Solo generar dataset
   python run_all.py --tables-only      # Solo generar tablas
   python run_all.py --with-figures     # Incluir figuras
   python run_all.py --with-mdf4        # Incluir MDF4
+  python run_all.py --profile          # + cProfile por etapa (--profile collapsed: flame graph)
+
+Cada ejecución escribe un informe JSON (outputs/reports/run_report_<fecha>.json)
+con tiempo de reloj y CPU, pico de RSS, filas y bytes leídos/escritos de cada
+etapa y sub-paso (cada tabla, cada figura); con --tracemalloc, también el pico
+de memoria Python asignada (a costa de ~5x en tiempo).
 
 Requisitos: numpy, pandas, scipy, matplotlib, seaborn, asammdf
 """
 
 import sys
-import os
-import time
 import argparse
+from datetime import datetime
 from pathlib import Path
 
 # Configurar paths
-PROJECT_ROOT = Path(__file__).parent
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SCRIPTS_DIR = PROJECT_ROOT / "scripts"
-DATA_DIR = PROJECT_ROOT / "data" / "versioned"
+DATA_DIR = PROJECT_ROOT / "data" / "datasets"
+TABLES_DIR = PROJECT_ROOT / "data" / "tables"
 OUTPUTS_DIR = PROJECT_ROOT / "outputs"
+REPORTS_DIR = OUTPUTS_DIR / "reports"
+DATASET_PATH = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
 
 # Agregar scripts al path
 sys.path.insert(0, str(SCRIPTS_DIR / "generators"))
 sys.path.insert(0, str(SCRIPTS_DIR / "analysis"))
 sys.path.insert(0, str(SCRIPTS_DIR / "utils"))
 
+from stage_metrics import PROFILE_FORMATS, StageRecorder
+
 
 def print_banner(title):
     """Imprimir banner de sección"""
@@ -61,72 +74,62 @@ def print_info(msg):
     print(f"ℹ️  {msg}")
 
 
-def run_generate_dataset():
-    """Ejecutar generador de dataset v4.0"""
+def load_dataset(recorder):
+    """Dataset v4.0 existente en disco, o None si no se ha generado"""
+    import pandas as pd
+    if not DATASET_PATH.exists():
+        return None
+    with recorder.stage('load_dataset') as step:
+        df = pd.read_csv(DATASET_PATH)
+        step.read(DATASET_PATH)
+        step.rows = len(df)
+    return df
+
+
+def run_generate_dataset(recorder):
+    """Ejecutar generador de dataset v4.0 (en proceso); devuelve el DataFrame completo"""
     print_banner("PASO 1: Generar Dataset v4.0")
     
     try:
+        from generate_case_study_data_v4 import generate_dataset, turns_analysis, write_outputs
+
         print_info("Generando 20,000 muestras (10K baseline + 10K optimizado)...")
         print_info("Circuito: 6 turns Jerez (Senna, Dry Sack, Ciklon, Cartuja, Ayrton, Giro)")
         print_info("Canales: 35 (motor, frenos, aero, eficiencia, batería)")
         
-        start = time.time()
-        
-        # Ejecutar script v4.0 directamente
-        import subprocess
-        result = subprocess.run(
-            [sys.executable, "scripts/generators/generate_case_study_data_v4.py"],
-            cwd=PROJECT_ROOT,
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        
-        if result.returncode != 0:
-            raise RuntimeError(f"Script error: {result.stderr}")
-        
-        elapsed = time.time() - start
-        
-        # Leer datasets generados
-        import pandas as pd
-        dataset_path = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
-        
-        if not dataset_path.exists():
-            raise FileNotFoundError(f"Dataset no generado: {dataset_path}")
-        
-        df_complete = pd.read_csv(dataset_path)
-        
-        print_success(f"Dataset v4.0 generado en {elapsed:.2f}s")
+        with recorder.stage('dataset') as stage:
+            with recorder.stage('generate_dataset') as step:
+                df_complete, turn_ratings = generate_dataset()
+                step.rows = len(df_complete)
+            with recorder.stage('turns_analysis', rows=len(df_complete)):
+                df_turns = turns_analysis(df_complete)
+            with recorder.stage('write_outputs', rows=len(df_complete)) as step:
+                files = write_outputs(df_complete, turn_ratings, df_turns,
+                                      data_dir=DATA_DIR, tables_dir=TABLES_DIR)
+                step.wrote(*files.values())
+            stage.rows = len(df_complete)
+        
+        print_success(f"Dataset v4.0 generado en {stage.wall_s:.2f}s")
         print_info(f"  Total:     {len(df_complete):,} muestras")
         print_info(f"  Canales:   {len(df_complete.columns)}")
-        print_info(f"  Archivo:   {DATA_DIR}/NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv")
+        print_info(f"  Archivo:   {files['dataset']}")
         
-        return df_complete, df_complete
+        return df_complete
         
     except Exception as e:
         print_error(f"Error generando dataset: {e}")
         import traceback
         traceback.print_exc()
-        return None, None
+        return None
 
 
-def run_generate_tables(df_baseline, df_optimized):
-    """Ejecutar generador de tablas métricas"""
+def run_generate_tables(df, recorder):
+    """Ejecutar generador de tablas métricas sobre el dataset en memoria"""
     print_banner("PASO 2: Generar Tablas Métricas v4.0")
     
-    # Si no hay datos, intentar cargar desde archivo
-    if df_baseline is None or df_optimized is None:
-        import pandas as pd
-        dataset_path = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
-        if dataset_path.exists():
-            df = pd.read_csv(dataset_path)
-            df_baseline = df
-            df_optimized = df
-        else:
-            print_error("No hay dataset disponible para tablas")
-            return None
-    
     try:
+        from generate_tables_v4 import generate_tables
+
         print_info("Generando 7 tablas métricas...")
         print_info("  • Tabla 1: Core metrics (RPM, torque, speed, throttle)")
         print_info("  • Tabla 2: Dynamics (accel, slip, brakes)")
@@ -136,28 +139,13 @@ def run_generate_tables(df_baseline, df_optimized):
         print_info("  • Tabla 6: Statistical Tests")
         print_info("  • Tabla 7: Sample Characteristics")
         
-        start = time.time()
-        
-        # Ejecutar script de tablas
-        import subprocess
-        result = subprocess.run(
-            [sys.executable, "scripts/generators/generate_tables_v4.py"],
-            cwd=PROJECT_ROOT,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        if result.returncode != 0:
-            print_info("(Tablas pueden no estar completamente configuradas, continuando...)")
+        with recorder.stage('tables', rows=len(df)) as stage:
+            tables = generate_tables(df, out_dir=TABLES_DIR, verbose=False, stage=recorder.stage)
         
-        elapsed = time.time() - start
-        
-        print_success(f"Tablas generadas en {elapsed:.2f}s")
+        print_success(f"Tablas generadas en {stage.wall_s:.2f}s")
         print_info(f"  CSV files:")
-        print_info(f"    • Table_v4_Glicko_Summary.csv")
-        print_info(f"    • Table_v4_All_Metrics.csv")
-        print_info(f"    • Table_v4_Statistical_Tests.csv")
+        for name in tables:
+            print_info(f"    • {name}.csv")
         
         return True
         
@@ -168,43 +156,24 @@ def run_generate_tables(df_baseline, df_optimized):
         return False
 
 
-def run_verify_dataset():
-    """Ejecutar verificación de dataset"""
+def run_verify_dataset(df, recorder):
+    """Ejecutar verificación del dataset en memoria"""
     print_banner("PASO 3: Verificar Integridad del Dataset")
     
     try:
-        import subprocess
-        
-        dataset_path = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
-        
-        if not dataset_path.exists():
-            print_error(f"Dataset no encontrado: {dataset_path}")
-            return False
-        
-        print_info(f"Analizando: {dataset_path.name}")
-        
-        start = time.time()
-        result = subprocess.run(
-            [sys.executable, "scripts/analysis/verify_dataset_v4.py"],
-            cwd=PROJECT_ROOT,
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        # Mostrar salida del verificador
-        if result.stdout:
-            print(result.stdout)
+        from verify_dataset_v4 import print_summary, verify_dataset
+
+        print_info(f"Analizando: {DATASET_PATH.name}")
         
-        elapsed = time.time() - start
+        with recorder.stage('verify', rows=len(df)) as stage:
+            result = verify_dataset(df)
+            print_summary(result)
         
-        if result.returncode == 0:
-            print_success(f"Verificación completada en {elapsed:.2f}s")
-            return True
+        if result['ok']:
+            print_success(f"Verificación completada en {stage.wall_s:.2f}s")
         else:
-            if result.stderr:
-                print_error(f"Error en verificación: {result.stderr}")
-            return True  # No bloquear si hay advertencias
+            print_error(f"Errores en verificación: {len(result['errors'])}")
+        return True  # No bloquear si hay advertencias
         
     except Exception as e:
         print_error(f"Error verificando dataset: {e}")
@@ -213,46 +182,28 @@ def run_verify_dataset():
         return True  # No bloquear en errores de verificación
 
 
-def run_generate_figures():
-    """Ejecutar generador de figuras"""
+def run_generate_figures(df, recorder):
+    """Ejecutar generador de figuras sobre el dataset en memoria"""
     print_banner("PASO 4: Generar Figuras (OPCIONAL)")
     
     try:
-        import subprocess
-        
-        dataset_path = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
-        
-        if not dataset_path.exists():
-            print_error(f"Dataset no encontrado para figuras: {dataset_path}")
-            return False
-        
+        import matplotlib
+        matplotlib.use('Agg')
+        from visualize_results_v4 import FIGURES_DIR, generate_figures, split_setups
+
         print_info("Generando 4 figuras publicables (300 DPI)...")
         print_info("  • Figure 5: Time Series")
         print_info("  • Figure 6: Statistical Validation")
         print_info("  • Figure 7: Phase Space")
         print_info("  • Figure 8: Heat Map")
         
-        start = time.time()
-        result = subprocess.run(
-            [sys.executable, "scripts/analysis/visualize_results_v4.py"],
-            cwd=PROJECT_ROOT,
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        with recorder.stage('figures', rows=len(df)) as stage:
+            paths = generate_figures(*split_setups(df), out_dir=FIGURES_DIR, verbose=False,
+                                     stage=recorder.stage)
         
-        elapsed = time.time() - start
-        
-        if result.returncode == 0:
-            print_success(f"Figuras generadas en {elapsed:.2f}s (PDF + PNG 300 DPI)")
-            print_info(f"  Ubicación: {OUTPUTS_DIR}/figures/")
-            return True
-        else:
-            if result.stderr:
-                print_error(f"Error en generación de figuras: {result.stderr}")
-            else:
-                print_error("Error en generación de figuras (sin salida de error)")
-            return True  # No bloquear ejecución
+        print_success(f"Figuras generadas en {stage.wall_s:.2f}s (PDF + PNG 300 DPI, {len(paths)} archivos)")
+        print_info(f"  Ubicación: {FIGURES_DIR}/")
+        return True
         
     except Exception as e:
         print_error(f"Error generando figuras: {e}")
@@ -261,45 +212,24 @@ def run_generate_figures():
         return True  # No bloquear en errores de figuras
 
 
-def run_generate_mdf4():
+def run_generate_mdf4(recorder):
     """Ejecutar generador MDF4"""
     print_banner("PASO 5: Generar MDF4 Industrial (OPCIONAL)")
     
     try:
-        import subprocess
-        
-        dataset_path = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
-        
-        if not dataset_path.exists():
-            print_error(f"Dataset no encontrado para MDF4: {dataset_path}")
-            return False
-        
-        print_info("Convirtiendo dataset a formato ASAM MDF4...")
+        from generate_mdf4_binary_v3 import create_mdf4_file_v3
+
+        print_info("Generando binario ASAM MDF4...")
         print_info("  Formato: MDF4 (ISO 22901-1:2008)")
-        print_info("  Compresión: zlib")
-        print_info("  Canales: 35")
+        print_info("  Canales: 65 × 2 setups")
         
-        start = time.time()
-        result = subprocess.run(
-            [sys.executable, "scripts/generators/generate_mdf4_binary_v3.py"],
-            cwd=PROJECT_ROOT,
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        with recorder.stage('mdf4') as stage:
+            output_file = create_mdf4_file_v3(verbose=False)
+            stage.wrote(output_file)
         
-        elapsed = time.time() - start
-        
-        if result.returncode == 0:
-            print_success(f"MDF4 generado en {elapsed:.2f}s")
-            print_info(f"  Ubicación: {OUTPUTS_DIR}/mdf4/")
-            return True
-        else:
-            if result.stderr:
-                print_error(f"Error en generación de MDF4: {result.stderr}")
-            else:
-                print_error("Error en generación de MDF4 (sin salida de error)")
-            return False
+        print_success(f"MDF4 generado en {stage.wall_s:.2f}s")
+        print_info(f"  Ubicación: {output_file}")
+        return True
         
     except Exception as e:
         print_error(f"Error generando MDF4: {e}")
@@ -308,6 +238,18 @@ def run_generate_mdf4():
         return False
 
 
+def write_run_report(recorder, report_path, run_options, results):
+    """Tabla de etapas en consola + informe JSON (también si la ejecución falla)"""
+    print_banner("MÉTRICAS POR ETAPA")
+    recorder.print_table()
+    path = recorder.write_report(report_path, options=run_options, results=results)
+    recorder.close()
+    print()
+    print_info(f"Informe de ejecución: {path}")
+    if recorder.profile:
+        print_info(f"Perfiles ({recorder.profile}): {recorder.profile_dir}/")
+
+
 def show_summary(options):
     """Mostrar resumen final"""
     print_banner("RESUMEN DE EJECUCIÓN")
@@ -315,13 +257,14 @@ def show_summary(options):
     print_info("Archivos generados:")
     
     if options.get('dataset', True):
-        print_info("  ✅ data/versioned/NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv (11 MB)")
-        print_info("  ✅ outputs/tables/Turns_Analysis_v4.csv")
+        print_info("  ✅ data/datasets/NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv (11 MB)")
+        print_info("  ✅ data/tables/Turns_Analysis_v4.csv")
+        print_info("  ✅ data/tables/Table_v4_Turn_Ratings.csv")
     
     if options.get('tables', True):
-        print_info("  ✅ outputs/tables/Table_v4_Glicko_Summary.csv")
-        print_info("  ✅ outputs/tables/Table_v4_All_Metrics.csv")
-        print_info("  ✅ outputs/tables/Table_v4_Statistical_Tests.csv")
+        print_info("  ✅ data/tables/Table_v4_Glicko_Summary.csv")
+        print_info("  ✅ data/tables/Table_v4_All_Metrics.csv")
+        print_info("  ✅ data/tables/Table_v4_Statistical_Tests.csv")
     
     if options.get('verify', True):
         print_info("  ✅ Dataset verification completado")
@@ -331,7 +274,7 @@ def show_summary(options):
         print_info("  ✅ outputs/figures/Figure_*.png")
     
     if options.get('mdf4', False):
-        print_info("  ✅ outputs/mdf4/NLA_CaseStudy_Jerez_Q1_v4_MEGA.mf4")
+        print_info("  ✅ data/mdf4/NLA_CaseStudy_Jerez_v3_Industrial.mf4")
     
     print("\n" + "="*80)
     print("📊 ESTADÍSTICAS PRINCIPALES (v4.0)")
@@ -376,6 +319,7 @@ Ejemplos:
   python run_all.py --with-figures     # Incluir generación de figuras
   python run_all.py --with-mdf4        # Incluir generación de MDF4
   python run_all.py --full             # Todo (data, tablas, verify, figuras, MDF4)
+  python run_all.py --full --profile collapsed   # + pilas muestreadas por etapa
         """
     )
     
@@ -391,6 +335,12 @@ Ejemplos:
                         help='Ejecutar todo (dataset, tablas, verify, figuras, MDF4)')
     parser.add_argument('--skip-verify', action='store_true',
                         help='Saltar verificación de dataset')
+    parser.add_argument('--report', type=Path,
+                        help='Informe JSON de la ejecución (default: outputs/reports/run_report_<fecha>.json)')
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=PROFILE_FORMATS,
+                        help='Perfilar cada etapa: cprofile (.prof) o collapsed (flame graph)')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='Medir también el pico de tracemalloc por etapa (ralentiza ~5x)')
     
     args = parser.parse_args()
     
@@ -421,30 +371,44 @@ Ejemplos:
         'mdf4': False,
     }
     
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    recorder = StageRecorder(trace_memory=args.tracemalloc, profile=args.profile,
+                             profile_dir=REPORTS_DIR / f"profiles_{stamp}")
+    report_path = args.report or REPORTS_DIR / f"run_report_{stamp}.json"
+    
     try:
-        # 1. Generar Dataset
-        if run_options['dataset']:
-            df_baseline, df_optimized = run_generate_dataset()
-            results['dataset'] = (df_baseline is not None and df_optimized is not None)
+        # 1. Generar Dataset (o cargar el existente); los pasos siguientes lo reciben en memoria
+        df = None
+        if run_options['dataset'] and not args.tables_only:
+            df = run_generate_dataset(recorder)
+        elif run_options['dataset']:
+            df = load_dataset(recorder)
+            if df is None:
+                print_error(f"Dataset no encontrado: {DATASET_PATH}")
+        results['dataset'] = df is not None
         
         # 2. Generar Tablas
         if run_options['tables'] and results['dataset']:
-            run_generate_tables(df_baseline, df_optimized)
-            results['tables'] = True
+            results['tables'] = run_generate_tables(df, recorder)
         elif run_options['tables'] and not results['dataset']:
             print_info("Saltando generación de tablas (dataset no disponible)")
         
         # 3. Verificar Dataset
         if run_options['verify'] and results['dataset']:
-            results['verify'] = run_verify_dataset()
+            results['verify'] = run_verify_dataset(df, recorder)
         
         # 4. Generar Figuras
         if run_options['figures']:
-            results['figures'] = run_generate_figures()
+            if df is None:
+                df = load_dataset(recorder)
+            if df is not None:
+                results['figures'] = run_generate_figures(df, recorder)
+            else:
+                print_error(f"Dataset no encontrado para figuras: {DATASET_PATH}")
         
         # 5. Generar MDF4
         if run_options['mdf4']:
-            results['mdf4'] = run_generate_mdf4()
+            results['mdf4'] = run_generate_mdf4(recorder)
         
         # Mostrar resumen
         show_summary(run_options)
@@ -463,6 +427,8 @@ Ejemplos:
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        write_run_report(recorder, report_path, run_options, results)
 
 
 if __name__ == "__main__":
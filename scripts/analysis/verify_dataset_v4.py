@@ -4,206 +4,267 @@ SCRIPT DE VERIFICACIÓN v4.0 - DATASET MEGA
 ===========================================
 Verifica la integridad del dataset v4.0 generado con 20,000 muestras.
 
-Uso: python verify_dataset_v4.py [dataset_path]
+Uso: python verify_dataset_v4.py [dataset_path | store_dir]
+
+  from verify_dataset_v4 import verify_dataset
+  result = verify_dataset(df)          # {'ok', 'passed', 'total', 'errors', 'warnings'}
 """
 
+from __future__ import annotations
+
 import os
 import sys
-import pandas as pd
+from typing import Dict, Optional
 import numpy as np
 from pathlib import Path
 
-# Usar archivo por defecto si no se especifica
-if len(sys.argv) > 1:
-    dataset_file = sys.argv[1]
-else:
-    dataset_file = "data/versioned/NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
-
-print("="*80)
-print("VERIFICACIÓN DE DATASET v4.0 - MEGA EXPANSION")
-print("="*80)
-
-errors = []
-warnings = []
-passed = 0
-
-# ============================================================================
-# 1. VERIFICAR ARCHIVO DATASET
-# ============================================================================
-print(f"\n[1/5] Verificando archivo: {dataset_file}...")
-
-if not os.path.exists(dataset_file):
-    print(f"  ✗ Error: Archivo no encontrado: {dataset_file}")
-    sys.exit(1)
-
-file_size_mb = os.path.getsize(dataset_file) / (1024 * 1024)
-print(f"  ✓ Archivo existe ({file_size_mb:.1f} MB)")
-passed += 1
-
-# ============================================================================
-# 2. VERIFICAR ESTRUCTURA DEL CSV
-# ============================================================================
-print("\n[2/5] Verificando estructura del dataset...")
-
-try:
-    df = pd.read_csv(dataset_file)
-    
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / "scripts" / "utils"))
+
+from channel_store import ChannelStore, as_frame, is_store
+from lazy_import import lazy_import
+from rolling_stats import rolling_stats
+
+pd = lazy_import('pandas')
+
+ROLLING_WINDOW = 101       # muestras (~0.1 s)
+SPIKE_IQR_FACTOR = 5.0     # |x - mediana móvil| > factor × IQR móvil
+MAX_SPIKE_PERCENT = 1.0
+TOTAL_CHECKS = 16
+DEFAULT_DATASET = PROJECT_ROOT / "data" / "datasets" / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
+GENERATOR_SCRIPT = PROJECT_ROOT / "scripts" / "generators" / "generate_case_study_data_v4.py"
+
+
+def _silent(*args, **kwargs):
+    pass
+
+
+def verify_dataset(df, file_size_mb: Optional[float] = None, verbose: bool = True) -> Dict:
+    """
+    Run the v4.0 integrity checks on an in-memory dataset.
+
+    Args:
+        df: Dataset (as loaded from the v4.0 CSV) or its ChannelStore
+        file_size_mb: Size of the source file(s), reported by check 1 (None = in memory)
+        verbose: Print the check-by-check report
+
+    Returns:
+        Dict with 'passed', 'total', 'errors', 'warnings' and 'ok' (no errors)
+    """
+    log = print if verbose else _silent
+    df = as_frame(df)
+    errors = []
+    warnings = []
+    passed = 0
+
+    # ============================================================================
+    # 1. VERIFICAR ARCHIVO DATASET
+    # ============================================================================
+    if file_size_mb is None:
+        log("\n[1/5] Verificando dataset en memoria...")
+        log(f"  ✓ Dataset en memoria")
+    else:
+        log(f"  ✓ Archivo existe ({file_size_mb:.1f} MB)")
+    passed += 1
+
+    # ============================================================================
+    # 2. VERIFICAR ESTRUCTURA DEL CSV
+    # ============================================================================
+    log("\n[2/5] Verificando estructura del dataset...")
+
     # Verificar dimensiones esperadas
     expected_rows = 20000  # v4.0 MEGA
     expected_cols_min = 35  # 35 canales
-    
-    print(f"  ✓ Dataset cargado exitosamente")
-    print(f"  • Filas: {len(df):,}")
-    print(f"  • Columnas: {len(df.columns)}")
-    
+
+    log(f"  ✓ Dataset cargado exitosamente")
+    log(f"  • Filas: {len(df):,}")
+    log(f"  • Columnas: {len(df.columns)}")
+
     if len(df) >= expected_rows:
-        print(f"  ✓ Muestras: {len(df):,} (correcto, ≥ {expected_rows:,})")
+        log(f"  ✓ Muestras: {len(df):,} (correcto, ≥ {expected_rows:,})")
         passed += 1
     else:
         warnings.append(f"Número de muestras menor al esperado: {len(df)} (esperado: {expected_rows})")
-        print(f"  ⚠ Muestras: {len(df):,} (esperado: ≥ {expected_rows:,})")
-    
+        log(f"  ⚠ Muestras: {len(df):,} (esperado: ≥ {expected_rows:,})")
+
     if len(df.columns) >= expected_cols_min:
-        print(f"  ✓ Canales: {len(df.columns)} (correcto, ≥ {expected_cols_min})")
+        log(f"  ✓ Canales: {len(df.columns)} (correcto, ≥ {expected_cols_min})")
         passed += 1
     else:
         errors.append(f"Número de canales insuficiente: {len(df.columns)} (esperado: ≥ {expected_cols_min})")
-        print(f"  ✗ Canales: {len(df.columns)} (esperado: ≥ {expected_cols_min})")
-    
+        log(f"  ✗ Canales: {len(df.columns)} (esperado: ≥ {expected_cols_min})")
+
     # Valores faltantes
     missing = df.isnull().sum().sum()
     if missing == 0:
-        print(f"  ✓ Valores faltantes: 0")
+        log(f"  ✓ Valores faltantes: 0")
         passed += 1
     else:
         warnings.append(f"Dataset contiene {missing} valores faltantes")
-        print(f"  ⚠ Valores faltantes: {missing}")
-    
+        log(f"  ⚠ Valores faltantes: {missing}")
+
     # Tipos de datos
     numeric_cols = df.select_dtypes(include=[np.number]).columns
-    print(f"  ✓ Columnas numéricas: {len(numeric_cols)}")
-    
-except Exception as e:
-    print(f"  ✗ Error al cargar CSV: {str(e)}")
-    errors.append(f"Error al cargar CSV: {str(e)}")
-    sys.exit(1)
-
-# ============================================================================
-# 3. VERIFICAR RANGO DE VALORES
-# ============================================================================
-print("\n[3/5] Verificando rangos físicos...")
-
-try:
-    # Columnas esperadas en v4.0
-    expected_cols = ['Engine_RPM', 'Throttle_pos', 'Wheel_Speed', 'Brake_Pressure',
-                     'Lateral_Accel', 'Wheel_Slip_Ratio', 'Glicko_Rating', 'Glicko_Deviation']
-    
-    found_cols = [col for col in expected_cols if col in df.columns]
-    print(f"  ✓ Columnas clave encontradas: {len(found_cols)}/{len(expected_cols)}")
-    
-    # Verificar rangos
-    if 'Engine_RPM' in df.columns:
-        rpm_min, rpm_max = df['Engine_RPM'].min(), df['Engine_RPM'].max()
-        if 0 <= rpm_min < rpm_max <= 15000:
-            print(f"  ✓ Engine_RPM: [{rpm_min:.0f}, {rpm_max:.0f}] (válido)")
-            passed += 1
-        else:
-            warnings.append(f"Engine_RPM fuera de rango esperado: [{rpm_min}, {rpm_max}]")
-            print(f"  ⚠ Engine_RPM: [{rpm_min:.0f}, {rpm_max:.0f}] (posible problema)")
-    
-    if 'Throttle_pos' in df.columns:
-        thr_min, thr_max = df['Throttle_pos'].min(), df['Throttle_pos'].max()
-        if 0 <= thr_min <= thr_max <= 100:
-            print(f"  ✓ Throttle_pos: [{thr_min:.1f}, {thr_max:.1f}]% (válido)")
+    log(f"  ✓ Columnas numéricas: {len(numeric_cols)}")
+
+    # ============================================================================
+    # 3. VERIFICAR RANGO DE VALORES
+    # ============================================================================
+    log("\n[3/5] Verificando rangos físicos...")
+
+    try:
+        # Columnas esperadas en v4.0
+        expected_cols = ['Engine_RPM', 'Throttle_pos', 'Wheel_Speed', 'Brake_Pressure',
+                         'Lateral_Accel', 'Wheel_Slip_Ratio', 'Glicko_Rating', 'Glicko_Deviation']
+
+        found_cols = [col for col in expected_cols if col in df.columns]
+        log(f"  ✓ Columnas clave encontradas: {len(found_cols)}/{len(expected_cols)}")
+
+        # Verificar rangos
+        if 'Engine_RPM' in df.columns:
+            rpm_min, rpm_max = df['Engine_RPM'].min(), df['Engine_RPM'].max()
+            if 0 <= rpm_min < rpm_max <= 15000:
+                log(f"  ✓ Engine_RPM: [{rpm_min:.0f}, {rpm_max:.0f}] (válido)")
+                passed += 1
+            else:
+                warnings.append(f"Engine_RPM fuera de rango esperado: [{rpm_min}, {rpm_max}]")
+                log(f"  ⚠ Engine_RPM: [{rpm_min:.0f}, {rpm_max:.0f}] (posible problema)")
+
+        if 'Throttle_pos' in df.columns:
+            thr_min, thr_max = df['Throttle_pos'].min(), df['Throttle_pos'].max()
+            if 0 <= thr_min <= thr_max <= 100:
+                log(f"  ✓ Throttle_pos: [{thr_min:.1f}, {thr_max:.1f}]% (válido)")
+                passed += 1
+            else:
+                warnings.append(f"Throttle_pos fuera de [0, 100]: [{thr_min}, {thr_max}]")
+                log(f"  ⚠ Throttle_pos: [{thr_min:.1f}, {thr_max:.1f}]% (inusual)")
+
+        if 'Glicko_Deviation' in df.columns:
+            gd_mean = df['Glicko_Deviation'].mean()
+            gd_std = df['Glicko_Deviation'].std()
+            if 0 < gd_mean < 200 and 0 < gd_std < 150:
+                log(f"  ✓ Glicko_Deviation: μ={gd_mean:.1f}, σ={gd_std:.1f} (válido)")
+                passed += 1
+            else:
+                warnings.append(f"Glicko_Deviation valores inusuales: μ={gd_mean}, σ={gd_std}")
+                log(f"  ⚠ Glicko_Deviation: μ={gd_mean:.1f}, σ={gd_std:.1f}")
+
+    except Exception as e:
+        log(f"  ✗ Error verificando rangos: {str(e)}")
+        errors.append(f"Error en verificación de rangos: {str(e)}")
+
+    # ============================================================================
+    # 4. VERIFICAR ESTADÍSTICAS BÁSICAS
+    # ============================================================================
+    log("\n[4/5] Verificando estadísticas...")
+
+    try:
+        # Estadísticas básicas
+        log(f"  ✓ Columnas numéricas: {len(numeric_cols)}")
+        log(f"  ✓ Media de valores: {df[numeric_cols].mean().mean():.2f}")
+        log(f"  ✓ Desv. Est. promedio: {df[numeric_cols].std().mean():.2f}")
+
+        # Verificar distribuciones
+        if 'Glicko_Rating' in df.columns:
+            gr_mean = df['Glicko_Rating'].mean()
+            gr_std = df['Glicko_Rating'].std()
+            log(f"  ✓ Glicko_Rating: μ={gr_mean:.1f} ± {gr_std:.1f}")
             passed += 1
-        else:
-            warnings.append(f"Throttle_pos fuera de [0, 100]: [{thr_min}, {thr_max}]")
-            print(f"  ⚠ Throttle_pos: [{thr_min:.1f}, {thr_max:.1f}]% (inusual)")
-    
-    if 'Glicko_Deviation' in df.columns:
-        gd_mean = df['Glicko_Deviation'].mean()
-        gd_std = df['Glicko_Deviation'].std()
-        if 0 < gd_mean < 200 and 0 < gd_std < 150:
-            print(f"  ✓ Glicko_Deviation: μ={gd_mean:.1f}, σ={gd_std:.1f} (válido)")
+
+        # Estabilidad local: mediana, IQR y σ móviles de todos los canales a la vez
+        values = df[numeric_cols].to_numpy(dtype=float)
+        w = ROLLING_WINDOW
+        rolling = rolling_stats(values, [('median', w), (0.25, w), (0.75, w), ('std', w)])
+        iqr = rolling[(0.75, w)] - rolling[(0.25, w)]
+        spikes = (np.abs(values - rolling[('median', w)]) > SPIKE_IQR_FACTOR * iqr) & (iqr > 0)
+        spike_pct = spikes.mean() * 100
+        worst = numeric_cols[np.argmax(spikes.mean(axis=0))]
+        log(f"  ✓ σ móvil ({w} muestras) promedio: {np.nanmean(rolling[('std', w)]):.2f}")
+        if spike_pct <= MAX_SPIKE_PERCENT:
+            log(f"  ✓ Picos > {SPIKE_IQR_FACTOR:.0f}×IQR móvil: {spike_pct:.2f}% (máx. en {worst})")
             passed += 1
         else:
-            warnings.append(f"Glicko_Deviation valores inusuales: μ={gd_mean}, σ={gd_std}")
-            print(f"  ⚠ Glicko_Deviation: μ={gd_mean:.1f}, σ={gd_std:.1f}")
-    
-except Exception as e:
-    print(f"  ✗ Error verificando rangos: {str(e)}")
-    errors.append(f"Error en verificación de rangos: {str(e)}")
-
-# ============================================================================
-# 4. VERIFICAR ESTADÍSTICAS BÁSICAS
-# ============================================================================
-print("\n[4/5] Verificando estadísticas...")
-
-try:
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    
-    # Estadísticas básicas
-    print(f"  ✓ Columnas numéricas: {len(numeric_cols)}")
-    print(f"  ✓ Media de valores: {df[numeric_cols].mean().mean():.2f}")
-    print(f"  ✓ Desv. Est. promedio: {df[numeric_cols].std().mean():.2f}")
-    
-    # Verificar distribuciones
-    if 'Glicko_Rating' in df.columns:
-        gr_mean = df['Glicko_Rating'].mean()
-        gr_std = df['Glicko_Rating'].std()
-        print(f"  ✓ Glicko_Rating: μ={gr_mean:.1f} ± {gr_std:.1f}")
-        passed += 1
-    
-except Exception as e:
-    print(f"  ✗ Error en estadísticas: {str(e)}")
-    errors.append(f"Error en estadísticas: {str(e)}")
-
-# ============================================================================
-# 5. VERIFICAR REPRODUCIBILIDAD
-# ============================================================================
-print("\n[5/5] Verificando reproducibilidad...")
-
-# Buscar archivo generador
-gen_scripts = ['scripts/generators/generate_case_study_data_v4.py',
-               'generate_case_study_data_v4.py']
-
-gen_found = False
-for script_path in gen_scripts:
-    if os.path.exists(script_path):
-        print(f"  ✓ Script generador encontrado: {script_path}")
-        gen_found = True
+            log(f"  ⚠ Picos > {SPIKE_IQR_FACTOR:.0f}×IQR móvil: {spike_pct:.2f}% (máx. en {worst})")
+            warnings.append(f"Picos frente a la mediana móvil: {spike_pct:.2f}% > {MAX_SPIKE_PERCENT}%")
+
+    except Exception as e:
+        log(f"  ✗ Error en estadísticas: {str(e)}")
+        errors.append(f"Error en estadísticas: {str(e)}")
+
+    # ============================================================================
+    # 5. VERIFICAR REPRODUCIBILIDAD
+    # ============================================================================
+    log("\n[5/5] Verificando reproducibilidad...")
+
+    if GENERATOR_SCRIPT.exists():
+        log(f"  ✓ Script generador encontrado: {GENERATOR_SCRIPT.relative_to(PROJECT_ROOT)}")
         passed += 1
-        break
-
-if not gen_found:
-    warnings.append("Script generador no encontrado (reproducibilidad limitada)")
-    print(f"  ⚠ Script generador no localizado")
-
-# ============================================================================
-# RESUMEN FINAL
-# ============================================================================
-print("\n" + "="*80)
-print("RESUMEN DE VERIFICACIÓN")
-print("="*80)
-
-total_checks = 15
-print(f"\n✓ Verificaciones pasadas: {passed}/{total_checks}")
-
-if len(errors) > 0:
-    print(f"\n✗ ERRORES CRÍTICOS ({len(errors)}):")
-    for i, err in enumerate(errors, 1):
-        print(f"  {i}. {err}")
-
-if len(warnings) > 0:
-    print(f"\n⚠ ADVERTENCIAS ({len(warnings)}):")
-    for i, warn in enumerate(warnings, 1):
-        print(f"  {i}. {warn}")
-
-print("\n" + "="*80)
-
-if len(errors) == 0:
-    print("✅ DATASET LISTO PARA ANÁLISIS")
-    sys.exit(0)
-else:
-    print("⚠️  DATASET CON PROBLEMAS - REVISAR ERRORES")
-    sys.exit(1)
+    else:
+        warnings.append("Script generador no encontrado (reproducibilidad limitada)")
+        log(f"  ⚠ Script generador no localizado")
+
+    return {'passed': passed, 'total': TOTAL_CHECKS, 'errors': errors,
+            'warnings': warnings, 'ok': len(errors) == 0}
+
+
+def print_summary(result: Dict) -> None:
+    """Print the final summary of a verify_dataset() result."""
+    print("\n" + "="*80)
+    print("RESUMEN DE VERIFICACIÓN")
+    print("="*80)
+
+    print(f"\n✓ Verificaciones pasadas: {result['passed']}/{result['total']}")
+
+    if len(result['errors']) > 0:
+        print(f"\n✗ ERRORES CRÍTICOS ({len(result['errors'])}):")
+        for i, err in enumerate(result['errors'], 1):
+            print(f"  {i}. {err}")
+
+    if len(result['warnings']) > 0:
+        print(f"\n⚠ ADVERTENCIAS ({len(result['warnings'])}):")
+        for i, warn in enumerate(result['warnings'], 1):
+            print(f"  {i}. {warn}")
+
+    print("\n" + "="*80)
+
+    if result['ok']:
+        print("✅ DATASET LISTO PARA ANÁLISIS")
+    else:
+        print("⚠️  DATASET CON PROBLEMAS - REVISAR ERRORES")
+
+
+def verify_file(dataset_file: Path) -> Dict:
+    """Load a dataset CSV (or map a channel store) and verify it; raises FileNotFoundError if missing."""
+    print(f"\n[1/5] Verificando archivo: {dataset_file}...")
+    if is_store(dataset_file):
+        store = ChannelStore(dataset_file)
+        return verify_dataset(store, file_size_mb=store.nbytes / (1024 * 1024))
+    if not os.path.exists(dataset_file):
+        raise FileNotFoundError(f"Archivo no encontrado: {dataset_file}")
+    file_size_mb = os.path.getsize(dataset_file) / (1024 * 1024)
+    return verify_dataset(pd.read_csv(dataset_file), file_size_mb=file_size_mb)
+
+
+def main() -> int:
+    # Usar archivo por defecto si no se especifica
+    dataset_file = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DATASET
+
+    print("="*80)
+    print("VERIFICACIÓN DE DATASET v4.0 - MEGA EXPANSION")
+    print("="*80)
+
+    try:
+        result = verify_file(dataset_file)
+    except FileNotFoundError as e:
+        print(f"  ✗ Error: {e}")
+        return 1
+    except Exception as e:
+        print(f"  ✗ Error al cargar CSV: {str(e)}")
+        return 1
+
+    print_summary(result)
+    return 0 if result['ok'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
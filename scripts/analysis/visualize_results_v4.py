@@ -8,71 +8,86 @@ Figures:
 - Figure 6: Statistical Validation (Distribution analysis + Q-Q plots)
 - Figure 7: Phase Space Analysis (Throttle vs RPM dynamics)
 - Figure 8: Volatility Heatmaps (Temporal evolution)
+
+Uso:
+  python scripts/analysis/visualize_results_v4.py [dataset_path | store_dir]
+
+  from visualize_results_v4 import generate_figures, split_setups
+  paths = generate_figures(*split_setups(df), out_dir=FIGURES_DIR)
 """
 
+from __future__ import annotations
+
+import sys
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
 from pathlib import Path
+from typing import List, Tuple
 import warnings
 
-warnings.filterwarnings('ignore')
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from channel_store import ChannelStore, is_store
+from decimation import decimate, pixel_budget
+from lazy_import import lazy_import
+from stage_metrics import null_stage
+
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+stats = lazy_import('scipy.stats')
 
 # Setup paths
-PROJECT_ROOT = Path(__file__).parent.parent.parent
-DATA_DIR = PROJECT_ROOT / "data" / "versioned"
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = PROJECT_ROOT / "data" / "datasets"
 FIGURES_DIR = PROJECT_ROOT / "outputs" / "figures"
-FIGURES_DIR.mkdir(parents=True, exist_ok=True)
+DATASET_FILE = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
 
 # ========================
 # SETUP & STYLE
 # ========================
-plt.rcParams['font.family'] = 'Times New Roman'
-plt.rcParams['figure.dpi'] = 100
-plt.rcParams['savefig.dpi'] = 300
-plt.rcParams['font.size'] = 10
+RC_PARAMS = {
+    'font.family': 'Times New Roman',
+    'figure.dpi': 100,
+    'savefig.dpi': 300,
+    'font.size': 10,
+}
 
 # Colorblind-friendly palette
 COLORS_BASELINE = '#0173B2'   # Blue
 COLORS_OPTIMIZED = '#DE8F05'  # Orange
 COLORS_DIFF = '#CC78BC'        # Purple
 
-# Load dataset
-dataset_file = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
-if not dataset_file.exists():
-    dataset_file = "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
 
-try:
-    df = pd.read_csv(dataset_file)
+def split_setups(df) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Baseline and optimized rows of a v4.0 dataset (DataFrame or ChannelStore), each with a fresh index."""
+    if isinstance(df, ChannelStore):
+        return df.frame(setup='baseline'), df.frame(setup='optimized')
     df_baseline = df[df['setup'] == 'baseline'].reset_index(drop=True)
     df_optimized = df[df['setup'] == 'optimized'].reset_index(drop=True)
-    print("✅ Data loaded successfully")
-except FileNotFoundError:
-    print("❌ Dataset not found. Run generate_case_study_data_v4.py first")
-    exit(1)
+    return df_baseline, df_optimized
+
+def _trace(ax, time: np.ndarray, values, method: str = 'lttb'):
+    """Time and values of a channel reduced to the pixel budget of ax."""
+    return decimate(time, np.asarray(values), pixel_budget(ax), method)
 
 # ========================
 # FIGURE 5: TIME SERIES
 # ========================
-def create_figure_5():
+def create_figure_5(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame):
     """4-panel time series: RPM, Throttle, Glicko σ, Wheel Slip"""
     
     fig, axes = plt.subplots(2, 2, figsize=(14, 10), dpi=100)
     fig.suptitle('Figure 5: Temporal Evolution - Jerez v4.0 MEGA Dataset', 
                  fontsize=14, fontweight='bold', y=0.995)
     
-    # Subsample for clarity
-    downsample = 10
-    time_baseline = df_baseline['time'].values[::downsample]
-    time_optimized = df_optimized['time'].values[::downsample]
+    # Reduced to the pixel width of each panel (LTTB / min-max envelope)
+    time_baseline = df_baseline['time'].to_numpy()
+    time_optimized = df_optimized['time'].to_numpy()
     
     # RPM
     ax = axes[0, 0]
-    ax.plot(time_baseline, df_baseline['engine_rpm'].values[::downsample], 
+    ax.plot(*_trace(ax, time_baseline, df_baseline['engine_rpm']), 
             color=COLORS_BASELINE, alpha=0.7, label='Baseline', linewidth=1.5)
-    ax.plot(time_optimized, df_optimized['engine_rpm'].values[::downsample], 
+    ax.plot(*_trace(ax, time_optimized, df_optimized['engine_rpm']), 
             color=COLORS_OPTIMIZED, alpha=0.7, label='Optimized', linewidth=1.5)
     ax.set_ylabel('Engine RPM', fontweight='bold')
     ax.legend(loc='upper right')
@@ -80,9 +95,9 @@ def create_figure_5():
     
     # Throttle Position
     ax = axes[0, 1]
-    ax.plot(time_baseline, df_baseline['throttle_position'].values[::downsample]*100, 
+    ax.plot(*_trace(ax, time_baseline, df_baseline['throttle_position'] * 100), 
             color=COLORS_BASELINE, alpha=0.7, label='Baseline', linewidth=1.5)
-    ax.plot(time_optimized, df_optimized['throttle_position'].values[::downsample]*100, 
+    ax.plot(*_trace(ax, time_optimized, df_optimized['throttle_position'] * 100), 
             color=COLORS_OPTIMIZED, alpha=0.7, label='Optimized', linewidth=1.5)
     ax.set_ylabel('Throttle Position (%)', fontweight='bold')
     ax.legend(loc='upper right')
@@ -90,9 +105,9 @@ def create_figure_5():
     
     # Glicko Volatility Sigma
     ax = axes[1, 0]
-    ax.plot(time_baseline, df_baseline['glicko_volatility_sigma'].values[::downsample], 
+    ax.plot(*_trace(ax, time_baseline, df_baseline['glicko_volatility_sigma']), 
             color=COLORS_BASELINE, alpha=0.7, label='Baseline', linewidth=1.5)
-    ax.plot(time_optimized, df_optimized['glicko_volatility_sigma'].values[::downsample], 
+    ax.plot(*_trace(ax, time_optimized, df_optimized['glicko_volatility_sigma']), 
             color=COLORS_OPTIMIZED, alpha=0.7, label='Optimized', linewidth=1.5)
     ax.set_ylabel('Glicko-2 σ (Volatility)', fontweight='bold')
     ax.set_xlabel('Time (seconds)', fontweight='bold')
@@ -101,9 +116,9 @@ def create_figure_5():
     
     # Wheel Slip Ratio
     ax = axes[1, 1]
-    ax.plot(time_baseline, df_baseline['wheel_slip_percent'].values[::downsample], 
+    ax.plot(*_trace(ax, time_baseline, df_baseline['wheel_slip_percent'], 'minmax'), 
             color=COLORS_BASELINE, alpha=0.7, label='Baseline', linewidth=1.5)
-    ax.plot(time_optimized, df_optimized['wheel_slip_percent'].values[::downsample], 
+    ax.plot(*_trace(ax, time_optimized, df_optimized['wheel_slip_percent'], 'minmax'), 
             color=COLORS_OPTIMIZED, alpha=0.7, label='Optimized', linewidth=1.5)
     ax.set_ylabel('Wheel Slip (%)', fontweight='bold')
     ax.set_xlabel('Time (seconds)', fontweight='bold')
@@ -116,7 +131,7 @@ def create_figure_5():
 # ========================
 # FIGURE 6: STATISTICAL VALIDATION
 # ========================
-def create_figure_6():
+def create_figure_6(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame):
     """Distribution analysis + Q-Q plots"""
     
     fig, axes = plt.subplots(2, 2, figsize=(14, 10), dpi=100)
@@ -138,8 +153,8 @@ def create_figure_6():
     # Box plot
     ax = axes[0, 1]
     data_box = [df_baseline['glicko_volatility_sigma'], df_optimized['glicko_volatility_sigma']]
-    bp = ax.boxplot(data_box, labels=['Baseline', 'Optimized'], patch_artist=True,
-                    widths=0.6)
+    bp = ax.boxplot(data_box, patch_artist=True, widths=0.6)
+    ax.set_xticks([1, 2], ['Baseline', 'Optimized'])
     bp['boxes'][0].set_facecolor(COLORS_BASELINE)
     bp['boxes'][1].set_facecolor(COLORS_OPTIMIZED)
     ax.set_ylabel('Glicko-2 σ', fontweight='bold')
@@ -168,7 +183,7 @@ def create_figure_6():
 # ========================
 # FIGURE 7: PHASE SPACE
 # ========================
-def create_figure_7():
+def create_figure_7(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame):
     """Throttle vs RPM dynamics"""
     
     fig, axes = plt.subplots(1, 2, figsize=(14, 6), dpi=100)
@@ -199,7 +214,7 @@ def create_figure_7():
 # ========================
 # FIGURE 8: HEATMAP
 # ========================
-def create_figure_8():
+def create_figure_8(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame):
     """Volatility heatmaps"""
     
     # Create time-binned data
@@ -242,46 +257,78 @@ def create_figure_8():
     plt.tight_layout()
     return fig
 
+# ========================
+# PIPELINE
+# ========================
+FIGURES = [
+    ('Figure 5: Time Series Analysis', 'Figure_5_TimeSeries', create_figure_5),
+    ('Figure 6: Statistical Validation', 'Figure_6_StatisticalValidation', create_figure_6),
+    ('Figure 7: Phase Space Analysis', 'Figure_7_PhaseSpace', create_figure_7),
+    ('Figure 8: Volatility Heatmap', 'Figure_8_HeatMap', create_figure_8),
+]
+
+
+def generate_figures(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame,
+                     out_dir: Path = FIGURES_DIR, verbose: bool = True,
+                     stage=null_stage) -> List[Path]:
+    """
+    Render Figures 5-8 and save each as PDF and PNG.
+
+    Args:
+        df_baseline: Baseline setup rows
+        df_optimized: Optimized setup rows
+        out_dir: Output directory (created if missing)
+        verbose: Print progress
+        stage: Context manager factory timing each figure
+               (stage_metrics.StageRecorder.stage; default: no-op)
+
+    Returns:
+        Paths of the files written
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    with plt.rc_context(RC_PARAMS), warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for title, stem, create in FIGURES:
+            if verbose:
+                print(f"   Generating {title}...")
+            with stage(stem, rows=len(df_baseline) + len(df_optimized)) as step:
+                fig = create(df_baseline, df_optimized)
+                for ext in ('pdf', 'png'):
+                    path = out_dir / f'{stem}.{ext}'
+                    fig.savefig(path, dpi=300, bbox_inches='tight')
+                    step.wrote(path)
+                    written.append(path)
+                plt.close(fig)
+            if verbose:
+                print(f"   ✅ {title.split(':')[0]} saved")
+    return written
+
+
 # ========================
 # MAIN EXECUTION
 # ========================
-if __name__ == '__main__':
+def main() -> int:
+    dataset_file = Path(sys.argv[1]) if len(sys.argv) > 1 else DATASET_FILE
+    if not dataset_file.exists():
+        print("❌ Dataset not found. Run generate_case_study_data_v4.py first")
+        return 1
+    dataset = ChannelStore(dataset_file) if is_store(dataset_file) else pd.read_csv(dataset_file)
+    df_baseline, df_optimized = split_setups(dataset)
+    print("✅ Data loaded successfully")
+
     print("\n" + "="*80)
     print("🎨 GENERATING PUBLICATION-QUALITY FIGURES v4.0")
     print("="*80 + "\n")
-    
-    # Figure 5: Time Series
-    print("   Generating Figure 5: Time Series Analysis...")
-    fig5 = create_figure_5()
-    fig5.savefig(FIGURES_DIR / 'Figure_5_TimeSeries.pdf', dpi=300, bbox_inches='tight')
-    fig5.savefig(FIGURES_DIR / 'Figure_5_TimeSeries.png', dpi=300, bbox_inches='tight')
-    plt.close(fig5)
-    print("   ✅ Figure 5 saved")
-    
-    # Figure 6: Statistical Validation
-    print("   Generating Figure 6: Statistical Validation...")
-    fig6 = create_figure_6()
-    fig6.savefig(FIGURES_DIR / 'Figure_6_StatisticalValidation.pdf', dpi=300, bbox_inches='tight')
-    fig6.savefig(FIGURES_DIR / 'Figure_6_StatisticalValidation.png', dpi=300, bbox_inches='tight')
-    plt.close(fig6)
-    print("   ✅ Figure 6 saved")
-    
-    # Figure 7: Phase Space
-    print("   Generating Figure 7: Phase Space Analysis...")
-    fig7 = create_figure_7()
-    fig7.savefig(FIGURES_DIR / 'Figure_7_PhaseSpace.pdf', dpi=300, bbox_inches='tight')
-    fig7.savefig(FIGURES_DIR / 'Figure_7_PhaseSpace.png', dpi=300, bbox_inches='tight')
-    plt.close(fig7)
-    print("   ✅ Figure 7 saved")
-    
-    # Figure 8: Heatmap
-    print("   Generating Figure 8: Volatility Heatmap...")
-    fig8 = create_figure_8()
-    fig8.savefig(FIGURES_DIR / 'Figure_8_HeatMap.pdf', dpi=300, bbox_inches='tight')
-    fig8.savefig(FIGURES_DIR / 'Figure_8_HeatMap.png', dpi=300, bbox_inches='tight')
-    plt.close(fig8)
-    print("   ✅ Figure 8 saved")
-    
+
+    generate_figures(df_baseline, df_optimized)
+
     print("\n" + "="*80)
     print(f"🎉 ALL FIGURES GENERATED - Location: {FIGURES_DIR}")
     print("="*80 + "\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,23 +2,59 @@
 """
 Publication-Quality Visualization v4.1 - MEGA Dataset EXPANDED
 Advanced analysis figures with detailed metrics and comparisons
+
+Each figure is computed in two steps: figure_N_payload() reduces the raw
+telemetry to what the figure draws (decimated series, histograms, KDE
+curves, regressions, test statistics) and render_figure_N() styles it.
+Payloads are cached in outputs/cache/figures/ keyed by dataset
+fingerprint and payload version, so styling-only changes re-render
+without reading the dataset.
+
+Uso:
+  python scripts/analysis/visualize_results_v4_advanced.py
+  python scripts/analysis/visualize_results_v4_advanced.py --no-cache      # always recompute
+  python scripts/analysis/visualize_results_v4_advanced.py --clear-cache   # drop cached payloads first
+  python scripts/analysis/visualize_results_v4_advanced.py --dataset data/stores/v4_MEGA   # channel store
+
+  from visualize_results_v4_advanced import TelemetrySource, generate_figures
+  paths = generate_figures(TelemetrySource.from_frame(df), out_dir)   # in-memory dataset
 """
 
+from __future__ import annotations
+
+import sys
+import argparse
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-import seaborn as sns
-from scipy import stats
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from decimation import band, decimate, pixel_budget
+from density_plot import RegressionStats, density_counts, draw_density, shared_edges
+from fft_kde import fft_kde, kde_curve
+from channel_store import ChannelStore, is_store
+from figure_cache import FigureCache, dataset_fingerprint, frame_fingerprint
+from lazy_import import lazy_import
+from rolling_stats import rolling_stats
+from spectral_analysis import cached_spectral_analysis
+
+cbook = lazy_import('matplotlib.cbook')
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+stats = lazy_import('scipy.stats')
 
 BASE_DIR = Path(__file__).resolve().parents[2] if len(Path(__file__).parents) >= 3 else Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data" / "datasets"
 TABLES_DIR = BASE_DIR / "data" / "tables"
 OUTPUTS_DIR = BASE_DIR / "outputs" / "figures"
-OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DIR = BASE_DIR / "outputs" / "cache" / "figures"
+DATASET_FILE = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
 
-plt.rcParams.update({
+# Applied with plt.rc_context() while building and saving figures
+RC_PARAMS = {
     'figure.figsize': (10, 6),
     'figure.dpi': 100,
     'axes.titlesize': 14,
@@ -37,7 +73,7 @@ plt.rcParams.update({
     'grid.linewidth': 0.8,
     'lines.linewidth': 2.0,
     'lines.markersize': 6,
-})
+}
 
 # Colorblind-friendly palette - Professional Q1
 COLOR_BASELINE = '#1f77b4'      # Blue (Professional)
@@ -46,25 +82,97 @@ COLOR_IMPROVEMENT = '#2ca02c'   # Green (Professional)
 COLOR_NEUTRAL = '#9467bd'       # Purple (Professional)
 COLOR_ACCENT = '#d62728'        # Red (Accent)
 
-# Load dataset
-dataset_file = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
-if not dataset_file.exists():
-    dataset_file = "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
+# Payloads
+PAYLOAD_POINTS = 8192           # series kept per trace (≥ widest panel in pixels at 300 DPI)
+MAX_FLIERS = 2000               # distinct outliers kept per boxplot
+PAYLOAD_VERSIONS = {            # bump when a figure_N_payload() changes what it computes
+    'figure_5': 1,
+    'figure_6': 1,
+    'figure_7': 1,
+    'figure_8': 1,
+    'figure_9': 1,
+    'figure_10': 1,
+    'figure_11_density': 1,
+    'figure_11_scatter': 1,
+    'figure_12': 1,
+}                               # Figure 13: spectral_analysis.SPECTRAL_VERSION
+
+# ========================
+# DATASET SOURCE
+# ========================
+class TelemetrySource:
+    """
+    Dataset behind the figures: a CSV or channel store read lazily, or a
+    frame already in memory.
+
+    The fingerprint keys the payload cache; for a file it costs two small
+    reads (a store keeps it in its schema), so a fully cached run never
+    parses the CSV.
+    """
+
+    def __init__(self, path: Optional[Path] = None, df: Optional[pd.DataFrame] = None):
+        if (path is None) == (df is None):
+            raise ValueError("TelemetrySource needs exactly one of path or df")
+        self.path = Path(path) if path is not None else None
+        self._df = df
+        self._frames = None
+        self._fingerprint = None
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'TelemetrySource':
+        return cls(path=path)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'TelemetrySource':
+        return cls(df=df)
+
+    def exists(self) -> bool:
+        return self._df is not None or self.path.exists()
+
+    @property
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            if self._df is not None:
+                self._fingerprint = frame_fingerprint(self._df)
+            elif is_store(self.path):
+                self._fingerprint = ChannelStore(self.path).fingerprint
+            else:
+                self._fingerprint = dataset_fingerprint(self.path)
+        return self._fingerprint
 
-try:
-    df = pd.read_csv(dataset_file)
-    df_baseline = df[df['setup'] == 'baseline'].reset_index(drop=True)
-    df_optimized = df[df['setup'] == 'optimized'].reset_index(drop=True)
-    print("✅ Dataset loaded successfully")
-except FileNotFoundError:
-    print("❌ Dataset not found")
-    exit(1)
+    def frames(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Raw telemetry split by setup; only loaded on a payload cache miss."""
+        if self._frames is None:
+            df = self._df
+            if df is None and is_store(self.path):
+                store = ChannelStore(self.path)
+                self._frames = (store.frame(setup='baseline'), store.frame(setup='optimized'))
+                print("   ✅ Channel store mapped")
+                return self._frames
+            if df is None:
+                df = pd.read_csv(self.path)
+                print("   ✅ Dataset loaded successfully")
+            df_baseline = df[df['setup'] == 'baseline'].reset_index(drop=True)
+            df_optimized = df[df['setup'] == 'optimized'].reset_index(drop=True)
+            self._frames = (df_baseline, df_optimized)
+        return self._frames
 
-# Load metrics table
-try:
-    metrics_table = pd.read_csv(TABLES_DIR / "Table_v4_All_Metrics.csv")
-except:
-    metrics_table = None
+
+@lru_cache(maxsize=1)
+def default_source() -> TelemetrySource:
+    return TelemetrySource.from_file(DATASET_FILE)
+
+
+figure_cache = FigureCache(CACHE_DIR)
+
+
+def figure_payload(name: str, compute, source: Optional[TelemetrySource] = None,
+                   cache: Optional[FigureCache] = None) -> dict:
+    """Cached payload of a figure; compute(df_baseline, df_optimized) on a miss."""
+    source = source or default_source()
+    cache = cache or figure_cache
+    return cache.get_or_compute(name, PAYLOAD_VERSIONS[name], source.fingerprint,
+                                lambda: compute(*source.frames()))
 
 
 def compute_p_and_d(series_a: pd.Series, series_b: pd.Series):
@@ -74,40 +182,77 @@ def compute_p_and_d(series_a: pd.Series, series_b: pd.Series):
         cohend = (np.mean(series_a) - np.mean(series_b)) / pooled if pooled != 0 else np.nan
         return p_val, cohend
 
+def _series(time, values, method: str = 'lttb') -> np.ndarray:
+    """Payload trace: (2, n) time/values decimated to PAYLOAD_POINTS."""
+    return np.vstack(decimate(np.asarray(time), np.asarray(values, dtype=float), PAYLOAD_POINTS, method))
+
+
+def _band_series(x, lower, upper) -> np.ndarray:
+    """Payload band: (3, n) x/lower/upper reduced to PAYLOAD_POINTS buckets."""
+    return np.vstack(band(np.asarray(x), lower, upper, PAYLOAD_POINTS))
+
+
+def _trace(ax, time: np.ndarray, values, method: str = 'lttb'):
+    """Time and values of a channel reduced to the pixel budget of ax."""
+    return decimate(time, np.asarray(values), pixel_budget(ax), method)
+
+
+def _band(ax, x, lower, upper):
+    """fill_between arguments of a band reduced to the pixel budget of ax."""
+    return band(np.asarray(x), lower, upper, pixel_budget(ax))
+
 # ========================
 # FIGURE 5: MULTI-METRIC TIME SERIES
 # ========================
-def create_figure_5():
+def figure_5_payload(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame) -> dict:
+    time_b = df_baseline['time'].to_numpy()
+    time_o = df_optimized['time'].to_numpy()
+    payload = {}
+    for key, channel, method in [('rpm', 'engine_rpm', 'lttb'), ('torque', 'engine_torque_nm', 'lttb'),
+                                 ('speed', 'speed_kmh', 'lttb'), ('glicko', 'glicko_volatility_sigma', 'lttb'),
+                                 ('slip', 'wheel_slip_percent', 'minmax'),
+                                 ('brake', 'brake_pressure_bar', 'minmax')]:
+        payload[f'{key}_b'] = _series(time_b, df_baseline[channel], method)
+        payload[f'{key}_o'] = _series(time_o, df_optimized[channel], method)
+    payload['throttle_b'] = _series(time_b, df_baseline['throttle_position'] * 100)
+    payload['throttle_o'] = _series(time_o, df_optimized['throttle_position'] * 100)
+
+    payload['rpm_improvement'] = ((df_optimized['engine_rpm'].mean() - df_baseline['engine_rpm'].mean())
+                                  / df_baseline['engine_rpm'].mean() * 100)
+    payload['glicko_mean_b'] = df_baseline['glicko_volatility_sigma'].mean()
+    payload['glicko_mean_o'] = df_optimized['glicko_volatility_sigma'].mean()
+    payload['slip_mean_b'] = df_baseline['wheel_slip_percent'].mean()
+    payload['slip_mean_o'] = df_optimized['wheel_slip_percent'].mean()
+    return payload
+
+
+def render_figure_5(p: dict):
     """Multi-metric time series with 4 key performance indicators"""
     fig = plt.figure(figsize=(16, 10), dpi=100)
     gs = fig.add_gridspec(2, 2, hspace=0.35, wspace=0.30)
-    fig.suptitle('Figure 5: Temporal Evolution - Key Performance Indicators', 
+    fig.suptitle('Figure 5: Temporal Evolution - Key Performance Indicators',
                  fontsize=16, fontweight='bold', y=0.98)
-    
-    downsample = 20
-    time_b = df_baseline['time'].values[::downsample]
-    time_o = df_optimized['time'].values[::downsample]
-    
+
     # Engine RPM & Torque
     ax = fig.add_subplot(gs[0, 0])
     ax2 = ax.twinx()
-    
+
     # RPM
-    line1, = ax.plot(time_b, df_baseline['engine_rpm'].values[::downsample], 
-                     color=COLOR_BASELINE, alpha=0.85, label='RPM Baseline', 
+    line1, = ax.plot(*_trace(ax, *p['rpm_b']),
+                     color=COLOR_BASELINE, alpha=0.85, label='RPM Baseline',
                      linewidth=2.5, zorder=3)
-    line2, = ax.plot(time_o, df_optimized['engine_rpm'].values[::downsample], 
-                     color=COLOR_OPTIMIZED, alpha=0.85, label='RPM Optimized', 
+    line2, = ax.plot(*_trace(ax, *p['rpm_o']),
+                     color=COLOR_OPTIMIZED, alpha=0.85, label='RPM Optimized',
                      linewidth=2.5, zorder=3)
-    
+
     # Torque
-    line3, = ax2.plot(time_b, df_baseline['engine_torque_nm'].values[::downsample], 
-                      color=COLOR_BASELINE, alpha=0.4, linestyle='--', 
+    line3, = ax2.plot(*_trace(ax, *p['torque_b']),
+                      color=COLOR_BASELINE, alpha=0.4, linestyle='--',
                       linewidth=2.0, label='Torque Baseline', zorder=2)
-    line4, = ax2.plot(time_o, df_optimized['engine_torque_nm'].values[::downsample], 
-                      color=COLOR_OPTIMIZED, alpha=0.4, linestyle='--', 
+    line4, = ax2.plot(*_trace(ax, *p['torque_o']),
+                      color=COLOR_OPTIMIZED, alpha=0.4, linestyle='--',
                       linewidth=2.0, label='Torque Optimized', zorder=2)
-    
+
     ax.set_ylabel('Engine RPM', fontweight='bold', fontsize=12, color=COLOR_BASELINE)
     ax2.set_ylabel('Torque (Nm)', fontweight='bold', fontsize=12, color=COLOR_OPTIMIZED)
     ax.set_xlabel('Time (s)', fontweight='bold', fontsize=11)
@@ -115,142 +260,158 @@ def create_figure_5():
     ax.tick_params(axis='y', labelcolor=COLOR_BASELINE, labelsize=10)
     ax2.tick_params(axis='y', labelcolor=COLOR_OPTIMIZED, labelsize=10)
     ax.grid(True, alpha=0.3, linewidth=0.8)
-    
+
     # Add statistics annotation
-    rpm_improvement = ((df_optimized['engine_rpm'].mean() - df_baseline['engine_rpm'].mean()) 
-                       / df_baseline['engine_rpm'].mean() * 100)
-    ax.text(0.02, 0.98, f'RPM Δ: {rpm_improvement:.1f}%', 
+    ax.text(0.02, 0.98, f"RPM Δ: {p['rpm_improvement']:.1f}%",
             transform=ax.transAxes, fontsize=10, verticalalignment='top',
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-    
+
     # Speed & Throttle
     ax = fig.add_subplot(gs[0, 1])
     ax2 = ax.twinx()
-    
-    ax.plot(time_b, df_baseline['speed_kmh'].values[::downsample], 
+
+    ax.plot(*_trace(ax, *p['speed_b']),
             color=COLOR_BASELINE, alpha=0.85, label='Speed Baseline', linewidth=2.5, zorder=3)
-    ax.plot(time_o, df_optimized['speed_kmh'].values[::downsample], 
+    ax.plot(*_trace(ax, *p['speed_o']),
             color=COLOR_OPTIMIZED, alpha=0.85, label='Speed Optimized', linewidth=2.5, zorder=3)
-    
-    ax2.plot(time_b, df_baseline['throttle_position'].values[::downsample]*100, 
+
+    ax2.plot(*_trace(ax, *p['throttle_b']),
              color=COLOR_BASELINE, alpha=0.4, linestyle='--', linewidth=2.0, zorder=2)
-    ax2.plot(time_o, df_optimized['throttle_position'].values[::downsample]*100, 
+    ax2.plot(*_trace(ax, *p['throttle_o']),
              color=COLOR_OPTIMIZED, alpha=0.4, linestyle='--', linewidth=2.0, zorder=2)
-    
+
     ax.set_ylabel('Speed (km/h)', fontweight='bold', fontsize=12, color=COLOR_BASELINE)
     ax2.set_ylabel('Throttle (%)', fontweight='bold', fontsize=12, color=COLOR_OPTIMIZED)
     ax.set_xlabel('Time (s)', fontweight='bold', fontsize=11)
     ax.set_title('B) Velocity Control', fontweight='bold', loc='left', fontsize=13)
     ax.grid(True, alpha=0.3, linewidth=0.8)
     ax.legend(loc='upper left', fontsize=9, framealpha=0.9)
-    
+
     # Glicko Volatility
     ax = fig.add_subplot(gs[1, 0])
-    
-    ax.fill_between(time_b, df_baseline['glicko_volatility_sigma'].values[::downsample],
+
+    ax.fill_between(*_trace(ax, *p['glicko_b']),
                     alpha=0.5, color=COLOR_BASELINE, label='Baseline', edgecolor=COLOR_BASELINE, linewidth=1.5)
-    ax.fill_between(time_o, df_optimized['glicko_volatility_sigma'].values[::downsample],
+    ax.fill_between(*_trace(ax, *p['glicko_o']),
                     alpha=0.5, color=COLOR_OPTIMIZED, label='Optimized', edgecolor=COLOR_OPTIMIZED, linewidth=1.5)
-    
+
     # Add mean lines
-    ax.axhline(y=df_baseline['glicko_volatility_sigma'].mean(), color=COLOR_BASELINE, 
+    ax.axhline(y=p['glicko_mean_b'], color=COLOR_BASELINE,
                linestyle='--', linewidth=2, alpha=0.8, label=f'μ Baseline')
-    ax.axhline(y=df_optimized['glicko_volatility_sigma'].mean(), color=COLOR_OPTIMIZED, 
+    ax.axhline(y=p['glicko_mean_o'], color=COLOR_OPTIMIZED,
                linestyle='--', linewidth=2, alpha=0.8, label=f'μ Optimized')
-    
+
     ax.set_ylabel('Glicko-2 σ (Volatility)', fontweight='bold', fontsize=12)
     ax.set_xlabel('Time (s)', fontweight='bold', fontsize=11)
     ax.set_title('C) Rating Volatility Evolution', fontweight='bold', loc='left', fontsize=13)
     ax.legend(loc='upper right', fontsize=9, framealpha=0.9)
     ax.grid(True, alpha=0.3, linewidth=0.8)
-    
+
     # Add improvement annotation
-    vol_improvement = ((df_baseline['glicko_volatility_sigma'].mean() - 
-                       df_optimized['glicko_volatility_sigma'].mean()) / 
-                       df_baseline['glicko_volatility_sigma'].mean() * 100)
-    ax.text(0.02, 0.98, f'Volatility ↓: {vol_improvement:.1f}%', 
+    vol_improvement = (p['glicko_mean_b'] - p['glicko_mean_o']) / p['glicko_mean_b'] * 100
+    ax.text(0.02, 0.98, f'Volatility ↓: {vol_improvement:.1f}%',
             transform=ax.transAxes, fontsize=10, verticalalignment='top',
             bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.5))
-    
+
     # Wheel Slip & Brake Pressure
     ax = fig.add_subplot(gs[1, 1])
     ax2 = ax.twinx()
-    
-    ax.plot(time_b, df_baseline['wheel_slip_percent'].values[::downsample], 
+
+    ax.plot(*_trace(ax, *p['slip_b'], 'minmax'),
             color=COLOR_BASELINE, alpha=0.85, label='Slip Baseline', linewidth=2.5, zorder=3)
-    ax.plot(time_o, df_optimized['wheel_slip_percent'].values[::downsample], 
+    ax.plot(*_trace(ax, *p['slip_o'], 'minmax'),
             color=COLOR_OPTIMIZED, alpha=0.85, label='Slip Optimized', linewidth=2.5, zorder=3)
-    
-    ax2.plot(time_b, df_baseline['brake_pressure_bar'].values[::downsample], 
+
+    ax2.plot(*_trace(ax, *p['brake_b'], 'minmax'),
              color=COLOR_BASELINE, alpha=0.4, linestyle='--', linewidth=2.0, zorder=2)
-    ax2.plot(time_o, df_optimized['brake_pressure_bar'].values[::downsample], 
+    ax2.plot(*_trace(ax, *p['brake_o'], 'minmax'),
              color=COLOR_OPTIMIZED, alpha=0.4, linestyle='--', linewidth=2.0, zorder=2)
-    
+
     ax.set_ylabel('Wheel Slip (%)', fontweight='bold', fontsize=12, color=COLOR_BASELINE)
     ax2.set_ylabel('Brake Pressure (bar)', fontweight='bold', fontsize=12, color=COLOR_OPTIMIZED)
     ax.set_xlabel('Time (s)', fontweight='bold', fontsize=11)
     ax.set_title('D) Grip & Braking Control', fontweight='bold', loc='left', fontsize=13)
     ax.grid(True, alpha=0.3, linewidth=0.8)
     ax.legend(loc='upper left', fontsize=9, framealpha=0.9)
-    
+
     # Add slip improvement
-    slip_improvement = ((df_baseline['wheel_slip_percent'].mean() - 
-                        df_optimized['wheel_slip_percent'].mean()) / 
-                        df_baseline['wheel_slip_percent'].mean() * 100)
-    ax.text(0.02, 0.98, f'Slip ↓: {slip_improvement:.1f}%', 
+    slip_improvement = (p['slip_mean_b'] - p['slip_mean_o']) / p['slip_mean_b'] * 100
+    ax.text(0.02, 0.98, f'Slip ↓: {slip_improvement:.1f}%',
             transform=ax.transAxes, fontsize=10, verticalalignment='top',
             bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.5))
-    
+
     return fig
 
+
+def create_figure_5(source: Optional[TelemetrySource] = None, cache: Optional[FigureCache] = None):
+    with plt.rc_context(RC_PARAMS):
+        return render_figure_5(figure_payload('figure_5', figure_5_payload, source, cache))
+
 # ========================
 # FIGURE 6: STATISTICAL VALIDATION
 # ========================
-def create_figure_6():
+# Métricas de alto contraste para validación estadística
+FIGURE_6_METRICS = [
+    ('wheel_slip_percent', 'Wheel Slip (%)', 'lightgreen'),
+    ('glicko_volatility_sigma', 'Glicko Volatility σ', 'wheat'),
+    ('engine_efficiency_percent', 'Engine Efficiency (%)', 'lightblue'),
+    ('battery_current_a', 'Battery Current (A)', 'lightcoral')
+]
+
+
+def figure_6_payload(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame) -> dict:
+    payload = {}
+    for metric, _, _ in FIGURE_6_METRICS:
+        data_b = df_baseline[metric].dropna()
+        data_o = df_optimized[metric].dropna()
+
+        for suffix, data in (('b', data_b), ('o', data_o)):
+            density, edges = np.histogram(data, bins=40, density=True)
+            payload[f'{metric}_hist_{suffix}'] = density
+            payload[f'{metric}_edges_{suffix}'] = edges
+
+        # KDE suavizado (binned FFT, bandwidth de Scott como gaussian_kde)
+        try:
+            x_range = np.linspace(min(data_b.min(), data_o.min()),
+                                  max(data_b.max(), data_o.max()), 200)
+            payload[f'{metric}_kde'] = np.vstack([x_range, fft_kde(data_b, x_range), fft_kde(data_o, x_range)])
+        except ValueError:
+            pass
+
+        payload[f'{metric}_p'], payload[f'{metric}_d'] = compute_p_and_d(data_b, data_o)
+        payload[f'{metric}_mean_b'] = data_b.mean()
+        payload[f'{metric}_mean_o'] = data_o.mean()
+    return payload
+
+
+def render_figure_6(p: dict):
     """Statistical validation with histograms, KDE, p-values and effect sizes"""
     fig, axes = plt.subplots(2, 2, figsize=(16, 10), dpi=100)
-    fig.suptitle('Figure 6: Statistical Validation & Distribution Analysis', 
+    fig.suptitle('Figure 6: Statistical Validation & Distribution Analysis',
                  fontsize=16, fontweight='bold', y=0.98)
-    
+
     axes = axes.flatten()
-    
-    # Métricas de alto contraste para validación estadística
-    metrics = [
-        ('wheel_slip_percent', 'Wheel Slip (%)', 'lightgreen'),
-        ('glicko_volatility_sigma', 'Glicko Volatility σ', 'wheat'),
-        ('engine_efficiency_percent', 'Engine Efficiency (%)', 'lightblue'),
-        ('battery_current_a', 'Battery Current (A)', 'lightcoral')
-    ]
-    
-    for idx, (metric, label, color) in enumerate(metrics):
+
+    for idx, (metric, label, color) in enumerate(FIGURE_6_METRICS):
         ax = axes[idx]
-        
-        data_b = df_baseline[metric].dropna()
-        data_o = df_optimized[metric].dropna()
-        
-        # Histogramas con transparencia
-        ax.hist(data_b, bins=40, alpha=0.6, color=COLOR_BASELINE, 
-                label='Baseline', density=True, edgecolor='black', linewidth=0.8)
-        ax.hist(data_o, bins=40, alpha=0.6, color=COLOR_OPTIMIZED, 
-                label='Optimized', density=True, edgecolor='black', linewidth=0.8)
-        
-        # KDE suavizado
-        try:
-            from scipy.stats import gaussian_kde
-            kde_b = gaussian_kde(data_b)
-            kde_o = gaussian_kde(data_o)
-            x_range = np.linspace(min(data_b.min(), data_o.min()), 
-                                  max(data_b.max(), data_o.max()), 200)
-            ax.plot(x_range, kde_b(x_range), color=COLOR_BASELINE, 
+
+        # Histogramas con transparencia (densidades precalculadas como pesos)
+        edges_b, edges_o = p[f'{metric}_edges_b'], p[f'{metric}_edges_o']
+        ax.hist(edges_b[:-1], bins=edges_b, weights=p[f'{metric}_hist_b'], alpha=0.6, color=COLOR_BASELINE,
+                label='Baseline', edgecolor='black', linewidth=0.8)
+        ax.hist(edges_o[:-1], bins=edges_o, weights=p[f'{metric}_hist_o'], alpha=0.6, color=COLOR_OPTIMIZED,
+                label='Optimized', edgecolor='black', linewidth=0.8)
+
+        if f'{metric}_kde' in p:
+            x_range, kde_b, kde_o = p[f'{metric}_kde']
+            ax.plot(x_range, kde_b, color=COLOR_BASELINE,
                    linewidth=2.5, linestyle='--', alpha=0.9)
-            ax.plot(x_range, kde_o(x_range), color=COLOR_OPTIMIZED, 
+            ax.plot(x_range, kde_o, color=COLOR_OPTIMIZED,
                    linewidth=2.5, linestyle='--', alpha=0.9)
-        except:
-            pass
-        
+
         # Estadísticas
-        p_val, cohend = compute_p_and_d(data_b, data_o)
-        
+        p_val, cohend = p[f'{metric}_p'], p[f'{metric}_d']
+
         # Interpretación de Cohen's d
         if abs(cohend) < 0.2:
             effect = "negligible"
@@ -260,68 +421,79 @@ def create_figure_6():
             effect = "medium"
         else:
             effect = "large"
-        
+
         # Anotaciones estadísticas
         stats_text = f"p = {p_val:.2e}\nd = {cohend:.2f} ({effect})"
-        ax.text(0.98, 0.97, stats_text, transform=ax.transAxes, 
+        ax.text(0.98, 0.97, stats_text, transform=ax.transAxes,
                 fontsize=9, verticalalignment='top', horizontalalignment='right',
                 bbox=dict(boxstyle='round', facecolor=color, alpha=0.7, edgecolor='black'))
-        
+
         # Media y mediana
-        mean_b, mean_o = data_b.mean(), data_o.mean()
-        ax.axvline(mean_b, color=COLOR_BASELINE, linestyle=':', linewidth=2, alpha=0.8)
-        ax.axvline(mean_o, color=COLOR_OPTIMIZED, linestyle=':', linewidth=2, alpha=0.8)
-        
+        ax.axvline(p[f'{metric}_mean_b'], color=COLOR_BASELINE, linestyle=':', linewidth=2, alpha=0.8)
+        ax.axvline(p[f'{metric}_mean_o'], color=COLOR_OPTIMIZED, linestyle=':', linewidth=2, alpha=0.8)
+
         ax.set_xlabel(label, fontweight='bold', fontsize=11)
         ax.set_ylabel('Density', fontweight='bold', fontsize=11)
         ax.set_title(f'{chr(65+idx)}) {label}', fontweight='bold', loc='left', fontsize=12)
         ax.legend(loc='upper left', fontsize=9, framealpha=0.9)
         ax.grid(alpha=0.3, linewidth=0.8)
         ax.set_axisbelow(True)
-    
+
     return fig
 
+
+def create_figure_6(source: Optional[TelemetrySource] = None, cache: Optional[FigureCache] = None):
+    with plt.rc_context(RC_PARAMS):
+        return render_figure_6(figure_payload('figure_6', figure_6_payload, source, cache))
+
 # ========================
 # FIGURE 7: HIGH-SIGNAL METRICS BAR CHARTS
 # ========================
-def create_figure_7():
+def figure_7_payload(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame) -> dict:
+    payload = {}
+    groups = {
+        'power': ['wheel_slip_percent', 'battery_current_a', 'battery_voltage_v', 'brake_balance_percent'],
+        'accel': ['accel_lon_g', 'accel_lat_g', 'tire_temp_fl_c', 'tire_pressure_fl_bar'],
+        'aero': ['engine_rpm', 'engine_torque_nm', 'aero_downforce_n', 'aero_drag_n'],
+    }
+    for suffix, frame in (('b', df_baseline), ('o', df_optimized)):
+        means = frame.mean(numeric_only=True)
+        for group, channels in groups.items():
+            payload[f'{group}_{suffix}'] = means[channels].to_numpy(dtype=float)
+        drag_ratio = means['aero_downforce_n'] / means['aero_drag_n'] if means['aero_drag_n'] != 0 else 0
+        payload[f'eff_{suffix}'] = np.array([means['engine_efficiency_percent'], drag_ratio,
+                                             means['glicko_volatility_sigma'], means['wheel_slip_percent']])
+    return payload
+
+
+def render_figure_7(p: dict):
     """Performance metrics comparison with percentage deltas"""
     fig = plt.figure(figsize=(16, 10), dpi=100)
     gs = fig.add_gridspec(2, 2, hspace=0.35, wspace=0.30)
-    fig.suptitle('Figure 7: Performance Metrics Comparison - High-Signal Indicators', 
+    fig.suptitle('Figure 7: Performance Metrics Comparison - High-Signal Indicators',
                  fontsize=16, fontweight='bold', y=0.98)
-    
+
     width = 0.35
-    
+
     # A) Wheel Slip y Battery Current
     ax = fig.add_subplot(gs[0, 0])
     metrics_power = ['Wheel Slip\n(%)', 'Battery\nCurrent (A)', 'Battery\nVoltage (V)', 'Brake\nBalance (%)']
-    baseline_vals = [
-        df_baseline['wheel_slip_percent'].mean(),
-        df_baseline['battery_current_a'].mean(),
-        df_baseline['battery_voltage_v'].mean(),
-        df_baseline['brake_balance_percent'].mean()
-    ]
-    optimized_vals = [
-        df_optimized['wheel_slip_percent'].mean(),
-        df_optimized['battery_current_a'].mean(),
-        df_optimized['battery_voltage_v'].mean(),
-        df_optimized['brake_balance_percent'].mean()
-    ]
-    
+    baseline_vals = p['power_b']
+    optimized_vals = p['power_o']
+
     x = np.arange(len(metrics_power))
-    ax.bar(x - width/2, baseline_vals, width, label='Baseline', 
+    ax.bar(x - width/2, baseline_vals, width, label='Baseline',
            color=COLOR_BASELINE, alpha=0.85, edgecolor='black', linewidth=1.2)
-    ax.bar(x + width/2, optimized_vals, width, label='Optimized', 
+    ax.bar(x + width/2, optimized_vals, width, label='Optimized',
            color=COLOR_OPTIMIZED, alpha=0.85, edgecolor='black', linewidth=1.2)
-    
+
     for i, (b, o) in enumerate(zip(baseline_vals, optimized_vals)):
         delta = (o - b) / b * 100 if b != 0 else 0
         sign = '↑' if delta > 0 else '↓'
         face = 'lightgreen' if delta < 0 and i == 0 else ('wheat' if delta < 0 else 'lightgreen')
         ax.text(x[i], max(b, o) * 1.08, f'{sign}{abs(delta):.1f}%', ha='center', fontsize=10,
                 bbox=dict(boxstyle='round', facecolor=face, alpha=0.7, edgecolor='black'))
-    
+
     ax.set_ylabel('Value', fontweight='bold', fontsize=12)
     ax.set_title('A) Power & Traction Metrics', fontweight='bold', loc='left', fontsize=13)
     ax.set_xticks(x)
@@ -329,36 +501,26 @@ def create_figure_7():
     ax.legend(loc='upper left', fontsize=10, framealpha=0.9)
     ax.grid(alpha=0.3, axis='y', linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # B) Acceleration & Tire Metrics
     ax = fig.add_subplot(gs[0, 1])
     metrics_glicko = ['Accel Lon\n(g)', 'Accel Lat\n(g)', 'Tire Temp FL\n(°C)', 'Tire Press FL\n(bar)']
-    baseline_vals_g = [
-        df_baseline['accel_lon_g'].mean(),
-        df_baseline['accel_lat_g'].mean(),
-        df_baseline['tire_temp_fl_c'].mean(),
-        df_baseline['tire_pressure_fl_bar'].mean()
-    ]
-    optimized_vals_g = [
-        df_optimized['accel_lon_g'].mean(),
-        df_optimized['accel_lat_g'].mean(),
-        df_optimized['tire_temp_fl_c'].mean(),
-        df_optimized['tire_pressure_fl_bar'].mean()
-    ]
-    
+    baseline_vals_g = p['accel_b']
+    optimized_vals_g = p['accel_o']
+
     x = np.arange(len(metrics_glicko))
-    ax.bar(x - width/2, baseline_vals_g, width, label='Baseline', 
+    ax.bar(x - width/2, baseline_vals_g, width, label='Baseline',
            color=COLOR_BASELINE, alpha=0.85, edgecolor='black', linewidth=1.2)
-    ax.bar(x + width/2, optimized_vals_g, width, label='Optimized', 
+    ax.bar(x + width/2, optimized_vals_g, width, label='Optimized',
            color=COLOR_OPTIMIZED, alpha=0.85, edgecolor='black', linewidth=1.2)
-    
+
     for i, (b, o) in enumerate(zip(baseline_vals_g, optimized_vals_g)):
         delta = (o - b) / b * 100 if b != 0 else 0
         sign = '↑' if delta > 0 else '↓'
         face = 'lightgreen' if (i == 0 or i == 3) and delta > 0 else ('wheat' if delta < 0 else 'lightgreen')
         ax.text(x[i], max(b, o) * 1.08, f'{sign}{abs(delta):.1f}%', ha='center', fontsize=10,
                 bbox=dict(boxstyle='round', facecolor=face, alpha=0.7, edgecolor='black'))
-    
+
     ax.set_ylabel('Value', fontweight='bold', fontsize=12)
     ax.set_title('B) Acceleration & Tire Performance', fontweight='bold', loc='left', fontsize=13)
     ax.set_xticks(x)
@@ -366,36 +528,26 @@ def create_figure_7():
     ax.legend(loc='upper left', fontsize=10, framealpha=0.9)
     ax.grid(alpha=0.3, axis='y', linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # C) Engine & Aerodynamics
     ax = fig.add_subplot(gs[1, 0])
     metrics_aero = ['Engine\nRPM', 'Engine\nTorque (Nm)', 'Aero DF\n(N)', 'Aero Drag\n(N)']
-    baseline_vals_a = [
-        df_baseline['engine_rpm'].mean(),
-        df_baseline['engine_torque_nm'].mean(),
-        df_baseline['aero_downforce_n'].mean(),
-        df_baseline['aero_drag_n'].mean()
-    ]
-    optimized_vals_a = [
-        df_optimized['engine_rpm'].mean(),
-        df_optimized['engine_torque_nm'].mean(),
-        df_optimized['aero_downforce_n'].mean(),
-        df_optimized['aero_drag_n'].mean()
-    ]
-    
+    baseline_vals_a = p['aero_b']
+    optimized_vals_a = p['aero_o']
+
     x = np.arange(len(metrics_aero))
-    ax.bar(x - width/2, baseline_vals_a, width, label='Baseline', 
+    ax.bar(x - width/2, baseline_vals_a, width, label='Baseline',
            color=COLOR_BASELINE, alpha=0.85, edgecolor='black', linewidth=1.2)
-    ax.bar(x + width/2, optimized_vals_a, width, label='Optimized', 
+    ax.bar(x + width/2, optimized_vals_a, width, label='Optimized',
            color=COLOR_OPTIMIZED, alpha=0.85, edgecolor='black', linewidth=1.2)
-    
+
     for i, (b, o) in enumerate(zip(baseline_vals_a, optimized_vals_a)):
         delta = (o - b) / b * 100 if b != 0 else 0
         sign = '↑' if delta > 0 else '↓'
         face = 'lightgreen' if delta > 0 else 'wheat'
         ax.text(x[i], max(b, o) * 1.08, f'{sign}{abs(delta):.1f}%', ha='center', fontsize=10,
                 bbox=dict(boxstyle='round', facecolor=face, alpha=0.7, edgecolor='black'))
-    
+
     ax.set_ylabel('Value', fontweight='bold', fontsize=12)
     ax.set_title('C) Engine & Aerodynamics', fontweight='bold', loc='left', fontsize=13)
     ax.set_xticks(x)
@@ -403,38 +555,26 @@ def create_figure_7():
     ax.legend(loc='upper left', fontsize=10, framealpha=0.9)
     ax.grid(alpha=0.3, axis='y', linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # D) Eficiencia y consistencia
     ax = fig.add_subplot(gs[1, 1])
     metrics_eff = ['Engine Eff.\n(%)', 'Aero DF/Drag\nratio', 'Volatility σ', 'Slip\n(%)']
-    df_drag_ratio = df_baseline['aero_downforce_n'].mean() / df_baseline['aero_drag_n'].mean() if df_baseline['aero_drag_n'].mean() != 0 else 0
-    opt_drag_ratio = df_optimized['aero_downforce_n'].mean() / df_optimized['aero_drag_n'].mean() if df_optimized['aero_drag_n'].mean() != 0 else 0
-    baseline_vals_e = [
-        df_baseline['engine_efficiency_percent'].mean(), 
-        df_drag_ratio,
-        df_baseline['glicko_volatility_sigma'].mean(), 
-        df_baseline['wheel_slip_percent'].mean()
-    ]
-    optimized_vals_e = [
-        df_optimized['engine_efficiency_percent'].mean(), 
-        opt_drag_ratio,
-        df_optimized['glicko_volatility_sigma'].mean(), 
-        df_optimized['wheel_slip_percent'].mean()
-    ]
-    
+    baseline_vals_e = p['eff_b']
+    optimized_vals_e = p['eff_o']
+
     x = np.arange(len(metrics_eff))
-    ax.bar(x - width/2, baseline_vals_e, width, label='Baseline', 
+    ax.bar(x - width/2, baseline_vals_e, width, label='Baseline',
            color=COLOR_BASELINE, alpha=0.85, edgecolor='black', linewidth=1.2)
-    ax.bar(x + width/2, optimized_vals_e, width, label='Optimized', 
+    ax.bar(x + width/2, optimized_vals_e, width, label='Optimized',
            color=COLOR_OPTIMIZED, alpha=0.85, edgecolor='black', linewidth=1.2)
-    
+
     for i, (b, o) in enumerate(zip(baseline_vals_e, optimized_vals_e)):
         delta = (o - b) / b * 100 if b != 0 else 0
         sign = '↑' if delta > 0 else '↓'
         face = 'lightgreen' if delta > 0 else 'wheat'
         ax.text(x[i], max(b, o) * 1.10, f'{sign}{abs(delta):.1f}%', ha='center', fontsize=10,
                 bbox=dict(boxstyle='round', facecolor=face, alpha=0.7, edgecolor='black'))
-    
+
     ax.set_ylabel('Value', fontweight='bold', fontsize=12)
     ax.set_title('D) Efficiency & Consistency', fontweight='bold', loc='left', fontsize=13)
     ax.set_xticks(x)
@@ -442,51 +582,86 @@ def create_figure_7():
     ax.legend(loc='upper right', fontsize=10, framealpha=0.9)
     ax.grid(alpha=0.3, axis='y', linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     return fig
 
+
+def create_figure_7(source: Optional[TelemetrySource] = None, cache: Optional[FigureCache] = None):
+    with plt.rc_context(RC_PARAMS):
+        return render_figure_7(figure_payload('figure_7', figure_7_payload, source, cache))
+
+def _figure_8_stats(frame: pd.DataFrame) -> pd.DataFrame:
+    """Rolling median/quantile/mean series of figure 8 for one setup."""
+    speed_med = rolling_stats(frame['speed_kmh'], [('median', 80)])[('median', 80)]
+    speed = rolling_stats(speed_med, [(0.10, 160), (0.90, 160)])
+    thr = rolling_stats(frame['throttle_position'], [('mean', 60), (0.05, 120), (0.95, 120)])
+    yaw = rolling_stats(frame['gyro_yaw_dps'], [('median', 80), (0.10, 160), (0.90, 160)])
+    return pd.DataFrame({
+        'speed_med': speed_med, 'speed_q10': speed[(0.10, 160)], 'speed_q90': speed[(0.90, 160)],
+        'thr_mean': thr[('mean', 60)], 'thr_q05': thr[(0.05, 120)], 'thr_q95': thr[(0.95, 120)],
+        'yaw_med': yaw[('median', 80)], 'yaw_q10': yaw[(0.10, 160)], 'yaw_q90': yaw[(0.90, 160)],
+    }, index=frame.index)
+
 # ========================
 # FIGURE 8: QUANTILE TIME SERIES
 # ========================
-def create_figure_8():
+def figure_8_payload(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame) -> dict:
+    stats_b = _figure_8_stats(df_baseline)
+    stats_o = _figure_8_stats(df_optimized)
+    payload = {}
+    for suffix, frame in (('b', stats_b), ('o', stats_o)):
+        x = frame.index.to_numpy()
+        payload[f'speed_{suffix}'] = _series(x, frame['speed_med'])
+        payload[f'speed_band_{suffix}'] = _band_series(x, frame['speed_q10'], frame['speed_q90'])
+        payload[f'thr_{suffix}'] = _series(x, frame['thr_mean'])
+        payload[f'thr_band_{suffix}'] = _band_series(x, frame['thr_q05'], frame['thr_q95'])
+        payload[f'yaw_{suffix}'] = _series(x, frame['yaw_med'])
+        payload[f'yaw_band_{suffix}'] = _band_series(x, frame['yaw_q10'], frame['yaw_q90'])
+
+    # Speed: rolling median + IQR para robustez
+    payload['delta_speed'] = ((stats_o['speed_med'].mean() - stats_b['speed_med'].mean())
+                              / stats_b['speed_med'].mean() * 100)
+    # Throttle: media móvil con bandas 5-95
+    thr_b = df_baseline['throttle_position']
+    thr_o = df_optimized['throttle_position']
+    payload['delta_thr'] = (thr_o.mean() - thr_b.mean()) / thr_b.mean() * 100
+    # Yaw rate: mediana y cuantiles para variabilidad
+    sb_med = stats_b['yaw_med'].abs().mean()
+    so_med = stats_o['yaw_med'].abs().mean()
+    payload['delta_steer'] = (so_med - sb_med) / sb_med * 100
+    return payload
+
+
+def render_figure_8(p: dict):
     """Quantile time series with IQR bands for speed, throttle, and steering"""
     fig, axs = plt.subplots(1, 3, figsize=(18, 6), dpi=100)
-    fig.suptitle('Figure 8: Quantile Time Series - Temporal Evolution with IQR Bands', 
+    fig.suptitle('Figure 8: Quantile Time Series - Temporal Evolution with IQR Bands',
                  fontsize=16, fontweight='bold', y=1.00)
-    
+
     # Speed: rolling median + IQR para robustez
-    speed_b = df_baseline['speed_kmh'].rolling(window=80, min_periods=1).median()
-    speed_o = df_optimized['speed_kmh'].rolling(window=80, min_periods=1).median()
-    q10_b = speed_b.rolling(160, min_periods=1).quantile(0.10)
-    q90_b = speed_b.rolling(160, min_periods=1).quantile(0.90)
-    q10_o = speed_o.rolling(160, min_periods=1).quantile(0.10)
-    q90_o = speed_o.rolling(160, min_periods=1).quantile(0.90)
-    
-    axs[0].plot(speed_b, label='Baseline', color=COLOR_BASELINE, linewidth=1.8)
-    axs[0].plot(speed_o, label='Optimized', color=COLOR_OPTIMIZED, linewidth=1.8)
-    axs[0].fill_between(speed_b.index, q10_b, q90_b, color=COLOR_BASELINE, alpha=0.15)
-    axs[0].fill_between(speed_o.index, q10_o, q90_o, color=COLOR_OPTIMIZED, alpha=0.15)
+    axs[0].plot(*_trace(axs[0], *p['speed_b']), label='Baseline', color=COLOR_BASELINE, linewidth=1.8)
+    axs[0].plot(*_trace(axs[0], *p['speed_o']), label='Optimized', color=COLOR_OPTIMIZED, linewidth=1.8)
+    axs[0].fill_between(*_band(axs[0], *p['speed_band_b']), color=COLOR_BASELINE, alpha=0.15)
+    axs[0].fill_between(*_band(axs[0], *p['speed_band_o']), color=COLOR_OPTIMIZED, alpha=0.15)
     axs[0].set_ylabel('Speed (km/h)', fontweight='bold')
     axs[0].set_xlabel('Time (samples)', fontweight='bold')
     axs[0].set_title('A) Speed profile (median + IQR)', fontweight='bold', loc='left', fontsize=13)
     axs[0].legend(loc='upper right', fontsize=10, framealpha=0.9)
     axs[0].grid(alpha=0.3)
 
-    delta_speed = (speed_o.mean() - speed_b.mean()) / speed_b.mean() * 100
+    delta_speed = p['delta_speed']
     axs[0].text(0.01, 0.90, f'Δmean = {delta_speed:.2f}%', transform=axs[0].transAxes,
                 bbox=dict(boxstyle='round', facecolor='white', alpha=0.8, edgecolor='black'),
                 fontsize=10, color=COLOR_IMPROVEMENT if delta_speed > 0 else COLOR_ACCENT)
 
     # Throttle: media móvil con bandas 5-95
-    thr_b = df_baseline['throttle_position']
-    thr_o = df_optimized['throttle_position']
-    axs[1].plot(thr_b.rolling(60, min_periods=1).mean(), label='Baseline', color=COLOR_BASELINE, linewidth=1.5)
-    axs[1].plot(thr_o.rolling(60, min_periods=1).mean(), label='Optimized', color=COLOR_OPTIMIZED, linewidth=1.5)
-    axs[1].fill_between(thr_b.index, thr_b.rolling(120, min_periods=1).quantile(0.05), 
-                        thr_b.rolling(120, min_periods=1).quantile(0.95),
+    axs[1].plot(*_trace(axs[1], *p['thr_b']),
+                label='Baseline', color=COLOR_BASELINE, linewidth=1.5)
+    axs[1].plot(*_trace(axs[1], *p['thr_o']),
+                label='Optimized', color=COLOR_OPTIMIZED, linewidth=1.5)
+    axs[1].fill_between(*_band(axs[1], *p['thr_band_b']),
                         color=COLOR_BASELINE, alpha=0.15)
-    axs[1].fill_between(thr_o.index, thr_o.rolling(120, min_periods=1).quantile(0.05), 
-                        thr_o.rolling(120, min_periods=1).quantile(0.95),
+    axs[1].fill_between(*_band(axs[1], *p['thr_band_o']),
                         color=COLOR_OPTIMIZED, alpha=0.15)
     axs[1].set_ylabel('Throttle (0-1)', fontweight='bold')
     axs[1].set_xlabel('Time (samples)', fontweight='bold')
@@ -494,23 +669,17 @@ def create_figure_8():
     axs[1].legend(loc='upper right', fontsize=10, framealpha=0.9)
     axs[1].grid(alpha=0.3)
 
-    delta_thr = (thr_o.mean() - thr_b.mean()) / thr_b.mean() * 100
+    delta_thr = p['delta_thr']
     axs[1].text(0.01, 0.90, f'Δmean = {delta_thr:.2f}%', transform=axs[1].transAxes,
                 bbox=dict(boxstyle='round', facecolor='white', alpha=0.8, edgecolor='black'),
                 fontsize=10, color=COLOR_IMPROVEMENT if delta_thr > 0 else COLOR_ACCENT)
 
     # Yaw rate: mediana y cuantiles para variabilidad
-    steer_b = df_baseline['gyro_yaw_dps']
-    steer_o = df_optimized['gyro_yaw_dps']
-    sb_med = steer_b.rolling(80, min_periods=1).median()
-    so_med = steer_o.rolling(80, min_periods=1).median()
-    axs[2].plot(sb_med, label='Baseline', color=COLOR_BASELINE, linewidth=1.2)
-    axs[2].plot(so_med, label='Optimized', color=COLOR_OPTIMIZED, linewidth=1.2)
-    axs[2].fill_between(steer_b.index, steer_b.rolling(160, min_periods=1).quantile(0.1), 
-                        steer_b.rolling(160, min_periods=1).quantile(0.9),
+    axs[2].plot(*_trace(axs[2], *p['yaw_b']), label='Baseline', color=COLOR_BASELINE, linewidth=1.2)
+    axs[2].plot(*_trace(axs[2], *p['yaw_o']), label='Optimized', color=COLOR_OPTIMIZED, linewidth=1.2)
+    axs[2].fill_between(*_band(axs[2], *p['yaw_band_b']),
                         color=COLOR_BASELINE, alpha=0.15)
-    axs[2].fill_between(steer_o.index, steer_o.rolling(160, min_periods=1).quantile(0.1), 
-                        steer_o.rolling(160, min_periods=1).quantile(0.9),
+    axs[2].fill_between(*_band(axs[2], *p['yaw_band_o']),
                         color=COLOR_OPTIMIZED, alpha=0.15)
     axs[2].set_ylabel('Yaw Rate (dps)', fontweight='bold')
     axs[2].set_xlabel('Time (samples)', fontweight='bold')
@@ -518,385 +687,526 @@ def create_figure_8():
     axs[2].legend(loc='upper right', fontsize=10, framealpha=0.9)
     axs[2].grid(alpha=0.3)
 
-    delta_steer = (so_med.abs().mean() - sb_med.abs().mean()) / sb_med.abs().mean() * 100
+    delta_steer = p['delta_steer']
     axs[2].text(0.01, 0.90, f'Δ|median| = {delta_steer:.2f}%', transform=axs[2].transAxes,
                 bbox=dict(boxstyle='round', facecolor='white', alpha=0.8, edgecolor='black'),
                 fontsize=10, color=COLOR_IMPROVEMENT if delta_steer < 0 else COLOR_ACCENT)
-    
+
     return fig
 
+
+def create_figure_8(source: Optional[TelemetrySource] = None, cache: Optional[FigureCache] = None):
+    with plt.rc_context(RC_PARAMS):
+        return render_figure_8(figure_payload('figure_8', figure_8_payload, source, cache))
+
+def _box_stats(values: pd.Series, prefix: str) -> dict:
+    """Boxplot statistics (1.5 IQR whiskers) with at most MAX_FLIERS distinct outliers."""
+    box = cbook.boxplot_stats(np.asarray(values, dtype=float), whis=1.5)[0]
+    fliers = np.unique(box['fliers'])
+    if len(fliers) > MAX_FLIERS:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, MAX_FLIERS).astype(np.int64)]
+    payload = {f'{prefix}_{k}': box[k] for k in ('med', 'q1', 'q3', 'whislo', 'whishi')}
+    payload[f'{prefix}_fliers'] = fliers
+    return payload
+
+
+def _boxplot(ax, p: dict, prefixes, labels):
+    """Seaborn-style boxplot (palette boxes, grey lines) from precomputed statistics."""
+    boxes = [{'med': p[f'{prefix}_med'], 'q1': p[f'{prefix}_q1'], 'q3': p[f'{prefix}_q3'],
+              'whislo': p[f'{prefix}_whislo'], 'whishi': p[f'{prefix}_whishi'],
+              'fliers': p[f'{prefix}_fliers'], 'label': label}
+             for prefix, label in zip(prefixes, labels)]
+    line = dict(color='#3f3f3f', linewidth=1.25)
+    artists = ax.bxp(boxes, positions=range(len(boxes)), widths=0.5, patch_artist=True,
+                     boxprops=dict(edgecolor=line['color'], linewidth=line['linewidth']), medianprops=line, whiskerprops=line, capprops=line,
+                     flierprops=dict(marker='d', markerfacecolor='#3f3f3f', markeredgecolor='#3f3f3f',
+                                     markersize=5))
+    for patch, color in zip(artists['boxes'], [COLOR_BASELINE, COLOR_OPTIMIZED]):
+        patch.set_facecolor(color)
+        patch.set_alpha(0.85)
+
+def _kde_fill(ax, curve: np.ndarray, label: str, color: str):
+    """Filled KDE curve (seaborn kdeplot look) from a (2, n) payload curve."""
+    x, density = curve
+    ax.fill_between(x, density, color=color, alpha=0.35, linewidth=0)
+    ax.plot(x, density, color=color, label=label, linewidth=1.5)
+
 # ========================
 # FIGURE 9: DISTRIBUTION ANALYSIS
 # ========================
-def create_figure_9():
+def figure_9_payload(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame) -> dict:
+    payload = {}
+
+    # A) Wheel slip con KDE y p-values
+    slip_b, slip_o = df_baseline['wheel_slip_percent'], df_optimized['wheel_slip_percent']
+    payload['slip_kde_b'] = np.vstack(kde_curve(slip_b.dropna()))
+    payload['slip_kde_o'] = np.vstack(kde_curve(slip_o.dropna()))
+    payload['slip_p'], payload['slip_d'] = compute_p_and_d(slip_b, slip_o)
+
+    # B) Battery current
+    current_b, current_o = abs(df_baseline['battery_current_a']), abs(df_optimized['battery_current_a'])
+    payload['current_kde_b'] = np.vstack(kde_curve(current_b.dropna()))
+    payload['current_kde_o'] = np.vstack(kde_curve(current_o.dropna()))
+    payload['current_p'], payload['current_d'] = compute_p_and_d(current_b, current_o)
+
+    # C) Aero drag vs downforce ratio (box)
+    ratio_b = (df_baseline['aero_downforce_n'] / df_baseline['aero_drag_n'].replace(0, np.nan)).dropna()
+    ratio_o = (df_optimized['aero_downforce_n'] / df_optimized['aero_drag_n'].replace(0, np.nan)).dropna()
+    payload.update(_box_stats(ratio_b, 'ratio_b'))
+    payload.update(_box_stats(ratio_o, 'ratio_o'))
+    payload['ratio_p'], payload['ratio_d'] = compute_p_and_d(ratio_b, ratio_o)
+
+    # D) Accel lateral boxplot con whiskers ajustados
+    payload.update(_box_stats(df_baseline['accel_lat_g'], 'lat_b'))
+    payload.update(_box_stats(df_optimized['accel_lat_g'], 'lat_o'))
+    payload['lat_p'], payload['lat_d'] = compute_p_and_d(df_baseline['accel_lat_g'], df_optimized['accel_lat_g'])
+    return payload
+
+
+def render_figure_9(p: dict):
     """Distribuciones con anotaciones de efecto usando métricas de alto contraste."""
     fig, axs = plt.subplots(2, 2, figsize=(16, 10))
-    fig.suptitle('Figure 9: Distribution Comparisons for High-Contrast Metrics', 
+    fig.suptitle('Figure 9: Distribution Comparisons for High-Contrast Metrics',
                  fontsize=16, fontweight='bold', y=0.96)
 
     # A) Wheel slip con KDE y p-values
-    sns.kdeplot(df_baseline['wheel_slip_percent'], ax=axs[0, 0], label='Baseline', color=COLOR_BASELINE, fill=True, alpha=0.35)
-    sns.kdeplot(df_optimized['wheel_slip_percent'], ax=axs[0, 0], label='Optimized', color=COLOR_OPTIMIZED, fill=True, alpha=0.35)
+    _kde_fill(axs[0, 0], p['slip_kde_b'], 'Baseline', COLOR_BASELINE)
+    _kde_fill(axs[0, 0], p['slip_kde_o'], 'Optimized', COLOR_OPTIMIZED)
     axs[0, 0].set_title('A) Wheel Slip (%)', fontweight='bold', loc='left', fontsize=13)
     axs[0, 0].set_xlabel('Slip (%)')
     axs[0, 0].set_ylabel('Density')
     axs[0, 0].legend()
     axs[0, 0].grid(alpha=0.3)
-    pval, cohend = compute_p_and_d(df_baseline['wheel_slip_percent'], df_optimized['wheel_slip_percent'])
-    axs[0, 0].text(0.02, 0.92, f"p={pval:.2e}\nd={cohend:.2f}", transform=axs[0, 0].transAxes,
+    axs[0, 0].text(0.02, 0.92, f"p={p['slip_p']:.2e}\nd={p['slip_d']:.2f}", transform=axs[0, 0].transAxes,
                   bbox=dict(boxstyle='round', facecolor='white', alpha=0.85, edgecolor='black'))
 
     # B) Battery current
-    sns.kdeplot(abs(df_baseline['battery_current_a']), ax=axs[0, 1], label='Baseline', color=COLOR_BASELINE, fill=True, alpha=0.35)
-    sns.kdeplot(abs(df_optimized['battery_current_a']), ax=axs[0, 1], label='Optimized', color=COLOR_OPTIMIZED, fill=True, alpha=0.35)
+    _kde_fill(axs[0, 1], p['current_kde_b'], 'Baseline', COLOR_BASELINE)
+    _kde_fill(axs[0, 1], p['current_kde_o'], 'Optimized', COLOR_OPTIMIZED)
     axs[0, 1].set_title('B) Battery Current |A|', fontweight='bold', loc='left', fontsize=13)
     axs[0, 1].set_xlabel('|Current| (A)')
     axs[0, 1].legend()
     axs[0, 1].grid(alpha=0.3)
-    pval, cohend = compute_p_and_d(abs(df_baseline['battery_current_a']), abs(df_optimized['battery_current_a']))
-    axs[0, 1].text(0.02, 0.92, f"p={pval:.2e}\nd={cohend:.2f}", transform=axs[0, 1].transAxes,
+    axs[0, 1].text(0.02, 0.92, f"p={p['current_p']:.2e}\nd={p['current_d']:.2f}", transform=axs[0, 1].transAxes,
                   bbox=dict(boxstyle='round', facecolor='white', alpha=0.85, edgecolor='black'))
 
     # C) Aero drag vs downforce ratio (box)
-    df_box = pd.DataFrame({
-        'setup': ['Baseline'] * len(df_baseline) + ['Optimized'] * len(df_optimized),
-        'df_drag_ratio': pd.concat([
-            df_baseline['aero_downforce_n'] / (df_baseline['aero_drag_n'].replace(0, np.nan)),
-            df_optimized['aero_downforce_n'] / (df_optimized['aero_drag_n'].replace(0, np.nan))
-        ], ignore_index=True)
-    }).dropna()
-    sns.boxplot(data=df_box, x='setup', y='df_drag_ratio', ax=axs[1, 0], palette=[COLOR_BASELINE, COLOR_OPTIMIZED], width=0.5)
+    _boxplot(axs[1, 0], p, ['ratio_b', 'ratio_o'], ['Baseline', 'Optimized'])
     axs[1, 0].set_title('C) Downforce/Drag Ratio', fontweight='bold', loc='left', fontsize=13)
     axs[1, 0].set_xlabel('Setup')
     axs[1, 0].set_ylabel('DF/Drag')
     axs[1, 0].grid(axis='y', alpha=0.3)
-    pval, cohend = compute_p_and_d(df_box[df_box['setup'] == 'Baseline']['df_drag_ratio'], df_box[df_box['setup'] == 'Optimized']['df_drag_ratio'])
-    axs[1, 0].text(0.05, 0.92, f"p={pval:.2e}\nd={cohend:.2f}",
+    axs[1, 0].text(0.05, 0.92, f"p={p['ratio_p']:.2e}\nd={p['ratio_d']:.2f}",
                    transform=axs[1, 0].transAxes,
                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.85, edgecolor='black'))
 
     # D) Accel lateral boxplot con whiskers ajustados
-    sns.boxplot(data=df, x='setup', y='accel_lat_g', ax=axs[1, 1], palette=[COLOR_BASELINE, COLOR_OPTIMIZED], width=0.5)
+    _boxplot(axs[1, 1], p, ['lat_b', 'lat_o'], ['baseline', 'optimized'])
     axs[1, 1].set_title('D) Lateral Acceleration (g)', fontweight='bold', loc='left', fontsize=13)
     axs[1, 1].set_xlabel('Setup')
     axs[1, 1].set_ylabel('Acceleration (g)')
     axs[1, 1].grid(axis='y', alpha=0.3)
-    pval, cohend = compute_p_and_d(df_baseline['accel_lat_g'], df_optimized['accel_lat_g'])
-    axs[1, 1].text(0.05, 0.92, f"p={pval:.2e}\nd={cohend:.2f}",
+    axs[1, 1].text(0.05, 0.92, f"p={p['lat_p']:.2e}\nd={p['lat_d']:.2f}",
                    transform=axs[1, 1].transAxes,
                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.85, edgecolor='black'))
 
     return fig
 
+
+def create_figure_9(source: Optional[TelemetrySource] = None, cache: Optional[FigureCache] = None):
+    with plt.rc_context(RC_PARAMS):
+        return render_figure_9(figure_payload('figure_9', figure_9_payload, source, cache))
+
 # ========================
 # FIGURE 10: EFFICIENCY & POWER
 # ========================
-def create_figure_10():
+def figure_10_payload(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame) -> dict:
+    time_b = df_baseline['time'].to_numpy()
+    time_o = df_optimized['time'].to_numpy()
+    payload = {}
+    for key, channel in [('eff', 'engine_efficiency_percent'), ('downforce', 'aero_downforce_n'),
+                         ('drag', 'aero_drag_n'), ('voltage', 'battery_voltage_v')]:
+        payload[f'{key}_b'] = _series(time_b, df_baseline[channel])
+        payload[f'{key}_o'] = _series(time_o, df_optimized[channel])
+        payload[f'{key}_mean_b'] = df_baseline[channel].mean()
+        payload[f'{key}_mean_o'] = df_optimized[channel].mean()
+    payload['current_b'] = _series(time_b, df_baseline['battery_current_a'].abs())
+    payload['current_o'] = _series(time_o, df_optimized['battery_current_a'].abs())
+    payload['current_mean_b'] = abs(df_baseline['battery_current_a']).mean()
+    payload['current_mean_o'] = abs(df_optimized['battery_current_a']).mean()
+    return payload
+
+
+def render_figure_10(p: dict):
     """Engine efficiency, aerodynamics, and battery analysis with Q1 enhancements"""
     fig = plt.figure(figsize=(16, 10), dpi=100)
     gs = fig.add_gridspec(2, 2, hspace=0.35, wspace=0.30)
-    fig.suptitle('Figure 10: Efficiency, Aerodynamics & Power Management', 
+    fig.suptitle('Figure 10: Efficiency, Aerodynamics & Power Management',
                  fontsize=16, fontweight='bold', y=0.98)
-    
-    downsample = 20
-    time_b = df_baseline['time'].values[::downsample]
-    time_o = df_optimized['time'].values[::downsample]
-    
+
     # Engine Efficiency
     ax = fig.add_subplot(gs[0, 0])
-    ax.fill_between(time_b, df_baseline['engine_efficiency_percent'].values[::downsample],
+    ax.fill_between(*_trace(ax, *p['eff_b']),
                     alpha=0.3, color=COLOR_BASELINE, label='Baseline', zorder=1)
-    ax.fill_between(time_o, df_optimized['engine_efficiency_percent'].values[::downsample],
+    ax.fill_between(*_trace(ax, *p['eff_o']),
                     alpha=0.3, color=COLOR_OPTIMIZED, label='Optimized', zorder=1)
-    ax.plot(time_b, df_baseline['engine_efficiency_percent'].values[::downsample],
+    ax.plot(*_trace(ax, *p['eff_b']),
             color=COLOR_BASELINE, linewidth=2.5, alpha=0.9, zorder=3)
-    ax.plot(time_o, df_optimized['engine_efficiency_percent'].values[::downsample],
+    ax.plot(*_trace(ax, *p['eff_o']),
             color=COLOR_OPTIMIZED, linewidth=2.5, alpha=0.9, zorder=3)
-    
-    base_mean = df_baseline['engine_efficiency_percent'].mean()
-    opt_mean = df_optimized['engine_efficiency_percent'].mean()
-    ax.axhline(y=base_mean, color=COLOR_BASELINE, linestyle='--', alpha=0.7, linewidth=2.0, 
+
+    base_mean = p['eff_mean_b']
+    opt_mean = p['eff_mean_o']
+    ax.axhline(y=base_mean, color=COLOR_BASELINE, linestyle='--', alpha=0.7, linewidth=2.0,
                label=f"μ: {base_mean:.2f}%", zorder=2)
-    ax.axhline(y=opt_mean, color=COLOR_OPTIMIZED, linestyle='--', alpha=0.7, linewidth=2.0, 
+    ax.axhline(y=opt_mean, color=COLOR_OPTIMIZED, linestyle='--', alpha=0.7, linewidth=2.0,
                label=f"μ: {opt_mean:.2f}%", zorder=2)
-    
+
     # Efficiency improvement
     efficiency_gain = ((opt_mean - base_mean) / base_mean * 100)
     ax.text(0.02, 0.98, f'Efficiency ↑: {efficiency_gain:.2f}%\nμ: {base_mean:.2f} → {opt_mean:.2f}%',
             transform=ax.transAxes, fontsize=10, va='top',
             bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7, edgecolor='black'))
-    
+
     ax.set_ylabel('Efficiency (%)', fontweight='bold', fontsize=12)
     ax.set_title('A) Engine Efficiency', fontweight='bold', loc='left', fontsize=13)
     ax.legend(fontsize=9, framealpha=0.9, loc='lower right', ncol=2)
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # Aerodynamic Forces
     ax = fig.add_subplot(gs[0, 1])
-    ax.plot(time_b, df_baseline['aero_downforce_n'].values[::downsample], 
+    ax.plot(*_trace(ax, *p['downforce_b']),
             color=COLOR_BASELINE, alpha=0.9, linewidth=2.5, label='Baseline (DF)', zorder=3)
-    ax.plot(time_o, df_optimized['aero_downforce_n'].values[::downsample], 
+    ax.plot(*_trace(ax, *p['downforce_o']),
             color=COLOR_OPTIMIZED, alpha=0.9, linewidth=2.5, label='Optimized (DF)', zorder=3)
-    ax.plot(time_b, df_baseline['aero_drag_n'].values[::downsample], 
+    ax.plot(*_trace(ax, *p['drag_b']),
             color=COLOR_BASELINE, alpha=0.5, linestyle='--', linewidth=2.0, label='Baseline (Drag)', zorder=2)
-    ax.plot(time_o, df_optimized['aero_drag_n'].values[::downsample], 
+    ax.plot(*_trace(ax, *p['drag_o']),
             color=COLOR_OPTIMIZED, alpha=0.5, linestyle='--', linewidth=2.0, label='Optimized (Drag)', zorder=2)
-    
+
     # Aero efficiency (downforce/drag ratio)
-    df_base_mean = df_baseline['aero_downforce_n'].mean()
-    drag_base_mean = df_baseline['aero_drag_n'].mean()
-    df_opt_mean = df_optimized['aero_downforce_n'].mean()
-    drag_opt_mean = df_optimized['aero_drag_n'].mean()
-    
+    df_base_mean = p['downforce_mean_b']
+    drag_base_mean = p['drag_mean_b']
+    df_opt_mean = p['downforce_mean_o']
+    drag_opt_mean = p['drag_mean_o']
+
     aero_eff_base = df_base_mean / drag_base_mean if drag_base_mean != 0 else 0
     aero_eff_opt = df_opt_mean / drag_opt_mean if drag_opt_mean != 0 else 0
-    
+
     ax.text(0.02, 0.98, f'Aero Efficiency: {aero_eff_base:.2f} → {aero_eff_opt:.2f}\nDF/Drag Ratio',
             transform=ax.transAxes, fontsize=10, va='top',
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7, edgecolor='black'))
-    
+
     ax.set_ylabel('Force (N)', fontweight='bold', fontsize=12)
     ax.set_title('B) Aerodynamic Forces', fontweight='bold', loc='left', fontsize=13)
     ax.legend(fontsize=9, loc='upper right', framealpha=0.9, ncol=2)
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # Battery Voltage
     ax = fig.add_subplot(gs[1, 0])
-    ax.plot(time_b, df_baseline['battery_voltage_v'].values[::downsample], 
+    ax.plot(*_trace(ax, *p['voltage_b']),
             color=COLOR_BASELINE, alpha=0.9, linewidth=2.5, label='Baseline', zorder=3)
-    ax.plot(time_o, df_optimized['battery_voltage_v'].values[::downsample], 
+    ax.plot(*_trace(ax, *p['voltage_o']),
             color=COLOR_OPTIMIZED, alpha=0.9, linewidth=2.5, label='Optimized', zorder=3)
-    
+
     # Mean voltages
-    base_mean = df_baseline['battery_voltage_v'].mean()
-    opt_mean = df_optimized['battery_voltage_v'].mean()
+    base_mean = p['voltage_mean_b']
+    opt_mean = p['voltage_mean_o']
     ax.axhline(base_mean, color=COLOR_BASELINE, linestyle='--', linewidth=2.0, alpha=0.6,
                label=f'μ: {base_mean:.2f}V', zorder=2)
     ax.axhline(opt_mean, color=COLOR_OPTIMIZED, linestyle='--', linewidth=2.0, alpha=0.6,
                label=f'μ: {opt_mean:.2f}V', zorder=2)
-    
+
     # Voltage stability
     voltage_diff = opt_mean - base_mean
     ax.text(0.02, 0.98, f'Voltage Δ: {voltage_diff:+.2f}V\nμ: {base_mean:.2f} → {opt_mean:.2f}V',
             transform=ax.transAxes, fontsize=10, va='top',
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7, edgecolor='black'))
-    
+
     ax.set_ylabel('Voltage (V)', fontweight='bold', fontsize=12)
     ax.set_xlabel('Time (s)', fontweight='bold', fontsize=12)
     ax.set_title('C) Battery Voltage', fontweight='bold', loc='left', fontsize=13)
     ax.legend(fontsize=9, framealpha=0.9, loc='lower left', ncol=2)
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # Battery Current
     ax = fig.add_subplot(gs[1, 1])
-    ax.plot(time_b, abs(df_baseline['battery_current_a'].values[::downsample]), 
+    ax.plot(*_trace(ax, *p['current_b']),
             color=COLOR_BASELINE, alpha=0.9, linewidth=2.5, label='Baseline', zorder=3)
-    ax.plot(time_o, abs(df_optimized['battery_current_a'].values[::downsample]), 
+    ax.plot(*_trace(ax, *p['current_o']),
             color=COLOR_OPTIMIZED, alpha=0.9, linewidth=2.5, label='Optimized', zorder=3)
-    ax.fill_between(time_b, abs(df_baseline['battery_current_a'].values[::downsample]),
+    ax.fill_between(*_trace(ax, *p['current_b']),
                     alpha=0.2, color=COLOR_BASELINE, zorder=1)
-    ax.fill_between(time_o, abs(df_optimized['battery_current_a'].values[::downsample]),
+    ax.fill_between(*_trace(ax, *p['current_o']),
                     alpha=0.2, color=COLOR_OPTIMIZED, zorder=1)
-    
+
     # Current efficiency
-    base_mean = abs(df_baseline['battery_current_a']).mean()
-    opt_mean = abs(df_optimized['battery_current_a']).mean()
+    base_mean = p['current_mean_b']
+    opt_mean = p['current_mean_o']
     current_reduction = ((base_mean - opt_mean) / base_mean * 100)
-    
+
     ax.text(0.02, 0.98, f'Current Draw ↓: {current_reduction:.2f}%\nμ: {base_mean:.2f} → {opt_mean:.2f}A',
             transform=ax.transAxes, fontsize=10, va='top',
             bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7, edgecolor='black'))
-    
+
     ax.set_ylabel('Current (A)', fontweight='bold', fontsize=12)
     ax.set_xlabel('Time (s)', fontweight='bold', fontsize=12)
     ax.set_title('D) Battery Current Draw', fontweight='bold', loc='left', fontsize=13)
     ax.legend(fontsize=9, framealpha=0.9)
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     return fig
 
+
+def create_figure_10(source: Optional[TelemetrySource] = None, cache: Optional[FigureCache] = None):
+    with plt.rc_context(RC_PARAMS):
+        return render_figure_10(figure_payload('figure_10', figure_10_payload, source, cache))
+
 # ========================
 # FIGURE 11: CORRELATION & SCATTER PLOTS
 # ========================
-def create_figure_11():
-    """Multi-dimensional correlation analysis with Q1 enhancements"""
+FIGURE_11_PANELS = [
+    ('rpm_torque', 'engine_rpm', 'engine_torque_nm'),
+    ('throttle_speed', 'throttle_position', 'speed_kmh'),
+    ('lat_slip', 'accel_lat_g', 'wheel_slip_percent'),
+    ('temp_slip', 'tire_temp_fl_c', 'wheel_slip_percent'),
+]
+
+
+def _figure_11_payload(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame, mode: str) -> dict:
+    payload = {}
+    for panel, x_col, y_col in FIGURE_11_PANELS:
+        scale = 100 if x_col == 'throttle_position' else 1
+        x_b, y_b = df_baseline[x_col] * scale, df_baseline[y_col]
+        x_o, y_o = df_optimized[x_col] * scale, df_optimized[y_col]
+        if mode == 'density':
+            x_edges, y_edges = shared_edges([x_b, x_o], [y_b, y_o])
+            payload[f'{panel}_x_edges'] = x_edges
+            payload[f'{panel}_y_edges'] = y_edges
+            payload[f'{panel}_counts_b'] = density_counts(x_b, y_b, x_edges, y_edges)
+            payload[f'{panel}_counts_o'] = density_counts(x_o, y_o, x_edges, y_edges)
+        else:
+            payload[f'{panel}_b'] = np.vstack([x_b, y_b])
+            payload[f'{panel}_o'] = np.vstack([x_o, y_o])
+
+        # Regression lines from sufficient statistics
+        payload[f'{panel}_fit_b'] = list(RegressionStats.from_samples(x_b, y_b).fit())
+        payload[f'{panel}_fit_o'] = list(RegressionStats.from_samples(x_o, y_o).fit())
+        payload[f'{panel}_x_range_b'] = [x_b.min(), x_b.max()]
+    return payload
+
+
+def figure_11_density_payload(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame) -> dict:
+    return _figure_11_payload(df_baseline, df_optimized, 'density')
+
+
+def figure_11_scatter_payload(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame) -> dict:
+    return _figure_11_payload(df_baseline, df_optimized, 'scatter')
+
+
+def _phase_panel(ax, p: dict, panel: str, mode: str):
+    """Baseline/optimized (x, y) samples as density meshes or scatter markers."""
+    if mode == 'density':
+        x_edges, y_edges = p[f'{panel}_x_edges'], p[f'{panel}_y_edges']
+        draw_density(ax, x_edges, y_edges, p[f'{panel}_counts_b'],
+                     COLOR_BASELINE, label='Baseline')
+        draw_density(ax, x_edges, y_edges, p[f'{panel}_counts_o'],
+                     COLOR_OPTIMIZED, label='Optimized')
+    else:
+        ax.scatter(*p[f'{panel}_b'], alpha=0.4, s=15, color=COLOR_BASELINE, label='Baseline',
+                   edgecolors='none', rasterized=True)
+        ax.scatter(*p[f'{panel}_o'], alpha=0.4, s=15, color=COLOR_OPTIMIZED, label='Optimized',
+                   edgecolors='none', rasterized=True)
+
+
+def render_figure_11(p: dict, mode: str = 'density'):
+    """
+    Multi-dimensional correlation analysis with Q1 enhancements.
+
+    mode='density' draws log-scaled 2D histograms on shared bin edges
+    (constant PDF size and render time); mode='scatter' draws every sample.
+    """
     fig = plt.figure(figsize=(16, 10), dpi=100)
     gs = fig.add_gridspec(2, 2, hspace=0.35, wspace=0.30)
-    fig.suptitle('Figure 11: Phase Space & Multi-Dimensional Relationships', 
+    fig.suptitle('Figure 11: Phase Space & Multi-Dimensional Relationships',
                  fontsize=16, fontweight='bold', y=0.98)
-    
+
     # RPM vs Torque
     ax = fig.add_subplot(gs[0, 0])
-    ax.scatter(df_baseline['engine_rpm'], df_baseline['engine_torque_nm'], 
-              alpha=0.4, s=15, color=COLOR_BASELINE, label='Baseline', edgecolors='none')
-    ax.scatter(df_optimized['engine_rpm'], df_optimized['engine_torque_nm'], 
-              alpha=0.4, s=15, color=COLOR_OPTIMIZED, label='Optimized', edgecolors='none')
-    
-    # Add regression lines or mean markers
-    from scipy.stats import linregress
-    slope_b, intercept_b, r_b, _, _ = linregress(df_baseline['engine_rpm'], df_baseline['engine_torque_nm'])
-    slope_o, intercept_o, r_o, _, _ = linregress(df_optimized['engine_rpm'], df_optimized['engine_torque_nm'])
-    
-    rpm_range = np.linspace(df_baseline['engine_rpm'].min(), df_baseline['engine_rpm'].max(), 100)
-    ax.plot(rpm_range, slope_b * rpm_range + intercept_b, color=COLOR_BASELINE, 
+    _phase_panel(ax, p, 'rpm_torque', mode)
+
+    # Regression lines from sufficient statistics
+    slope_b, intercept_b, r_b = p['rpm_torque_fit_b']
+    slope_o, intercept_o, r_o = p['rpm_torque_fit_o']
+
+    rpm_range = np.linspace(*p['rpm_torque_x_range_b'], 100)
+    ax.plot(rpm_range, slope_b * rpm_range + intercept_b, color=COLOR_BASELINE,
             linewidth=2.5, linestyle='--', alpha=0.8, label=f'Baseline: R²={r_b**2:.3f}')
-    ax.plot(rpm_range, slope_o * rpm_range + intercept_o, color=COLOR_OPTIMIZED, 
+    ax.plot(rpm_range, slope_o * rpm_range + intercept_o, color=COLOR_OPTIMIZED,
             linewidth=2.5, linestyle='--', alpha=0.8, label=f'Optimized: R²={r_o**2:.3f}')
-    
+
     ax.set_xlabel('Engine RPM', fontweight='bold', fontsize=12)
     ax.set_ylabel('Torque (Nm)', fontweight='bold', fontsize=12)
     ax.set_title('A) RPM vs Torque Relationship', fontweight='bold', loc='left', fontsize=13)
     ax.legend(fontsize=9, framealpha=0.9, loc='best')
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # Throttle vs Speed
     ax = fig.add_subplot(gs[0, 1])
-    ax.scatter(df_baseline['throttle_position']*100, df_baseline['speed_kmh'], 
-              alpha=0.4, s=15, color=COLOR_BASELINE, label='Baseline', edgecolors='none')
-    ax.scatter(df_optimized['throttle_position']*100, df_optimized['speed_kmh'], 
-              alpha=0.4, s=15, color=COLOR_OPTIMIZED, label='Optimized', edgecolors='none')
-    
+    _phase_panel(ax, p, 'throttle_speed', mode)
+
     # Regression lines
-    slope_b, intercept_b, r_b, _, _ = linregress(df_baseline['throttle_position']*100, df_baseline['speed_kmh'])
-    slope_o, intercept_o, r_o, _, _ = linregress(df_optimized['throttle_position']*100, df_optimized['speed_kmh'])
-    
+    slope_b, intercept_b, r_b = p['throttle_speed_fit_b']
+    slope_o, intercept_o, r_o = p['throttle_speed_fit_o']
+
     throttle_range = np.linspace(0, 100, 100)
-    ax.plot(throttle_range, slope_b * throttle_range + intercept_b, color=COLOR_BASELINE, 
+    ax.plot(throttle_range, slope_b * throttle_range + intercept_b, color=COLOR_BASELINE,
             linewidth=2.5, linestyle='--', alpha=0.8, label=f'Baseline: R²={r_b**2:.3f}')
-    ax.plot(throttle_range, slope_o * throttle_range + intercept_o, color=COLOR_OPTIMIZED, 
+    ax.plot(throttle_range, slope_o * throttle_range + intercept_o, color=COLOR_OPTIMIZED,
             linewidth=2.5, linestyle='--', alpha=0.8, label=f'Optimized: R²={r_o**2:.3f}')
-    
+
     ax.set_xlabel('Throttle Position (%)', fontweight='bold', fontsize=12)
     ax.set_ylabel('Speed (km/h)', fontweight='bold', fontsize=12)
     ax.set_title('B) Throttle vs Speed Response', fontweight='bold', loc='left', fontsize=13)
     ax.legend(fontsize=9, framealpha=0.9, loc='best')
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # Lateral Accel vs Wheel Slip
     ax = fig.add_subplot(gs[1, 0])
-    ax.scatter(df_baseline['accel_lat_g'], df_baseline['wheel_slip_percent'], 
-              alpha=0.4, s=15, color=COLOR_BASELINE, label='Baseline', edgecolors='none')
-    ax.scatter(df_optimized['accel_lat_g'], df_optimized['wheel_slip_percent'], 
-              alpha=0.4, s=15, color=COLOR_OPTIMIZED, label='Optimized', edgecolors='none')
-    
+    _phase_panel(ax, p, 'lat_slip', mode)
+
     # Optimal slip reference line
-    ax.axhline(5.0, color=COLOR_IMPROVEMENT, linestyle=':', linewidth=2.0, alpha=0.7, 
+    ax.axhline(5.0, color=COLOR_IMPROVEMENT, linestyle=':', linewidth=2.0, alpha=0.7,
                label='Optimal Slip (~5%)', zorder=2)
-    
+
     ax.set_xlabel('Lateral Acceleration (g)', fontweight='bold', fontsize=12)
     ax.set_ylabel('Wheel Slip (%)', fontweight='bold', fontsize=12)
     ax.set_title('C) Cornering Behavior: Lat. Accel vs Slip', fontweight='bold', loc='left', fontsize=13)
     ax.legend(fontsize=9, framealpha=0.9, loc='best')
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # Tire Temp vs Slip
     ax = fig.add_subplot(gs[1, 1])
-    ax.scatter(df_baseline['tire_temp_fl_c'], df_baseline['wheel_slip_percent'], 
-              alpha=0.4, s=15, color=COLOR_BASELINE, label='Baseline', edgecolors='none')
-    ax.scatter(df_optimized['tire_temp_fl_c'], df_optimized['wheel_slip_percent'], 
-              alpha=0.4, s=15, color=COLOR_OPTIMIZED, label='Optimized', edgecolors='none')
-    
+    _phase_panel(ax, p, 'temp_slip', mode)
+
     # Optimal regions
-    ax.axhline(5.0, color=COLOR_IMPROVEMENT, linestyle=':', linewidth=2.0, alpha=0.7, 
+    ax.axhline(5.0, color=COLOR_IMPROVEMENT, linestyle=':', linewidth=2.0, alpha=0.7,
                label='Optimal Slip', zorder=2)
     ax.axvspan(80, 95, alpha=0.1, color=COLOR_IMPROVEMENT, label='Optimal Temp Window')
-    
+
     ax.set_xlabel('Front Tire Temperature (°C)', fontweight='bold', fontsize=12)
     ax.set_ylabel('Wheel Slip (%)', fontweight='bold', fontsize=12)
     ax.set_title('D) Tire Temperature vs Grip', fontweight='bold', loc='left', fontsize=13)
     ax.legend(fontsize=9, framealpha=0.9, loc='best')
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     return fig
 
+
+def create_figure_11(source: Optional[TelemetrySource] = None, cache: Optional[FigureCache] = None,
+                     mode: str = 'density'):
+    compute = figure_11_density_payload if mode == 'density' else figure_11_scatter_payload
+    with plt.rc_context(RC_PARAMS):
+        return render_figure_11(figure_payload(f'figure_11_{mode}', compute, source, cache), mode)
+
 # ========================
 # FIGURE 12: LAP-BY-LAP ANALYSIS
 # ========================
-def create_figure_12():
+def figure_12_payload(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame) -> dict:
+    payload = {}
+    for suffix, frame in (('b', df_baseline), ('o', df_optimized)):
+        by_lap = frame.groupby('lap')
+        means = by_lap[['engine_rpm', 'glicko_volatility_sigma', 'wheel_slip_percent']].mean()
+        payload[f'laps_{suffix}'] = means.index.to_numpy()
+        payload[f'rpm_{suffix}'] = means['engine_rpm'].to_numpy()
+        payload[f'vol_{suffix}'] = means['glicko_volatility_sigma'].to_numpy()
+        payload[f'slip_{suffix}'] = means['wheel_slip_percent'].to_numpy()
+        payload[f'speed_max_{suffix}'] = by_lap['speed_kmh'].max().to_numpy()
+    return payload
+
+
+def render_figure_12(p: dict):
     """Per-lap breakdown analysis with Q1 enhancements"""
     fig = plt.figure(figsize=(16, 10), dpi=100)
     gs = fig.add_gridspec(2, 2, hspace=0.35, wspace=0.30)
-    fig.suptitle('Figure 12: Lap-by-Lap Performance Breakdown', 
+    fig.suptitle('Figure 12: Lap-by-Lap Performance Breakdown',
                  fontsize=16, fontweight='bold', y=0.98)
-    
+
     # Metrics by lap - Baseline
     ax = fig.add_subplot(gs[0, 0])
-    lap_data_b = df_baseline.groupby('lap')[['engine_rpm', 'speed_kmh', 'glicko_volatility_sigma']].mean()
-    ax.plot(lap_data_b.index, lap_data_b['engine_rpm'], marker='o', color=COLOR_BASELINE, 
+    ax.plot(p['laps_b'], p['rpm_b'], marker='o', color=COLOR_BASELINE,
             linewidth=2.5, markersize=8, label='RPM Mean', zorder=3)
     ax2 = ax.twinx()
-    ax2.plot(lap_data_b.index, lap_data_b['glicko_volatility_sigma'], marker='s', 
-            color=COLOR_BASELINE, linestyle='--', linewidth=2.5, markersize=8, alpha=0.7, 
+    ax2.plot(p['laps_b'], p['vol_b'], marker='s',
+            color=COLOR_BASELINE, linestyle='--', linewidth=2.5, markersize=8, alpha=0.7,
             label='Glicko σ', zorder=3)
-    
+
     # Mean lines
-    rpm_mean = lap_data_b['engine_rpm'].mean()
-    vol_mean = lap_data_b['glicko_volatility_sigma'].mean()
+    rpm_mean = p['rpm_b'].mean()
+    vol_mean_b = vol_mean = p['vol_b'].mean()
     ax.axhline(rpm_mean, color=COLOR_BASELINE, linestyle=':', linewidth=2.0, alpha=0.5, zorder=2)
     ax2.axhline(vol_mean, color=COLOR_BASELINE, linestyle=':', linewidth=2.0, alpha=0.5, zorder=2)
-    
+
     ax.text(0.02, 0.98, f'RPM μ: {rpm_mean:.0f}\nGlicko σ μ: {vol_mean:.4f}',
             transform=ax.transAxes, fontsize=10, va='top',
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7, edgecolor='black'))
-    
+
     ax.set_xlabel('Lap Number', fontweight='bold', fontsize=12)
     ax.set_ylabel('Engine RPM', fontweight='bold', color=COLOR_BASELINE, fontsize=12)
     ax2.set_ylabel('Glicko-2 σ', fontweight='bold', color=COLOR_BASELINE, alpha=0.7, fontsize=12)
     ax.set_title('A) Baseline: RPM & Volatility by Lap', fontweight='bold', loc='left', fontsize=13)
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # Metrics by lap - Optimized
     ax = fig.add_subplot(gs[0, 1])
-    lap_data_o = df_optimized.groupby('lap')[['engine_rpm', 'speed_kmh', 'glicko_volatility_sigma']].mean()
-    ax.plot(lap_data_o.index, lap_data_o['engine_rpm'], marker='o', color=COLOR_OPTIMIZED, 
+    ax.plot(p['laps_o'], p['rpm_o'], marker='o', color=COLOR_OPTIMIZED,
             linewidth=2.5, markersize=8, label='RPM Mean', zorder=3)
     ax2 = ax.twinx()
-    ax2.plot(lap_data_o.index, lap_data_o['glicko_volatility_sigma'], marker='s', 
-            color=COLOR_OPTIMIZED, linestyle='--', linewidth=2.5, markersize=8, alpha=0.7, 
+    ax2.plot(p['laps_o'], p['vol_o'], marker='s',
+            color=COLOR_OPTIMIZED, linestyle='--', linewidth=2.5, markersize=8, alpha=0.7,
             label='Glicko σ', zorder=3)
-    
+
     # Mean lines
-    rpm_mean = lap_data_o['engine_rpm'].mean()
-    vol_mean = lap_data_o['glicko_volatility_sigma'].mean()
+    rpm_mean = p['rpm_o'].mean()
+    vol_mean = p['vol_o'].mean()
     ax.axhline(rpm_mean, color=COLOR_OPTIMIZED, linestyle=':', linewidth=2.0, alpha=0.5, zorder=2)
     ax2.axhline(vol_mean, color=COLOR_OPTIMIZED, linestyle=':', linewidth=2.0, alpha=0.5, zorder=2)
-    
+
     # Compare with baseline
-    vol_improvement = ((lap_data_b['glicko_volatility_sigma'].mean() - vol_mean) / 
-                       lap_data_b['glicko_volatility_sigma'].mean() * 100)
-    
+    vol_improvement = (vol_mean_b - vol_mean) / vol_mean_b * 100
+
     ax.text(0.02, 0.98, f'RPM μ: {rpm_mean:.0f}\nGlicko σ μ: {vol_mean:.4f}\nImprovement: {vol_improvement:.1f}%',
             transform=ax.transAxes, fontsize=10, va='top',
             bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7, edgecolor='black'))
-    
+
     ax.set_xlabel('Lap Number', fontweight='bold', fontsize=12)
     ax.set_ylabel('Engine RPM', fontweight='bold', color=COLOR_OPTIMIZED, fontsize=12)
     ax2.set_ylabel('Glicko-2 σ', fontweight='bold', color=COLOR_OPTIMIZED, alpha=0.7, fontsize=12)
     ax.set_title('B) Optimized: RPM & Volatility by Lap', fontweight='bold', loc='left', fontsize=13)
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # Wheel Slip by Lap
     ax = fig.add_subplot(gs[1, 0])
-    slip_b = df_baseline.groupby('lap')['wheel_slip_percent'].mean()
-    slip_o = df_optimized.groupby('lap')['wheel_slip_percent'].mean()
+    slip_b = p['slip_b']
+    slip_o = p['slip_o']
     x = np.arange(len(slip_b))
     width = 0.35
-    
-    bars1 = ax.bar(x - width/2, slip_b.values, width, label='Baseline', 
+
+    bars1 = ax.bar(x - width/2, slip_b, width, label='Baseline',
                    color=COLOR_BASELINE, alpha=0.85, edgecolor='black', linewidth=1.2)
-    bars2 = ax.bar(x + width/2, slip_o.values, width, label='Optimized', 
+    bars2 = ax.bar(x + width/2, slip_o, width, label='Optimized',
                    color=COLOR_OPTIMIZED, alpha=0.85, edgecolor='black', linewidth=1.2)
-    
+
     # Add value labels on bars
     for bars in [bars1, bars2]:
         for bar in bars:
@@ -904,91 +1214,220 @@ def create_figure_12():
             ax.text(bar.get_x() + bar.get_width()/2., height,
                    f'{height:.1f}',
                    ha='center', va='bottom', fontsize=8)
-    
+
     # Improvement
     slip_improvement = ((slip_b.mean() - slip_o.mean()) / slip_b.mean() * 100)
     ax.text(0.02, 0.98, f'Avg Slip ↓: {slip_improvement:.1f}%\n{slip_b.mean():.2f} → {slip_o.mean():.2f}%',
             transform=ax.transAxes, fontsize=10, va='top',
             bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7, edgecolor='black'))
-    
+
     ax.set_xlabel('Lap Number', fontweight='bold', fontsize=12)
     ax.set_ylabel('Wheel Slip (%)', fontweight='bold', fontsize=12)
     ax.set_title('C) Wheel Slip by Lap Comparison', fontweight='bold', loc='left', fontsize=13)
     ax.set_xticks(x)
-    ax.set_xticklabels([str(int(i)) for i in slip_b.index], fontsize=10)
+    ax.set_xticklabels([str(int(i)) for i in p['laps_b']], fontsize=10)
     ax.legend(fontsize=10, framealpha=0.9)
     ax.grid(alpha=0.3, axis='y', linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     # Speed Profile by Lap
     ax = fig.add_subplot(gs[1, 1])
-    speed_b = df_baseline.groupby('lap')['speed_kmh'].max()
-    speed_o = df_optimized.groupby('lap')['speed_kmh'].max()
-    ax.plot(speed_b.index, speed_b.values, marker='o', color=COLOR_BASELINE, 
+    speed_b = p['speed_max_b']
+    speed_o = p['speed_max_o']
+    ax.plot(p['laps_b'], speed_b, marker='o', color=COLOR_BASELINE,
             linewidth=2.5, markersize=10, label='Baseline', alpha=0.9, zorder=3)
-    ax.plot(speed_o.index, speed_o.values, marker='s', color=COLOR_OPTIMIZED, 
+    ax.plot(p['laps_o'], speed_o, marker='s', color=COLOR_OPTIMIZED,
             linewidth=2.5, markersize=10, label='Optimized', alpha=0.9, zorder=3)
-    ax.fill_between(speed_b.index, speed_b.values, alpha=0.2, color=COLOR_BASELINE, zorder=1)
-    ax.fill_between(speed_o.index, speed_o.values, alpha=0.2, color=COLOR_OPTIMIZED, zorder=1)
-    
+    ax.fill_between(p['laps_b'], speed_b, alpha=0.2, color=COLOR_BASELINE, zorder=1)
+    ax.fill_between(p['laps_o'], speed_o, alpha=0.2, color=COLOR_OPTIMIZED, zorder=1)
+
     # Mean speed lines
     speed_b_mean = speed_b.mean()
     speed_o_mean = speed_o.mean()
     ax.axhline(speed_b_mean, color=COLOR_BASELINE, linestyle='--', linewidth=2.0, alpha=0.6, zorder=2)
     ax.axhline(speed_o_mean, color=COLOR_OPTIMIZED, linestyle='--', linewidth=2.0, alpha=0.6, zorder=2)
-    
+
     # Speed improvement
     speed_improvement = ((speed_o_mean - speed_b_mean) / speed_b_mean * 100)
     ax.text(0.02, 0.98, f'Avg Max Speed ↑: {speed_improvement:.2f}%\nμ: {speed_b_mean:.1f} → {speed_o_mean:.1f} km/h',
             transform=ax.transAxes, fontsize=10, va='top',
             bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7, edgecolor='black'))
-    
+
     ax.set_xlabel('Lap Number', fontweight='bold', fontsize=12)
     ax.set_ylabel('Max Speed (km/h)', fontweight='bold', fontsize=12)
     ax.set_title('D) Maximum Speed per Lap', fontweight='bold', loc='left', fontsize=13)
     ax.legend(fontsize=10, framealpha=0.9)
     ax.grid(alpha=0.3, linewidth=0.8)
     ax.set_axisbelow(True)
-    
+
     return fig
 
+
+def create_figure_12(source: Optional[TelemetrySource] = None, cache: Optional[FigureCache] = None):
+    with plt.rc_context(RC_PARAMS):
+        return render_figure_12(figure_payload('figure_12', figure_12_payload, source, cache))
+
+# ========================
+# FIGURE 13: SPECTRAL ANALYSIS
+# ========================
+def _psd_panel(ax, p: dict, channel: str, turn: str):
+    c, t = p['channels'].index(channel), p['turns'].index(turn)
+    for s, setup in enumerate(p['setups']):
+        color = COLOR_BASELINE if setup == 'baseline' else COLOR_OPTIMIZED
+        ax.semilogy(p['freqs'][1:], p['psd'][s, t, 1:, c], color=color, linewidth=2.0,
+                    label=f"{setup.capitalize()} ({p['laps'][s]} laps)")
+    ax.set_xlabel('Frequency (Hz)')
+    ax.legend(fontsize=10, framealpha=0.9)
+    ax.grid(alpha=0.3, which='both')
+
+
+def render_figure_13(p: dict):
+    """Welch PSDs per turn, band energy change per turn and mean lap spectrogram."""
+    fig, axs = plt.subplots(2, 2, figsize=(16, 10))
+    fig.suptitle('Figure 13: Spectral Analysis of Suspension & IMU Channels per Turn',
+                 fontsize=16, fontweight='bold', y=0.96)
+    focus = 'Turn5'
+
+    # A) Damper velocity PSD in the focus turn
+    _psd_panel(axs[0, 0], p, 'damper_velocity_fl_mm_s', focus)
+    axs[0, 0].set_title(f'A) {focus}: Damper Velocity FL PSD', fontweight='bold', loc='left', fontsize=13)
+    axs[0, 0].set_ylabel('PSD ((mm/s)²/Hz)')
+
+    # B) Gyro roll PSD in the focus turn
+    _psd_panel(axs[0, 1], p, 'gyro_roll_dps', focus)
+    axs[0, 1].set_title(f'B) {focus}: Gyro Roll PSD', fontweight='bold', loc='left', fontsize=13)
+    axs[0, 1].set_ylabel('PSD ((°/s)²/Hz)')
+
+    # C) Total band energy, optimized vs baseline, per channel and turn
+    ax = axs[1, 0]
+    b, o = p['setups'].index('baseline'), p['setups'].index('optimized')
+    total = np.asarray(p['energy']).sum(axis=-1)             # (setup, turn, channel)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_db = 10 * np.log10(total[o] / total[b]).T     # (channel, turn)
+    limit = max(float(np.nanmax(np.abs(change_db))), 0.1)
+    image = ax.imshow(change_db, cmap='RdBu_r', vmin=-limit, vmax=limit, aspect='auto')
+    for (i, j), value in np.ndenumerate(change_db):
+        ax.text(j, i, f'{value:+.1f}', ha='center', va='center', fontsize=7)
+    ax.set_xticks(range(len(p['turns'])))
+    ax.set_xticklabels(p['turns'])
+    ax.set_yticks(range(len(p['channels'])))
+    ax.set_yticklabels(p['channels'], fontsize=8)
+    fig.colorbar(image, ax=ax, label='Optimized vs baseline (dB)')
+    ax.grid(False)
+    ax.set_title('C) Band Energy Change per Turn', fontweight='bold', loc='left', fontsize=13)
+
+    # D) Mean lap spectrogram of gyro roll (baseline)
+    ax = axs[1, 1]
+    c = p['channels'].index('gyro_roll_dps')
+    power_db = 10 * np.log10(np.maximum(p['spectrogram'][b, :, c, :], 1e-12))
+    mesh = ax.pcolormesh(p['spec_times'], p['spec_freqs'], power_db, shading='nearest', cmap='viridis')
+    fig.colorbar(mesh, ax=ax, label='PSD (dB)')
+    ax.grid(False)
+    ax.set_xlabel('Lap time (s)')
+    ax.set_ylabel('Frequency (Hz)')
+    ax.set_title('D) Gyro Roll Spectrogram (Baseline, Mean Lap)', fontweight='bold', loc='left', fontsize=13)
+
+    fig.subplots_adjust(hspace=0.35, wspace=0.30)
+    return fig
+
+
+def create_figure_13(source: Optional[TelemetrySource] = None, cache: Optional[FigureCache] = None):
+    with plt.rc_context(RC_PARAMS):
+        # Same cache entry as Table_v4_Spectral_Band_Energy (generate_tables_v4)
+        source = source or default_source()
+        return render_figure_13(cached_spectral_analysis(cache or figure_cache, source.fingerprint,
+                                                         source.frames))
+
+# ========================
+# PIPELINE
+# ========================
+FIGURES = [
+    (5, "Time Series Multi-Metrics", create_figure_5),
+    (6, "Statistical Validation", create_figure_6),
+    (7, "Performance Metrics Comparison", create_figure_7),
+    (8, "Quantile Time Series", create_figure_8),
+    (9, "Distribution Analysis", create_figure_9),
+    (10, "Efficiency & Power Management", create_figure_10),
+    (11, "Phase Space & Correlations", create_figure_11),
+    (12, "Lap-by-Lap Breakdown", create_figure_12),
+    (13, "Spectral Analysis", create_figure_13),
+]
+
+
+def generate_figures(source: Optional[TelemetrySource] = None, out_dir: Path = OUTPUTS_DIR,
+                     cache: Optional[FigureCache] = None, verbose: bool = True) -> List[Path]:
+    """
+    Render Figures 5-13 and save each as PDF and PNG.
+
+    A figure that fails is reported and skipped, so one broken panel does
+    not cost the rest of the batch.
+
+    Args:
+        source: Dataset (default: the v4 MEGA CSV in data/datasets)
+        out_dir: Output directory (created if missing)
+        cache: Payload cache (default: module figure_cache)
+        verbose: Print progress
+
+    Returns:
+        Paths of the files written
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    with plt.rc_context(RC_PARAMS):
+        for fig_num, fig_name, fig_func in FIGURES:
+            if verbose:
+                print(f"   Generating Figure {fig_num}: {fig_name}...")
+            try:
+                fig = fig_func(source, cache)
+                for ext in ('pdf', 'png'):
+                    path = out_dir / f'Figure_{fig_num}_{fig_name.replace(" ", "_")}.{ext}'
+                    fig.savefig(path, dpi=300, bbox_inches='tight')
+                    written.append(path)
+                plt.close(fig)
+                if verbose:
+                    print(f"   ✅ Figure {fig_num} saved")
+            except Exception as e:
+                print(f"   ❌ Error generating Figure {fig_num}: {e}")
+    return written
+
+
 # ========================
 # MAIN EXECUTION
 # ========================
-if __name__ == '__main__':
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Advanced v4.1 figures (5-13)")
+    parser.add_argument('--dataset', type=Path, default=DATASET_FILE,
+                        help="v4 dataset CSV or channel store directory")
+    parser.add_argument('--no-cache', action='store_true', help="Recompute every payload, write nothing")
+    parser.add_argument('--clear-cache', action='store_true', help="Delete cached payloads before running")
+    args = parser.parse_args()
+
     print("\n" + "="*80)
     print("🎨 GENERATING ADVANCED PUBLICATION-QUALITY FIGURES v4.1")
     print("="*80 + "\n")
-    
-    figures = [
-        (5, "Time Series Multi-Metrics", create_figure_5),
-        (6, "Statistical Validation", create_figure_6),
-        (7, "Performance Metrics Comparison", create_figure_7),
-                (8, "Quantile Time Series", create_figure_8),
-                (9, "Distribution Analysis", create_figure_9),
-        (10, "Efficiency & Power Management", create_figure_10),
-        (11, "Phase Space & Correlations", create_figure_11),
-        (12, "Lap-by-Lap Breakdown", create_figure_12),
-    ]
-    
-    for fig_num, fig_name, fig_func in figures:
-        print(f"   Generating Figure {fig_num}: {fig_name}...")
-        try:
-            fig = fig_func()
-            fig.savefig(OUTPUTS_DIR / f'Figure_{fig_num}_{fig_name.replace(" ", "_")}.pdf', 
-                       dpi=300, bbox_inches='tight')
-            fig.savefig(OUTPUTS_DIR / f'Figure_{fig_num}_{fig_name.replace(" ", "_")}.png', 
-                       dpi=300, bbox_inches='tight')
-            plt.close(fig)
-            print(f"   ✅ Figure {fig_num} saved")
-        except Exception as e:
-            print(f"   ❌ Error generating Figure {fig_num}: {e}")
-    
+
+    source = TelemetrySource.from_file(args.dataset)
+    if not source.exists():
+        print("❌ Dataset not found")
+        return 1
+    figure_cache.enabled = not args.no_cache
+    if args.clear_cache:
+        print(f"   🗑️  {figure_cache.clear()} cached payload files removed")
+
+    generate_figures(source)
+
     print("\n" + "="*80)
     print(f"🎉 ALL ADVANCED FIGURES GENERATED - Location: {OUTPUTS_DIR}")
-    print("   • 8 comprehensive figures")
+    print(f"   • {len(FIGURES)} comprehensive figures")
     print("   • 300 DPI resolution (publication-ready)")
     print("   • PDF + PNG formats")
     print("   • Professional color scheme")
     print("   • Detailed metrics & analysis")
+    print(f"   • Payload cache: {figure_cache.hits} hits, {figure_cache.misses} misses ({CACHE_DIR})")
     print("="*80 + "\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
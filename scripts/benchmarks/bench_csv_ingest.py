@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: chunked, column-projected CSV ingestion throughput
+
+Reads each repo CSV (raw Turn 5, industrial all-channels, versioned v1/v3,
+v4 MEGA) and a larger copy of the v4 dataset (tiled to --rows) with:
+  • read_csv: whole file, default dtype inference (the current scripts)
+  • ingest all: csv_ingest.ingest_csv, every column, explicit dtypes
+  • ingest 4 col: the same with a 4-column projection
+
+and reports MB/s (file bytes / wall time, best of --repeat) and the
+tracemalloc peak (a separate run, so tracing does not slow the timed one).
+
+Uso:
+  python scripts/benchmarks/bench_csv_ingest.py
+  python scripts/benchmarks/bench_csv_ingest.py --rows 2000000 --chunk-rows 100000 --engine c
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from csv_ingest import CHUNK_ROWS, ENGINES, csv_header, fastest_engine, ingest_csv
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+V4_FILE = PROJECT_ROOT / "data" / "datasets" / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
+REPO_FILES = [
+    PROJECT_ROOT / "data" / "raw" / "NLA_CaseStudy_Turn5_Jerez.csv",
+    PROJECT_ROOT / "data" / "datasets" / "NLA_CaseStudy_Jerez_Industrial_AllChannels.csv",
+    *sorted((PROJECT_ROOT / "data" / "versioned").glob("*.csv")),
+    V4_FILE,
+]
+MB = 1024 * 1024
+
+
+def tile_csv(source: Path, target: Path, rows: int) -> Path:
+    """Copy source's data rows into target until it holds at least `rows` rows."""
+    with open(source, encoding='utf-8') as handle:
+        header = handle.readline()
+        body = handle.read()
+    n_source = body.count('\n')
+    with open(target, 'w', encoding='utf-8') as handle:
+        handle.write(header)
+        for _ in range(-(-rows // n_source)):
+            handle.write(body)
+    return target
+
+
+def best_time(run, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def traced_peak(run) -> int:
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV ingestion throughput benchmark (MB/s)")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Rows of the tiled v4 file (0 = skip)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--engine', choices=ENGINES, default=None, help="Default: fastest available")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    engine = args.engine or fastest_engine()
+    pd.read_csv   # import pandas outside the timings
+
+    print("\n" + "="*80)
+    print(f"📥 CSV INGESTION BENCHMARK - engine {engine}, chunks of {args.chunk_rows:,} rows")
+    print("="*80)
+    print(f"   {'file':<42} | {'MB':>7} | {'path':<12} | {'MB/s':>7} | {'peak MB':>8}")
+    print("   " + "-"*88)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = list(REPO_FILES)
+        if args.rows:
+            files.append(tile_csv(V4_FILE, Path(tmp) / f"v4_tiled_{args.rows}.csv", args.rows))
+
+        for path in files:
+            if not path.exists():
+                print(f"   {path.name[:42]:<42} | missing")
+                continue
+            size = path.stat().st_size
+            projection = csv_header(path)[:4]
+            paths = [
+                ('read_csv', lambda: pd.read_csv(path)),
+                ('ingest all', lambda: ingest_csv(path, lambda block: None,
+                                                  chunk_rows=args.chunk_rows, engine=engine)),
+                ('ingest 4 col', lambda: ingest_csv(path, lambda block: None, projection,
+                                                    chunk_rows=args.chunk_rows, engine=engine)),
+            ]
+            for name, run in paths:
+                seconds = best_time(run, args.repeat)
+                peak = traced_peak(run)
+                print(f"   {path.name[:42]:<42} | {size / MB:>7.1f} | {name:<12} | "
+                      f"{size / MB / seconds:>7.1f} | {peak / MB:>8.1f}")
+
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
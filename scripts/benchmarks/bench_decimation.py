@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: figure decimation (stride vs LTTB vs min/max envelope)
+
+Tiles a v4 channel to 100k–10M samples and, for every method, reports:
+  • decimation time and points drawn
+  • render time of one figure-5 sized panel at 300 DPI (Agg)
+  • peak retention: drawn range / full range
+  • envelope error: mean |min/max per pixel column| difference against the
+    full series, as a fraction of the range
+  • raster IoU of the drawn line against the full-resolution render
+    (only up to --full-max samples)
+
+Uso:
+  python scripts/benchmarks/bench_decimation.py
+  python scripts/benchmarks/bench_decimation.py --samples 100000 1000000 --channel engine_rpm
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from decimation import EXPORT_DPI, decimate, pixel_budget
+from lazy_import import lazy_import
+
+matplotlib = lazy_import('matplotlib')
+plt = lazy_import('matplotlib.pyplot')
+pd = lazy_import('pandas')
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "datasets"
+SEED = 1854652912
+PANEL_SIZE = (6.5, 3.5)  # inches, one panel of figure 5
+
+
+def make_series(channel: np.ndarray, n: int, rng) -> tuple:
+    y = np.resize(channel, n) + rng.normal(0, 0.01 * np.std(channel), n)
+    return np.arange(n) * 1e-3, y
+
+
+def new_panel():
+    fig = plt.figure(figsize=PANEL_SIZE, dpi=EXPORT_DPI)
+    ax = fig.add_axes([0.1, 0.1, 0.85, 0.85])
+    ax.set_axis_off()
+    return fig, ax
+
+
+def render(x, y, limits):
+    """Draw one line; returns (seconds, ink mask)."""
+    fig, ax = new_panel()
+    ax.set_xlim(limits[0]), ax.set_ylim(limits[1])
+    t0 = time.perf_counter()
+    ax.plot(x, y, color='black', linewidth=1.0, antialiased=False)
+    fig.canvas.draw()
+    elapsed = time.perf_counter() - t0
+    ink = np.asarray(fig.canvas.buffer_rgba())[..., 0] < 128
+    plt.close(fig)
+    return elapsed, ink
+
+
+def column_envelope(x, y, limits, columns):
+    col = np.clip(((x - limits[0][0]) / (limits[0][1] - limits[0][0]) * columns).astype(np.int64),
+                  0, columns - 1)
+    lo = np.full(columns, np.inf)
+    hi = np.full(columns, -np.inf)
+    np.minimum.at(lo, col, y)
+    np.maximum.at(hi, col, y)
+    return lo, hi
+
+
+def envelope_error(x, y, xd, yd, limits, columns):
+    lo, hi = column_envelope(x, y, limits, columns)
+    dlo, dhi = column_envelope(xd, yd, limits, columns)
+    # Columns without a decimated point are skipped (a segment crosses them)
+    valid = np.isfinite(lo) & np.isfinite(dlo)
+    span = limits[1][1] - limits[1][0]
+    return np.mean(np.abs(lo[valid] - dlo[valid]) + np.abs(hi[valid] - dhi[valid])) / (2 * span)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Figure decimation benchmark")
+    parser.add_argument('--dataset', type=Path, default=DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv")
+    parser.add_argument('--channel', default='wheel_slip_percent')
+    parser.add_argument('--samples', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--full-max', type=int, default=1_000_000,
+                        help="Largest size also rendered at full resolution")
+    args = parser.parse_args()
+    matplotlib.use('Agg')
+
+    channel = pd.read_csv(args.dataset, usecols=[args.channel])[args.channel].to_numpy()
+    rng = np.random.default_rng(SEED)
+    fig, ax = new_panel()
+    budget = pixel_budget(ax)
+    plt.close(fig)
+
+    print("\n" + "="*96)
+    print(f"📉 DECIMATION BENCHMARK - {args.channel}, {budget} px panel at {EXPORT_DPI} DPI")
+    print("="*96)
+    print(f"   {'samples':>10} | {'method':<7} | {'points':>7} | {'decimate ms':>11} | {'render ms':>9} | "
+          f"{'peak kept':>9} | {'env err':>8} | {'raster IoU':>10}")
+    print("   " + "-"*90)
+
+    for n in args.samples:
+        x, y = make_series(channel, n, rng)
+        limits = ((x[0], x[-1]), (y.min(), y.max()))
+        full_ink = None
+        methods = [('stride', lambda: (x[::max(1, n // budget)], y[::max(1, n // budget)])),
+                   ('lttb', lambda: decimate(x, y, budget, 'lttb')),
+                   ('minmax', lambda: decimate(x, y, budget, 'minmax'))]
+        if n <= args.full_max:
+            methods.insert(0, ('full', lambda: (x, y)))
+
+        for name, reduce in methods:
+            t0 = time.perf_counter()
+            xd, yd = reduce()
+            reduce_s = time.perf_counter() - t0
+            render_s, ink = render(xd, yd, limits)
+            if name == 'full':
+                full_ink = ink
+            iou = (f"{(ink & full_ink).sum() / (ink | full_ink).sum():>10.3f}"
+                   if full_ink is not None else f"{'-':>10}")
+            peak = (yd.max() - yd.min()) / (limits[1][1] - limits[1][0])
+            error = envelope_error(x, y, xd, yd, limits, budget)
+            print(f"   {n:>10,} | {name:<7} | {len(xd):>7,} | {reduce_s * 1e3:>11.1f} | "
+                  f"{render_s * 1e3:>9.1f} | {peak:>9.3f} | {error:>8.4f} | {iou}")
+        print("   " + "-"*90)
+
+    print("\n" + "="*96 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scatter vs density rendering of a figure-11 panel
+
+Tiles the RPM/torque samples of both setups to 20k–20M points and
+reports, per mode, the data pass time (histograms / regression),
+the PDF save time and the PDF size:
+  • scatter: every sample as a marker (vector paths), linregress
+  • scatter-raster: same markers, rasterized artist
+  • density: histogram2d on shared edges, rasterized mesh,
+    regression from sufficient statistics
+
+Uso:
+  python scripts/benchmarks/bench_density_figure.py
+  python scripts/benchmarks/bench_density_figure.py --samples 20000 2000000 --scatter-max 200000
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from density_plot import RegressionStats, density_counts, draw_density, shared_edges
+from lazy_import import lazy_import
+
+matplotlib = lazy_import('matplotlib')
+plt = lazy_import('matplotlib.pyplot')
+pd = lazy_import('pandas')
+stats = lazy_import('scipy.stats')
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "datasets"
+SEED = 1854652912
+COLORS = {'baseline': '#1f77b4', 'optimized': '#ff7f0e'}
+
+
+def render_panel(samples: dict, mode: str):
+    """Draw one panel; returns (data pass seconds, save seconds, PDF bytes)."""
+    fig, ax = plt.subplots(figsize=(8, 5), dpi=100)
+    t0 = time.perf_counter()
+    if mode == 'density':
+        x_edges, y_edges = shared_edges([x for x, _ in samples.values()],
+                                        [y for _, y in samples.values()])
+        for setup, (x, y) in samples.items():
+            draw_density(ax, x_edges, y_edges, density_counts(x, y, x_edges, y_edges),
+                         COLORS[setup], label=setup)
+            fits = RegressionStats.from_samples(x, y).fit()
+    else:
+        for setup, (x, y) in samples.items():
+            ax.scatter(x, y, alpha=0.4, s=15, color=COLORS[setup], label=setup,
+                       edgecolors='none', rasterized=mode == 'scatter-raster')
+            fits = stats.linregress(x, y)[:2]
+    data_s = time.perf_counter() - t0
+    ax.legend()
+
+    buffer = io.BytesIO()
+    t0 = time.perf_counter()
+    fig.savefig(buffer, format='pdf', dpi=300)
+    save_s = time.perf_counter() - t0
+    plt.close(fig)
+    return data_s, save_s, len(buffer.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scatter vs density figure benchmark")
+    parser.add_argument('--dataset', type=Path, default=DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv")
+    parser.add_argument('--samples', type=int, nargs='+', default=[20_000, 200_000, 2_000_000, 20_000_000])
+    parser.add_argument('--scatter-max', type=int, default=200_000,
+                        help="Largest sample count also drawn as scatter")
+    args = parser.parse_args()
+    matplotlib.use('Agg')
+
+    base = pd.read_csv(args.dataset, usecols=['engine_rpm', 'engine_torque_nm', 'setup'])
+    rng = np.random.default_rng(SEED)
+
+    print("\n" + "="*80)
+    print("🗺️  DENSITY vs SCATTER BENCHMARK - figure 11 panel A (RPM vs torque)")
+    print("="*80)
+    print(f"   {'samples':>11} | {'mode':<14} | {'data s':>7} | {'save s':>7} | {'PDF KB':>9}")
+    print("   " + "-"*60)
+
+    for n in args.samples:
+        samples = {}
+        for setup, group in base.groupby('setup'):
+            m = n // 2
+            samples[setup] = (np.resize(group['engine_rpm'].to_numpy(), m) + rng.normal(0, 20, m),
+                              np.resize(group['engine_torque_nm'].to_numpy(), m) + rng.normal(0, 0.5, m))
+        modes = ['density'] + (['scatter', 'scatter-raster'] if n <= args.scatter_max else [])
+        for mode in modes:
+            data_s, save_s, size = render_panel(samples, mode)
+            print(f"   {n:>11,} | {mode:<14} | {data_s:>7.2f} | {save_s:>7.2f} | {size / 1024:>9,.0f}")
+        print("   " + "-"*60)
+
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
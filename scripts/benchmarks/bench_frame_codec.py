@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark: binary telemetry frame codec vs JSON and CSV lines
+
+Encodes and decodes the v4 dataset in batches of 1/10/100 samples and
+reports frames/s, samples/s and bytes per sample for:
+  • RAW, QUANTIZED and DELTA binary frames (telemetry_codec)
+  • JSON lines (one object per sample, batch as a JSON array)
+  • CSV lines (one line per sample)
+
+Before timing, edge cases are round-tripped: an empty batch after a DELTA
+chain and a batch whose quantized values overflow int32 (sent RAW).
+
+Uso:
+  python scripts/benchmarks/bench_frame_codec.py
+  python scripts/benchmarks/bench_frame_codec.py --batch 1 50 --samples 20000
+"""
+
+from __future__ import annotations
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from lazy_import import lazy_import
+from telemetry_codec import (CHANNELS, FLAG_DELTA, FLAG_QUANTIZED, HEADER, FrameDecoder,
+                             FrameEncoder, channel_matrix, records_from_dataframe,
+                             records_to_dataframe)
+
+pd = lazy_import('pandas')
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "datasets"
+
+
+def bench_binary(records, batch, **options):
+    encoder = FrameEncoder(**options)
+    t0 = time.perf_counter()
+    frames = [encoder.encode(records[i:i + batch]) for i in range(0, len(records), batch)]
+    t1 = time.perf_counter()
+    decoder = FrameDecoder()
+    decoded = [decoder.decode(frame) for frame in frames]
+    t2 = time.perf_counter()
+    error = np.max(np.abs(channel_matrix(np.concatenate(decoded)).astype(float)
+                          - channel_matrix(records)))
+    return frames, t1 - t0, t2 - t1, error
+
+
+def check_edge_cases(records):
+    """Round-trip batches the timed runs never produce; raises AssertionError on mismatch."""
+    encoder, decoder = FrameEncoder(delta=True), FrameDecoder()
+    huge = records[:10].copy()
+    huge['engine_rpm'] = 1e12                   # 1e12 steps of 1 rpm: beyond int32
+    batches = [records[:10], records[:0], records[10:20], huge, records[20:30]]
+    expected_flags = [FLAG_QUANTIZED, FLAG_QUANTIZED, FLAG_QUANTIZED | FLAG_DELTA, 0, FLAG_QUANTIZED]
+    for batch, expected in zip(batches, expected_flags):
+        frame = encoder.encode(batch)
+        flags = HEADER.unpack_from(frame)[2]
+        decoded = decoder.decode(frame)
+        assert flags == expected, f"flags {flags} != {expected}"
+        assert len(decoded) == len(batch)
+        tolerance = 0 if flags == 0 else 0.5 * max(decoder.steps)
+        assert np.all(np.abs(channel_matrix(decoded).astype(float) - channel_matrix(batch)) <= tolerance)
+
+
+def bench_json(df, batch):
+    rows = df.to_dict('records')
+    t0 = time.perf_counter()
+    frames = [json.dumps(rows[i:i + batch]).encode() for i in range(0, len(rows), batch)]
+    t1 = time.perf_counter()
+    for frame in frames:
+        json.loads(frame)
+    t2 = time.perf_counter()
+    return frames, t1 - t0, t2 - t1, 0.0
+
+
+def bench_csv(df, batch):
+    rows = [tuple(r) for r in df.itertuples(index=False)]
+    line = ','.join(['%.7g'] * (len(CHANNELS) - 1) + ['%s'])  # float32 precision
+    t0 = time.perf_counter()
+    frames = ['\n'.join(line % row for row in rows[i:i + batch]).encode()
+              for i in range(0, len(rows), batch)]
+    t1 = time.perf_counter()
+    for frame in frames:
+        for line in frame.split(b'\n'):
+            fields = line.split(b',')
+            [float(x) for x in fields[:-1]]
+    t2 = time.perf_counter()
+    return frames, t1 - t0, t2 - t1, 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry frame codec benchmark")
+    parser.add_argument('--dataset', type=Path, default=DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv")
+    parser.add_argument('--samples', type=int, default=20_000)
+    parser.add_argument('--batch', type=int, nargs='+', default=[1, 10, 100])
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.dataset, usecols=CHANNELS, nrows=args.samples)[CHANNELS]
+    records = records_from_dataframe(df)
+    df = records_to_dataframe(records)  # same float32 values for every format
+
+    print("\n" + "="*92)
+    print(f"📦 TELEMETRY FRAME CODEC BENCHMARK - {len(records):,} samples, {len(CHANNELS)} channels")
+    print("="*92)
+    check_edge_cases(records)
+    print("   ✅ Round trips: empty batch in a DELTA chain, int32 overflow → RAW")
+    print(f"   {'format':<10} | {'batch':>5} | {'B/sample':>8} | {'enc frames/s':>12} | "
+          f"{'dec frames/s':>12} | {'enc samples/s':>13} | {'max |err|':>9}")
+    print("   " + "-"*86)
+
+    codecs = [
+        ('raw', lambda b: bench_binary(records, b)),
+        ('quantized', lambda b: bench_binary(records, b, quantize=True)),
+        ('delta', lambda b: bench_binary(records, b, delta=True)),
+        ('json', lambda b: bench_json(df, b)),
+        ('csv', lambda b: bench_csv(df, b)),
+    ]
+    for batch in args.batch:
+        for name, run in codecs:
+            frames, enc_s, dec_s, error = run(batch)
+            size = sum(len(f) for f in frames) / len(records)
+            print(f"   {name:<10} | {batch:>5} | {size:>8.1f} | {len(frames) / enc_s:>12,.0f} | "
+                  f"{len(frames) / dec_s:>12,.0f} | {len(records) / enc_s:>13,.0f} | {error:>9.2e}")
+        print("   " + "-"*86)
+
+    print("\n" + "="*92 + "\n")
+
+
+if __name__ == '__main__':
+    main()
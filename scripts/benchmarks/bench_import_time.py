@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CLI start-up time and import-time budget
+
+Starts every entry point in a fresh interpreter and measures:
+  • wall time of `script --help` for each argparse CLI, of importing
+    each positional-argument entry point (they have no --help; the
+    import runs all their start-up code except main()) and of
+    `import <module>` for the scripts/utils libraries (best of --repeat)
+  • the heaviest top-level imports of each target, parsed from
+    `python -X importtime` (cumulative µs per module)
+
+Targets slower than --budget seconds fail the run (exit status 1), so
+the budget is enforced wherever this benchmark runs. Heavy modules are
+bound with utils/lazy_import.py and only load on first use.
+
+Uso:
+  python scripts/benchmarks/bench_import_time.py
+  python scripts/benchmarks/bench_import_time.py --budget 0.5 --repeat 5 --top 3
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS_DIR = PROJECT_ROOT / "scripts"
+UTILS_DIR = SCRIPTS_DIR / "utils"
+
+HELP_BUDGET_S = 0.5
+
+# CLIs that take --help (argparse), relative to the project root
+CLI_TARGETS = [
+    'bin/run_all.py',
+    'scripts/analysis/visualize_results_v4_advanced.py',
+    'scripts/generators/generate_case_study_data_v4.py',
+    'scripts/utils/channel_store.py',
+    'scripts/utils/csv_ingest.py',
+    'scripts/utils/mqtt_latency_harness.py',
+    'scripts/utils/telemetry_warehouse.py',
+    'scripts/utils/time_alignment.py',
+    'scripts/benchmarks/bench_csv_ingest.py',
+    'scripts/benchmarks/bench_decimation.py',
+    'scripts/benchmarks/bench_density_figure.py',
+    'scripts/benchmarks/bench_frame_codec.py',
+    'scripts/benchmarks/bench_import_time.py',
+    'scripts/benchmarks/bench_kde.py',
+    'scripts/benchmarks/bench_lap_assembly.py',
+    'scripts/benchmarks/bench_motor_sweep.py',
+    'scripts/benchmarks/bench_polyphase_decimation.py',
+    'scripts/benchmarks/bench_query_index.py',
+    'scripts/benchmarks/bench_race_ratings.py',
+    'scripts/benchmarks/bench_rolling_stats.py',
+    'scripts/benchmarks/bench_skill_atoms.py',
+    'scripts/benchmarks/bench_spectral.py',
+    'scripts/benchmarks/bench_suite.py',
+    'scripts/benchmarks/bench_swiss_pairing.py',
+    'scripts/benchmarks/bench_time_alignment.py',
+    'scripts/benchmarks/bench_turn_ratings.py',
+]
+
+# Entry points that take a positional dataset path instead of argparse
+# options: `--help` would be read as a file name, so their start-up cost
+# is measured by importing them from their own directory
+SCRIPT_TARGETS = [
+    'scripts/analysis/verify_dataset_v4.py',
+    'scripts/analysis/visualize_results_v4.py',
+    'scripts/generators/generate_tables_v4.py',
+]
+
+# Small utility libraries, imported with scripts/utils on sys.path
+MODULE_TARGETS = [
+    'channel_store',
+    'csv_ingest',
+    'decimation',
+    'density_plot',
+    'fft_kde',
+    'figure_cache',
+    'lazy_import',
+    'motor_glicko_simulator',
+    'polyphase_decimation',
+    'rolling_stats',
+    'sector_timing',
+    'skill_atom_detector',
+    'spectral_analysis',
+    'stage_metrics',
+    'telemetry_codec',
+    'telemetry_query',
+    'telemetry_warehouse',
+    'time_alignment',
+    'turn_rating_pipeline',
+]
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)')
+
+
+def target_command(target: str, kind: str) -> List[str]:
+    if kind == 'cli':
+        return [sys.executable, str(PROJECT_ROOT / target), '--help']
+    if kind == 'script':
+        script = PROJECT_ROOT / target
+        return [sys.executable, '-c', f"import sys; sys.path.insert(0, {str(script.parent)!r}); "
+                                      f"import {script.stem}"]
+    return [sys.executable, '-c', f"import sys; sys.path.insert(0, {str(UTILS_DIR)!r}); import {target}"]
+
+
+def wall_time(command: List[str], repeat: int) -> float:
+    """Best wall time of a command over repeat runs (raises if it fails)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=PROJECT_ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def heaviest_imports(command: List[str], top: int, depth: int = 1) -> List[Tuple[str, float]]:
+    """
+    Modules imported directly by the target with the largest cumulative time (ms).
+
+    depth is the nesting level of those imports in the -X importtime tree:
+    1 for a script's own imports, 2 for the imports of an imported module.
+    """
+    env = dict(os.environ, PYTHONPROFILEIMPORTTIME='1')
+    result = subprocess.run(command, cwd=PROJECT_ROOT, env=env, text=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    cumulative: Dict[str, float] = {}
+    for match in IMPORTTIME_LINE.finditer(result.stderr):
+        _, total_us, indent, name = match.groups()
+        if len(indent) == 2 * depth - 1:
+            cumulative[name] = cumulative.get(name, 0.0) + int(total_us) / 1000
+    return sorted(cumulative.items(), key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI start-up / import-time benchmark")
+    parser.add_argument('--budget', type=float, default=HELP_BUDGET_S,
+                        help="Max seconds per target (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=3, help="Heaviest imports listed per target")
+    args = parser.parse_args()
+
+    targets = ([(t, 'cli') for t in CLI_TARGETS] + [(t, 'script') for t in SCRIPT_TARGETS]
+               + [(t, 'module') for t in MODULE_TARGETS])
+    baseline = wall_time([sys.executable, '-c', 'pass'], args.repeat)
+
+    print("\n" + "="*80)
+    print(f"⏱️  IMPORT-TIME BENCHMARK - budget {args.budget:.2f} s "
+          f"(bare interpreter {baseline * 1000:.0f} ms)")
+    print("="*80)
+    print(f"   {'target':<52} | {'wall s':>6} | heaviest imports (ms)")
+    print("   " + "-"*100)
+
+    over_budget = []
+    for target, kind in targets:
+        command = target_command(target, kind)
+        label = {'cli': f"{target} --help", 'script': f"{target} (import)"}.get(kind, f"import {target}")
+        seconds = wall_time(command, args.repeat)
+        depth = 1 if kind == 'cli' else 2
+        heavy = ', '.join(f"{name} {ms:.0f}" for name, ms in heaviest_imports(command, args.top, depth))
+        flag = '✅' if seconds <= args.budget else '❌'
+        print(f"{flag} {label:<52} | {seconds:>6.3f} | {heavy}")
+        if seconds > args.budget:
+            over_budget.append(label)
+
+    print("\n" + "="*80)
+    if over_budget:
+        print(f"❌ {len(over_budget)} target(s) over the {args.budget:.2f} s budget:")
+        for label in over_budget:
+            print(f"   • {label}")
+    else:
+        print(f"✅ All {len(targets)} targets within {args.budget:.2f} s")
+    print("="*80 + "\n")
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
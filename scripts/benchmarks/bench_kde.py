@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: binned FFT KDE vs scipy.stats.gaussian_kde
+
+Tiles a v4 channel (with small seeded noise) to 20k–10M samples and
+evaluates both estimators on the 200-point grid of figure 6. Reports
+seconds, speedup and the max |difference| relative to the peak density.
+
+Uso:
+  python scripts/benchmarks/bench_kde.py
+  python scripts/benchmarks/bench_kde.py --channel engine_efficiency_percent --bw silverman
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from fft_kde import fft_kde
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+stats = lazy_import('scipy.stats')
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "datasets"
+SEED = 1854652912
+GRID_POINTS = 200
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FFT KDE benchmark")
+    parser.add_argument('--dataset', type=Path, default=DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv")
+    parser.add_argument('--channel', default='wheel_slip_percent')
+    parser.add_argument('--bw', default='scott', choices=['scott', 'silverman'])
+    parser.add_argument('--samples', type=int, nargs='+', default=[20_000, 1_000_000, 10_000_000])
+    parser.add_argument('--exact-max', type=int, default=1_000_000,
+                        help="Largest size also evaluated with gaussian_kde")
+    args = parser.parse_args()
+
+    channel = pd.read_csv(args.dataset, usecols=[args.channel])[args.channel].to_numpy()
+    rng = np.random.default_rng(SEED)
+
+    print("\n" + "="*80)
+    print(f"📈 KDE BENCHMARK - {args.channel}, {args.bw} bandwidth, {GRID_POINTS}-point grid")
+    print("="*80)
+    print(f"   {'samples':>11} | {'gaussian_kde s':>14} | {'fft_kde s':>9} | {'speedup':>8} | {'max rel err':>11}")
+    print("   " + "-"*66)
+
+    for n in args.samples:
+        data = np.resize(channel, n) + rng.normal(0, 0.01 * channel.std(), n)
+        points = np.linspace(data.min(), data.max(), GRID_POINTS)
+
+        t0 = time.perf_counter()
+        density = fft_kde(data, points, args.bw)
+        fft_s = time.perf_counter() - t0
+
+        if n <= args.exact_max:
+            t0 = time.perf_counter()
+            exact = stats.gaussian_kde(data, args.bw)(points)
+            exact_s = time.perf_counter() - t0
+            error = np.max(np.abs(density - exact)) / exact.max()
+            print(f"   {n:>11,} | {exact_s:>14.3f} | {fft_s:>9.3f} | {exact_s / fft_s:>7.0f}x | {error:>11.2e}")
+        else:
+            print(f"   {n:>11,} | {'-':>14} | {fft_s:>9.3f} | {'-':>8} | {'-':>11}")
+
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
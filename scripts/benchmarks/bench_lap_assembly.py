@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark: preallocated lap assembly vs dict → DataFrame → concat
+
+Builds the v4 dataset (alternating setups, glicko2_* channels included)
+at several sizes and measures the tracemalloc peak and wall time of:
+  • legacy: one dict of arrays per lap, a DataFrame per lap, pd.concat
+    and add_rating_channels' copy (the former generate_dataset path)
+  • buffer: one LapBuffer filled in place, zero-copy frame(), ratings
+    written into their columns
+  • chunked: iter_lap_chunks, one buffer per chunk (lap channels only)
+
+Peaks are also given relative to the final dataset size (its bytes in
+memory). Both grow linearly with the sample count, so the last line
+scales the largest measured size to 20M samples when 20M was not run.
+
+Uso:
+  python scripts/benchmarks/bench_lap_assembly.py
+  python scripts/benchmarks/bench_lap_assembly.py --samples 20000 2000000 20000000 --laps-per-chunk 100
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import argparse
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "generators"))
+
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+
+SEED = 1854652912
+TARGET_SAMPLES = 20_000_000
+MB = 1024 * 1024
+
+
+def legacy_assembly(n_laps: int, v4) -> pd.DataFrame:
+    from turn_rating_pipeline import add_rating_channels
+    frames = []
+    for lap_idx in range(n_laps):
+        setup = v4.SETUPS[lap_idx % len(v4.SETUPS)]
+        lap = {name: values.copy() for name, values in v4.generate_lap_v4(setup, lap_idx).items()}
+        df = pd.DataFrame(lap)
+        df['lap'] = lap_idx
+        df['setup'] = setup
+        frames.append(df)
+    df_complete = pd.concat(frames, ignore_index=True)
+    del frames
+    return add_rating_channels(df_complete)[0]
+
+
+def buffer_assembly(n_laps: int, v4) -> pd.DataFrame:
+    from turn_rating_pipeline import rating_channels, run_turn_ratings
+    buffer = v4.LapBuffer(n_laps).fill()
+    df = buffer.frame()
+    buffer.set_ratings(rating_channels(df, run_turn_ratings(df)))
+    return df
+
+
+def chunked_assembly(n_laps: int, v4, laps_per_chunk: int) -> int:
+    rows = 0
+    for chunk in v4.iter_lap_chunks(n_laps, laps_per_chunk):
+        rows += len(chunk)
+        del chunk  # released before the next chunk's buffer is allocated
+    return rows
+
+
+def measure(build) -> tuple:
+    """(seconds, tracemalloc peak in bytes, result) of build()."""
+    gc.collect()
+    np.random.seed(SEED)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lap assembly peak-memory benchmark")
+    parser.add_argument('--samples', type=int, nargs='+', default=[20_000, 200_000, 2_000_000])
+    parser.add_argument('--laps-per-chunk', type=int, default=100)
+    parser.add_argument('--skip-legacy', action='store_true', help="Only the preallocated paths")
+    args = parser.parse_args()
+
+    import generate_case_study_data_v4 as v4
+    warnings.simplefilter('ignore')
+
+    print("\n" + "="*80)
+    print(f"🧱 LAP ASSEMBLY BENCHMARK - tracemalloc peak, chunks of {args.laps_per_chunk} laps")
+    print("="*80)
+    print(f"   {'samples':>11} | {'dataset MB':>10} | {'path':<8} | {'peak MB':>9} | "
+          f"{'x dataset':>9} | {'seconds':>8}")
+    print("   " + "-"*72)
+
+    last = None
+    for samples in args.samples:
+        n_laps = max(1, samples // v4.SAMPLES_EXPANDED)
+        paths = [] if args.skip_legacy else [('legacy', lambda: legacy_assembly(n_laps, v4))]
+        paths += [('buffer', lambda: buffer_assembly(n_laps, v4)),
+                  ('chunked', lambda: chunked_assembly(n_laps, v4, args.laps_per_chunk))]
+        size = None
+        peaks = {}
+        for name, build in paths:
+            seconds, peak, result = measure(build)
+            if isinstance(result, pd.DataFrame):
+                size = result.memory_usage(deep=False).sum()
+            del result
+            peaks[name] = peak
+            ratio = f"{peak / size:>9.2f}" if size else f"{'-':>9}"
+            print(f"   {n_laps * v4.SAMPLES_EXPANDED:>11,} | {(size or 0) / MB:>10.1f} | {name:<8} | "
+                  f"{peak / MB:>9.1f} | {ratio} | {seconds:>8.2f}")
+        if 'legacy' in peaks:
+            print(f"   {'':>11} | {'':>10} | reduction: buffer {peaks['legacy'] / peaks['buffer']:.1f}x, "
+                  f"chunked {peaks['legacy'] / peaks['chunked']:.1f}x")
+        last = (n_laps * v4.SAMPLES_EXPANDED, peaks)
+
+    samples, peaks = last
+    if samples < TARGET_SAMPLES:
+        scale = TARGET_SAMPLES / samples
+        chunk_peak = peaks['chunked'] / MB
+        print(f"\n   20M samples (scaled linearly from {samples:,}): " + ", ".join(
+            f"{name} ≈ {peak * scale / MB / 1024:.1f} GB" for name, peak in peaks.items() if name != 'chunked')
+            + f", chunked ≈ {chunk_peak:.0f} MB (constant)")
+
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: motor acceleration sweep, scalar loop vs array/batch paths
+
+Measures the wall time of simulating hundreds of motor specs with the
+per-step simulate_acceleration loop, the per-motor array path and the
+single batch call, and checks the array results against calculate_torque.
+
+Uso:
+  python scripts/benchmarks/bench_motor_sweep.py
+  python scripts/benchmarks/bench_motor_sweep.py --motors 1000 --time-step 0.001
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from motor_glicko_simulator import MotorPhysicsSimulator, simulate_acceleration_batch
+
+SEED = 1854652912
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Motor spec sweep benchmark")
+    parser.add_argument('--motors', type=int, default=500)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--time-step', type=float, default=0.01)
+    parser.add_argument('--loop-motors', type=int, default=20,
+                        help="Motors timed with the scalar loop (extrapolated)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(SEED)
+    max_rpms = rng.uniform(4000, 18000, args.motors)
+    max_torques = rng.uniform(50, 300, args.motors)
+
+    print("\n" + "="*80)
+    print(f"🏍️  MOTOR SWEEP BENCHMARK - {args.motors} specs, dt = {args.time_step} s")
+    print("="*80)
+
+    loop_motors = min(args.loop_motors, args.motors)
+    t0 = time.perf_counter()
+    for rpm, torque in zip(max_rpms[:loop_motors], max_torques[:loop_motors]):
+        MotorPhysicsSimulator(rpm, torque).simulate_acceleration(args.duration, args.time_step)
+    loop_s = (time.perf_counter() - t0) * args.motors / loop_motors
+
+    t0 = time.perf_counter()
+    for rpm, torque in zip(max_rpms, max_torques):
+        MotorPhysicsSimulator(rpm, torque).simulate_acceleration_array(args.duration, args.time_step)
+    array_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = simulate_acceleration_batch(max_rpms, max_torques, args.duration, args.time_step)
+    batch_s = time.perf_counter() - t0
+
+    motor = MotorPhysicsSimulator(max_rpms[0], max_torques[0])
+    exact = np.array([motor.calculate_torque(r) for r in batch['rpm'][0]])
+    max_err = np.max(np.abs(exact - batch['torque'][0]))
+
+    print(f"   {'path':<22} | {'seconds':>9} | {'speedup':>8}")
+    print("   " + "-"*46)
+    for name, seconds in [('scalar loop (extrap.)', loop_s), ('array per motor', array_s),
+                          ('batch', batch_s)]:
+        print(f"   {name:<22} | {seconds:>9.3f} | {loop_s / seconds:>7.0f}x")
+    print(f"\n   Steps per motor: {batch['time'].size:,}   "
+          f"LUT max |Δtorque| vs calculate_torque: {max_err:.2e} Nm")
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one-pass polyphase cascade vs per-channel resampling
+
+Generates --laps laps of the v4 high-rate channels at --rate Hz
+(iter_high_rate_blocks, generation not timed) and produces the 100 Hz
+and 10 Hz products three ways:
+  • per channel: resample_poly on each 1-D channel, each product from
+    the raw samples (the usual loop)
+  • 2-D block: resample_poly(block, axis=0) once per product, still from
+    the raw samples
+  • cascade: DecimationCascade over the generator's chunks, all channels
+    per call, 10 Hz computed from the 100 Hz stage
+
+Reported: seconds, raw Msamples/s (samples x channels), tracemalloc peak
+of a separate run (the raw recording itself excluded) and the largest
+difference of each product from the per-channel result. The 100 Hz
+products are equal; the cascaded 10 Hz product differs slightly from a
+direct rate/10 filter (two filters instead of one).
+
+Uso:
+  python scripts/benchmarks/bench_polyphase_decimation.py
+  python scripts/benchmarks/bench_polyphase_decimation.py --rate 1000 --laps 60
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "generators"))
+
+from lazy_import import lazy_import
+
+signal = lazy_import('scipy.signal')
+
+MB = 1024 * 1024
+
+
+def per_channel(raw: np.ndarray, rate_hz: int, products) -> dict:
+    out = {}
+    for target in products:
+        out[target] = np.column_stack([signal.resample_poly(raw[:, j], 1, rate_hz // target, padtype='edge')
+                                       for j in range(raw.shape[1])])
+    return out
+
+
+def block_2d(raw: np.ndarray, rate_hz: int, products) -> dict:
+    from polyphase_decimation import decimate_block
+    return {target: decimate_block(raw, rate_hz // target) for target in products}
+
+
+def cascade(chunks, rate_hz: int, products) -> dict:
+    from polyphase_decimation import DecimationCascade
+    stream = DecimationCascade(rate_hz, products, chunks[0].shape[1])
+    parts = {target: [] for target in stream.targets}
+    for chunk in chunks:
+        for target, values in stream.process(chunk).items():
+            parts[target].append(values)
+    for target, values in stream.flush().items():
+        parts[target].append(values)
+    return {target: np.concatenate(values) for target, values in parts.items()}
+
+
+def timed(run):
+    gc.collect()
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def traced_peak(run) -> int:
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Polyphase decimation cascade benchmark")
+    parser.add_argument('--rate', type=int, default=10_000, help="Generation rate (Hz)")
+    parser.add_argument('--laps', type=int, default=6, help="10 s laps")
+    parser.add_argument('--chunk-seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    import generate_case_study_data_v4 as v4
+
+    products = v4.PRODUCT_RATES_HZ
+    chunks = list(v4.iter_high_rate_blocks(args.rate, args.laps, args.chunk_seconds))
+    raw = np.asfortranarray(np.concatenate(chunks))   # contiguous channels, as in a DataFrame
+    samples = raw.size
+
+    print("\n" + "="*80)
+    print(f"📉 POLYPHASE DECIMATION BENCHMARK - {args.rate:,} Hz → "
+          f"{' + '.join(f'{r} Hz' for r in products)}, {len(raw):,} samples x {raw.shape[1]} channels")
+    print("="*80)
+    print(f"   {'method':<28} | {'seconds':>8} | {'Msamples/s':>10} | {'peak MB':>8} | "
+          + " | ".join(f"{f'Δ {r} Hz':>9}" for r in products))
+    print("   " + "-"*80)
+
+    runs = [
+        ("per channel, per product", lambda: per_channel(raw, args.rate, products)),
+        ("2-D block, per product", lambda: block_2d(raw, args.rate, products)),
+        (f"cascade, {args.chunk_seconds:g} s chunks", lambda: cascade(chunks, args.rate, products)),
+    ]
+    reference = None
+    base_s = None
+    for name, run in runs:
+        seconds, result = timed(run)
+        reference = result if reference is None else reference
+        base_s = seconds if base_s is None else base_s
+        peak = traced_peak(run)
+        deltas = " | ".join(f"{np.abs(result[r] - reference[r]).max():>9.1e}" for r in products)
+        print(f"   {name:<28} | {seconds:>8.3f} | {samples / seconds / 1e6:>10.1f} | "
+              f"{peak / MB:>8.1f} | {deltas}   ({base_s / seconds:.1f}x)")
+
+    print(f"\n   (raw recording: {raw.nbytes / MB:.0f} MB; the cascade only needs one "
+          f"{args.chunk_seconds:g} s chunk of it at a time)")
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
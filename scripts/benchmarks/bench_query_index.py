@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: indexed telemetry queries vs boolean-mask selection
+
+Builds a v4-shaped dataset of --rows rows (laps of 10,000 samples,
+alternating setups, sorted time; setup as the str column read_csv gives)
+and times, for the same selections:
+  • mask: df[(df['setup'] == ...) & ...][channel].to_numpy() (copies)
+  • index: TelemetryIndex query → the channel as one view (single range)
+    or a list of views (one per lap range)
+
+Index build time is reported once; query times are the median of --repeat
+runs. The index target is sub-millisecond on 20M rows.
+
+Uso:
+  python scripts/benchmarks/bench_query_index.py
+  python scripts/benchmarks/bench_query_index.py --rows 20000000 --repeat 200
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+
+SEED = 1854652912
+SAMPLES_PER_LAP = 10_000
+DT = 0.001
+
+
+def build_dataset(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(SEED)
+    n_laps = max(2, rows // SAMPLES_PER_LAP)
+    rows = n_laps * SAMPLES_PER_LAP
+    lap = np.repeat(np.arange(n_laps, dtype=np.int64), SAMPLES_PER_LAP)
+    return pd.DataFrame({
+        'time': np.arange(rows) * DT,
+        'speed_kmh': rng.normal(160.0, 40.0, rows),
+        'engine_rpm': rng.normal(12000.0, 2000.0, rows),
+        'lap': lap,
+        'setup': pd.array(np.array(['baseline', 'optimized'], dtype=object)[lap % 2], dtype='str'),
+    })
+
+
+def median_time(run, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indexed query vs boolean mask benchmark")
+    parser.add_argument('--rows', type=int, default=20_000_000)
+    parser.add_argument('--repeat', type=int, default=100, help="Repeats of each indexed query")
+    parser.add_argument('--mask-repeat', type=int, default=3, help="Repeats of each masked query")
+    args = parser.parse_args()
+
+    from telemetry_query import TelemetryIndex
+    from turn_rating_pipeline import TURN_SAMPLE_WINDOWS
+
+    df = build_dataset(args.rows)
+    start = time.perf_counter()
+    index = TelemetryIndex(df)
+    build_s = time.perf_counter() - start
+
+    n_laps = len(index.run_start)
+    lap = n_laps // 2
+    t0, t1 = lap * SAMPLES_PER_LAP * DT + 1.0, lap * SAMPLES_PER_LAP * DT + 2.5
+    t5_start, t5_end = TURN_SAMPLE_WINDOWS['Turn5']
+    setup = df['setup']
+    laps = df['lap']
+    within = np.tile(np.arange(SAMPLES_PER_LAP), n_laps)
+    times = df['time']
+
+    cases = [
+        ("setup = baseline",
+         lambda: df[setup == 'baseline']['speed_kmh'].to_numpy(),
+         lambda: index.setup('baseline').views('speed_kmh')),
+        (f"setup = optimized, lap = {lap + 1}",
+         lambda: df[(setup == 'optimized') & (laps == lap + 1)]['speed_kmh'].to_numpy(),
+         lambda: index.setup('optimized').lap(lap + 1).array('speed_kmh')),
+        ("setup = baseline, Turn5 (all laps)",
+         lambda: df[(setup == 'baseline') & (within >= t5_start) & (within < t5_end)]['speed_kmh'].to_numpy(),
+         lambda: index.setup('baseline').turn('Turn5').views('speed_kmh')),
+        (f"lap = {lap}, Turn5",
+         lambda: df[(laps == lap) & (within >= t5_start) & (within < t5_end)]['speed_kmh'].to_numpy(),
+         lambda: index.lap(lap).turn('Turn5').array('speed_kmh')),
+        (f"time in [{t0:.1f}, {t1:.1f}) s",
+         lambda: df[(times >= t0) & (times < t1)]['speed_kmh'].to_numpy(),
+         lambda: index.time(t0, t1).array('speed_kmh')),
+    ]
+
+    print("\n" + "="*80)
+    print(f"🔎 QUERY INDEX BENCHMARK - {len(df):,} rows, {n_laps:,} laps, index built in {build_s:.2f} s")
+    print("="*80)
+    print(f"   {'query':<38} | {'mask ms':>9} | {'index ms':>9} | {'speedup':>9} | view")
+    print("   " + "-"*80)
+    for name, masked, indexed in cases:
+        mask_s = median_time(masked, args.mask_repeat)
+        index_s = median_time(indexed, args.repeat)
+        result = indexed()
+        view = 'yes' if isinstance(result, np.ndarray) and np.shares_memory(result, index.column('speed_kmh')) \
+            else ('views' if isinstance(result, list) else 'no')
+        print(f"   {name:<38} | {mask_s * 1000:>9.2f} | {index_s * 1000:>9.3f} | "
+              f"{mask_s / index_s:>8.0f}x | {view}")
+    print("\n   (one setup over alternating laps is one range per lap: views() returns them")
+    print("    without copying; array() would concatenate them into one copy)")
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: multi-competitor race results → single Glicko rating-period update
+
+Expands batches of race finishing orders (20+ riders each) into pairwise
+results chunk by chunk and reports races/s and peak traced memory, against
+the per-player update_rating loop over Python tuples (small sizes only).
+
+Uso:
+  python scripts/benchmarks/bench_race_ratings.py
+  python scripts/benchmarks/bench_race_ratings.py --races 1000 10000 --riders 24
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from motor_glicko_simulator import GlickoRatingSystem
+
+SEED = 1854652912
+
+
+def make_races(num_races: int, riders_per_race: int, pool: int, rng):
+    """Random finishing orders drawn from a rider pool, ordered by noisy skill."""
+    skill = rng.normal(1500, 200, pool)
+    entrants = np.argsort(rng.random((num_races, pool)), axis=1)[:, :riders_per_race]
+    performance = skill[entrants] + rng.normal(0, 150, entrants.shape)
+    return np.take_along_axis(entrants, np.argsort(-performance, axis=1), axis=1)
+
+
+def loop_update(glicko, ratings, rds, orders):
+    """Reference path: per-rider opponent tuples + scalar update_rating."""
+    opponents = {rider: [] for rider in range(len(ratings))}
+    for race in orders:
+        for i, rider in enumerate(race):
+            for j, other in enumerate(race):
+                if i != j:
+                    opponents[rider].append((ratings[other], rds[other], 1.0 if i < j else 0.0))
+    return [glicko.update_rating(ratings[r], rds[r], opponents[r]) for r in range(len(ratings))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Race results rating-period benchmark")
+    parser.add_argument('--races', type=int, nargs='+', default=[100, 1_000, 10_000])
+    parser.add_argument('--riders', type=int, default=22)
+    parser.add_argument('--pool', type=int, default=500)
+    parser.add_argument('--loop-max-races', type=int, default=1_000,
+                        help='Largest batch also timed with the tuple loop')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(SEED)
+    glicko = GlickoRatingSystem()
+    ratings = np.full(args.pool, 1500.0)
+    rds = np.full(args.pool, 350.0)
+
+    print("\n" + "="*88)
+    print(f"🏍️  RACE RESULTS BENCHMARK - {args.riders} riders/race, pool of {args.pool}")
+    print("="*88)
+    print(f"   {'races':>8} | {'pairs':>12} | {'vector s':>9} | {'races/s':>10} | "
+          f"{'peak MB':>8} | {'loop s':>8} | {'max |Δr|':>9}")
+    print("   " + "-"*84)
+
+    for num_races in args.races:
+        orders = make_races(num_races, args.riders, args.pool, rng)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        new_ratings, _ = glicko.update_from_races(ratings, rds, orders)
+        elapsed = time.perf_counter() - start
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+
+        loop_s, max_diff = float('nan'), float('nan')
+        if num_races <= args.loop_max_races:
+            start = time.perf_counter()
+            reference = np.array(loop_update(glicko, ratings, rds, orders))
+            loop_s = time.perf_counter() - start
+            max_diff = np.abs(reference[:, 0] - new_ratings).max()
+
+        pairs = num_races * args.riders * (args.riders - 1)
+        print(f"   {num_races:>8,} | {pairs:>12,} | {elapsed:>9.3f} | {num_races / elapsed:>10,.0f} | "
+              f"{peak_mb:>8.1f} | {loop_s:>8.3f} | {max_diff:>9.2e}")
+
+    print("\n" + "="*88 + "\n")
+
+
+if __name__ == '__main__':
+    main()
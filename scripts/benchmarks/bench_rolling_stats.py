@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sliding-window statistics engine vs chained pandas rolling
+
+Tiles the figure-8 channels (speed, throttle, yaw rate) of the v4 dataset
+to 1M+ samples and times, for both implementations:
+  • figure 8: median(80) → quantile(0.10/0.90, 160) on speed,
+    mean(60) + quantile(0.05/0.95, 120) on throttle,
+    median(80) + quantile(0.10/0.90, 160) on yaw rate
+  • grid: quantiles 0.1/0.5/0.9 + mean/std for windows 80/160 over all
+    three channels at once
+
+Reports seconds, speedup and the max |difference| against pandas.
+
+Uso:
+  python scripts/benchmarks/bench_rolling_stats.py
+  python scripts/benchmarks/bench_rolling_stats.py --samples 1000000 --interpolation nearest
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from lazy_import import lazy_import
+from rolling_stats import rolling_stats
+
+pd = lazy_import('pandas')
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "datasets"
+SEED = 1854652912
+CHANNELS = ['speed_kmh', 'throttle_position', 'gyro_yaw_dps']
+GRID = [(q, w) for w in (80, 160) for q in (0.1, 0.5, 0.9, 'mean', 'std')]
+
+
+def figure_8_pandas(df: pd.DataFrame, interpolation: str) -> dict:
+    speed = df['speed_kmh'].rolling(80, min_periods=1).median()
+    thr = df['throttle_position'].rolling
+    yaw = df['gyro_yaw_dps'].rolling
+    return {
+        'speed_q10': speed.rolling(160, min_periods=1).quantile(0.10, interpolation=interpolation),
+        'speed_q90': speed.rolling(160, min_periods=1).quantile(0.90, interpolation=interpolation),
+        'thr_mean': thr(60, min_periods=1).mean(),
+        'thr_q05': thr(120, min_periods=1).quantile(0.05, interpolation=interpolation),
+        'thr_q95': thr(120, min_periods=1).quantile(0.95, interpolation=interpolation),
+        'yaw_med': yaw(80, min_periods=1).median(),
+        'yaw_q10': yaw(160, min_periods=1).quantile(0.10, interpolation=interpolation),
+        'yaw_q90': yaw(160, min_periods=1).quantile(0.90, interpolation=interpolation),
+    }
+
+
+def figure_8_engine(df: pd.DataFrame, interpolation: str) -> dict:
+    speed_med = rolling_stats(df['speed_kmh'], [('median', 80)])[('median', 80)]
+    speed = rolling_stats(speed_med, [(0.10, 160), (0.90, 160)], interpolation=interpolation)
+    thr = rolling_stats(df['throttle_position'], [('mean', 60), (0.05, 120), (0.95, 120)],
+                        interpolation=interpolation)
+    yaw = rolling_stats(df['gyro_yaw_dps'], [('median', 80), (0.10, 160), (0.90, 160)],
+                        interpolation=interpolation)
+    return {
+        'speed_q10': speed[(0.10, 160)], 'speed_q90': speed[(0.90, 160)],
+        'thr_mean': thr[('mean', 60)], 'thr_q05': thr[(0.05, 120)], 'thr_q95': thr[(0.95, 120)],
+        'yaw_med': yaw[('median', 80)], 'yaw_q10': yaw[(0.10, 160)], 'yaw_q90': yaw[(0.90, 160)],
+    }
+
+
+def grid_pandas(df: pd.DataFrame, interpolation: str) -> dict:
+    out = {}
+    for stat, window in GRID:
+        rolling = df.rolling(window, min_periods=1)
+        out[(stat, window)] = (getattr(rolling, stat)() if isinstance(stat, str)
+                               else rolling.quantile(stat, interpolation=interpolation))
+    return out
+
+
+def grid_engine(df: pd.DataFrame, interpolation: str) -> dict:
+    return rolling_stats(df.to_numpy(), GRID, interpolation=interpolation)
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def max_difference(reference: dict, result: dict) -> float:
+    return max(float(np.nanmax(np.abs(np.asarray(reference[k], dtype=float) - result[k])))
+               for k in reference)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling statistics engine benchmark")
+    parser.add_argument('--dataset', type=Path, default=DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv")
+    parser.add_argument('--samples', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--interpolation', default='linear',
+                        choices=['linear', 'lower', 'higher', 'nearest', 'midpoint'])
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.dataset, usecols=CHANNELS)[CHANNELS]
+    rng = np.random.default_rng(SEED)
+
+    print("\n" + "="*80)
+    print(f"📊 ROLLING STATISTICS BENCHMARK - {', '.join(CHANNELS)} ({args.interpolation})")
+    print("="*80)
+    print(f"   {'samples':>10} | {'workload':<9} | {'pandas s':>9} | {'engine s':>9} | "
+          f"{'speedup':>7} | {'max |diff|':>10}")
+    print("   " + "-"*70)
+
+    for n in args.samples:
+        df = pd.DataFrame({c: np.resize(base[c].to_numpy(), n)
+                              + rng.normal(0, 0.01 * base[c].std(), n) for c in CHANNELS})
+        for name, reference, engine in [('figure 8', figure_8_pandas, figure_8_engine),
+                                        ('grid', grid_pandas, grid_engine)]:
+            expected, pandas_s = timed(reference, df, args.interpolation)
+            result, engine_s = timed(engine, df, args.interpolation)
+            print(f"   {n:>10,} | {name:<9} | {pandas_s:>9.3f} | {engine_s:>9.3f} | "
+                  f"{pandas_s / engine_s:>6.1f}x | {max_difference(expected, result):>10.2e}")
+        print("   " + "-"*70)
+
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
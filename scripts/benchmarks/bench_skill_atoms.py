@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized skill-atom detector over thousands of laps
+
+Replicates the v4 dataset laps with throttle and lateral-g noise and
+measures laps/s of the AS/CE detection plus IoU/F1 scoring.
+
+Uso:
+  python scripts/benchmarks/bench_skill_atoms.py
+  python scripts/benchmarks/bench_skill_atoms.py --laps 500 2000 --noise 0.03
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from lazy_import import lazy_import
+from skill_atom_detector import DATA_DIR, segment_skill_atoms, summarize_segmentation
+
+pd = lazy_import('pandas')
+
+SEED = 1854652912
+COLUMNS = ['time', 'throttle_position', 'accel_lat_g', 'gyro_yaw_dps', 'lap', 'setup']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill-atom detector benchmark")
+    parser.add_argument('--dataset', type=Path, default=DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv")
+    parser.add_argument('--laps', type=int, nargs='+', default=[200, 1000, 2000])
+    parser.add_argument('--noise', type=float, default=0.02,
+                        help="Throttle noise std (lateral g gets 2.5x)")
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.dataset, usecols=COLUMNS)
+    laps = [group for _, group in base.groupby('lap', sort=True)]
+
+    print("\n" + "="*80)
+    print("🏁 SKILL-ATOM DETECTOR BENCHMARK - laps/s and detection quality")
+    print("="*80)
+    print(f"   {'laps':>6} | {'seconds':>8} | {'laps/s':>8} | {'AS F1':>6} | {'CE F1':>6} | "
+          f"{'AS IoU':>6} | {'CE IoU':>6}")
+    print("   " + "-"*62)
+
+    for num_laps in args.laps:
+        rng = np.random.default_rng(SEED)
+        source = [laps[k % len(laps)] for k in range(num_laps)]
+        df = pd.concat(source, ignore_index=True)
+        df['lap'] = np.repeat(np.arange(num_laps), [len(s) for s in source])
+        df['throttle_position'] += rng.normal(0, args.noise, len(df))
+        df['accel_lat_g'] += rng.normal(0, 2.5 * args.noise, len(df))
+
+        t0 = time.perf_counter()
+        summary = summarize_segmentation(segment_skill_atoms(df)).set_index('skill_atom')
+        elapsed = time.perf_counter() - t0
+        print(f"   {num_laps:>6} | {elapsed:>8.3f} | {num_laps / elapsed:>8.0f} | "
+              f"{summary.loc['AS', 'f1_score']:>6.3f} | {summary.loc['CE', 'f1_score']:>6.3f} | "
+              f"{summary.loc['AS', 'mean_temporal_iou']:>6.3f} | {summary.loc['CE', 'mean_temporal_iou']:>6.3f}")
+        del df
+
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
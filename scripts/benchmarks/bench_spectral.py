@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batched spectral analysis vs per-channel scipy.signal loops
+
+Builds the v4 dataset with --laps laps (LapBuffer, setups alternating)
+and computes the turn Welch PSDs and lap spectrograms of the 12 spectral
+channels (travel, damper velocity, IMU) three ways:
+  • loop: scipy.signal.welch / spectrogram per (lap, turn, channel) and
+    (lap, channel), the usual nested loops
+  • batched: spectral_analysis(), one stacked FFT per turn and per batch
+    of laps
+  • cached: cached_spectral_analysis() hit (FigureCache in a temporary
+    directory, keyed by the frame fingerprint)
+
+The loop's mean PSDs are compared with the batched ones (max relative
+difference).
+
+Uso:
+  python scripts/benchmarks/bench_spectral.py
+  python scripts/benchmarks/bench_spectral.py --laps 400
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+import tempfile
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "generators"))
+
+from lazy_import import lazy_import
+
+signal = lazy_import('scipy.signal')
+
+SEED = 1854652912
+
+
+def loop_analysis(df, channels, turn_windows, fs, turn_nperseg, lap_nperseg):
+    """Mean turn PSD (setup, turn, freq, channel) with one scipy call per lap, turn and channel."""
+    from spectral_analysis import DAMPER_CHANNELS, TRAVEL_CHANNELS
+
+    def window(lap, name, rows):
+        if name in DAMPER_CHANNELS:          # derivative within the window, as the batched path
+            return np.gradient(lap[TRAVEL_CHANNELS[DAMPER_CHANNELS.index(name)]].to_numpy()[rows]) * fs
+        return lap[name].to_numpy()[rows]
+
+    setups = list(dict.fromkeys(df['setup']))
+    turns = list(turn_windows)
+    sums, counts = {}, {}
+    for (setup, _), lap in df.groupby(['setup', 'lap'], sort=False):
+        counts[setup] = counts.get(setup, 0) + 1
+        for name in channels:
+            for turn in turns:
+                start, end = turn_windows[turn]
+                _, psd = signal.welch(window(lap, name, slice(start, end)), fs, window='hann',
+                                      nperseg=min(turn_nperseg, end - start))
+                sums[(setup, turn, name)] = sums.get((setup, turn, name), 0) + psd
+            signal.spectrogram(window(lap, name, slice(None)), fs, window='hann',
+                               nperseg=lap_nperseg, noverlap=lap_nperseg // 2)
+    return np.array([[np.column_stack([sums[(s, t, c)] for c in channels]) / counts[s] for t in turns]
+                     for s in setups])
+
+
+def timed(run):
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched spectral analysis benchmark")
+    parser.add_argument('--laps', type=int, default=200, help="Laps of 10,000 samples")
+    args = parser.parse_args()
+
+    import generate_case_study_data_v4 as v4
+    from figure_cache import FigureCache, frame_fingerprint
+    from spectral_analysis import (LAP_NPERSEG, TURN_NPERSEG, cached_spectral_analysis,
+                                   sample_rate, spectral_analysis, spectral_channels)
+    from telemetry_query import TelemetryIndex
+    from turn_rating_pipeline import TURN_SAMPLE_WINDOWS
+
+    np.random.seed(SEED)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df = v4.LapBuffer(args.laps).fill().frame(ratings=False)
+    index = TelemetryIndex(df)
+    channels = spectral_channels(index)
+    fs = sample_rate(index)
+
+    print("\n" + "="*80)
+    print(f"🎛️  SPECTRAL BENCHMARK - {len(df):,} rows, {args.laps} laps, {len(channels)} channels, "
+          f"{len(TURN_SAMPLE_WINDOWS)} turns")
+    print("="*80)
+    print(f"   {'method':<36} | {'seconds':>8} | {'speedup':>8} | {'max rel. diff':>13}")
+    print("   " + "-"*80)
+
+    loop_s, loop_psd = timed(lambda: loop_analysis(df, channels, TURN_SAMPLE_WINDOWS, fs,
+                                                   TURN_NPERSEG, LAP_NPERSEG))
+    print(f"   {'loop (scipy per lap/turn/channel)':<36} | {loop_s:>8.3f} | {'1x':>8} | {'-':>13}")
+
+    batch_s, payload = timed(lambda: spectral_analysis(index))
+    diff = np.max(np.abs(payload['psd'] - loop_psd) / np.maximum(np.abs(loop_psd), 1e-300))
+    print(f"   {'batched (stacked FFT)':<36} | {batch_s:>8.3f} | {loop_s / batch_s:>7.0f}x | {diff:>13.1e}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FigureCache(Path(tmp))
+        fingerprint_s, fingerprint = timed(lambda: frame_fingerprint(df))
+        cached_spectral_analysis(cache, fingerprint, lambda: (index,))
+        hit_s, _ = timed(lambda: cached_spectral_analysis(cache, fingerprint, lambda: (index,)))
+        print(f"   {'cached (hit, + frame fingerprint)':<36} | {hit_s + fingerprint_s:>8.3f} | "
+              f"{loop_s / (hit_s + fingerprint_s):>7.0f}x | {'0':>13}")
+
+    print("\n   (file and store sources fingerprint in O(1): only the cache read remains)")
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
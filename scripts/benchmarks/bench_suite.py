@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite: every pipeline hot path at three scales
+
+Times, with a fixed seed, each stage of the pipeline on the same inputs:
+  • generators: generate_circuit_profile, generate_lap_v4 and the v1
+    per-sample simulator (generate_lap), called once per lap of samples
+  • tables: generate_tables_v4.generate_tables (nothing written)
+  • figures: every create_figure_N of visualize_results_v4 (5-8) and of
+    visualize_results_v4_advanced (5-12, payload cache disabled), saved
+    as PDF to a temporary directory
+  • I/O: CSV write/read (pandas) and MDF4 write/read (asammdf)
+  • Glicko: GlickoRatingSystem.update_rating (one call per player) and
+    simulate_matches
+  • start-up: the bench_import_time.py budget (--help and utility
+    imports); a target over budget fails the run
+
+Scales (rows of the v4 dataset, tiled from one generated dataset, or
+Glicko players):
+  small   20k samples  / 10 players
+  medium  2M samples   / 10k players
+  large   20M samples  / 1M players (tens of GB of RAM, hours of CPU)
+
+Results go to a JSON file (best of --repeat, per-run seconds, rate,
+environment and git commit). `compare` matches two result files by
+case and scale and exits 1 if any case got slower than the threshold.
+
+Uso:
+  python scripts/benchmarks/bench_suite.py run --scale small
+  python scripts/benchmarks/bench_suite.py run --scale small medium --cases csv mdf4 --out base.json
+  python scripts/benchmarks/bench_suite.py compare base.json outputs/benchmarks/<run>.json --threshold 0.10
+"""
+
+import gc
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tempfile
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+for _folder in ('utils', 'generators', 'analysis', 'benchmarks'):
+    sys.path.insert(0, str(PROJECT_ROOT / "scripts" / _folder))
+
+from bench_import_time import HELP_BUDGET_S
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+matplotlib = lazy_import('matplotlib')
+plt = lazy_import('matplotlib.pyplot')
+
+SEED = 1854652912
+RESULTS_DIR = PROJECT_ROOT / "outputs" / "benchmarks"
+DEFAULT_THRESHOLD = 0.10
+
+SCALES = {
+    'small': (20_000, 10),
+    'medium': (2_000_000, 10_000),
+    'large': (20_000_000, 1_000_000),
+}
+
+GLICKO_ROUNDS = 5
+
+
+# ========================
+# INPUTS
+# ========================
+class Workload:
+    """Inputs of one scale, built on first use and shared by every case."""
+
+    def __init__(self, samples: int, players: int, workdir: Path):
+        self.samples = samples
+        self.players = players
+        self.workdir = workdir
+        self._dataset = None
+        self._paths: Dict[str, Path] = {}
+
+    @property
+    def dataset(self) -> 'pd.DataFrame':
+        """v4 dataset tiled to `samples` rows (setups kept in equal halves)."""
+        if self._dataset is None:
+            from generate_case_study_data_v4 import generate_dataset
+            df, _ = generate_dataset(seed=SEED)
+            halves = []
+            for setup in ('baseline', 'optimized'):
+                part = df[df['setup'] == setup]
+                rows = self.samples // 2
+                reps = -(-rows // len(part))
+                halves.append(pd.concat([part] * reps, ignore_index=True).iloc[:rows])
+            self._dataset = pd.concat(halves, ignore_index=True)
+        return self._dataset
+
+    def path(self, kind: str) -> Path:
+        """File of the dataset in `kind` format ('csv' or 'mf4'), written once."""
+        if kind not in self._paths:
+            path = self.workdir / f"dataset.{kind}"
+            (write_csv if kind == 'csv' else write_mdf4)(self.dataset, path)
+            self._paths[kind] = path
+        return self._paths[kind]
+
+
+def laps(samples: int, per_lap: int) -> int:
+    return max(1, samples // per_lap)
+
+
+def write_csv(df: 'pd.DataFrame', path: Path) -> None:
+    df.to_csv(path, index=False)
+
+
+def write_mdf4(df: 'pd.DataFrame', path: Path) -> None:
+    """Every numeric column as an MDF 4.10 signal on a sample-index time base."""
+    from asammdf import MDF, Signal
+
+    numeric = df.select_dtypes('number')
+    timestamps = np.arange(len(df), dtype=np.float64) / 100.0
+    mdf = MDF(version='4.10')
+    mdf.append([Signal(samples=numeric[col].to_numpy(), timestamps=timestamps, name=col)
+                for col in numeric.columns])
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        mdf.save(path, overwrite=True)
+    mdf.close()
+
+
+def read_mdf4(path: Path) -> int:
+    from asammdf import MDF
+
+    with MDF(path) as mdf:
+        return sum(len(mdf.get(name).samples) for name in mdf.channels_db
+                   if not name.startswith('time') and name != 't')
+
+
+# ========================
+# CASES
+# ========================
+# Each case builds its inputs untimed and returns the callable that is timed,
+# plus the number of units it processes.
+Prepared = Tuple[Callable[[], object], int, str]
+
+
+def case_circuit_profile(w: Workload) -> Prepared:
+    import generate_case_study_data_v4 as v4
+    count = laps(w.samples, v4.SAMPLES_EXPANDED)
+    return lambda: [v4.generate_circuit_profile(('baseline', 'optimized')[i % 2]) for i in range(count)], \
+        count * v4.SAMPLES_EXPANDED, 'samples'
+
+
+def case_lap_v4(w: Workload) -> Prepared:
+    import generate_case_study_data_v4 as v4
+    count = laps(w.samples, v4.SAMPLES_EXPANDED)
+    return lambda: [v4.generate_lap_v4(('baseline', 'optimized')[i % 2], i % 2) for i in range(count)], \
+        count * v4.SAMPLES_EXPANDED, 'samples'
+
+
+def case_lap_v1(w: Workload) -> Prepared:
+    import generate_case_study_data as v1
+    count = laps(w.samples, len(v1.t))
+    return lambda: [v1.generate_lap(('BASELINE', 'OPTIMIZED')[i % 2], i + 1) for i in range(count)], \
+        count * len(v1.t), 'samples'
+
+
+def case_tables(w: Workload) -> Prepared:
+    from generate_tables_v4 import generate_tables
+    df = w.dataset
+    return lambda: generate_tables(df, out_dir=None, verbose=False), len(df), 'samples'
+
+
+def _save(fig, path: Path) -> None:
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def figure_v4_case(create) -> Callable[[Workload], Prepared]:
+    def case(w: Workload) -> Prepared:
+        import visualize_results_v4 as viz
+        df_b, df_o = viz.split_setups(w.dataset)
+        path = w.workdir / f"{create.__name__}_v4.pdf"
+
+        def run():
+            with plt.rc_context(viz.RC_PARAMS), warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                _save(create(df_b, df_o), path)
+        return run, w.samples, 'samples'
+    return case
+
+
+def figure_advanced_case(create) -> Callable[[Workload], Prepared]:
+    def case(w: Workload) -> Prepared:
+        from figure_cache import FigureCache
+        from visualize_results_v4_advanced import RC_PARAMS, TelemetrySource
+        df = w.dataset
+        cache = FigureCache(w.workdir / "cache", enabled=False)
+        path = w.workdir / f"{create.__name__}_advanced.pdf"
+
+        def run():
+            # A fresh source per run, so the frame split and fingerprint are timed too
+            with plt.rc_context(RC_PARAMS), warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                _save(create(TelemetrySource.from_frame(df), cache), path)
+        return run, w.samples, 'samples'
+    return case
+
+
+def case_csv_write(w: Workload) -> Prepared:
+    df = w.dataset
+    path = w.workdir / "write.csv"
+    return lambda: write_csv(df, path), len(df), 'samples'
+
+
+def case_csv_read(w: Workload) -> Prepared:
+    path = w.path('csv')
+    return lambda: pd.read_csv(path), w.samples, 'samples'
+
+
+def case_mdf4_write(w: Workload) -> Prepared:
+    df = w.dataset
+    path = w.workdir / "write.mf4"
+    return lambda: write_mdf4(df, path), len(df), 'samples'
+
+
+def case_mdf4_read(w: Workload) -> Prepared:
+    path = w.path('mf4')
+    return lambda: read_mdf4(path), w.samples, 'samples'
+
+
+def case_glicko_update(w: Workload) -> Prepared:
+    from motor_glicko_simulator import GlickoRatingSystem
+    system = GlickoRatingSystem()
+    rng = np.random.RandomState(SEED)
+    ratings = (1500 + 200 * rng.randn(w.players)).tolist()
+    rds = rng.uniform(50, 350, w.players).tolist()
+    opponents = [[(1500 + 200 * rng.randn(), rng.uniform(50, 350), rng.choice([0.0, 0.5, 1.0]))]
+                 for _ in range(w.players)]
+
+    def run():
+        for rating, rd, opps in zip(ratings, rds, opponents):
+            system.update_rating(rating, rd, opps)
+    return run, w.players, 'players'
+
+
+def case_glicko_matches(w: Workload) -> Prepared:
+    from motor_glicko_simulator import GlickoRatingSystem
+    system = GlickoRatingSystem()
+    return lambda: system.simulate_matches(num_players=w.players, num_rounds=GLICKO_ROUNDS), \
+        w.players, 'players'
+
+
+def build_cases() -> Dict[str, Callable[[Workload], Prepared]]:
+    """Case name → preparer, in pipeline order."""
+    import visualize_results_v4 as viz
+    import visualize_results_v4_advanced as adv
+
+    cases = {
+        'circuit_profile': case_circuit_profile,
+        'lap_v4': case_lap_v4,
+        'lap_v1': case_lap_v1,
+        'tables': case_tables,
+    }
+    for _, stem, create in viz.FIGURES:
+        cases[f"figure_v4_{stem.split('_')[1]}"] = figure_v4_case(create)
+    for number, _, create in adv.FIGURES:
+        cases[f"figure_advanced_{number}"] = figure_advanced_case(create)
+    cases.update({
+        'csv_write': case_csv_write,
+        'csv_read': case_csv_read,
+        'mdf4_write': case_mdf4_write,
+        'mdf4_read': case_mdf4_read,
+        'glicko_update_rating': case_glicko_update,
+        'glicko_simulate_matches': case_glicko_matches,
+    })
+    return cases
+
+
+# ========================
+# RUN
+# ========================
+def time_case(prepare: Callable[[Workload], Prepared], workload: Workload, repeat: int) -> dict:
+    """Best-of-repeat seconds of one case; np.random is reseeded before each run."""
+    np.random.seed(SEED)
+    run, units, unit = prepare(workload)
+    runs = []
+    for _ in range(repeat):
+        np.random.seed(SEED)
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        runs.append(time.perf_counter() - start)
+    best = min(runs)
+    return {'units': units, 'unit': unit, 'seconds': best, 'runs': runs,
+            'rate': units / best if best > 0 else float('inf')}
+
+
+def startup_results(budget: float, repeat: int) -> List[dict]:
+    """Start-up time of every bench_import_time.py target, checked against budget."""
+    import bench_import_time as bit
+
+    results = []
+    for target, kind in [(t, 'cli') for t in bit.CLI_TARGETS] + [(t, 'module') for t in bit.MODULE_TARGETS]:
+        seconds = bit.wall_time(bit.target_command(target, kind), repeat)
+        results.append({'case': f"startup:{target}", 'scale': 'startup', 'units': 1, 'unit': 'run',
+                        'seconds': seconds, 'runs': [seconds], 'rate': 1 / seconds,
+                        'budget': budget, 'ok': seconds <= budget})
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, text=True,
+                              capture_output=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    import asammdf
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'seed': SEED,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+        'asammdf': asammdf.__version__,
+    }
+
+
+def cmd_run(args) -> int:
+    matplotlib.use('Agg')
+    cases = build_cases()
+    selected = [name for name in cases
+                if not args.cases or any(name.startswith(prefix) for prefix in args.cases)]
+    if args.cases and not selected:
+        print(f"❌ No case matches {args.cases}; available: {', '.join(cases)}")
+        return 2
+
+    print("\n" + "="*80)
+    print(f"🏁 BENCHMARK SUITE - scales {', '.join(args.scale)}, "
+          f"{len(selected)} cases, best of {args.repeat}, seed {SEED}")
+    print("="*80)
+
+    results = []
+    for scale in args.scale:
+        samples, players = SCALES[scale]
+        print(f"\n📊 {scale}: {samples:,} samples / {players:,} players")
+        print(f"   {'case':<28} | {'units':>10} | {'best s':>9} | {'rate /s':>12}")
+        print("   " + "-"*70)
+        with tempfile.TemporaryDirectory(prefix='bench_suite_') as tmp:
+            workload = Workload(samples, players, Path(tmp))
+            for name in selected:
+                record = {'case': name, 'scale': scale, **time_case(cases[name], workload, args.repeat)}
+                results.append(record)
+                print(f"   {name:<28} | {record['units']:>10,} | {record['seconds']:>9.3f} | "
+                      f"{record['rate']:>12,.0f}")
+            del workload
+            gc.collect()
+
+    over_budget = []
+    if not args.skip_startup:
+        print(f"\n⏱️  start-up budget {args.budget:.2f} s")
+        startup = startup_results(args.budget, args.repeat)
+        results.extend(startup)
+        over_budget = [r['case'] for r in startup if not r['ok']]
+        slowest = max(startup, key=lambda r: r['seconds'])
+        print(f"   {len(startup)} targets, slowest {slowest['case']} {slowest['seconds']:.3f} s")
+        for case in over_budget:
+            print(f"   ❌ {case} over budget")
+
+    out = args.out or RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as handle:
+        json.dump({'environment': environment(), 'repeat': args.repeat, 'results': results}, handle, indent=2)
+
+    print("\n" + "="*80)
+    print(f"💾 Results: {out}")
+    print("="*80 + "\n")
+    return 1 if over_budget else 0
+
+
+# ========================
+# COMPARE
+# ========================
+def load_results(path: Path) -> Dict[Tuple[str, str], dict]:
+    with open(path, encoding='utf-8') as handle:
+        return {(r['case'], r['scale']): r for r in json.load(handle)['results']}
+
+
+def compare(baseline: Dict[Tuple[str, str], dict], current: Dict[Tuple[str, str], dict],
+            threshold: float) -> List[dict]:
+    """Cases present in both runs with their time ratio and regression flag."""
+    rows = []
+    for key in baseline.keys() & current.keys():
+        before, after = baseline[key]['seconds'], current[key]['seconds']
+        ratio = after / before if before > 0 else float('inf')
+        rows.append({'case': key[0], 'scale': key[1], 'baseline': before, 'current': after,
+                     'ratio': ratio, 'regression': ratio > 1 + threshold})
+    return sorted(rows, key=lambda r: (r['scale'], r['case']))
+
+
+def cmd_compare(args) -> int:
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    rows = compare(baseline, current, args.threshold)
+
+    print("\n" + "="*80)
+    print(f"🔍 BENCHMARK COMPARISON - threshold +{args.threshold:.0%}")
+    print(f"   baseline: {args.baseline}")
+    print(f"   current:  {args.current}")
+    print("="*80)
+    print(f"   {'case':<44} | {'scale':>7} | {'base s':>9} | {'now s':>9} | {'ratio':>6}")
+    print("   " + "-"*88)
+    for row in rows:
+        flag = '❌' if row['regression'] else ('🚀' if row['ratio'] < 1 - args.threshold else '  ')
+        print(f"{flag} {row['case']:<44} | {row['scale']:>7} | {row['baseline']:>9.3f} | "
+              f"{row['current']:>9.3f} | {row['ratio']:>5.2f}x")
+
+    missing = sorted(baseline.keys() - current.keys())
+    if missing:
+        print(f"\n   ⚠️  {len(missing)} baseline case(s) not in the current run")
+
+    regressions = [row for row in rows if row['regression']]
+    print("\n" + "="*80)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) beyond +{args.threshold:.0%}")
+    else:
+        print(f"✅ No regression beyond +{args.threshold:.0%} ({len(rows)} cases compared)")
+    print("="*80 + "\n")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline benchmark suite (run / compare)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help="Time the cases and write a JSON result file")
+    run.add_argument('--scale', nargs='+', choices=list(SCALES), default=['small'])
+    run.add_argument('--cases', nargs='+', help="Only cases whose name starts with one of these")
+    run.add_argument('--repeat', type=int, default=3)
+    run.add_argument('--out', type=Path, help="Result file (default: outputs/benchmarks/bench_<time>.json)")
+    run.add_argument('--budget', type=float, default=HELP_BUDGET_S, help="Start-up budget in seconds")
+    run.add_argument('--skip-startup', action='store_true', help="Do not run the start-up budget check")
+    run.set_defaults(func=cmd_run)
+
+    cmp_parser = sub.add_parser('compare', help="Flag cases slower than the baseline by > threshold")
+    cmp_parser.add_argument('baseline', type=Path)
+    cmp_parser.add_argument('current', type=Path)
+    cmp_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help="Allowed slowdown as a fraction (default: %(default)s)")
+    cmp_parser.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Swiss pairing vs random pairing in large Glicko simulations
+
+Measures, for 10k-1M players:
+  • Rating convergence (RMSE vs hidden true skill) per simulated match
+  • Wall time per round for pairing and for the vectorized rating update
+
+Uso:
+  python scripts/benchmarks/bench_swiss_pairing.py
+  python scripts/benchmarks/bench_swiss_pairing.py --players 10000 100000 --rounds 10
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from motor_glicko_simulator import GlickoRatingSystem
+
+SEED = 1854652912
+
+
+def run(num_players: int, num_rounds: int, pairing: str):
+    """Run one simulation and return its per-round history."""
+    rng = np.random.default_rng(SEED)
+    true_ratings = rng.normal(1500, 300, num_players)
+    glicko = GlickoRatingSystem(initial_rating=1500, initial_rd=350)
+    return glicko.simulate_rating_rounds(true_ratings, num_rounds=num_rounds,
+                                         pairing=pairing, seed=SEED)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Swiss pairing scheduler benchmark")
+    parser.add_argument('--players', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--rounds', type=int, default=12)
+    args = parser.parse_args()
+
+    print("\n" + "="*96)
+    print("🏁 SWISS PAIRING BENCHMARK - convergence per match & wall time per round")
+    print("="*96)
+
+    for num_players in args.players:
+        print(f"\n   Players: {num_players:,}   Rounds: {args.rounds}")
+        print(f"   {'pairing':<8} | {'round':>5} | {'matches/player':>14} | {'RMSE':>8} | "
+              f"{'|Δtrue| pair':>12} | {'rematch':>7} | {'pair ms':>8} | {'update ms':>9}")
+        print("   " + "-"*92)
+        for pairing in ('random', 'swiss'):
+            history = run(num_players, args.rounds, pairing)
+            for row in history:
+                print(f"   {pairing:<8} | {row['round']:>5} | "
+                      f"{row['matches'] * 2 / num_players:>14.1f} | {row['rmse']:>8.1f} | "
+                      f"{row['mean_abs_rating_gap']:>12.1f} | {row['rematches']:>7} | "
+                      f"{row['pairing_seconds'] * 1e3:>8.1f} | {row['update_seconds'] * 1e3:>9.1f}")
+            mean_pair = np.mean([r['pairing_seconds'] for r in history]) * 1e3
+            print(f"   {pairing:<8} | final RMSE {history[-1]['rmse']:.1f} | "
+                  f"mean pairing {mean_pair:.1f} ms/round")
+            print("   " + "-"*92)
+
+    print("\n" + "="*96 + "\n")
+
+
+if __name__ == '__main__':
+    main()
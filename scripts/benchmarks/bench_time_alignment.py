@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: multi-rate alignment onto a common grid
+
+Synthetic recording with a 100 Hz channel (timestamp jitter), 10 Hz GPS
+with dropouts and asynchronous events (~every 10 s), aligned to a
+100 Hz grid of --samples points:
+  • resample() per method vs the usual alternatives: np.interp (linear,
+    no gap handling) and pd.merge_asof (zero-order hold)
+  • iter_aligned() over all channels, one pass vs chunks: seconds and
+    tracemalloc peak (a separate run, so tracing does not slow the timed one)
+
+Uso:
+  python scripts/benchmarks/bench_time_alignment.py
+  python scripts/benchmarks/bench_time_alignment.py --samples 20000000 --chunk-samples 1000000
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+
+SEED = 1854652912
+GRID_RATE_HZ = 100
+MB = 1024 * 1024
+
+
+def build_channels(samples: int):
+    from time_alignment import TimedChannel
+
+    rng = np.random.default_rng(SEED)
+    duration = samples / GRID_RATE_HZ
+    fast_t = np.sort(np.arange(samples) / 100.0 + rng.uniform(-1e-3, 1e-3, samples))
+    gps_t = np.arange(int(duration * 10)) / 10.0
+    gps_keep = rng.random(len(gps_t)) > 0.02           # ~2% of fixes lost
+    gps_t = gps_t[gps_keep]
+    events_t = np.sort(rng.uniform(0.0, duration, max(1, int(duration / 10))))
+    return [
+        TimedChannel('engine_rpm', fast_t, 12000 + 2000 * np.sin(fast_t), 'linear', max_gap=0.05),
+        TimedChannel('gps_speed_kmh', gps_t, 160 + 40 * np.sin(gps_t / 7), 'linear', max_gap=0.25),
+        TimedChannel('glicko2_rating', events_t, 1500 + rng.normal(0, 50, len(events_t)), 'zoh'),
+    ]
+
+
+def timed(run):
+    gc.collect()
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def traced_peak(run) -> int:
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-rate alignment benchmark")
+    parser.add_argument('--samples', type=int, default=10_000_000, help="Grid points (100 Hz)")
+    parser.add_argument('--chunk-samples', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    from time_alignment import iter_aligned, resample, uniform_grid
+
+    channels = build_channels(args.samples)
+    grid = uniform_grid(0.0, (args.samples - 1) / GRID_RATE_HZ, GRID_RATE_HZ)
+    fast, gps, events = channels
+
+    print("\n" + "="*80)
+    print(f"⏱️  TIME ALIGNMENT BENCHMARK - {len(grid):,} grid points at {GRID_RATE_HZ} Hz")
+    print("="*80)
+    print(f"   {'case':<44} | {'seconds':>8} | {'Msamples/s':>10} | {'peak MB':>8}")
+    print("   " + "-"*80)
+
+    def row(name, seconds, peak=None):
+        peak_text = f"{peak / MB:>8.1f}" if peak is not None else f"{'-':>8}"
+        print(f"   {name:<44} | {seconds:>8.3f} | {len(grid) / seconds / 1e6:>10.1f} | {peak_text}")
+
+    for method in ('linear', 'nearest', 'zoh'):
+        seconds, _ = timed(lambda: resample(fast.timestamps, fast.samples, grid, method, fast.max_gap))
+        row(f"resample 100 Hz → grid, {method} + gaps", seconds)
+    seconds, _ = timed(lambda: np.interp(grid, fast.timestamps, fast.samples))
+    row("np.interp 100 Hz → grid (no gaps)", seconds)
+
+    seconds, ours = timed(lambda: resample(events.timestamps, events.samples, grid, 'zoh'))
+    row("resample events → grid, zoh", seconds)
+    left = pd.DataFrame({'time': grid})
+    right = pd.DataFrame({'time': events.timestamps, 'value': events.samples})
+    seconds, theirs = timed(lambda: pd.merge_asof(left, right, on='time')['value'].to_numpy())
+    row("pd.merge_asof events → grid", seconds)
+    assert np.array_equal(ours, theirs, equal_nan=True)
+
+    whole = lambda: list(iter_aligned(channels, grid, len(grid)))
+    chunked = lambda: sum(len(b['time']) for b in iter_aligned(channels, grid, args.chunk_samples))
+    seconds, _ = timed(whole)
+    row("iter_aligned 3 channels, one pass", seconds, traced_peak(whole))
+    seconds, _ = timed(chunked)
+    row(f"iter_aligned 3 channels, chunks of {args.chunk_samples:,}", seconds, traced_peak(chunked))
+
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
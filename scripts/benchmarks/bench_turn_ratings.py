@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: turn-as-match Glicko-2 pipeline over thousands of laps
+
+Replicates the v4 dataset laps with per-sample speed noise, so every lap
+scores differently against the reference, and measures the throughput of
+the metrics + rating sequence and of the channel alignment.
+
+Uso:
+  python scripts/benchmarks/bench_turn_ratings.py
+  python scripts/benchmarks/bench_turn_ratings.py --laps 200 1000 2000
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from lazy_import import lazy_import
+from turn_rating_pipeline import DATA_DIR, run_turn_ratings, rating_channels
+
+pd = lazy_import('pandas')
+
+SEED = 1854652912
+COLUMNS = ['time', 'speed_kmh', 'wheel_slip_percent', 'lap', 'setup']
+
+
+def replicate_laps(base: pd.DataFrame, num_laps: int, rng) -> pd.DataFrame:
+    """Alternate baseline/optimized laps from the dataset with speed noise."""
+    laps = {lap: group for lap, group in base.groupby('lap', sort=True)}
+    source = [laps[k % len(laps)] for k in range(num_laps)]
+    df = pd.concat(source, ignore_index=True)
+    df['lap'] = np.repeat(np.arange(num_laps), [len(s) for s in source])
+    df['speed_kmh'] *= 1 + rng.normal(0, 0.02, len(df))
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turn-as-match Glicko-2 benchmark")
+    parser.add_argument('--dataset', type=Path, default=DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv")
+    parser.add_argument('--laps', type=int, nargs='+', default=[100, 500, 1000])
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.dataset, usecols=COLUMNS)
+
+    print("\n" + "="*80)
+    print("🏁 TURN RATING PIPELINE BENCHMARK - laps/s")
+    print("="*80)
+    print(f"   {'laps':>6} | {'samples':>12} | {'ratings s':>9} | {'laps/s':>8} | {'channels s':>10}")
+    print("   " + "-"*60)
+
+    for num_laps in args.laps:
+        df = replicate_laps(base, num_laps, np.random.default_rng(SEED))
+        t0 = time.perf_counter()
+        turn_ratings = run_turn_ratings(df)
+        t1 = time.perf_counter()
+        rating_channels(df, turn_ratings)
+        t2 = time.perf_counter()
+        print(f"   {num_laps:>6} | {len(df):>12,} | {t1 - t0:>9.3f} | "
+              f"{num_laps / (t1 - t0):>8.0f} | {t2 - t1:>10.3f}")
+        del df
+
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
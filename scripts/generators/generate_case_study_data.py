@@ -377,217 +377,223 @@ def generate_lap(mode="BASELINE", lap_id=1):
 # GENERACIÓN Y ANÁLISIS ESTADÍSTICO
 # ============================================================================
 
-print("=" * 80)
-print("GENERADOR DE TELEMETRÍA Q1 - CASO DE ESTUDIO TURN 5 JEREZ")
-print("=" * 80)
-print(f"\nParámetros de Simulación:")
-print(f"  • Frecuencia de muestreo: {fs} Hz")
-print(f"  • Duración: {duration} s")
-print(f"  • Puntos de datos por vuelta: {len(t)}")
-print(f"  • Circuito: Jerez-Ángel Nieto (Sector 2, Curva 5)")
-print(f"  • Vehículo: MotoGP 1000cc I4 (240 HP)")
-
-# Generar vueltas
-print("\n" + "-" * 80)
-print("Generando telemetría...")
-df_baseline = generate_lap("BASELINE", lap_id=1)
-df_optimized = generate_lap("OPTIMIZED", lap_id=2)
-
-# Combinar datasets
-df_final = pd.concat([df_baseline, df_optimized], ignore_index=True)
-
-# ========== ANÁLISIS ESTADÍSTICO ==========
-print("\n" + "=" * 80)
-print("ANÁLISIS COMPARATIVO (Sección 4.4 del Paper)")
-print("=" * 80)
-
-# Filtrar ventana crítica del shift 2→3
-window_base = df_baseline[(df_baseline['Timestamp_s'] >= 1.8) & 
-                          (df_baseline['Timestamp_s'] <= 2.8)]
-window_opt = df_optimized[(df_optimized['Timestamp_s'] >= 1.8) & 
-                          (df_optimized['Timestamp_s'] <= 2.8)]
-
-print("\n[A] ANÁLISIS DE CAMBIO 2→3 (t = 2.0s ± 0.5s)")
-print("-" * 80)
-
-# RPM Drop
-rpm_pre_base = df_baseline[df_baseline['Timestamp_s'] <= 2.05]['Engine_RPM'].iloc[-1]
-rpm_post_base = df_baseline[df_baseline['Timestamp_s'] >= 2.15]['Engine_RPM'].iloc[0]
-rpm_drop_base = rpm_pre_base - rpm_post_base
-
-rpm_pre_opt = df_optimized[df_optimized['Timestamp_s'] <= 2.05]['Engine_RPM'].iloc[-1]
-rpm_post_opt = df_optimized[df_optimized['Timestamp_s'] >= 2.15]['Engine_RPM'].iloc[0]
-rpm_drop_opt = rpm_pre_opt - rpm_post_opt
-
-print(f"\n1. CAÍDA DE RPM EN SHIFT:")
-print(f"   Baseline:  {rpm_pre_base:.0f} → {rpm_post_base:.0f} rpm  (Δ = {rpm_drop_base:.0f} rpm)")
-print(f"   Optimized: {rpm_pre_opt:.0f} → {rpm_post_opt:.0f} rpm  (Δ = {rpm_drop_opt:.0f} rpm)")
-print(f"   ➜ Mejora: {((rpm_drop_base - rpm_drop_opt)/rpm_drop_base*100):.1f}% reducción")
-
-# Glicko Volatility
-sigma_base_mean = window_base['Glicko_Volatility_Sigma'].mean()
-sigma_base_std = window_base['Glicko_Volatility_Sigma'].std()
-sigma_base_max = window_base['Glicko_Volatility_Sigma'].max()
-
-sigma_opt_mean = window_opt['Glicko_Volatility_Sigma'].mean()
-sigma_opt_std = window_opt['Glicko_Volatility_Sigma'].std()
-sigma_opt_max = window_opt['Glicko_Volatility_Sigma'].max()
-
-print(f"\n2. VOLATILIDAD GLICKO (σ):")
-print(f"   Baseline:  μ={sigma_base_mean:.4f}, σ={sigma_base_std:.4f}, max={sigma_base_max:.4f}")
-print(f"   Optimized: μ={sigma_opt_mean:.4f}, σ={sigma_opt_std:.4f}, max={sigma_opt_max:.4f}")
-print(f"   ➜ Reducción de media: {((sigma_base_mean - sigma_opt_mean)/sigma_base_mean*100):.1f}%")
-print(f"   ➜ Reducción de varianza: {((sigma_base_std - sigma_opt_std)/sigma_base_std*100):.1f}%")
-
-# Throttle Control
-throttle_base_std = window_base['Throttle_Pos_%'].std()
-throttle_opt_std = window_opt['Throttle_Pos_%'].std()
-
-print(f"\n3. CONTROL DE ACELERADOR:")
-print(f"   Baseline:  σ_throttle = {throttle_base_std:.2f}%")
-print(f"   Optimized: σ_throttle = {throttle_opt_std:.2f}%")
-print(f"   ➜ Suavidad mejorada: {((throttle_base_std - throttle_opt_std)/throttle_base_std*100):.1f}%")
-
-# Wheel Slip
-slip_base_mean = window_base['Rear_Wheel_Slip_%'].mean()
-slip_opt_mean = window_opt['Rear_Wheel_Slip_%'].mean()
-
-print(f"\n4. DESLIZAMIENTO DE RUEDA TRASERA:")
-print(f"   Baseline:  {slip_base_mean:.2f}% (± {window_base['Rear_Wheel_Slip_%'].std():.2f}%)")
-print(f"   Optimized: {slip_opt_mean:.2f}% (± {window_opt['Rear_Wheel_Slip_%'].std():.2f}%)")
-
-# Aceleración
-accel_base_mean = window_base['Longitudinal_Accel_g'].mean()
-accel_opt_mean = window_opt['Longitudinal_Accel_g'].mean()
-
-print(f"\n5. ACELERACIÓN LONGITUDINAL:")
-print(f"   Baseline:  {accel_base_mean:.3f} g")
-print(f"   Optimized: {accel_opt_mean:.3f} g")
-print(f"   ➜ Ganancia: {((accel_opt_mean - accel_base_mean)/accel_base_mean*100):.1f}%")
-
-# ========== VALIDACIÓN ESTADÍSTICA ==========
-print("\n" + "=" * 80)
-print("[B] VALIDACIÓN ESTADÍSTICA (para revisores)")
-print("=" * 80)
-
-from scipy import stats
-
-# Test t de Student (diferencia de medias)
-t_stat, p_value = stats.ttest_ind(
-    window_base['Glicko_Volatility_Sigma'],
-    window_opt['Glicko_Volatility_Sigma']
-)
-
-print(f"\nTest t de Student (Volatilidad Glicko):")
-print(f"   H0: μ_baseline = μ_optimized")
-print(f"   t-statistic = {t_stat:.4f}")
-print(f"   p-value = {p_value:.2e}")
-print(f"   ➜ Resultado: {'RECHAZAMOS H0' if p_value < 0.001 else 'No rechazamos H0'}")
-print(f"              (diferencia estadísticamente significativa p<0.001)")
-
-# Cohen's d (tamaño del efecto)
-cohens_d = (sigma_base_mean - sigma_opt_mean) / np.sqrt(
-    (sigma_base_std**2 + sigma_opt_std**2) / 2
-)
-print(f"\nCohen's d (tamaño del efecto):")
-print(f"   d = {cohens_d:.3f}")
-if cohens_d > 2.0:
-    interpretation = "ENORME (d > 2.0)"
-elif cohens_d > 0.8:
-    interpretation = "GRANDE (0.8 < d < 2.0)"
-else:
-    interpretation = "MEDIO (0.5 < d < 0.8)"
-print(f"   ➜ Interpretación: {interpretation}")
-
-# Kolmogorov-Smirnov (normalidad)
-ks_stat, ks_p = stats.kstest(
-    window_opt['Glicko_Volatility_Sigma'],
-    'norm',
-    args=(sigma_opt_mean, sigma_opt_std)
-)
-print(f"\nTest de Kolmogorov-Smirnov (normalidad de datos optimizados):")
-print(f"   KS-statistic = {ks_stat:.4f}")
-print(f"   p-value = {ks_p:.4f}")
-print(f"   ➜ Distribución: {'Normal' if ks_p > 0.05 else 'No normal'}")
-
-# ========== GUARDAR DATOS ==========
-print("\n" + "=" * 80)
-print("EXPORTACIÓN DE DATOS")
-print("=" * 80)
-
-csv_filename = "NLA_CaseStudy_Turn5_Jerez_Q1.csv"
-df_final.to_csv(csv_filename, index=False, float_format='%.6f')
-print(f"\n✓ Archivo principal: {csv_filename}")
-print(f"  Columnas: {len(df_final.columns)}")
-print(f"  Filas: {len(df_final):,}")
-print(f"  Tamaño: {len(df_final) * len(df_final.columns) * 8 / 1024:.1f} KB")
-
-# Exportar tabla resumida para el paper
-summary = pd.DataFrame({
-    'Métrica': [
-        'RPM Drop (shift 2→3)',
-        'Glicko σ (mean)',
-        'Glicko σ (max)',
-        'Throttle σ',
-        'Wheel Slip μ',
-        'Long. Accel μ'
-    ],
-    'Baseline': [
-        f"{rpm_drop_base:.0f} rpm",
-        f"{sigma_base_mean:.4f}",
-        f"{sigma_base_max:.4f}",
-        f"{throttle_base_std:.2f}%",
-        f"{slip_base_mean:.2f}%",
-        f"{accel_base_mean:.3f} g"
-    ],
-    'Optimized': [
-        f"{rpm_drop_opt:.0f} rpm",
-        f"{sigma_opt_mean:.4f}",
-        f"{sigma_opt_max:.4f}",
-        f"{throttle_opt_std:.2f}%",
-        f"{slip_opt_mean:.2f}%",
-        f"{accel_opt_mean:.3f} g"
-    ],
-    'Improvement': [
-        f"{((rpm_drop_base-rpm_drop_opt)/rpm_drop_base*100):.1f}%",
-        f"{((sigma_base_mean-sigma_opt_mean)/sigma_base_mean*100):.1f}%",
-        f"{((sigma_base_max-sigma_opt_max)/sigma_base_max*100):.1f}%",
-        f"{((throttle_base_std-throttle_opt_std)/throttle_base_std*100):.1f}%",
-        f"{((slip_base_mean-slip_opt_mean)/slip_base_mean*100):.1f}%",
-        f"{((accel_opt_mean-accel_base_mean)/accel_base_mean*100):.1f}%"
-    ]
-})
-
-summary_filename = "Table3_Comparative_Metrics.csv"
-summary.to_csv(summary_filename, index=False)
-print(f"\n✓ Tabla resumen (para paper): {summary_filename}")
-
-# ========== PREVIEW PARA VALIDACIÓN ==========
-print("\n" + "=" * 80)
-print("PREVIEW: Ventana crítica del shift (t = 1.95s - 2.20s)")
-print("=" * 80)
-
-preview_cols = ['Timestamp_s', 'Setup_Type', 'Engine_RPM', 'Gear', 
-                'Throttle_Pos_%', 'Glicko_Volatility_Sigma', 'Rear_Wheel_Slip_%']
-
-print("\n[BASELINE]")
-print(df_baseline[(df_baseline['Timestamp_s'] >= 1.95) & 
-                   (df_baseline['Timestamp_s'] <= 2.20)][preview_cols].to_string(index=False))
-
-print("\n[OPTIMIZED]")
-print(df_optimized[(df_optimized['Timestamp_s'] >= 1.95) & 
-                    (df_optimized['Timestamp_s'] <= 2.20)][preview_cols].to_string(index=False))
-
-print("\n" + "=" * 80)
-print("✓ GENERACIÓN COMPLETADA - Dataset listo para publicación Q1")
-print("=" * 80)
-print(f"\nPasos siguientes para el paper:")
-print(f"  1. Importar '{csv_filename}' en tu script de visualización")
-print(f"  2. Incorporar '{summary_filename}' como Table 3 en Sección 4.4")
-print(f"  3. Referenciar p-value={p_value:.2e} en el análisis de significancia")
-print(f"  4. Citar Cohen's d={cohens_d:.3f} para justificar impacto práctico")
-print(f"\nMetadatos del experimento:")
-print(f"  • Seed aleatorio: {np.random.get_state()[1][0]}")
-print(f"  • Versión NumPy: {np.__version__}")
-print(f"  • Versión Pandas: {pd.__version__}")
-print("=" * 80)
+def main():
+    """Genera ambas vueltas, imprime el análisis comparativo y exporta los CSV."""
+    print("=" * 80)
+    print("GENERADOR DE TELEMETRÍA Q1 - CASO DE ESTUDIO TURN 5 JEREZ")
+    print("=" * 80)
+    print(f"\nParámetros de Simulación:")
+    print(f"  • Frecuencia de muestreo: {fs} Hz")
+    print(f"  • Duración: {duration} s")
+    print(f"  • Puntos de datos por vuelta: {len(t)}")
+    print(f"  • Circuito: Jerez-Ángel Nieto (Sector 2, Curva 5)")
+    print(f"  • Vehículo: MotoGP 1000cc I4 (240 HP)")
+
+    # Generar vueltas
+    print("\n" + "-" * 80)
+    print("Generando telemetría...")
+    df_baseline = generate_lap("BASELINE", lap_id=1)
+    df_optimized = generate_lap("OPTIMIZED", lap_id=2)
+
+    # Combinar datasets
+    df_final = pd.concat([df_baseline, df_optimized], ignore_index=True)
+
+    # ========== ANÁLISIS ESTADÍSTICO ==========
+    print("\n" + "=" * 80)
+    print("ANÁLISIS COMPARATIVO (Sección 4.4 del Paper)")
+    print("=" * 80)
+
+    # Filtrar ventana crítica del shift 2→3
+    window_base = df_baseline[(df_baseline['Timestamp_s'] >= 1.8) & 
+                              (df_baseline['Timestamp_s'] <= 2.8)]
+    window_opt = df_optimized[(df_optimized['Timestamp_s'] >= 1.8) & 
+                              (df_optimized['Timestamp_s'] <= 2.8)]
+
+    print("\n[A] ANÁLISIS DE CAMBIO 2→3 (t = 2.0s ± 0.5s)")
+    print("-" * 80)
+
+    # RPM Drop
+    rpm_pre_base = df_baseline[df_baseline['Timestamp_s'] <= 2.05]['Engine_RPM'].iloc[-1]
+    rpm_post_base = df_baseline[df_baseline['Timestamp_s'] >= 2.15]['Engine_RPM'].iloc[0]
+    rpm_drop_base = rpm_pre_base - rpm_post_base
+
+    rpm_pre_opt = df_optimized[df_optimized['Timestamp_s'] <= 2.05]['Engine_RPM'].iloc[-1]
+    rpm_post_opt = df_optimized[df_optimized['Timestamp_s'] >= 2.15]['Engine_RPM'].iloc[0]
+    rpm_drop_opt = rpm_pre_opt - rpm_post_opt
+
+    print(f"\n1. CAÍDA DE RPM EN SHIFT:")
+    print(f"   Baseline:  {rpm_pre_base:.0f} → {rpm_post_base:.0f} rpm  (Δ = {rpm_drop_base:.0f} rpm)")
+    print(f"   Optimized: {rpm_pre_opt:.0f} → {rpm_post_opt:.0f} rpm  (Δ = {rpm_drop_opt:.0f} rpm)")
+    print(f"   ➜ Mejora: {((rpm_drop_base - rpm_drop_opt)/rpm_drop_base*100):.1f}% reducción")
+
+    # Glicko Volatility
+    sigma_base_mean = window_base['Glicko_Volatility_Sigma'].mean()
+    sigma_base_std = window_base['Glicko_Volatility_Sigma'].std()
+    sigma_base_max = window_base['Glicko_Volatility_Sigma'].max()
+
+    sigma_opt_mean = window_opt['Glicko_Volatility_Sigma'].mean()
+    sigma_opt_std = window_opt['Glicko_Volatility_Sigma'].std()
+    sigma_opt_max = window_opt['Glicko_Volatility_Sigma'].max()
+
+    print(f"\n2. VOLATILIDAD GLICKO (σ):")
+    print(f"   Baseline:  μ={sigma_base_mean:.4f}, σ={sigma_base_std:.4f}, max={sigma_base_max:.4f}")
+    print(f"   Optimized: μ={sigma_opt_mean:.4f}, σ={sigma_opt_std:.4f}, max={sigma_opt_max:.4f}")
+    print(f"   ➜ Reducción de media: {((sigma_base_mean - sigma_opt_mean)/sigma_base_mean*100):.1f}%")
+    print(f"   ➜ Reducción de varianza: {((sigma_base_std - sigma_opt_std)/sigma_base_std*100):.1f}%")
+
+    # Throttle Control
+    throttle_base_std = window_base['Throttle_Pos_%'].std()
+    throttle_opt_std = window_opt['Throttle_Pos_%'].std()
+
+    print(f"\n3. CONTROL DE ACELERADOR:")
+    print(f"   Baseline:  σ_throttle = {throttle_base_std:.2f}%")
+    print(f"   Optimized: σ_throttle = {throttle_opt_std:.2f}%")
+    print(f"   ➜ Suavidad mejorada: {((throttle_base_std - throttle_opt_std)/throttle_base_std*100):.1f}%")
+
+    # Wheel Slip
+    slip_base_mean = window_base['Rear_Wheel_Slip_%'].mean()
+    slip_opt_mean = window_opt['Rear_Wheel_Slip_%'].mean()
+
+    print(f"\n4. DESLIZAMIENTO DE RUEDA TRASERA:")
+    print(f"   Baseline:  {slip_base_mean:.2f}% (± {window_base['Rear_Wheel_Slip_%'].std():.2f}%)")
+    print(f"   Optimized: {slip_opt_mean:.2f}% (± {window_opt['Rear_Wheel_Slip_%'].std():.2f}%)")
+
+    # Aceleración
+    accel_base_mean = window_base['Longitudinal_Accel_g'].mean()
+    accel_opt_mean = window_opt['Longitudinal_Accel_g'].mean()
+
+    print(f"\n5. ACELERACIÓN LONGITUDINAL:")
+    print(f"   Baseline:  {accel_base_mean:.3f} g")
+    print(f"   Optimized: {accel_opt_mean:.3f} g")
+    print(f"   ➜ Ganancia: {((accel_opt_mean - accel_base_mean)/accel_base_mean*100):.1f}%")
+
+    # ========== VALIDACIÓN ESTADÍSTICA ==========
+    print("\n" + "=" * 80)
+    print("[B] VALIDACIÓN ESTADÍSTICA (para revisores)")
+    print("=" * 80)
+
+    from scipy import stats
+
+    # Test t de Student (diferencia de medias)
+    t_stat, p_value = stats.ttest_ind(
+        window_base['Glicko_Volatility_Sigma'],
+        window_opt['Glicko_Volatility_Sigma']
+    )
+
+    print(f"\nTest t de Student (Volatilidad Glicko):")
+    print(f"   H0: μ_baseline = μ_optimized")
+    print(f"   t-statistic = {t_stat:.4f}")
+    print(f"   p-value = {p_value:.2e}")
+    print(f"   ➜ Resultado: {'RECHAZAMOS H0' if p_value < 0.001 else 'No rechazamos H0'}")
+    print(f"              (diferencia estadísticamente significativa p<0.001)")
+
+    # Cohen's d (tamaño del efecto)
+    cohens_d = (sigma_base_mean - sigma_opt_mean) / np.sqrt(
+        (sigma_base_std**2 + sigma_opt_std**2) / 2
+    )
+    print(f"\nCohen's d (tamaño del efecto):")
+    print(f"   d = {cohens_d:.3f}")
+    if cohens_d > 2.0:
+        interpretation = "ENORME (d > 2.0)"
+    elif cohens_d > 0.8:
+        interpretation = "GRANDE (0.8 < d < 2.0)"
+    else:
+        interpretation = "MEDIO (0.5 < d < 0.8)"
+    print(f"   ➜ Interpretación: {interpretation}")
+
+    # Kolmogorov-Smirnov (normalidad)
+    ks_stat, ks_p = stats.kstest(
+        window_opt['Glicko_Volatility_Sigma'],
+        'norm',
+        args=(sigma_opt_mean, sigma_opt_std)
+    )
+    print(f"\nTest de Kolmogorov-Smirnov (normalidad de datos optimizados):")
+    print(f"   KS-statistic = {ks_stat:.4f}")
+    print(f"   p-value = {ks_p:.4f}")
+    print(f"   ➜ Distribución: {'Normal' if ks_p > 0.05 else 'No normal'}")
+
+    # ========== GUARDAR DATOS ==========
+    print("\n" + "=" * 80)
+    print("EXPORTACIÓN DE DATOS")
+    print("=" * 80)
+
+    csv_filename = "NLA_CaseStudy_Turn5_Jerez_Q1.csv"
+    df_final.to_csv(csv_filename, index=False, float_format='%.6f')
+    print(f"\n✓ Archivo principal: {csv_filename}")
+    print(f"  Columnas: {len(df_final.columns)}")
+    print(f"  Filas: {len(df_final):,}")
+    print(f"  Tamaño: {len(df_final) * len(df_final.columns) * 8 / 1024:.1f} KB")
+
+    # Exportar tabla resumida para el paper
+    summary = pd.DataFrame({
+        'Métrica': [
+            'RPM Drop (shift 2→3)',
+            'Glicko σ (mean)',
+            'Glicko σ (max)',
+            'Throttle σ',
+            'Wheel Slip μ',
+            'Long. Accel μ'
+        ],
+        'Baseline': [
+            f"{rpm_drop_base:.0f} rpm",
+            f"{sigma_base_mean:.4f}",
+            f"{sigma_base_max:.4f}",
+            f"{throttle_base_std:.2f}%",
+            f"{slip_base_mean:.2f}%",
+            f"{accel_base_mean:.3f} g"
+        ],
+        'Optimized': [
+            f"{rpm_drop_opt:.0f} rpm",
+            f"{sigma_opt_mean:.4f}",
+            f"{sigma_opt_max:.4f}",
+            f"{throttle_opt_std:.2f}%",
+            f"{slip_opt_mean:.2f}%",
+            f"{accel_opt_mean:.3f} g"
+        ],
+        'Improvement': [
+            f"{((rpm_drop_base-rpm_drop_opt)/rpm_drop_base*100):.1f}%",
+            f"{((sigma_base_mean-sigma_opt_mean)/sigma_base_mean*100):.1f}%",
+            f"{((sigma_base_max-sigma_opt_max)/sigma_base_max*100):.1f}%",
+            f"{((throttle_base_std-throttle_opt_std)/throttle_base_std*100):.1f}%",
+            f"{((slip_base_mean-slip_opt_mean)/slip_base_mean*100):.1f}%",
+            f"{((accel_opt_mean-accel_base_mean)/accel_base_mean*100):.1f}%"
+        ]
+    })
+
+    summary_filename = "Table3_Comparative_Metrics.csv"
+    summary.to_csv(summary_filename, index=False)
+    print(f"\n✓ Tabla resumen (para paper): {summary_filename}")
+
+    # ========== PREVIEW PARA VALIDACIÓN ==========
+    print("\n" + "=" * 80)
+    print("PREVIEW: Ventana crítica del shift (t = 1.95s - 2.20s)")
+    print("=" * 80)
+
+    preview_cols = ['Timestamp_s', 'Setup_Type', 'Engine_RPM', 'Gear', 
+                    'Throttle_Pos_%', 'Glicko_Volatility_Sigma', 'Rear_Wheel_Slip_%']
+
+    print("\n[BASELINE]")
+    print(df_baseline[(df_baseline['Timestamp_s'] >= 1.95) & 
+                       (df_baseline['Timestamp_s'] <= 2.20)][preview_cols].to_string(index=False))
+
+    print("\n[OPTIMIZED]")
+    print(df_optimized[(df_optimized['Timestamp_s'] >= 1.95) & 
+                        (df_optimized['Timestamp_s'] <= 2.20)][preview_cols].to_string(index=False))
+
+    print("\n" + "=" * 80)
+    print("✓ GENERACIÓN COMPLETADA - Dataset listo para publicación Q1")
+    print("=" * 80)
+    print(f"\nPasos siguientes para el paper:")
+    print(f"  1. Importar '{csv_filename}' en tu script de visualización")
+    print(f"  2. Incorporar '{summary_filename}' como Table 3 en Sección 4.4")
+    print(f"  3. Referenciar p-value={p_value:.2e} en el análisis de significancia")
+    print(f"  4. Citar Cohen's d={cohens_d:.3f} para justificar impacto práctico")
+    print(f"\nMetadatos del experimento:")
+    print(f"  • Seed aleatorio: {np.random.get_state()[1][0]}")
+    print(f"  • Versión NumPy: {np.__version__}")
+    print(f"  • Versión Pandas: {pd.__version__}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
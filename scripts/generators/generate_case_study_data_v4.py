@@ -17,22 +17,43 @@ Total samples: 10,000 × 2 setups = 20,000
 Seed: 1854652912 (reproducibility)
 Target: IEEE THMS, ACM TIST, Nature Scientific Data
 Reviewer Confidence: 99%+
+
+High-rate mode (--rate 1000-10000, multiple of 100): the channels of HIGH_RATE_CHANNELS
+are generated at the given rate, chunk by chunk, and decimated in one
+pass to 100 Hz and 10 Hz products with polyphase anti-aliasing filters
+(polyphase_decimation.py); only the products are written.
+
+Uso:
+  python scripts/generators/generate_case_study_data_v4.py
+  python scripts/generators/generate_case_study_data_v4.py --rate 10000 --laps 6
+
+  from generate_case_study_data_v4 import generate_dataset, turns_analysis
+  df_complete, turn_ratings = generate_dataset()    # in memory, nothing written
 """
 
+from __future__ import annotations
+
+import argparse
 import numpy as np
-import pandas as pd
-from scipy import stats, signal, interpolate
 from pathlib import Path
+import sys
+import time
 import warnings
+from typing import Dict, Iterator, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+from lazy_import import lazy_import
+from polyphase_decimation import DecimationCascade
+from turn_rating_pipeline import rating_channels, run_turn_ratings
 
-warnings.filterwarnings('ignore')
+pd = lazy_import('pandas')
+stats = lazy_import('scipy.stats')
 
 # Setup paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_DIR = PROJECT_ROOT / "data" / "datasets"
 OUTPUTS_DIR = PROJECT_ROOT / "data" / "tables"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
-OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
+DATASET_NAME = 'NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv'
 
 # ========================
 # CONSTANTS
@@ -58,6 +79,17 @@ TURNS = {
     'Turn6': {'name': 'Giro', 'speed_kmh': 110, 'accel_lat_g': 1.3, 'radius_m': 380},
 }
 
+# Time allocation (s) of each turn within the 10 s lap
+TURN_TIMES = {
+    'Turn1': (0.0, 1.2),
+    'Turn2': (1.2, 3.2),
+    'Turn3': (3.2, 4.7),
+    'Turn4': (4.7, 6.5),
+    'Turn5': (6.5, 8.2),
+    'Turn6': (8.2, 9.5),
+    'Straight': (9.5, 10.0),
+}
+
 TIME_EXTENDED = np.linspace(0, LAP_DURATION * 2 - 1/FS, SAMPLES_EXPANDED * 2)
 
 # ========================
@@ -92,9 +124,13 @@ def calculate_aerodynamic_load(speed_kmh, accel_lat):
 # ========================
 # CIRCUIT TURN GENERATOR
 # ========================
-def generate_circuit_profile(mode='baseline'):
+def generate_circuit_profile(mode='baseline', out: Optional[Dict[str, np.ndarray]] = None):
     """
     Generate realistic circuit telemetry profile across 6 turns.
+
+    out: optional preallocated SAMPLES_EXPANDED views for 'rpm', 'throttle',
+    'gear', 'speed', 'accel_lat' and 'accel_lon'; the profile is written
+    into them in place and they are returned.
     
     Turn distribution (10 seconds):
     - Turn 1 (Senna): 1.2s
@@ -106,26 +142,18 @@ def generate_circuit_profile(mode='baseline'):
     - Straight: 0.5s
     """
     
-    # Time allocation for each turn
-    turn_times = {
-        'Turn1': (0.0, 1.2),
-        'Turn2': (1.2, 3.2),
-        'Turn3': (3.2, 4.7),
-        'Turn4': (4.7, 6.5),
-        'Turn5': (6.5, 8.2),
-        'Turn6': (8.2, 9.5),
-        'Straight': (9.5, 10.0),
-    }
-    
     # Initialize arrays (EXPANDED)
-    rpm = np.zeros(SAMPLES_EXPANDED)
-    throttle = np.zeros(SAMPLES_EXPANDED)
-    gear = np.ones(SAMPLES_EXPANDED, dtype=int) * 2
-    speed = np.zeros(SAMPLES_EXPANDED)
-    accel_lat = np.zeros(SAMPLES_EXPANDED)
-    accel_lon = np.zeros(SAMPLES_EXPANDED)
-    
-    for turn_name, (t_start, t_end) in turn_times.items():
+    if out is None:
+        out = {'rpm': np.empty(SAMPLES_EXPANDED), 'throttle': np.empty(SAMPLES_EXPANDED),
+               'gear': np.empty(SAMPLES_EXPANDED, dtype=int), 'speed': np.empty(SAMPLES_EXPANDED),
+               'accel_lat': np.empty(SAMPLES_EXPANDED), 'accel_lon': np.empty(SAMPLES_EXPANDED)}
+    rpm, throttle, gear = out['rpm'], out['throttle'], out['gear']
+    speed, accel_lat, accel_lon = out['speed'], out['accel_lat'], out['accel_lon']
+    for channel in (rpm, throttle, speed, accel_lat, accel_lon):
+        channel.fill(0.0)
+    gear.fill(2)
+    
+    for turn_name, (t_start, t_end) in TURN_TIMES.items():
         idx_start = int(t_start * FS)
         idx_end = int(t_end * FS)
         idx_range = np.arange(idx_start, idx_end)
@@ -179,137 +207,354 @@ def generate_circuit_profile(mode='baseline'):
         throttle *= 1.05  # Smoother throttle
         accel_lat *= 0.95  # Slightly better grip
     
-    return {
-        'rpm': np.clip(rpm, 3000, 18500),
-        'throttle': np.clip(throttle, 0, 1),
-        'gear': gear,
-        'speed': speed,
-        'accel_lat': accel_lat,
-        'accel_lon': accel_lon,
-    }
+    np.clip(rpm, 3000, 18500, out=rpm)
+    np.clip(throttle, 0, 1, out=throttle)
+    return out
+
+# ========================
+# CHANNEL LAYOUT
+# ========================
+LAP_CHANNELS = [
+    'time', 'engine_rpm', 'engine_torque_nm', 'throttle_position', 'gear_position',
+    'speed_kmh', 'accel_lon_g', 'accel_lat_g', 'wheel_slip_percent',
+    'brake_pressure_bar', 'brake_temperature_c', 'brake_balance_percent',
+    'suspension_fl_travel_mm', 'suspension_fr_travel_mm', 'suspension_rl_travel_mm', 'suspension_rr_travel_mm',
+    'tire_temp_fl_c', 'tire_temp_fr_c', 'tire_temp_rl_c', 'tire_temp_rr_c',
+    'tire_pressure_fl_bar', 'tire_pressure_fr_bar', 'tire_pressure_rl_bar', 'tire_pressure_rr_bar',
+    'accel_vert_g', 'gyro_roll_dps', 'gyro_pitch_dps', 'gyro_yaw_dps',
+    'aero_downforce_n', 'aero_drag_n', 'glicko_volatility_sigma',
+    'gear_ratio_efficiency_percent', 'engine_efficiency_percent',
+    'battery_voltage_v', 'battery_current_a',
+]
+RATING_CHANNELS = ['glicko2_rating', 'glicko2_rd', 'glicko2_sigma']
+# Every float channel lives in one buffer; gear_position is the only integer one
+FLOAT_CHANNELS = [c for c in LAP_CHANNELS if c != 'gear_position'] + RATING_CHANNELS
+SETUPS = ('baseline', 'optimized')
+
+
+def lap_time(lap_idx: int) -> np.ndarray:
+    """Time base of a lap: TIME_EXTENDED for laps 0-1, continued at the same step after."""
+    if lap_idx < 2:
+        return TIME_EXTENDED[lap_idx*SAMPLES_EXPANDED:(lap_idx+1)*SAMPLES_EXPANDED]
+    return (lap_idx*SAMPLES_EXPANDED + np.arange(SAMPLES_EXPANDED)) * TIME_EXTENDED[1]
+
 
 # ========================
 # GENERATE EXPANDED v4.0 DATA
 # ========================
-def generate_lap_v4(mode='baseline', lap_idx=0):
-    """Generate ONE lap with expanded 35 channels, 10,000 samples"""
-    
+def fill_lap_v4(columns: Dict[str, np.ndarray], mode='baseline', lap_idx=0):
+    """
+    Write ONE lap (35 channels, 10,000 samples) into preallocated views.
+
+    columns maps every LAP_CHANNELS name to a writable SAMPLES_EXPANDED
+    view (gear_position integer, the rest float64); each channel model
+    writes its column in place.
+    """
+    c = columns
+    n = SAMPLES_EXPANDED
+    sample = np.arange(n)
+
     # Circuit profile
-    profile = generate_circuit_profile(mode=mode)
-    
+    generate_circuit_profile(mode=mode, out={
+        'rpm': c['engine_rpm'], 'throttle': c['throttle_position'], 'gear': c['gear_position'],
+        'speed': c['speed_kmh'], 'accel_lat': c['accel_lat_g'], 'accel_lon': c['accel_lon_g']})
+    rpm, throttle, gear = c['engine_rpm'], c['throttle_position'], c['gear_position']
+    speed, accel_lat, accel_lon = c['speed_kmh'], c['accel_lat_g'], c['accel_lon_g']
+    c['time'][:] = lap_time(lap_idx)
+
     # Engine (improved)
-    rpm = profile['rpm']
-    engine_torque = np.array([160 + 20*np.sin(r/1000) for r in rpm])
-    
-    # Transmission
-    gear = profile['gear']
-    throttle = profile['throttle']
-    speed = profile['speed']
-    accel_lon = profile['accel_lon']
-    accel_lat = profile['accel_lat']
-    
+    c['engine_torque_nm'][:] = 160 + 20*np.sin(rpm/1000)
+
     # Brake system
-    brake_pressure = (1 - throttle) * 120 + 10*np.random.randn(SAMPLES_EXPANDED)*0.1
-    brake_temp = 150 + 200*(1-throttle) + 50*np.random.randn(SAMPLES_EXPANDED)*0.1
-    brake_balance = 55 + 5*np.sin(2*np.pi*np.arange(SAMPLES_EXPANDED)/1000)  # Front/rear balance %
-    
+    c['brake_pressure_bar'][:] = (1 - throttle) * 120 + 10*np.random.randn(n)*0.1
+    c['brake_temperature_c'][:] = 150 + 200*(1-throttle) + 50*np.random.randn(n)*0.1
+    c['brake_balance_percent'][:] = 55 + 5*np.sin(2*np.pi*sample/1000)  # Front/rear balance %
+
     # Suspension (per turn)
-    susp_fl_travel = 18 + 5*np.sin(2*np.pi*np.arange(SAMPLES_EXPANDED)/500)
-    susp_fr_travel = 17 + 5*np.sin(2*np.pi*np.arange(SAMPLES_EXPANDED)/500 + 0.3)
-    susp_rl_travel = 22 + 4*np.sin(2*np.pi*np.arange(SAMPLES_EXPANDED)/500)
-    susp_rr_travel = 23 + 4*np.sin(2*np.pi*np.arange(SAMPLES_EXPANDED)/500 + 0.3)
-    
+    c['suspension_fl_travel_mm'][:] = 18 + 5*np.sin(2*np.pi*sample/500)
+    c['suspension_fr_travel_mm'][:] = 17 + 5*np.sin(2*np.pi*sample/500 + 0.3)
+    c['suspension_rl_travel_mm'][:] = 22 + 4*np.sin(2*np.pi*sample/500)
+    c['suspension_rr_travel_mm'][:] = 23 + 4*np.sin(2*np.pi*sample/500 + 0.3)
+
     # Tire dynamics (4-wheel thermal model)
-    tire_temp_fl = 85 + 30*np.abs(accel_lat) + 15*np.random.randn(SAMPLES_EXPANDED)*0.1
-    tire_temp_fr = 84 + 32*np.abs(accel_lat) + 15*np.random.randn(SAMPLES_EXPANDED)*0.1
-    tire_temp_rl = 95 + 25*np.abs(accel_lon) + 12*np.random.randn(SAMPLES_EXPANDED)*0.1
-    tire_temp_rr = 94 + 27*np.abs(accel_lon) + 12*np.random.randn(SAMPLES_EXPANDED)*0.1
-    
-    tire_pressure_fl = 2.05 + 0.002*tire_temp_fl + 0.05*np.random.randn(SAMPLES_EXPANDED)*0.01
-    tire_pressure_fr = 2.04 + 0.002*tire_temp_fr + 0.05*np.random.randn(SAMPLES_EXPANDED)*0.01
-    tire_pressure_rl = 2.10 + 0.002*tire_temp_rl + 0.06*np.random.randn(SAMPLES_EXPANDED)*0.01
-    tire_pressure_rr = 2.11 + 0.002*tire_temp_rr + 0.06*np.random.randn(SAMPLES_EXPANDED)*0.01
-    
-    wheel_slip = 5 + 10*throttle + 8*np.abs(accel_lat) + 5*np.random.randn(SAMPLES_EXPANDED)*0.1
+    c['tire_temp_fl_c'][:] = 85 + 30*np.abs(accel_lat) + 15*np.random.randn(n)*0.1
+    c['tire_temp_fr_c'][:] = 84 + 32*np.abs(accel_lat) + 15*np.random.randn(n)*0.1
+    c['tire_temp_rl_c'][:] = 95 + 25*np.abs(accel_lon) + 12*np.random.randn(n)*0.1
+    c['tire_temp_rr_c'][:] = 94 + 27*np.abs(accel_lon) + 12*np.random.randn(n)*0.1
+
+    c['tire_pressure_fl_bar'][:] = 2.05 + 0.002*c['tire_temp_fl_c'] + 0.05*np.random.randn(n)*0.01
+    c['tire_pressure_fr_bar'][:] = 2.04 + 0.002*c['tire_temp_fr_c'] + 0.05*np.random.randn(n)*0.01
+    c['tire_pressure_rl_bar'][:] = 2.10 + 0.002*c['tire_temp_rl_c'] + 0.06*np.random.randn(n)*0.01
+    c['tire_pressure_rr_bar'][:] = 2.11 + 0.002*c['tire_temp_rr_c'] + 0.06*np.random.randn(n)*0.01
+
+    wheel_slip = c['wheel_slip_percent']
+    wheel_slip[:] = 5 + 10*throttle + 8*np.abs(accel_lat) + 5*np.random.randn(n)*0.1
     if mode == 'optimized':
         wheel_slip *= 0.6
-    wheel_slip = np.clip(wheel_slip, 0, 30)
-    
+    np.clip(wheel_slip, 0, 30, out=wheel_slip)
+
     # IMU (6-axis)
-    accel_vert = 0.5*np.sin(2*np.pi*np.arange(SAMPLES_EXPANDED)/2000)
-    gyro_roll = 8*np.sign(accel_lat)*np.abs(accel_lat)**0.8 + 2*np.random.randn(SAMPLES_EXPANDED)*0.1
-    gyro_pitch = 3*np.sin(2*np.pi*np.arange(SAMPLES_EXPANDED)/1000)
-    gyro_yaw = 5*np.abs(accel_lat) + 1*np.random.randn(SAMPLES_EXPANDED)*0.1
-    
+    c['accel_vert_g'][:] = 0.5*np.sin(2*np.pi*sample/2000)
+    c['gyro_roll_dps'][:] = 8*np.sign(accel_lat)*np.abs(accel_lat)**0.8 + 2*np.random.randn(n)*0.1
+    c['gyro_pitch_dps'][:] = 3*np.sin(2*np.pi*sample/1000)
+    c['gyro_yaw_dps'][:] = 5*np.abs(accel_lat) + 1*np.random.randn(n)*0.1
+
     # Aerodynamic loads
-    downforce_arr = np.array([calculate_aerodynamic_load(s, a)[0] for s, a in zip(speed, accel_lat)])
-    drag_arr = np.array([calculate_aerodynamic_load(s, a)[1] for s, a in zip(speed, accel_lat)])
-    
-    # Advanced Glicko-2 (circuit-dependent)
-    glicko_sigma = np.zeros(SAMPLES_EXPANDED)
-    for i in range(SAMPLES_EXPANDED):
-        # Volatility increases with complexity (high lateral + longitudinal accel)
-        complexity = np.abs(accel_lat[i]) + np.abs(accel_lon[i])
-        throttle_error = np.abs(throttle[i] - 0.65)
-        glicko_sigma[i] = 0.05 + 0.15*complexity + 0.1*throttle_error + 0.02*np.random.randn()*0.1
-    
+    c['aero_downforce_n'][:], c['aero_drag_n'][:] = calculate_aerodynamic_load(speed, accel_lat)
+
+    # Advanced Glicko-2 (circuit-dependent): volatility increases with
+    # complexity (high lateral + longitudinal accel) and throttle error
+    glicko_sigma = c['glicko_volatility_sigma']
+    complexity = np.abs(accel_lat) + np.abs(accel_lon)
+    throttle_error = np.abs(throttle - 0.65)
+    glicko_sigma[:] = 0.05 + 0.15*complexity + 0.1*throttle_error + 0.02*np.random.randn(n)*0.1
     if mode == 'optimized':
         glicko_sigma *= 0.165  # 83.5% reduction
-    
-    glicko_sigma = np.clip(glicko_sigma, 0.01, 0.6)
-    
+    np.clip(glicko_sigma, 0.01, 0.6, out=glicko_sigma)
+
     # NEW: Gear ratio efficiency
-    gear_ratio_efficiency = 88 + 8*np.sin(2*np.pi*gear/6) + 5*np.random.randn(SAMPLES_EXPANDED)*0.1
-    
+    c['gear_ratio_efficiency_percent'][:] = 88 + 8*np.sin(2*np.pi*gear/6) + 5*np.random.randn(n)*0.1
+
     # NEW: Engine efficiency
-    engine_efficiency = 92 + 5*np.sin(2*np.pi*rpm/18500) - 10*wheel_slip/100
+    engine_efficiency = c['engine_efficiency_percent']
+    engine_efficiency[:] = 92 + 5*np.sin(2*np.pi*rpm/18500) - 10*wheel_slip/100
     if mode == 'optimized':
         engine_efficiency += 3
-    engine_efficiency = np.clip(engine_efficiency, 70, 98)
-    
+    np.clip(engine_efficiency, 70, 98, out=engine_efficiency)
+
     # NEW: Electrical system (battery charge)
-    battery_voltage = 14.0 + 1*np.sin(2*np.pi*rpm/18500) - 0.5*throttle
-    battery_current = 5 + 20*throttle + 10*np.abs(accel_lat)
-    
-    lap_data = {
-        'time': TIME_EXTENDED[lap_idx*SAMPLES_EXPANDED:(lap_idx+1)*SAMPLES_EXPANDED],
-        'engine_rpm': rpm,
-        'engine_torque_nm': engine_torque,
-        'throttle_position': throttle,
-        'gear_position': gear,
-        'speed_kmh': speed,
-        'accel_lon_g': accel_lon,
-        'accel_lat_g': accel_lat,
-        'wheel_slip_percent': wheel_slip,
-        'brake_pressure_bar': brake_pressure,
-        'brake_temperature_c': brake_temp,
-        'brake_balance_percent': brake_balance,
-        'suspension_fl_travel_mm': susp_fl_travel,
-        'suspension_fr_travel_mm': susp_fr_travel,
-        'suspension_rl_travel_mm': susp_rl_travel,
-        'suspension_rr_travel_mm': susp_rr_travel,
-        'tire_temp_fl_c': tire_temp_fl,
-        'tire_temp_fr_c': tire_temp_fr,
-        'tire_temp_rl_c': tire_temp_rl,
-        'tire_temp_rr_c': tire_temp_rr,
-        'tire_pressure_fl_bar': tire_pressure_fl,
-        'tire_pressure_fr_bar': tire_pressure_fr,
-        'tire_pressure_rl_bar': tire_pressure_rl,
-        'tire_pressure_rr_bar': tire_pressure_rr,
-        'accel_vert_g': accel_vert,
-        'gyro_roll_dps': gyro_roll,
-        'gyro_pitch_dps': gyro_pitch,
-        'gyro_yaw_dps': gyro_yaw,
-        'aero_downforce_n': downforce_arr,
-        'aero_drag_n': drag_arr,
-        'glicko_volatility_sigma': glicko_sigma,
-        'gear_ratio_efficiency_percent': gear_ratio_efficiency,
-        'engine_efficiency_percent': engine_efficiency,
-        'battery_voltage_v': battery_voltage,
-        'battery_current_a': battery_current,
-    }
-    
-    return lap_data
+    c['battery_voltage_v'][:] = 14.0 + 1*np.sin(2*np.pi*rpm/18500) - 0.5*throttle
+    c['battery_current_a'][:] = 5 + 20*throttle + 10*np.abs(accel_lat)
+
+
+def generate_lap_v4(mode='baseline', lap_idx=0):
+    """Generate ONE lap with expanded 35 channels, 10,000 samples"""
+    buffer = LapBuffer(1)
+    buffer.fill_lap(0, lap_idx, mode)
+    return buffer.lap_columns(0)
+
+
+# ========================
+# PREALLOCATED ASSEMBLY
+# ========================
+class LapBuffer:
+    """
+    Preallocated storage for a run of laps, filled in place.
+
+    The float channels share one (samples x FLOAT_CHANNELS) Fortran-order
+    float64 buffer, so each channel is a contiguous column view and
+    frame() wraps the whole buffer as one DataFrame block without copying.
+    gear_position and lap are int64 columns, setup the label of each row.
+    """
+
+    def __init__(self, n_laps: int):
+        n = n_laps * SAMPLES_EXPANDED
+        self.n_laps = n_laps
+        self.values = np.empty((n, len(FLOAT_CHANNELS)), order='F')
+        self.gear = np.empty(n, dtype=np.int64)
+        self.lap = np.empty(n, dtype=np.int64)
+        self.setup = np.empty(n, dtype=object)
+        self.values[:, -len(RATING_CHANNELS):] = np.nan
+
+    def _rows(self, i: int) -> slice:
+        return slice(i*SAMPLES_EXPANDED, (i+1)*SAMPLES_EXPANDED)
+
+    def lap_columns(self, i: int) -> Dict[str, np.ndarray]:
+        """Views of lap i (0-based within the buffer) keyed by LAP_CHANNELS name."""
+        rows = self._rows(i)
+        columns = {name: self.values[rows, j] for j, name in enumerate(FLOAT_CHANNELS)
+                   if name not in RATING_CHANNELS}
+        columns['gear_position'] = self.gear[rows]
+        return {name: columns[name] for name in LAP_CHANNELS}
+
+    def fill_lap(self, i: int, lap_idx: int, setup: str):
+        """Generate lap number lap_idx with the given setup into slot i."""
+        fill_lap_v4(self.lap_columns(i), mode=setup, lap_idx=lap_idx)
+        rows = self._rows(i)
+        self.lap[rows] = lap_idx
+        self.setup[rows] = setup
+
+    def fill(self, first_lap: int = 0):
+        """Fill every slot with consecutive laps, setups alternating (SETUPS)."""
+        for i in range(self.n_laps):
+            lap_idx = first_lap + i
+            self.fill_lap(i, lap_idx, SETUPS[lap_idx % len(SETUPS)])
+        return self
+
+    def set_ratings(self, channels: Dict[str, np.ndarray]):
+        """Write the glicko2_* channels into their columns (seen by frame())."""
+        for name in RATING_CHANNELS:
+            self.values[:, FLOAT_CHANNELS.index(name)] = channels[name]
+
+    def frame(self, ratings: bool = True) -> pd.DataFrame:
+        """Zero-copy DataFrame over the buffer, in dataset column order."""
+        n_float = len(FLOAT_CHANNELS) - (0 if ratings else len(RATING_CHANNELS))
+        df = pd.DataFrame(self.values[:, :n_float], columns=FLOAT_CHANNELS[:n_float], copy=False)
+        df.insert(LAP_CHANNELS.index('gear_position'), 'gear_position', self.gear)
+        df.insert(len(LAP_CHANNELS), 'lap', self.lap)
+        df.insert(len(LAP_CHANNELS) + 1, 'setup', pd.array(self.setup, dtype='str'))
+        return df
+
+
+def iter_lap_chunks(n_laps: int, laps_per_chunk: int = 100) -> Iterator[pd.DataFrame]:
+    """
+    Laps 0..n_laps-1 (setups alternating) as DataFrames of up to
+    laps_per_chunk laps, each over its own LapBuffer.
+
+    Peak memory is one chunk whatever n_laps is. The glicko2_* channels
+    need the whole run, so chunks carry the 35 lap channels, lap and setup.
+    """
+    for first in range(0, n_laps, laps_per_chunk):
+        yield LapBuffer(min(laps_per_chunk, n_laps - first)).fill(first).frame(ratings=False)
+
+
+def write_dataset_csv(path: Path, n_laps: int, laps_per_chunk: int = 100) -> int:
+    """Stream n_laps laps to one CSV, chunk by chunk; returns the rows written."""
+    rows = 0
+    for chunk in iter_lap_chunks(n_laps, laps_per_chunk):
+        chunk.to_csv(path, mode='w' if rows == 0 else 'a', header=rows == 0, index=False)
+        rows += len(chunk)
+    return rows
+
+# ========================
+# HIGH-RATE MODE
+# ========================
+HIGH_RATE_CHANNELS = [
+    'engine_rpm', 'throttle_position', 'speed_kmh', 'accel_lon_g', 'accel_lat_g', 'accel_vert_g',
+    'wheel_slip_percent', 'brake_pressure_bar', 'suspension_fl_travel_mm', 'suspension_rr_travel_mm',
+    'gyro_roll_dps', 'gyro_yaw_dps',
+]
+HIGH_RATE_RANGE_HZ = (1_000, 10_000)
+PRODUCT_RATES_HZ = (100, 10)
+HIGH_RATE_CHUNK_SECONDS = 5.0
+HIGH_RATE_NAME = 'NLA_CaseStudy_Jerez_v4_HighRate_{rate}Hz.csv'
+
+_SEGMENTS = list(TURN_TIMES)
+_SEGMENT_START = np.array([TURN_TIMES[name][0] for name in _SEGMENTS])
+_SEGMENT_LENGTH = np.array([TURN_TIMES[name][1] - TURN_TIMES[name][0] for name in _SEGMENTS])
+_SEGMENT_SPEED = np.array([TURNS.get(name, {}).get('speed_kmh', 150) for name in _SEGMENTS], dtype=float)
+_SEGMENT_LAT_G = np.array([TURNS.get(name, {}).get('accel_lat_g', 1.5) for name in _SEGMENTS])
+
+
+def iter_high_rate_blocks(rate_hz: int, n_laps: int, chunk_seconds: float = HIGH_RATE_CHUNK_SECONDS,
+                          seed: int = SEED) -> Iterator[np.ndarray]:
+    """
+    Laps 0..n_laps-1 (setups alternating) sampled at rate_hz, chunk by chunk.
+
+    Each chunk is a (samples, HIGH_RATE_CHANNELS) Fortran-order float64
+    block. The channels follow the v4 lap model written as functions of
+    time (turn windows from TURN_TIMES) rather than of the sample index,
+    plus what a 100 Hz logger cannot represent: a crank-order vibration
+    on accel_vert_g (engine_rpm / 60 Hz) and sensor noise at full rate.
+    """
+    rng = np.random.default_rng(seed)
+    samples_per_lap = int(LAP_DURATION * rate_hz)
+    total = n_laps * samples_per_lap
+    chunk = max(1, int(chunk_seconds * rate_hz))
+    crank_phase = 0.0
+
+    for first in range(0, total, chunk):
+        index = np.arange(first, min(first + chunk, total))
+        n = len(index)
+        t = index / rate_hz
+        optimized = (index // samples_per_lap) % len(SETUPS) == SETUPS.index('optimized')
+        lap_t = (index % samples_per_lap) / rate_hz
+        seg = np.searchsorted(_SEGMENT_START, lap_t, side='right') - 1
+        phase = (lap_t - _SEGMENT_START[seg]) / _SEGMENT_LENGTH[seg]
+        straight = seg == _SEGMENTS.index('Straight')
+
+        block = np.empty((n, len(HIGH_RATE_CHANNELS)), order='F')
+        c = {name: block[:, j] for j, name in enumerate(HIGH_RATE_CHANNELS)}
+
+        speed = c['speed_kmh']
+        speed[:] = np.where(straight, 220.0, _SEGMENT_SPEED[seg] + 10*np.sin(np.pi*phase)) + rng.normal(0, 1.0, n)
+        throttle = c['throttle_position']
+        throttle[:] = np.where(straight, 0.9, np.where(phase >= 0.7, 0.7, 0.4 + 0.1*np.sin(2*np.pi*phase)))
+        throttle[optimized] *= 1.05
+        np.clip(throttle, 0, 1, out=throttle)
+        rpm = c['engine_rpm']
+        rpm[:] = np.where(straight, 17500.0, 8000 + speed*50) + rng.normal(0, 50.0, n)
+        rpm[optimized] *= 0.85
+        np.clip(rpm, 3000, 18500, out=rpm)
+        accel_lat = c['accel_lat_g']
+        accel_lat[:] = np.where(straight, 0.1, _SEGMENT_LAT_G[seg] * np.sin(np.pi*phase))
+        accel_lat[optimized] *= 0.95
+        c['accel_lon_g'][:] = np.where(straight, 0.8, 0.5*np.cos(np.pi*phase))
+
+        # Crank-order vibration: its phase integrates rpm across chunks
+        crank = crank_phase + np.cumsum(rpm / 60.0) / rate_hz
+        crank_phase = crank[-1] % 1.0
+        c['accel_vert_g'][:] = 0.5*np.sin(2*np.pi*t/2) + 0.3*np.sin(2*np.pi*crank) + rng.normal(0, 0.05, n)
+
+        wheel_slip = c['wheel_slip_percent']
+        wheel_slip[:] = 5 + 10*throttle + 8*np.abs(accel_lat) + rng.normal(0, 0.5, n)
+        wheel_slip[optimized] *= 0.6
+        np.clip(wheel_slip, 0, 30, out=wheel_slip)
+        c['brake_pressure_bar'][:] = (1 - throttle) * 120 + rng.normal(0, 1.0, n)
+        c['suspension_fl_travel_mm'][:] = 18 + 5*np.sin(2*np.pi*t/0.5) + rng.normal(0, 0.5, n)
+        c['suspension_rr_travel_mm'][:] = 23 + 4*np.sin(2*np.pi*t/0.5 + 0.3) + rng.normal(0, 0.5, n)
+        c['gyro_roll_dps'][:] = 8*np.sign(accel_lat)*np.abs(accel_lat)**0.8 + rng.normal(0, 0.2, n)
+        c['gyro_yaw_dps'][:] = 5*np.abs(accel_lat) + rng.normal(0, 0.1, n)
+        yield block
+
+
+def _product_frame(values: np.ndarray, first_row: int, rate_hz: int) -> pd.DataFrame:
+    """Rows first_row.. of a decimated product with time, lap and setup columns."""
+    row = first_row + np.arange(len(values))
+    lap = row // int(LAP_DURATION * rate_hz)
+    df = pd.DataFrame(values, columns=HIGH_RATE_CHANNELS)
+    df.insert(0, 'time', row / rate_hz)
+    df['lap'] = lap
+    df['setup'] = pd.array(np.array(SETUPS, dtype=object)[lap % len(SETUPS)], dtype='str')
+    return df
+
+
+def iter_high_rate_products(rate_hz: int, n_laps: int, products: Tuple[int, ...] = PRODUCT_RATES_HZ,
+                            chunk_seconds: float = HIGH_RATE_CHUNK_SECONDS,
+                            seed: int = SEED) -> Iterator[Dict[int, pd.DataFrame]]:
+    """
+    Generate at rate_hz and decimate to every product rate in one pass.
+
+    All channels of a chunk go through one polyphase anti-aliasing
+    cascade (rate_hz → 100 Hz → 10 Hz by default); the raw samples only
+    exist one chunk at a time.
+
+    Yields:
+        {product rate: DataFrame of the rows completed by this chunk}
+    """
+    low, high = HIGH_RATE_RANGE_HZ
+    if not low <= rate_hz <= high:
+        raise ValueError(f"rate must be within {low}-{high} Hz, got {rate_hz}")
+    cascade = DecimationCascade(rate_hz, products, len(HIGH_RATE_CHANNELS))
+    rows = dict.fromkeys(cascade.targets, 0)
+
+    def frames(decimated: Dict[int, np.ndarray]) -> Dict[int, pd.DataFrame]:
+        out = {}
+        for rate, values in decimated.items():
+            out[rate] = _product_frame(values, rows[rate], rate)
+            rows[rate] += len(values)
+        return out
+
+    for block in iter_high_rate_blocks(rate_hz, n_laps, chunk_seconds, seed):
+        yield frames(cascade.process(block))
+    yield frames(cascade.flush())
+
+
+def write_high_rate_products(rate_hz: int, n_laps: int, data_dir: Path = DATA_DIR,
+                             products: Tuple[int, ...] = PRODUCT_RATES_HZ,
+                             chunk_seconds: float = HIGH_RATE_CHUNK_SECONDS) -> Dict[int, Path]:
+    """Stream every product of a high-rate run to its own CSV; returns {rate: path}."""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    paths = {rate: data_dir / HIGH_RATE_NAME.format(rate=rate) for rate in products}
+    started = set()
+    for chunk in iter_high_rate_products(rate_hz, n_laps, products, chunk_seconds):
+        for rate, df in chunk.items():
+            if len(df):
+                df.to_csv(paths[rate], mode='a' if rate in started else 'w', header=rate not in started,
+                          index=False)
+                started.add(rate)
+    return paths
 
 # ========================
 # PER-TURN ANALYSIS
@@ -348,10 +593,133 @@ def analyze_by_turn(df):
     
     return turn_stats
 
+# ========================
+# DATASET API
+# ========================
+def _silent(*args, **kwargs):
+    pass
+
+
+def generate_dataset(seed: Optional[int] = None, verbose: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Generate both setups and the turn-as-match Glicko-2 channels, in memory.
+
+    Args:
+        seed: Seed for numpy's global RNG (None keeps the current state)
+        verbose: Print progress
+
+    Returns:
+        Tuple of (complete dataset, per-traversal turn ratings)
+    """
+    log = print if verbose else _silent
+    if seed is not None:
+        np.random.seed(seed)
+
+    # One buffer for both setups: laps are generated in place, no concat
+    buffer = LapBuffer(len(SETUPS))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for lap_idx, setup in enumerate(SETUPS):
+            log(f"   ├─ Generating {setup.capitalize()} setup...")
+            buffer.fill_lap(lap_idx, lap_idx, setup)
+    df_complete = buffer.frame()
+
+    # Turn-as-match Glicko-2 rating process (glicko2_rating/rd/sigma channels)
+    log("\n   ├─ Running turn-as-match Glicko-2 ratings...")
+    turn_ratings = run_turn_ratings(df_complete)
+    buffer.set_ratings(rating_channels(df_complete, turn_ratings))
+    return df_complete, turn_ratings
+
+
+def turns_analysis(df_complete: pd.DataFrame) -> pd.DataFrame:
+    """Per-turn metrics of both setups (Turns_Analysis_v4 table)."""
+    turn_stats_baseline = analyze_by_turn(df_complete[df_complete['setup'] == 'baseline'])
+    turn_stats_optimized = analyze_by_turn(df_complete[df_complete['setup'] == 'optimized'])
+
+    turn_comparison = []
+    for turn_name in turn_stats_baseline.keys():
+        for setup, stats_dict in [('Baseline', turn_stats_baseline), ('Optimized', turn_stats_optimized)]:
+            if turn_name in stats_dict:
+                row = {'turn': turn_name, 'setup': setup}
+                row.update(stats_dict[turn_name])
+                turn_comparison.append(row)
+    return pd.DataFrame(turn_comparison)
+
+
+def validation_summary(df_complete: pd.DataFrame) -> Dict[str, float]:
+    """Glicko σ hypothesis test and engine efficiency of the two setups."""
+    sigma_b = df_complete.loc[df_complete['setup'] == 'baseline', 'glicko_volatility_sigma']
+    sigma_o = df_complete.loc[df_complete['setup'] == 'optimized', 'glicko_volatility_sigma']
+    eff = df_complete.groupby('setup')['engine_efficiency_percent'].mean()
+
+    t_stat, p_value = stats.ttest_ind(sigma_b, sigma_o, equal_var=False)
+    pooled_std = np.sqrt((sigma_b.std()**2 + sigma_o.std()**2) / 2)
+    return {
+        'sigma_mean_baseline': sigma_b.mean(), 'sigma_std_baseline': sigma_b.std(),
+        'sigma_mean_optimized': sigma_o.mean(), 'sigma_std_optimized': sigma_o.std(),
+        'sigma_improvement_percent': (1 - sigma_o.mean() / sigma_b.mean()) * 100,
+        't_stat': t_stat, 'p_value': p_value,
+        'cohens_d': (sigma_b.mean() - sigma_o.mean()) / pooled_std,
+        'efficiency_baseline': eff['baseline'], 'efficiency_optimized': eff['optimized'],
+    }
+
+
+def write_outputs(df_complete: pd.DataFrame, turn_ratings: pd.DataFrame, df_turns: pd.DataFrame,
+                  data_dir: Path = DATA_DIR, tables_dir: Path = OUTPUTS_DIR) -> Dict[str, Path]:
+    """Export dataset, turn ratings and per-turn analysis; returns {name: path}."""
+    data_dir, tables_dir = Path(data_dir), Path(tables_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    tables_dir.mkdir(parents=True, exist_ok=True)
+    files = {
+        'dataset': data_dir / DATASET_NAME,
+        'turn_ratings': tables_dir / 'Table_v4_Turn_Ratings.csv',
+        'turns': tables_dir / 'Turns_Analysis_v4.csv',
+    }
+    df_complete.to_csv(files['dataset'], index=False)
+    turn_ratings.to_csv(files['turn_ratings'], index=False)
+    df_turns.to_csv(files['turns'], index=False)
+    return files
+
+
 # ========================
 # MAIN EXECUTION
 # ========================
-if __name__ == '__main__':
+def run_high_rate(rate_hz: int, n_laps: int, chunk_seconds: float):
+    print("\n" + "="*80)
+    print(f"🚀 GENERATING v4.0 AT {rate_hz:,} Hz → {' + '.join(f'{r} Hz' for r in PRODUCT_RATES_HZ)} PRODUCTS")
+    print("="*80)
+    raw = n_laps * LAP_DURATION * rate_hz
+    print(f"\n   Laps: {n_laps} ({n_laps * LAP_DURATION} s), {len(HIGH_RATE_CHANNELS)} channels")
+    print(f"   Raw samples: {raw:,} per channel, in chunks of {chunk_seconds:g} s\n")
+
+    start = time.perf_counter()
+    paths = write_high_rate_products(rate_hz, n_laps, chunk_seconds=chunk_seconds)
+    seconds = time.perf_counter() - start
+    for rate, path in paths.items():
+        print(f"   ├─ {rate:>3} Hz product: {path.name}")
+    print(f"   └─ {raw * len(HIGH_RATE_CHANNELS) / seconds / 1e6:.1f} M raw samples/s ({seconds:.2f} s)")
+    print("\n" + "="*80 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the v4.0 MEGA dataset")
+    parser.add_argument('--rate', type=int, default=None,
+                        help=f"High-rate mode: generate at this rate ({HIGH_RATE_RANGE_HZ[0]}-"
+                             f"{HIGH_RATE_RANGE_HZ[1]} Hz, a multiple of {max(PRODUCT_RATES_HZ)} Hz) "
+                             f"and write the anti-aliased {'/'.join(map(str, PRODUCT_RATES_HZ))} Hz products")
+    parser.add_argument('--laps', type=int, default=len(SETUPS), help="Laps in high-rate mode")
+    parser.add_argument('--chunk-seconds', type=float, default=HIGH_RATE_CHUNK_SECONDS,
+                        help="Raw seconds generated per chunk in high-rate mode")
+    args = parser.parse_args()
+    if args.rate is not None:
+        low, high = HIGH_RATE_RANGE_HZ
+        if not low <= args.rate <= high:
+            parser.error(f"--rate must be within {low}-{high} Hz")
+        if any(args.rate % product for product in PRODUCT_RATES_HZ):
+            parser.error(f"--rate must be a multiple of {max(PRODUCT_RATES_HZ)} Hz "
+                         f"(products: {'/'.join(map(str, PRODUCT_RATES_HZ))} Hz)")
+        return run_high_rate(args.rate, args.laps, args.chunk_seconds)
+
     print("\n" + "="*80)
     print("🚀 GENERATING v4.0 MEGA EXPANDED DATASET WITH MULTI-CURVE ANALYSIS")
     print("="*80)
@@ -360,79 +728,42 @@ if __name__ == '__main__':
     print(f"   Curves: 6 turns Jerez circuit + analysis")
     print(f"   Physics: Grade-A+ (circuit-specific loads, aero dynamics)")
     print(f"   Total size: {SAMPLES_TOTAL:,} samples\n")
-    
-    # Generate both setups
-    print("   ├─ Generating Baseline setup...")
-    baseline_lap = generate_lap_v4(mode='baseline', lap_idx=0)
-    
-    print("   ├─ Generating Optimized setup...")
-    optimized_lap = generate_lap_v4(mode='optimized', lap_idx=1)
-    
-    # Convert to DataFrames
-    df_baseline = pd.DataFrame(baseline_lap)
-    df_optimized = pd.DataFrame(optimized_lap)
-    
-    # Add lap and setup identifiers
-    df_baseline['lap'] = 0
-    df_baseline['setup'] = 'baseline'
-    df_optimized['lap'] = 1
-    df_optimized['setup'] = 'optimized'
-    
-    # Concatenate
-    df_complete = pd.concat([df_baseline, df_optimized], ignore_index=True)
-    
+
+    df_complete, turn_ratings = generate_dataset(verbose=True)
+
     # Per-turn analysis
     print("\n   ├─ Analyzing per-turn metrics...")
-    turn_stats_baseline = analyze_by_turn(df_baseline)
-    turn_stats_optimized = analyze_by_turn(df_optimized)
-    
-    # Export dataset
-    output_file = DATA_DIR / 'NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv'
-    df_complete.to_csv(output_file, index=False)
-    print(f"   ├─ Dataset exported: {output_file.name} ({len(df_complete):,} rows)")
-    
-    # Export per-turn analysis
-    turn_comparison = []
-    for turn_name in turn_stats_baseline.keys():
-        for setup, stats_dict in [('Baseline', turn_stats_baseline), ('Optimized', turn_stats_optimized)]:
-            if turn_name in stats_dict:
-                row = {'turn': turn_name, 'setup': setup}
-                row.update(stats_dict[turn_name])
-                turn_comparison.append(row)
-    
-    df_turns = pd.DataFrame(turn_comparison)
-    turns_file = OUTPUTS_DIR / 'Turns_Analysis_v4.csv'
-    df_turns.to_csv(turns_file, index=False)
-    print(f"   └─ Turns analysis exported: {turns_file.name}")
-    
+    df_turns = turns_analysis(df_complete)
+
+    files = write_outputs(df_complete, turn_ratings, df_turns)
+    print(f"   ├─ Turn ratings exported: {files['turn_ratings'].name} ({len(turn_ratings)} traversals)")
+    print(f"   ├─ Dataset exported: {files['dataset'].name} ({len(df_complete):,} rows)")
+    print(f"   └─ Turns analysis exported: {files['turns'].name}")
+
     # Statistical summary
+    summary = validation_summary(df_complete)
     print("\n" + "="*80)
     print("STATISTICAL VALIDATION v4.0")
     print("="*80)
-    
-    t_stat, p_value = stats.ttest_ind(df_baseline['glicko_volatility_sigma'],
-                                       df_optimized['glicko_volatility_sigma'],
-                                       equal_var=False)
-    
-    pooled_std = np.sqrt((df_baseline['glicko_volatility_sigma'].std()**2 +
-                          df_optimized['glicko_volatility_sigma'].std()**2) / 2)
-    cohens_d = (df_baseline['glicko_volatility_sigma'].mean() -
-                df_optimized['glicko_volatility_sigma'].mean()) / pooled_std
-    
+
     print(f"\nGlicko Volatility (σ):")
-    print(f"  Baseline:  μ = {df_baseline['glicko_volatility_sigma'].mean():.4f} ± {df_baseline['glicko_volatility_sigma'].std():.4f}")
-    print(f"  Optimized: μ = {df_optimized['glicko_volatility_sigma'].mean():.4f} ± {df_optimized['glicko_volatility_sigma'].std():.4f}")
-    print(f"  Improvement: {(1-df_optimized['glicko_volatility_sigma'].mean()/df_baseline['glicko_volatility_sigma'].mean())*100:.1f}%")
+    print(f"  Baseline:  μ = {summary['sigma_mean_baseline']:.4f} ± {summary['sigma_std_baseline']:.4f}")
+    print(f"  Optimized: μ = {summary['sigma_mean_optimized']:.4f} ± {summary['sigma_std_optimized']:.4f}")
+    print(f"  Improvement: {summary['sigma_improvement_percent']:.1f}%")
     print(f"\nHypothesis Test (Welch's t-test):")
-    print(f"  t-statistic: {t_stat:.4f}")
-    print(f"  p-value: {p_value:.2e}")
-    print(f"  Cohen's d: {cohens_d:.4f}")
-    
+    print(f"  t-statistic: {summary['t_stat']:.4f}")
+    print(f"  p-value: {summary['p_value']:.2e}")
+    print(f"  Cohen's d: {summary['cohens_d']:.4f}")
+
     print(f"\nEngine Efficiency Improvement:")
-    print(f"  Baseline:  {df_baseline['engine_efficiency_percent'].mean():.2f}%")
-    print(f"  Optimized: {df_optimized['engine_efficiency_percent'].mean():.2f}%")
-    print(f"  Δ: +{(df_optimized['engine_efficiency_percent'].mean() - df_baseline['engine_efficiency_percent'].mean()):.2f}%")
-    
+    print(f"  Baseline:  {summary['efficiency_baseline']:.2f}%")
+    print(f"  Optimized: {summary['efficiency_optimized']:.2f}%")
+    print(f"  Δ: +{(summary['efficiency_optimized'] - summary['efficiency_baseline']):.2f}%")
+
     print("\n" + "="*80)
     print("✅ v4.0 GENERATION COMPLETE")
     print("="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
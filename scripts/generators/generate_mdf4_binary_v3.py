@@ -10,16 +10,20 @@ Compatible: Vector CANape, ETAS INCA, Bosch WinDarab, MATLAB, DIAdem
 Sampling: 100 Hz (FIM standard)
 Quality: SNR 51+ dB, Physics Grade-A
 File Size: ~1.2 MB (industrial-grade binary)
+
+Uso:
+  python scripts/generators/generate_mdf4_binary_v3.py
+
+  from generate_mdf4_binary_v3 import build_mdf4_v3, create_mdf4_file_v3
+  mdf = build_mdf4_v3()                 # in memory
+  path = create_mdf4_file_v3(out_path)  # written to disk
 """
 
 import numpy as np
-import pandas as pd
-from asammdf import MDF, Signal
 from datetime import datetime
+from pathlib import Path
 import warnings
 
-warnings.filterwarnings('ignore')
-
 # ========================
 # CONSTANTS
 # ========================
@@ -32,6 +36,9 @@ SAMPLES_PER_LAP = FS * LAP_DURATION
 
 TIME = np.linspace(0, LAP_DURATION - 1/FS, SAMPLES_PER_LAP)
 
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+MDF4_FILE = PROJECT_ROOT / "data" / "mdf4" / "NLA_CaseStudy_Jerez_v3_Industrial.mf4"
+
 # ========================
 # GENERATE TELEMETRY (65 channels)
 # ========================
@@ -264,69 +271,96 @@ def generate_advanced_telemetry_v3(setup_type='baseline'):
 # ========================
 # CREATE MDF4 FILE
 # ========================
-def create_mdf4_file_v3():
+def _silent(*args, **kwargs):
+    pass
+
+
+def build_mdf4_v3(verbose: bool = False) -> 'MDF':
     """
-    Create professional-grade ASAM MDF 4.10 binary file.
+    Build the professional-grade ASAM MDF 4.10 object in memory (130 signals).
+
+    asammdf is imported here, so importing this module stays cheap.
     """
-    
-    print("\n🔧 Creating ASAM MDF 4.10 Binary File (v3.0)...")
-    
+    from asammdf import MDF, Signal
+
+    log = print if verbose else _silent
+
     # Create MDF object
     mdf = MDF(version='4.10')
-    
+
     # Metadata
     mdf.header.author = 'Nonlinear Lumping Analysis Research Group'
     mdf.header.organization = 'Formula Motorsport Engineering'
     mdf.header.project = 'MotoGP Turn 5 Jerez Gearing Optimization'
     mdf.header.subject = 'Glicko-2 Human-Machine Coupling Analysis'
-    
-    # ===== GENERATE SIGNALS =====
-    print("   ├─ Generating telemetry: Baseline setup...")
-    telemetry_baseline = generate_advanced_telemetry_v3(setup_type='baseline')
-    
-    print("   ├─ Generating telemetry: Optimized setup...")
-    telemetry_optimized = generate_advanced_telemetry_v3(setup_type='optimized')
-    
-    # ===== ADD SIGNALS TO MDF =====
-    print("   ├─ Adding 130 signals to MDF4...")
-    signal_count = 0
-    
-    for channel_name, data_baseline in telemetry_baseline.items():
-        # Baseline signal
-        sig_baseline = Signal(
-            samples=data_baseline,
-            timestamps=TIME,
-            name=f'{channel_name}_baseline',
-            unit=_get_unit(channel_name),
-            comment=f'{channel_name} - Baseline Setup'
-        )
-        mdf.append(sig_baseline)
-        signal_count += 1
-        
-        # Optimized signal
-        data_optimized = telemetry_optimized[channel_name]
-        sig_optimized = Signal(
-            samples=data_optimized,
-            timestamps=TIME,
-            name=f'{channel_name}_optimized',
-            unit=_get_unit(channel_name),
-            comment=f'{channel_name} - Optimized Setup'
-        )
-        mdf.append(sig_optimized)
-        signal_count += 1
-    
-    print(f"   └─ Total signals: {signal_count}")
-    
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+
+        # ===== GENERATE SIGNALS =====
+        log("   ├─ Generating telemetry: Baseline setup...")
+        telemetry_baseline = generate_advanced_telemetry_v3(setup_type='baseline')
+
+        log("   ├─ Generating telemetry: Optimized setup...")
+        telemetry_optimized = generate_advanced_telemetry_v3(setup_type='optimized')
+
+        # ===== ADD SIGNALS TO MDF =====
+        log("   ├─ Adding 130 signals to MDF4...")
+        signal_count = 0
+
+        for channel_name, data_baseline in telemetry_baseline.items():
+            # Baseline signal
+            sig_baseline = Signal(
+                samples=data_baseline,
+                timestamps=TIME,
+                name=f'{channel_name}_baseline',
+                unit=_get_unit(channel_name),
+                comment=f'{channel_name} - Baseline Setup'
+            )
+            mdf.append(sig_baseline)
+            signal_count += 1
+
+            # Optimized signal
+            data_optimized = telemetry_optimized[channel_name]
+            sig_optimized = Signal(
+                samples=data_optimized,
+                timestamps=TIME,
+                name=f'{channel_name}_optimized',
+                unit=_get_unit(channel_name),
+                comment=f'{channel_name} - Optimized Setup'
+            )
+            mdf.append(sig_optimized)
+            signal_count += 1
+
+    log(f"   └─ Total signals: {signal_count}")
+    return mdf
+
+
+def create_mdf4_file_v3(output_file: Path = MDF4_FILE, verbose: bool = True) -> Path:
+    """
+    Create professional-grade ASAM MDF 4.10 binary file.
+
+    Returns:
+        Path of the written file
+    """
+    log = print if verbose else _silent
+    log("\n🔧 Creating ASAM MDF 4.10 Binary File (v3.0)...")
+
+    mdf = build_mdf4_v3(verbose)
+
     # Save MDF4 file
-    output_file = 'NLA_CaseStudy_Jerez_v3_Industrial.mf4'
-    mdf.save(output_file, overwrite=True)
-    
-    print(f"\n✅ MDF4 file created: {output_file}")
-    print(f"   Version: ASAM MDF 4.10 (ISO 22901-1:2008)")
-    print(f"   Signals: {len(mdf.channels_db)} channels")
-    print(f"   Sampling: 100 Hz, {SAMPLES_PER_LAP} samples")
-    print(f"   Date: {datetime.now().isoformat()}\n")
-    
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        mdf.save(output_file, overwrite=True)
+
+    log(f"\n✅ MDF4 file created: {output_file}")
+    log(f"   Version: ASAM MDF 4.10 (ISO 22901-1:2008)")
+    log(f"   Signals: {len(mdf.channels_db)} channels")
+    log(f"   Sampling: 100 Hz, {SAMPLES_PER_LAP} samples")
+    log(f"   Date: {datetime.now().isoformat()}\n")
+
     return output_file
 
 def _get_unit(channel_name):
@@ -365,9 +399,9 @@ def _get_unit(channel_name):
 # ========================
 # MAIN EXECUTION
 # ========================
-if __name__ == '__main__':
+def main():
     import sys
-    
+
     try:
         output_file = create_mdf4_file_v3()
         print(f"🎉 MDF4 Industrial Binary Successfully Generated!")
@@ -378,3 +412,7 @@ if __name__ == '__main__':
         subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-q', 'asammdf'])
         output_file = create_mdf4_file_v3()
         print(f"🎉 MDF4 Industrial Binary Successfully Generated!")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,23 +4,32 @@ Generate Simulated/Emulated Data for Section 4 (H1/H2)
 This script generates CSV files for the data that is not available in the
 empirical dataset but is needed for Section 4:
 
-1. Skill Atom Segmentation (H2) - boundaries, IoU/F1
-2. MQTT Latency (H1) - edge-to-cloud communication
-3. Time Loss Attribution - performance breakdown
-
-These are simulated/emulated data based on:
-- Published benchmarks (AWS IoT, 5G NR)
-- Domain expert validation
-- Physics-based approximations
+1. Skill Atom Segmentation (H2) - boundaries, IoU/F1 (detected on the
+   MEGA dataset telemetry)
+2. MQTT Latency (H1) - edge-to-cloud communication (measured on a local
+   publish/subscribe harness)
+3. Time Loss Attribution - performance breakdown (distance-based sector
+   timing on the MEGA dataset)
+
+Sources:
+- Segmentation and time loss: computed on the MEGA dataset telemetry
+- Latency: measured on a localhost broker (no WAN hop; compare with the
+  published AWS IoT / 5G NR benchmarks)
 
 Author: NLA Research Group
 Date: January 2026
 """
 
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+from mqtt_latency_harness import load_telemetry_frames, run_latency_benchmark, summarize_latency
+from skill_atom_detector import segment_skill_atoms, summarize_segmentation
+from sector_timing import time_loss_table
+
 # Reproducibility
 SEED = 1854652912
 np.random.seed(SEED)
@@ -34,123 +43,20 @@ print("GENERATING SIMULATED/EMULATED DATA FOR SECTION 4")
 print("="*70)
 
 # ============================================================================
-# (A) SKILL ATOM SEGMENTATION BOUNDARIES & METRICS
+# (A) SKILL ATOM SEGMENTATION BOUNDARIES & METRICS (DETECTED)
 # ============================================================================
 
-print("\n[1/3] Generating Skill Atom Segmentation data...")
-
-# Define skill atoms with expert-validated boundaries
-# Based on the MEGA dataset active window (1000 samples @ 1 kHz)
-skill_atoms = []
-
-# Turn 5 is a Controlled Exit (CE) maneuver
-# We'll segment it into sub-phases for demonstration
-
-# Braking Entry (BE): Not present in this dataset (already at apex)
-# Apex Steering (AS): Transition from corner to straight
-# Controlled Exit (CE): Main acceleration phase
-
-# Generate 50 samples (expert validation set)
-for sample_id in range(50):
-    setup = 'baseline' if sample_id < 25 else 'optimized'
-    
-    # Ground truth boundaries (manually annotated)
-    # Times in seconds from start of active window
-    if setup == 'baseline':
-        # Baseline has more variability in boundaries
-        gt_as_start = np.random.uniform(0.00, 0.15)
-        gt_as_end = np.random.uniform(0.15, 0.35)
-        gt_ce_start = gt_as_end
-        gt_ce_end = np.random.uniform(0.85, 1.00)
-    else:
-        # Optimized has more consistent boundaries
-        gt_as_start = np.random.uniform(0.00, 0.10)
-        gt_as_end = np.random.uniform(0.20, 0.30)
-        gt_ce_start = gt_as_end
-        gt_ce_end = np.random.uniform(0.90, 1.00)
-    
-    # Predicted boundaries (heuristic-based detection)
-    # Add realistic detection error (~±50-150ms)
-    pred_as_start = gt_as_start + np.random.normal(0, 0.05)
-    pred_as_end = gt_as_end + np.random.normal(0, 0.06)
-    pred_ce_start = gt_ce_start + np.random.normal(0, 0.04)
-    pred_ce_end = gt_ce_end + np.random.normal(0, 0.05)
-    
-    # Clip to valid range
-    pred_as_start = np.clip(pred_as_start, 0, 1)
-    pred_as_end = np.clip(pred_as_end, pred_as_start, 1)
-    pred_ce_start = np.clip(pred_ce_start, pred_as_end, 1)
-    pred_ce_end = np.clip(pred_ce_end, pred_ce_start, 1)
-    
-    # Calculate IoU for each skill atom
-    def calculate_iou(gt_start, gt_end, pred_start, pred_end):
-        intersection_start = max(gt_start, pred_start)
-        intersection_end = min(gt_end, pred_end)
-        intersection = max(0, intersection_end - intersection_start)
-        
-        union_start = min(gt_start, pred_start)
-        union_end = max(gt_end, pred_end)
-        union = union_end - union_start
-        
-        return intersection / union if union > 0 else 0
-    
-    iou_as = calculate_iou(gt_as_start, gt_as_end, pred_as_start, pred_as_end)
-    iou_ce = calculate_iou(gt_ce_start, gt_ce_end, pred_ce_start, pred_ce_end)
-    
-    # Apex Steering
-    skill_atoms.append({
-        'sample_id': sample_id,
-        'setup': setup,
-        'skill_atom': 'AS',
-        'gt_start_time_s': gt_as_start,
-        'gt_end_time_s': gt_as_end,
-        'pred_start_time_s': pred_as_start,
-        'pred_end_time_s': pred_as_end,
-        'temporal_iou': iou_as,
-        'detection_correct': 1 if iou_as > 0.5 else 0,
-        'expert_validated': 1,
-    })
-    
-    # Controlled Exit
-    skill_atoms.append({
-        'sample_id': sample_id,
-        'setup': setup,
-        'skill_atom': 'CE',
-        'gt_start_time_s': gt_ce_start,
-        'gt_end_time_s': gt_ce_end,
-        'pred_start_time_s': pred_ce_start,
-        'pred_end_time_s': pred_ce_end,
-        'temporal_iou': iou_ce,
-        'detection_correct': 1 if iou_ce > 0.5 else 0,
-        'expert_validated': 1,
-    })
-
-df_segmentation = pd.DataFrame(skill_atoms)
-
-# Calculate precision, recall, F1 per skill atom
-summary = []
-for atom in ['AS', 'CE']:
-    df_atom = df_segmentation[df_segmentation['skill_atom'] == atom]
-    
-    true_positives = df_atom['detection_correct'].sum()
-    false_positives = len(df_atom) - true_positives
-    false_negatives = 0  # Assuming all ground truth atoms were detected
-    
-    precision = true_positives / (true_positives + false_positives)
-    recall = true_positives / (true_positives + false_negatives) if (true_positives + false_negatives) > 0 else 1.0
-    f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
-    
-    summary.append({
-        'skill_atom': atom,
-        'precision': precision,
-        'recall': recall,
-        'f1_score': f1,
-        'mean_temporal_iou': df_atom['temporal_iou'].mean(),
-        'std_temporal_iou': df_atom['temporal_iou'].std(),
-        'samples': len(df_atom),
-    })
-
-df_segmentation_summary = pd.DataFrame(summary)
+print("\n[1/3] Detecting Skill Atom Segmentation boundaries...")
+
+# Apex Steering (AS) and Controlled Exit (CE) detected in every turn of the
+# MEGA dataset with hysteresis thresholds on throttle, lateral g and the
+# steering proxy; ground truth is the generator's known phase layout.
+# See scripts/utils/skill_atom_detector.py.
+df_telemetry = pd.read_csv(BASE_DIR / 'data' / 'datasets' / 'NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv',
+                           usecols=['time', 'throttle_position', 'accel_lat_g', 'gyro_yaw_dps',
+                                    'lap', 'setup'])
+df_segmentation = segment_skill_atoms(df_telemetry)
+df_segmentation_summary = summarize_segmentation(df_segmentation)
 
 # Save
 segmentation_path = OUTPUT_DIR / 'Table_v4_Skill_Atom_Segmentation.csv'
@@ -165,82 +71,18 @@ print(f"\n  Performance Summary:")
 print(df_segmentation_summary.to_string(index=False))
 
 # ============================================================================
-# (B) MQTT LATENCY DATA (EMULATED)
+# (B) MQTT LATENCY DATA (MEASURED, LOCAL BROKER)
 # ============================================================================
 
-print("\n[2/3] Generating MQTT latency data (emulated)...")
-
-# Simulate 1000 MQTT messages with realistic latency distributions
-# Based on AWS IoT Core benchmarks and 5G NR parameters
-
-mqtt_messages = []
-
-for msg_id in range(1000):
-    # Edge→Gateway latency (local network)
-    # Raspberry Pi 4 + Mosquitto on same subnet
-    # Normal distribution: mean=8ms, std=3ms
-    edge_to_gateway = np.random.gamma(shape=4, scale=2) + 2  # Gamma for realistic tail
-    
-    # Gateway→Cloud latency (AWS IoT Core)
-    # 5G NR + public internet
-    # Bimodal: fast path (5G) vs slow path (congestion)
-    if np.random.random() < 0.85:  # 85% fast path
-        gateway_to_cloud = np.random.gamma(shape=10, scale=5) + 20
-    else:  # 15% slow path (congestion)
-        gateway_to_cloud = np.random.gamma(shape=5, scale=15) + 80
-    
-    # Total end-to-end
-    total_latency = edge_to_gateway + gateway_to_cloud
-    
-    # Packet loss (rare events)
-    packet_lost = 1 if np.random.random() < 0.0003 else 0
-    
-    # Message size (telemetry payload)
-    # 37 channels × 4 bytes + overhead
-    message_size_bytes = 148 + np.random.randint(-10, 30)
-    
-    # QoS level (always 1 for this test)
-    qos = 1
-    
-    mqtt_messages.append({
-        'message_id': msg_id,
-        'timestamp_s': msg_id * 0.01,  # 100 Hz sampling
-        'edge_to_gateway_ms': edge_to_gateway,
-        'gateway_to_cloud_ms': gateway_to_cloud,
-        'total_latency_ms': total_latency,
-        'packet_lost': packet_lost,
-        'message_size_bytes': message_size_bytes,
-        'qos_level': qos,
-    })
-
-df_mqtt = pd.DataFrame(mqtt_messages)
-
-# Calculate summary statistics
-mqtt_summary = {
-    'metric': ['Edge→Gateway', 'Gateway→Cloud', 'End-to-End'],
-    'p50_latency_ms': [
-        df_mqtt['edge_to_gateway_ms'].quantile(0.50),
-        df_mqtt['gateway_to_cloud_ms'].quantile(0.50),
-        df_mqtt['total_latency_ms'].quantile(0.50),
-    ],
-    'p95_latency_ms': [
-        df_mqtt['edge_to_gateway_ms'].quantile(0.95),
-        df_mqtt['gateway_to_cloud_ms'].quantile(0.95),
-        df_mqtt['total_latency_ms'].quantile(0.95),
-    ],
-    'p99_latency_ms': [
-        df_mqtt['edge_to_gateway_ms'].quantile(0.99),
-        df_mqtt['gateway_to_cloud_ms'].quantile(0.99),
-        df_mqtt['total_latency_ms'].quantile(0.99),
-    ],
-    'max_latency_ms': [
-        df_mqtt['edge_to_gateway_ms'].max(),
-        df_mqtt['gateway_to_cloud_ms'].max(),
-        df_mqtt['total_latency_ms'].max(),
-    ],
-    'packet_loss_pct': [0.03, 0.03, df_mqtt['packet_lost'].mean() * 100],
-}
-df_mqtt_summary = pd.DataFrame(mqtt_summary)
+print("\n[2/3] Measuring MQTT latency data (local pub/sub harness)...")
+
+# Real transport instead of gamma draws: 1000 v4 telemetry samples (37
+# channels) published at 100 Hz through a localhost broker with QoS 1 acks.
+# See scripts/utils/mqtt_latency_harness.py for batching/rate sweeps.
+telemetry_frames = load_telemetry_frames(num_samples=1000)
+df_mqtt = run_latency_benchmark(telemetry_frames, rate_hz=100, batch_size=1, qos=1,
+                                num_messages=1000)
+df_mqtt_summary = summarize_latency(df_mqtt)
 
 # Save
 mqtt_path = OUTPUT_DIR / 'Table_v4_MQTT_Latency.csv'
@@ -255,87 +97,19 @@ print(f"\n  Latency Summary:")
 print(df_mqtt_summary.to_string(index=False))
 
 # ============================================================================
-# (C) TIME LOSS ATTRIBUTION (APPROXIMATED FROM MEGA DATASET)
+# (C) TIME LOSS ATTRIBUTION (DISTANCE-BASED SECTORS, MEGA DATASET)
 # ============================================================================
 
-print("\n[3/3] Generating Time Loss Attribution data...")
-
-# Load MEGA dataset to calculate approximate time loss
-mega_path = Path('data/datasets/NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv')
-df_mega = pd.read_csv(mega_path)
-
-# Filter active window
-baseline_active = df_mega[(df_mega['setup'] == 'baseline') & (df_mega['speed_kmh'] > 1)]
-optimized_active = df_mega[(df_mega['setup'] == 'optimized') & (df_mega['speed_kmh'] > 1)]
-
-# Calculate sector times (approximate)
-# Divide the 1-second window into 4 sectors (250ms each)
-time_loss_data = []
-
-for sector in range(4):
-    sector_name = f"Sector_{sector+1}"
-    
-    # Get samples for this sector
-    baseline_sector = baseline_active.iloc[sector*250:(sector+1)*250]
-    optimized_sector = optimized_active.iloc[sector*250:(sector+1)*250]
-    
-    # Calculate average speed
-    baseline_speed = baseline_sector['speed_kmh'].mean()
-    optimized_speed = optimized_sector['speed_kmh'].mean()
-    
-    # Approximate time for 100m sector (arbitrary distance)
-    sector_distance_m = 100
-    baseline_time = (sector_distance_m / (baseline_speed / 3.6)) if baseline_speed > 0 else 0
-    optimized_time = (sector_distance_m / (optimized_speed / 3.6)) if optimized_speed > 0 else 0
-    
-    time_delta = baseline_time - optimized_time
-    
-    # Attribute time loss to factors
-    # Based on correlations in the data
-    
-    # Setup contribution (RPM drop, slip)
-    rpm_diff = baseline_sector['engine_rpm'].mean() - optimized_sector['engine_rpm'].mean()
-    slip_diff = baseline_sector['wheel_slip_percent'].mean() - optimized_sector['wheel_slip_percent'].mean()
-    setup_contribution = 0.6 * time_delta  # 60% of gain is setup
-    
-    # Rider contribution (throttle control, consistency)
-    throttle_std_diff = baseline_sector['throttle_position'].std() - optimized_sector['throttle_position'].std()
-    rider_contribution = 0.3 * time_delta  # 30% is rider confidence
-    
-    # Other factors (track conditions, tire wear, etc.)
-    other_contribution = 0.1 * time_delta  # 10% other
-    
-    time_loss_data.append({
-        'sector': sector_name,
-        'baseline_time_s': baseline_time,
-        'optimized_time_s': optimized_time,
-        'time_delta_s': time_delta,
-        'setup_contribution_s': setup_contribution,
-        'rider_contribution_s': rider_contribution,
-        'other_contribution_s': other_contribution,
-        'baseline_avg_speed_kmh': baseline_speed,
-        'optimized_avg_speed_kmh': optimized_speed,
-        'rpm_delta': rpm_diff,
-        'slip_delta_pct': slip_diff,
-    })
-
-df_time_loss = pd.DataFrame(time_loss_data)
-
-# Add total row
-total_row = {
-    'sector': 'Total',
-    'baseline_time_s': df_time_loss['baseline_time_s'].sum(),
-    'optimized_time_s': df_time_loss['optimized_time_s'].sum(),
-    'time_delta_s': df_time_loss['time_delta_s'].sum(),
-    'setup_contribution_s': df_time_loss['setup_contribution_s'].sum(),
-    'rider_contribution_s': df_time_loss['rider_contribution_s'].sum(),
-    'other_contribution_s': df_time_loss['other_contribution_s'].sum(),
-    'baseline_avg_speed_kmh': df_time_loss['baseline_avg_speed_kmh'].mean(),
-    'optimized_avg_speed_kmh': df_time_loss['optimized_avg_speed_kmh'].mean(),
-    'rpm_delta': df_time_loss['rpm_delta'].mean(),
-    'slip_delta_pct': df_time_loss['slip_delta_pct'].mean(),
-}
-df_time_loss = pd.concat([df_time_loss, pd.DataFrame([total_row])], ignore_index=True)
+print("\n[3/3] Computing Time Loss Attribution (distance-based sectors)...")
+
+# Sector times from distance (cumulative trapezoid of speed) with the
+# crossings found by searchsorted; the delta vs the optimized lap is
+# attributed to setup/rider/other by least squares on channel differences.
+# See scripts/utils/sector_timing.py.
+mega_path = BASE_DIR / 'data' / 'datasets' / 'NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv'
+df_mega = pd.read_csv(mega_path, usecols=['time', 'speed_kmh', 'engine_rpm', 'wheel_slip_percent',
+                                          'throttle_position', 'lap', 'setup'])
+df_time_loss = time_loss_table(df_mega, baseline='baseline', optimized='optimized', num_sectors=4)
 
 # Save
 time_loss_path = OUTPUT_DIR / 'Table_v4_Time_Loss_Attribution.csv'
@@ -372,6 +146,6 @@ print(f"  • Skill Atom F1-Score: {df_segmentation_summary['f1_score'].mean():.
 print(f"  • Temporal IoU: {df_segmentation_summary['mean_temporal_iou'].mean():.3f}")
 print(f"  • MQTT p95 Latency: {df_mqtt_summary.loc[2, 'p95_latency_ms']:.1f} ms")
 print(f"  • Total Time Gain: {df_time_loss.loc[4, 'time_delta_s']:.3f} s")
-print(f"  • Setup Contribution: {df_time_loss.loc[4, 'setup_contribution_s']:.3f} s (60%)")
+print(f"  • Setup Contribution: {df_time_loss.loc[4, 'setup_contribution_s']:.3f} s")
 
 print("\n✅ All simulated/emulated data ready for Section 4")
@@ -2,244 +2,347 @@
 """
 v4.0 COMPREHENSIVE METRICS & TABLES GENERATION
 Create publication-ready tables for all metrics
+
+Table_v4_Spectral_Band_Energy holds the Welch band energies of the
+suspension, damper velocity and IMU channels per turn and setup
+(spectral_analysis.py); the command line caches the spectral payload in
+outputs/cache/figures/ by dataset fingerprint, the same entry Figure 13
+of visualize_results_v4_advanced.py reads.
+
+Uso:
+  python scripts/generators/generate_tables_v4.py [dataset_path | store_dir]
+
+  from generate_tables_v4 import generate_tables
+  tables = generate_tables(df_v4, out_dir=None, verbose=False)   # {name: DataFrame}, no I/O
 """
 
-import pandas as pd
-import numpy as np
-from scipy import stats
+from __future__ import annotations
+
+import sys
 from pathlib import Path
-import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "utils"))
+
+from channel_store import ChannelStore, is_store
+from figure_cache import FigureCache, dataset_fingerprint, frame_fingerprint
+from lazy_import import lazy_import
+from spectral_analysis import band_energy_table, cached_spectral_analysis, spectral_analysis
+from stage_metrics import null_stage
+
+pd = lazy_import('pandas')
+stats = lazy_import('scipy.stats')
 
 # Setup paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_DIR = PROJECT_ROOT / "data" / "datasets"
 OUTPUTS_DIR = PROJECT_ROOT / "data" / "tables"
-OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
-
-# Load v4.0 dataset
-dataset_file = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
-if not dataset_file.exists():
-    # Fallback to current directory
-    dataset_file = "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
-
-df_v4 = pd.read_csv(dataset_file)
-df_baseline = df_v4[df_v4['setup'] == 'baseline']
-df_optimized = df_v4[df_v4['setup'] == 'optimized']
-
-print("\n" + "="*140)
-print("🎯 v4.0 COMPREHENSIVE METRICS & TABLES - MotoGP Jerez Turn 5 Optimization")
-print("="*140)
-
-# ========================
-# TABLE 1: CORE METRICS (Engine, Transmission, Chassis)
-# ========================
-print("\n📊 TABLE 1: CORE PERFORMANCE METRICS (v4.0)")
-print("-"*140)
-
-metrics_core = {
-    'RPM Mean': (df_baseline['engine_rpm'].mean(), df_optimized['engine_rpm'].mean()),
-    'RPM Max': (df_baseline['engine_rpm'].max(), df_optimized['engine_rpm'].max()),
-    'RPM Std Dev': (df_baseline['engine_rpm'].std(), df_optimized['engine_rpm'].std()),
-    'Torque Mean (Nm)': (df_baseline['engine_torque_nm'].mean(), df_optimized['engine_torque_nm'].mean()),
-    'Speed Mean (km/h)': (df_baseline['speed_kmh'].mean(), df_optimized['speed_kmh'].mean()),
-    'Speed Max (km/h)': (df_baseline['speed_kmh'].max(), df_optimized['speed_kmh'].max()),
-    'Throttle Mean (%)': (df_baseline['throttle_position'].mean()*100, df_optimized['throttle_position'].mean()*100),
-    'Gear Mean': (df_baseline['gear_position'].mean(), df_optimized['gear_position'].mean()),
-}
-
-print(f"{'Metric':<30} | {'Baseline':>15} | {'Optimized':>15} | {'Improvement':>15}")
-print("-"*140)
-for metric_name, (baseline_val, optimized_val) in metrics_core.items():
-    delta = ((baseline_val - optimized_val) / baseline_val * 100) if baseline_val != 0 else 0
-    print(f"{metric_name:<30} | {baseline_val:>15.2f} | {optimized_val:>15.2f} | {delta:>+14.1f}%")
-
-# ========================
-# TABLE 2: DYNAMICS & CONTROL (Acceleration, Braking, Grip)
-# ========================
-print("\n\n📊 TABLE 2: DYNAMICS & CONTROL METRICS (v4.0)")
-print("-"*140)
-
-metrics_dynamics = {
-    'Longitudinal Accel (g)': (df_baseline['accel_lon_g'].mean(), df_optimized['accel_lon_g'].mean()),
-    'Lateral Accel (g)': (df_baseline['accel_lat_g'].mean(), df_optimized['accel_lat_g'].mean()),
-    'Vertical Accel (g)': (df_baseline['accel_vert_g'].mean(), df_optimized['accel_vert_g'].mean()),
-    'Wheel Slip (%)': (df_baseline['wheel_slip_percent'].mean(), df_optimized['wheel_slip_percent'].mean()),
-    'Brake Pressure (bar)': (df_baseline['brake_pressure_bar'].mean(), df_optimized['brake_pressure_bar'].mean()),
-    'Brake Temp (°C)': (df_baseline['brake_temperature_c'].mean(), df_optimized['brake_temperature_c'].mean()),
-    'Brake Balance (%)': (df_baseline['brake_balance_percent'].mean(), df_optimized['brake_balance_percent'].mean()),
-}
-
-print(f"{'Metric':<30} | {'Baseline':>15} | {'Optimized':>15} | {'Improvement':>15}")
-print("-"*140)
-for metric_name, (baseline_val, optimized_val) in metrics_dynamics.items():
-    delta = ((baseline_val - optimized_val) / baseline_val * 100) if baseline_val != 0 else 0
-    print(f"{metric_name:<30} | {baseline_val:>15.2f} | {optimized_val:>15.2f} | {delta:>+14.1f}%")
-
-# ========================
-# TABLE 3: TIRE & SUSPENSION (Thermal, Pressures, Travel)
-# ========================
-print("\n\n📊 TABLE 3: TIRE & SUSPENSION METRICS (v4.0)")
-print("-"*140)
-
-tire_fl_temp_b = df_baseline['tire_temp_fl_c'].mean()
-tire_fl_temp_o = df_optimized['tire_temp_fl_c'].mean()
-tire_press_fl_b = df_baseline['tire_pressure_fl_bar'].mean()
-tire_press_fl_o = df_optimized['tire_pressure_fl_bar'].mean()
-
-metrics_chassis = {
-    'Tire Temp FL (°C)': (tire_fl_temp_b, tire_fl_temp_o),
-    'Tire Pressure FL (bar)': (tire_press_fl_b, tire_press_fl_o),
-    'Susp Travel FL (mm)': (df_baseline['suspension_fl_travel_mm'].mean(), df_optimized['suspension_fl_travel_mm'].mean()),
-    'Susp Travel RL (mm)': (df_baseline['suspension_rl_travel_mm'].mean(), df_optimized['suspension_rl_travel_mm'].mean()),
-}
-
-print(f"{'Metric':<30} | {'Baseline':>15} | {'Optimized':>15} | {'Improvement':>15}")
-print("-"*140)
-for metric_name, (baseline_val, optimized_val) in metrics_chassis.items():
-    delta = ((baseline_val - optimized_val) / baseline_val * 100) if baseline_val != 0 else 0
-    print(f"{metric_name:<30} | {baseline_val:>15.2f} | {optimized_val:>15.2f} | {delta:>+14.1f}%")
-
-# ========================
-# TABLE 4: AERODYNAMICS & EFFICIENCY (NEW v4.0)
-# ========================
-print("\n\n📊 TABLE 4: AERODYNAMICS & EFFICIENCY METRICS (NEW v4.0)")
-print("-"*140)
-
-metrics_aero = {
-    'Aero Downforce (N)': (df_baseline['aero_downforce_n'].mean(), df_optimized['aero_downforce_n'].mean()),
-    'Aero Drag (N)': (df_baseline['aero_drag_n'].mean(), df_optimized['aero_drag_n'].mean()),
-    'Gear Ratio Efficiency (%)': (df_baseline['gear_ratio_efficiency_percent'].mean(), df_optimized['gear_ratio_efficiency_percent'].mean()),
-    'Engine Efficiency (%)': (df_baseline['engine_efficiency_percent'].mean(), df_optimized['engine_efficiency_percent'].mean()),
-    'Battery Voltage (V)': (df_baseline['battery_voltage_v'].mean(), df_optimized['battery_voltage_v'].mean()),
-    'Battery Current (A)': (df_baseline['battery_current_a'].mean(), df_optimized['battery_current_a'].mean()),
-}
-
-print(f"{'Metric':<30} | {'Baseline':>15} | {'Optimized':>15} | {'Improvement':>15}")
-print("-"*140)
-for metric_name, (baseline_val, optimized_val) in metrics_aero.items():
-    if 'Efficiency' in metric_name or 'Voltage' in metric_name:
-        delta = optimized_val - baseline_val  # For efficiency/voltage, higher is better
-    else:
-        delta = ((baseline_val - optimized_val) / baseline_val * 100) if baseline_val != 0 else 0
-    print(f"{metric_name:<30} | {baseline_val:>15.2f} | {optimized_val:>15.2f} | {delta:>+14.2f}{'%' if '%' in metric_name else ''}")
-
-# ========================
-# TABLE 5: GLICKO-2 DEEP METRICS (Core Metric)
-# ========================
-print("\n\n📊 TABLE 5: GLICKO-2 VOLATILITY METRICS - PRIMARY OUTCOME (v4.0)")
-print("-"*140)
-
-glicko_stats = {
-    'σ Mean (volatility)': (df_baseline['glicko_volatility_sigma'].mean(), df_optimized['glicko_volatility_sigma'].mean()),
-    'σ Std Dev': (df_baseline['glicko_volatility_sigma'].std(), df_optimized['glicko_volatility_sigma'].std()),
-    'σ Max': (df_baseline['glicko_volatility_sigma'].max(), df_optimized['glicko_volatility_sigma'].max()),
-    'σ Min': (df_baseline['glicko_volatility_sigma'].min(), df_optimized['glicko_volatility_sigma'].min()),
-    'σ Median': (df_baseline['glicko_volatility_sigma'].median(), df_optimized['glicko_volatility_sigma'].median()),
-    'σ Q1 (25%)': (df_baseline['glicko_volatility_sigma'].quantile(0.25), df_optimized['glicko_volatility_sigma'].quantile(0.25)),
-    'σ Q3 (75%)': (df_baseline['glicko_volatility_sigma'].quantile(0.75), df_optimized['glicko_volatility_sigma'].quantile(0.75)),
-}
-
-print(f"{'Metric':<30} | {'Baseline':>15} | {'Optimized':>15} | {'Improvement':>15}")
-print("-"*140)
-for metric_name, (baseline_val, optimized_val) in glicko_stats.items():
-    delta = ((baseline_val - optimized_val) / baseline_val * 100) if baseline_val != 0 else 0
-    print(f"{metric_name:<30} | {baseline_val:>15.4f} | {optimized_val:>15.4f} | {delta:>+14.1f}%")
-
-# ========================
-# TABLE 6: STATISTICAL TESTS (Hypothesis Testing)
-# ========================
-print("\n\n📊 TABLE 6: HYPOTHESIS TESTING & EFFECT SIZE (v4.0)")
-print("-"*140)
-
-# Welch's t-test
-t_stat, p_value = stats.ttest_ind(df_baseline['glicko_volatility_sigma'],
-                                   df_optimized['glicko_volatility_sigma'],
-                                   equal_var=False)
-
-# Cohen's d
-pooled_std = np.sqrt((df_baseline['glicko_volatility_sigma'].std()**2 +
-                      df_optimized['glicko_volatility_sigma'].std()**2) / 2)
-cohens_d = (df_baseline['glicko_volatility_sigma'].mean() -
-            df_optimized['glicko_volatility_sigma'].mean()) / pooled_std
-
-# Levene's test (equal variances)
-levene_stat, levene_p = stats.levene(df_baseline['glicko_volatility_sigma'],
-                                     df_optimized['glicko_volatility_sigma'])
-
-# KS test
-ks_stat, ks_p = stats.ks_2samp(df_baseline['glicko_volatility_sigma'],
-                               df_optimized['glicko_volatility_sigma'])
-
-print(f"\nTest Type                    | Test Statistic      | p-value        | Interpretation")
-print("-"*140)
-print(f"{'Welch t-test':<28} | t = {t_stat:>15.4f} | {p_value:>14.2e} | HIGHLY SIGNIFICANT ✅")
-print(f"{'Cohen d (effect size)':<28} | d = {cohens_d:>15.4f} | {'':>14} | LARGE EFFECT (d>0.8)")
-print(f"{'Levene test (var equality)':<28} | F = {levene_stat:>15.4f} | {levene_p:>14.2e} | {'UNEQUAL VARIANCES' if levene_p < 0.05 else 'EQUAL VARIANCES'}")
-print(f"{'KS test (distribution)':<28} | KS = {ks_stat:>14.4f} | {ks_p:>14.2e} | DISTRIBUTIONS DIFFER ✅")
-
-# ========================
-# TABLE 7: SAMPLE CHARACTERISTICS
-# ========================
-print("\n\n📊 TABLE 7: SAMPLE CHARACTERISTICS & DATA QUALITY (v4.0)")
-print("-"*140)
-
-print(f"{'Characteristic':<30} | {'Baseline':>15} | {'Optimized':>15}")
-print("-"*140)
-print(f"{'Sample Size':<30} | {len(df_baseline):>15} | {len(df_optimized):>15}")
-print(f"{'Duration (seconds)':<30} | {df_baseline['time'].max() - df_baseline['time'].min():>15.2f} | {df_optimized['time'].max() - df_optimized['time'].min():>15.2f}")
-print(f"{'Missing Values':<30} | {df_baseline.isnull().sum().sum():>15} | {df_optimized.isnull().sum().sum():>15}")
-print(f"{'Total Channels':<30} | {len(df_baseline.columns):>15} | {len(df_optimized.columns):>15}")
-
-# ========================
-# EXPORT TABLES TO CSV
-# ========================
-print("\n\n" + "="*140)
-print("✅ EXPORTING TABLES TO CSV")
-print("="*140)
-
-# Create summary table for paper
-summary_data = {
-    'Metric': list(glicko_stats.keys()),
-    'Baseline': [val[0] for val in glicko_stats.values()],
-    'Optimized': [val[1] for val in glicko_stats.values()],
-    'Improvement (%)': [((val[0]-val[1])/val[0]*100) if val[0] != 0 else 0 for val in glicko_stats.values()],
-}
-df_summary = pd.DataFrame(summary_data)
-summary_file = OUTPUTS_DIR / 'Table_v4_Glicko_Summary.csv'
-df_summary.to_csv(summary_file, index=False)
-print(f"✅ {summary_file.name}")
-
-# Create combined metrics table
-combined_data = []
-for table_name, metrics_dict in [('Core', metrics_core), ('Dynamics', metrics_dynamics), 
-                                 ('Chassis', metrics_chassis), ('Aero', metrics_aero)]:
-    for metric_name, (baseline_val, optimized_val) in metrics_dict.items():
+DATASET_FILE = DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
+FIGURE_CACHE_DIR = PROJECT_ROOT / "outputs" / "cache" / "figures"   # shared with Figure 13
+SPECTRAL_FOCUS_TURN = 'Turn5'
+
+
+def _silent(*args, **kwargs):
+    pass
+
+
+def compute_metrics(df_baseline: pd.DataFrame, df_optimized: pd.DataFrame) -> Dict[str, dict]:
+    """
+    Baseline/optimized values of every table metric plus the σ hypothesis tests.
+
+    Returns:
+        Dict with 'core', 'dynamics', 'chassis', 'aero', 'glicko' ({metric: (baseline, optimized)})
+        and 'tests' ({name: value})
+    """
+    # ========================
+    # TABLE 1: CORE METRICS (Engine, Transmission, Chassis)
+    # ========================
+    metrics_core = {
+        'RPM Mean': (df_baseline['engine_rpm'].mean(), df_optimized['engine_rpm'].mean()),
+        'RPM Max': (df_baseline['engine_rpm'].max(), df_optimized['engine_rpm'].max()),
+        'RPM Std Dev': (df_baseline['engine_rpm'].std(), df_optimized['engine_rpm'].std()),
+        'Torque Mean (Nm)': (df_baseline['engine_torque_nm'].mean(), df_optimized['engine_torque_nm'].mean()),
+        'Speed Mean (km/h)': (df_baseline['speed_kmh'].mean(), df_optimized['speed_kmh'].mean()),
+        'Speed Max (km/h)': (df_baseline['speed_kmh'].max(), df_optimized['speed_kmh'].max()),
+        'Throttle Mean (%)': (df_baseline['throttle_position'].mean()*100, df_optimized['throttle_position'].mean()*100),
+        'Gear Mean': (df_baseline['gear_position'].mean(), df_optimized['gear_position'].mean()),
+    }
+
+    # ========================
+    # TABLE 2: DYNAMICS & CONTROL (Acceleration, Braking, Grip)
+    # ========================
+    metrics_dynamics = {
+        'Longitudinal Accel (g)': (df_baseline['accel_lon_g'].mean(), df_optimized['accel_lon_g'].mean()),
+        'Lateral Accel (g)': (df_baseline['accel_lat_g'].mean(), df_optimized['accel_lat_g'].mean()),
+        'Vertical Accel (g)': (df_baseline['accel_vert_g'].mean(), df_optimized['accel_vert_g'].mean()),
+        'Wheel Slip (%)': (df_baseline['wheel_slip_percent'].mean(), df_optimized['wheel_slip_percent'].mean()),
+        'Brake Pressure (bar)': (df_baseline['brake_pressure_bar'].mean(), df_optimized['brake_pressure_bar'].mean()),
+        'Brake Temp (°C)': (df_baseline['brake_temperature_c'].mean(), df_optimized['brake_temperature_c'].mean()),
+        'Brake Balance (%)': (df_baseline['brake_balance_percent'].mean(), df_optimized['brake_balance_percent'].mean()),
+    }
+
+    # ========================
+    # TABLE 3: TIRE & SUSPENSION (Thermal, Pressures, Travel)
+    # ========================
+    metrics_chassis = {
+        'Tire Temp FL (°C)': (df_baseline['tire_temp_fl_c'].mean(), df_optimized['tire_temp_fl_c'].mean()),
+        'Tire Pressure FL (bar)': (df_baseline['tire_pressure_fl_bar'].mean(), df_optimized['tire_pressure_fl_bar'].mean()),
+        'Susp Travel FL (mm)': (df_baseline['suspension_fl_travel_mm'].mean(), df_optimized['suspension_fl_travel_mm'].mean()),
+        'Susp Travel RL (mm)': (df_baseline['suspension_rl_travel_mm'].mean(), df_optimized['suspension_rl_travel_mm'].mean()),
+    }
+
+    # ========================
+    # TABLE 4: AERODYNAMICS & EFFICIENCY (NEW v4.0)
+    # ========================
+    metrics_aero = {
+        'Aero Downforce (N)': (df_baseline['aero_downforce_n'].mean(), df_optimized['aero_downforce_n'].mean()),
+        'Aero Drag (N)': (df_baseline['aero_drag_n'].mean(), df_optimized['aero_drag_n'].mean()),
+        'Gear Ratio Efficiency (%)': (df_baseline['gear_ratio_efficiency_percent'].mean(), df_optimized['gear_ratio_efficiency_percent'].mean()),
+        'Engine Efficiency (%)': (df_baseline['engine_efficiency_percent'].mean(), df_optimized['engine_efficiency_percent'].mean()),
+        'Battery Voltage (V)': (df_baseline['battery_voltage_v'].mean(), df_optimized['battery_voltage_v'].mean()),
+        'Battery Current (A)': (df_baseline['battery_current_a'].mean(), df_optimized['battery_current_a'].mean()),
+    }
+
+    # ========================
+    # TABLE 5: GLICKO-2 DEEP METRICS (Core Metric)
+    # ========================
+    sigma_b = df_baseline['glicko_volatility_sigma']
+    sigma_o = df_optimized['glicko_volatility_sigma']
+    glicko_stats = {
+        'σ Mean (volatility)': (sigma_b.mean(), sigma_o.mean()),
+        'σ Std Dev': (sigma_b.std(), sigma_o.std()),
+        'σ Max': (sigma_b.max(), sigma_o.max()),
+        'σ Min': (sigma_b.min(), sigma_o.min()),
+        'σ Median': (sigma_b.median(), sigma_o.median()),
+        'σ Q1 (25%)': (sigma_b.quantile(0.25), sigma_o.quantile(0.25)),
+        'σ Q3 (75%)': (sigma_b.quantile(0.75), sigma_o.quantile(0.75)),
+    }
+
+    # ========================
+    # TABLE 6: STATISTICAL TESTS (Hypothesis Testing)
+    # ========================
+    # Welch's t-test
+    t_stat, p_value = stats.ttest_ind(sigma_b, sigma_o, equal_var=False)
+
+    # Cohen's d
+    pooled_std = np.sqrt((sigma_b.std()**2 + sigma_o.std()**2) / 2)
+    cohens_d = (sigma_b.mean() - sigma_o.mean()) / pooled_std
+
+    # Levene's test (equal variances)
+    levene_stat, levene_p = stats.levene(sigma_b, sigma_o)
+
+    # KS test
+    ks_stat, ks_p = stats.ks_2samp(sigma_b, sigma_o)
+
+    return {
+        'core': metrics_core,
+        'dynamics': metrics_dynamics,
+        'chassis': metrics_chassis,
+        'aero': metrics_aero,
+        'glicko': glicko_stats,
+        'tests': {
+            't_stat': t_stat, 'p_value': p_value, 'cohens_d': cohens_d,
+            'levene_stat': levene_stat, 'levene_p': levene_p, 'ks_stat': ks_stat, 'ks_p': ks_p,
+        },
+    }
+
+
+def build_tables(metrics: Dict[str, dict]) -> Dict[str, pd.DataFrame]:
+    """CSV tables of the paper: {file stem: DataFrame}."""
+    glicko_stats = metrics['glicko']
+    tests = metrics['tests']
+
+    # Create summary table for paper
+    summary_data = {
+        'Metric': list(glicko_stats.keys()),
+        'Baseline': [val[0] for val in glicko_stats.values()],
+        'Optimized': [val[1] for val in glicko_stats.values()],
+        'Improvement (%)': [((val[0]-val[1])/val[0]*100) if val[0] != 0 else 0 for val in glicko_stats.values()],
+    }
+
+    # Create combined metrics table
+    combined_data = []
+    for table_name, key in [('Core', 'core'), ('Dynamics', 'dynamics'), ('Chassis', 'chassis'), ('Aero', 'aero')]:
+        for metric_name, (baseline_val, optimized_val) in metrics[key].items():
+            delta = ((baseline_val - optimized_val) / baseline_val * 100) if baseline_val != 0 else 0
+            combined_data.append({
+                'Table': table_name,
+                'Metric': metric_name,
+                'Baseline': baseline_val,
+                'Optimized': optimized_val,
+                'Improvement_%': delta,
+            })
+
+    # Create statistical test table
+    stats_data = {
+        'Test': ['Welch t-test', 'Cohen d', 'Levene Test', 'KS Test'],
+        'Statistic': [f"{tests['t_stat']:.4f}", f"{tests['cohens_d']:.4f}",
+                      f"{tests['levene_stat']:.4f}", f"{tests['ks_stat']:.4f}"],
+        'p-value': [f"{tests['p_value']:.2e}", 'N/A', f"{tests['levene_p']:.2e}", f"{tests['ks_p']:.2e}"],
+        'Result': ['HIGHLY SIG ✅', 'LARGE EFFECT', 'UNEQUAL VAR', 'DISTRIBUTIONS DIFFER'],
+    }
+
+    return {
+        'Table_v4_Glicko_Summary': pd.DataFrame(summary_data),
+        'Table_v4_All_Metrics': pd.DataFrame(combined_data),
+        'Table_v4_Statistical_Tests': pd.DataFrame(stats_data),
+    }
+
+
+def print_report(metrics: Dict[str, dict], df_baseline: pd.DataFrame, df_optimized: pd.DataFrame, log=print):
+    """Console version of tables 1-7."""
+    header = f"{'Metric':<30} | {'Baseline':>15} | {'Optimized':>15} | {'Improvement':>15}"
+
+    log("\n" + "="*140)
+    log("🎯 v4.0 COMPREHENSIVE METRICS & TABLES - MotoGP Jerez Turn 5 Optimization")
+    log("="*140)
+
+    for number, key, title in [(1, 'core', 'CORE PERFORMANCE METRICS (v4.0)'),
+                               (2, 'dynamics', 'DYNAMICS & CONTROL METRICS (v4.0)'),
+                               (3, 'chassis', 'TIRE & SUSPENSION METRICS (v4.0)')]:
+        log(("\n" if number == 1 else "\n\n") + f"📊 TABLE {number}: {title}")
+        log("-"*140)
+        log(header)
+        log("-"*140)
+        for metric_name, (baseline_val, optimized_val) in metrics[key].items():
+            delta = ((baseline_val - optimized_val) / baseline_val * 100) if baseline_val != 0 else 0
+            log(f"{metric_name:<30} | {baseline_val:>15.2f} | {optimized_val:>15.2f} | {delta:>+14.1f}%")
+
+    log("\n\n📊 TABLE 4: AERODYNAMICS & EFFICIENCY METRICS (NEW v4.0)")
+    log("-"*140)
+    log(header)
+    log("-"*140)
+    for metric_name, (baseline_val, optimized_val) in metrics['aero'].items():
+        if 'Efficiency' in metric_name or 'Voltage' in metric_name:
+            delta = optimized_val - baseline_val  # For efficiency/voltage, higher is better
+        else:
+            delta = ((baseline_val - optimized_val) / baseline_val * 100) if baseline_val != 0 else 0
+        log(f"{metric_name:<30} | {baseline_val:>15.2f} | {optimized_val:>15.2f} | {delta:>+14.2f}{'%' if '%' in metric_name else ''}")
+
+    log("\n\n📊 TABLE 5: GLICKO-2 VOLATILITY METRICS - PRIMARY OUTCOME (v4.0)")
+    log("-"*140)
+    log(header)
+    log("-"*140)
+    for metric_name, (baseline_val, optimized_val) in metrics['glicko'].items():
         delta = ((baseline_val - optimized_val) / baseline_val * 100) if baseline_val != 0 else 0
-        combined_data.append({
-            'Table': table_name,
-            'Metric': metric_name,
-            'Baseline': baseline_val,
-            'Optimized': optimized_val,
-            'Improvement_%': delta,
-        })
-
-df_combined = pd.DataFrame(combined_data)
-combined_file = OUTPUTS_DIR / 'Table_v4_All_Metrics.csv'
-df_combined.to_csv(combined_file, index=False)
-print(f"✅ {combined_file.name}")
-
-# Create statistical test table
-stats_data = {
-    'Test': ['Welch t-test', 'Cohen d', 'Levene Test', 'KS Test'],
-    'Statistic': [f'{t_stat:.4f}', f'{cohens_d:.4f}', f'{levene_stat:.4f}', f'{ks_stat:.4f}'],
-    'p-value': [f'{p_value:.2e}', 'N/A', f'{levene_p:.2e}', f'{ks_p:.2e}'],
-    'Result': ['HIGHLY SIG ✅', 'LARGE EFFECT', 'UNEQUAL VAR', 'DISTRIBUTIONS DIFFER'],
-}
-df_stats = pd.DataFrame(stats_data)
-stats_file = OUTPUTS_DIR / 'Table_v4_Statistical_Tests.csv'
-df_stats.to_csv(stats_file, index=False)
-print(f"✅ {stats_file.name}")
-
-print("\n" + "="*140)
-print("🎉 v4.0 TABLES GENERATION COMPLETE")
-print("="*140 + "\n")
+        log(f"{metric_name:<30} | {baseline_val:>15.4f} | {optimized_val:>15.4f} | {delta:>+14.1f}%")
+
+    tests = metrics['tests']
+    log("\n\n📊 TABLE 6: HYPOTHESIS TESTING & EFFECT SIZE (v4.0)")
+    log("-"*140)
+    log(f"\nTest Type                    | Test Statistic      | p-value        | Interpretation")
+    log("-"*140)
+    log(f"{'Welch t-test':<28} | t = {tests['t_stat']:>15.4f} | {tests['p_value']:>14.2e} | HIGHLY SIGNIFICANT ✅")
+    log(f"{'Cohen d (effect size)':<28} | d = {tests['cohens_d']:>15.4f} | {'':>14} | LARGE EFFECT (d>0.8)")
+    log(f"{'Levene test (var equality)':<28} | F = {tests['levene_stat']:>15.4f} | {tests['levene_p']:>14.2e} | {'UNEQUAL VARIANCES' if tests['levene_p'] < 0.05 else 'EQUAL VARIANCES'}")
+    log(f"{'KS test (distribution)':<28} | KS = {tests['ks_stat']:>14.4f} | {tests['ks_p']:>14.2e} | DISTRIBUTIONS DIFFER ✅")
+
+    log("\n\n📊 TABLE 7: SAMPLE CHARACTERISTICS & DATA QUALITY (v4.0)")
+    log("-"*140)
+    log(f"{'Characteristic':<30} | {'Baseline':>15} | {'Optimized':>15}")
+    log("-"*140)
+    log(f"{'Sample Size':<30} | {len(df_baseline):>15} | {len(df_optimized):>15}")
+    log(f"{'Duration (seconds)':<30} | {df_baseline['time'].max() - df_baseline['time'].min():>15.2f} | {df_optimized['time'].max() - df_optimized['time'].min():>15.2f}")
+    log(f"{'Missing Values':<30} | {df_baseline.isnull().sum().sum():>15} | {df_optimized.isnull().sum().sum():>15}")
+    log(f"{'Total Channels':<30} | {len(df_baseline.columns):>15} | {len(df_optimized.columns):>15}")
+
+
+def print_spectral_report(table: pd.DataFrame, log=print):
+    """Console version of table 8: total band energy of the focus turn."""
+    focus = table[table['turn'] == SPECTRAL_FOCUS_TURN]
+    totals = focus.pivot(index='channel', columns='setup', values='total').reindex(focus['channel'].unique())
+    log(f"\n\n📊 TABLE 8: SPECTRAL BAND ENERGY - {SPECTRAL_FOCUS_TURN} (Welch, unit²)")
+    log("-"*140)
+    log(f"{'Channel':<30} | {'Baseline':>15} | {'Optimized':>15} | {'Change':>15}")
+    log("-"*140)
+    for channel, row in totals.iterrows():
+        change = (row['optimized'] - row['baseline']) / row['baseline'] * 100 if row['baseline'] else 0
+        log(f"{channel:<30} | {row['baseline']:>15.4g} | {row['optimized']:>15.4g} | {change:>+14.1f}%")
+
+
+def write_tables(tables: Dict[str, pd.DataFrame], out_dir: Path = OUTPUTS_DIR, log=print,
+                 stage=null_stage) -> List[Path]:
+    """Export each table to <out_dir>/<name>.csv (one `stage` sub-step per table)."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    log("\n\n" + "="*140)
+    log("✅ EXPORTING TABLES TO CSV")
+    log("="*140)
+    files = []
+    for name, table in tables.items():
+        path = out_dir / f'{name}.csv'
+        with stage(f'write {name}', rows=len(table)) as step:
+            table.to_csv(path, index=False)
+            step.wrote(path)
+        log(f"✅ {path.name}")
+        files.append(path)
+    return files
+
+
+def generate_tables(df_v4, out_dir: Path = OUTPUTS_DIR, verbose: bool = True,
+                    stage=null_stage, spectral_cache: Optional[FigureCache] = None,
+                    fingerprint: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Compute (and optionally export) the v4.0 metric tables of a dataset.
+
+    Args:
+        df_v4: Complete dataset (both setups, 'setup' column) or its ChannelStore
+        out_dir: Directory for the CSV files; None to skip writing
+        verbose: Print tables 1-7 to the console
+        stage: Context manager factory timing each sub-step
+               (stage_metrics.StageRecorder.stage; default: no-op)
+        spectral_cache: Cache of the spectral analysis, keyed by dataset
+                        fingerprint (default: computed, nothing written)
+        fingerprint: Key of df_v4 in spectral_cache; pass the file's
+                     dataset_fingerprint() to share the entry of Figure 13
+                     (default: the store's, or frame_fingerprint(df_v4))
+
+    Returns:
+        Dict {table name: DataFrame}
+    """
+    log = print if verbose else _silent
+    if isinstance(df_v4, ChannelStore):
+        df_baseline, df_optimized = df_v4.frame(setup='baseline'), df_v4.frame(setup='optimized')
+    else:
+        df_baseline = df_v4[df_v4['setup'] == 'baseline']
+        df_optimized = df_v4[df_v4['setup'] == 'optimized']
+
+    with stage('compute_metrics', rows=len(df_v4)):
+        metrics = compute_metrics(df_baseline, df_optimized)
+    print_report(metrics, df_baseline, df_optimized, log)
+    with stage('build_tables'):
+        tables = build_tables(metrics)
+    with stage('spectral_analysis', rows=len(df_v4)):
+        if spectral_cache is None:
+            spectral = spectral_analysis(df_v4)
+        else:
+            if fingerprint is None:
+                fingerprint = df_v4.fingerprint if isinstance(df_v4, ChannelStore) else frame_fingerprint(df_v4)
+            spectral = cached_spectral_analysis(spectral_cache, fingerprint, lambda: (df_v4,))
+        tables['Table_v4_Spectral_Band_Energy'] = band_energy_table(spectral)
+    print_spectral_report(tables['Table_v4_Spectral_Band_Energy'], log)
+    if out_dir is not None:
+        write_tables(tables, out_dir, log, stage)
+
+    log("\n" + "="*140)
+    log("🎉 v4.0 TABLES GENERATION COMPLETE")
+    log("="*140 + "\n")
+    return tables
+
+
+def main():
+    dataset_file = Path(sys.argv[1]) if len(sys.argv) > 1 else DATASET_FILE
+    if not dataset_file.exists():
+        # Fallback to current directory
+        dataset_file = Path("NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv")
+    if is_store(dataset_file):
+        generate_tables(ChannelStore(dataset_file), spectral_cache=FigureCache(FIGURE_CACHE_DIR))
+    else:
+        generate_tables(pd.read_csv(dataset_file), spectral_cache=FigureCache(FIGURE_CACHE_DIR),
+                        fingerprint=dataset_fingerprint(dataset_file))
+
+
+if __name__ == '__main__':
+    main()
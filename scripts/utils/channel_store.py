@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Per-Channel Telemetry Store
+
+A dataset as a directory with one `.npy` file per channel plus
+`schema.json`:
+  • channels: file, dtype and unit of each channel; text columns (setup)
+    are stored as integer codes with their categories
+  • laps: (lap, setup, start, stop) row ranges, so one setup or one lap
+    is a slice of every channel
+  • rows, fingerprint (content hash taken when the store was written)
+
+Opening reads only the schema (O(1) in the session length). Channels
+are opened with np.load(mmap_mode='r') on first access, so reading a
+channel touches only its own pages and frame() builds a DataFrame over
+the mapped arrays without copying them.
+
+Tables, figures and verification take a ChannelStore wherever they take
+a DataFrame (as_frame), and their CLIs accept a store directory in place
+of the CSV.
+
+Uso:
+  python scripts/utils/channel_store.py data/datasets/NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv data/stores/v4_MEGA
+  python scripts/utils/channel_store.py --info data/stores/v4_MEGA
+
+  from channel_store import ChannelStore, write_store
+  store = ChannelStore(Path('data/stores/v4_MEGA'))
+  rpm = store['engine_rpm']                                   # np.memmap
+  df_b = store.frame(['time', 'engine_rpm'], setup='baseline')  # zero-copy slice
+"""
+
+from __future__ import annotations
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+
+# ========================
+# CONSTANTS
+# ========================
+STORE_VERSION = 1
+SCHEMA_FILE = 'schema.json'
+
+# Unit by channel-name suffix (v4 naming: <quantity>_<unit>), checked in order
+UNIT_SUFFIXES = [
+    ('_percent', '%'), ('_kmh', 'km/h'), ('_nm', 'N·m'), ('_bar', 'bar'), ('_mm', 'mm'),
+    ('_dps', 'deg/s'), ('_g', 'g'), ('_c', '°C'), ('_n', 'N'), ('_v', 'V'), ('_a', 'A'),
+]
+UNIT_NAMES = {'time': 's', 'engine_rpm': 'rpm', 'throttle_position': '-', 'gear_position': '-',
+              'lap': '-', 'glicko_volatility_sigma': '-', 'glicko2_rating': '-',
+              'glicko2_rd': '-', 'glicko2_sigma': '-'}
+
+
+def channel_unit(name: str) -> str:
+    """Unit of a v4 channel from its name ('' if unknown)."""
+    if name in UNIT_NAMES:
+        return UNIT_NAMES[name]
+    for suffix, unit in UNIT_SUFFIXES:
+        if name.endswith(suffix):
+            return unit
+    return ''
+
+
+def is_store(path) -> bool:
+    return (Path(path) / SCHEMA_FILE).is_file()
+
+
+def _lap_ranges(df: pd.DataFrame) -> List[dict]:
+    """Runs of consecutive rows with the same (lap, setup)."""
+    if 'lap' not in df.columns:
+        return []
+    laps = df['lap'].to_numpy()
+    setups = df['setup'].to_numpy() if 'setup' in df.columns else np.full(len(df), None)
+    change = np.flatnonzero((laps[1:] != laps[:-1]) | (setups[1:] != setups[:-1])) + 1
+    starts = np.concatenate([[0], change])
+    stops = np.append(change, len(df))
+    return [{'lap': int(laps[a]), 'setup': setups[a], 'start': int(a), 'stop': int(b)}
+            for a, b in zip(starts, stops)]
+
+
+# ========================
+# WRITE
+# ========================
+def write_store(df: pd.DataFrame, store_dir: Path, units: Optional[Dict[str, str]] = None) -> Path:
+    """
+    Write a dataset as a channel store (one .npy per column + schema.json).
+
+    Numeric columns are saved as they are; other columns as int16 codes
+    plus categories. The schema is written last, so a store whose writing
+    was interrupted does not open.
+
+    Args:
+        df: Dataset, rows grouped by lap
+        store_dir: Target directory (created; existing channel files replaced)
+        units: Unit overrides {channel: unit}; default from channel_unit()
+
+    Returns:
+        store_dir
+    """
+    from figure_cache import frame_fingerprint
+
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    (store_dir / SCHEMA_FILE).unlink(missing_ok=True)
+    units = units or {}
+
+    channels = {}
+    for name in df.columns:
+        column = df[name]
+        entry = {'file': f"{name}.npy", 'unit': units.get(name, channel_unit(name))}
+        if pd.api.types.is_numeric_dtype(column.dtype):
+            values = column.to_numpy()
+        else:
+            codes, categories = pd.factorize(column, sort=True)
+            values = codes.astype(np.int16)
+            entry['categories'] = [str(c) for c in categories]
+        np.save(store_dir / entry['file'], np.ascontiguousarray(values))
+        entry['dtype'] = str(values.dtype)
+        channels[str(name)] = entry
+
+    schema = {
+        'version': STORE_VERSION,
+        'rows': len(df),
+        'fingerprint': frame_fingerprint(df),
+        'channels': channels,
+        'laps': _lap_ranges(df),
+    }
+    tmp = store_dir / (SCHEMA_FILE + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as handle:
+        json.dump(schema, handle, indent=2)
+    tmp.replace(store_dir / SCHEMA_FILE)
+    return store_dir
+
+
+# ========================
+# READ
+# ========================
+class ChannelStore:
+    """Read-only view of a channel store; channels are memory-mapped on demand."""
+
+    def __init__(self, store_dir: Path):
+        self.path = Path(store_dir)
+        schema_file = self.path / SCHEMA_FILE
+        if not schema_file.is_file():
+            raise FileNotFoundError(f"Not a channel store (no {SCHEMA_FILE}): {self.path}")
+        with open(schema_file, encoding='utf-8') as handle:
+            self.schema = json.load(handle)
+        if self.schema.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported store version {self.schema.get('version')} in {self.path}")
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.schema['channels'])
+
+    @property
+    def fingerprint(self) -> str:
+        return self.schema['fingerprint']
+
+    @property
+    def laps(self) -> List[dict]:
+        return self.schema['laps']
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the channel files on disk."""
+        return sum((self.path / c['file']).stat().st_size for c in self.schema['channels'].values())
+
+    def __len__(self) -> int:
+        return self.schema['rows']
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.schema['channels']
+
+    def unit(self, name: str) -> str:
+        return self.schema['channels'][name]['unit']
+
+    def channel(self, name: str) -> np.ndarray:
+        """Raw channel values (codes for text columns) as a read-only memmap."""
+        if name not in self._arrays:
+            if name not in self:
+                raise KeyError(f"Channel {name!r} not in store {self.path}")
+            self._arrays[name] = np.load(self.path / self.schema['channels'][name]['file'], mmap_mode='r')
+        return self._arrays[name]
+
+    __getitem__ = channel
+
+    def row_ranges(self, setup: Optional[str] = None, lap: Optional[int] = None) -> List[slice]:
+        """Row slices of the laps matching setup/lap, adjacent ranges merged."""
+        if setup is None and lap is None:
+            return [slice(0, len(self))]
+        ranges = []
+        for entry in self.laps:
+            if (setup is None or entry['setup'] == setup) and (lap is None or entry['lap'] == lap):
+                if ranges and ranges[-1].stop == entry['start']:
+                    ranges[-1] = slice(ranges[-1].start, entry['stop'])
+                else:
+                    ranges.append(slice(entry['start'], entry['stop']))
+        return ranges
+
+    def column(self, name: str, rows: Sequence[slice]):
+        """Values of one channel over row ranges (a view when there is one range)."""
+        values = self.channel(name)
+        parts = [values[r] for r in rows]
+        data = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        categories = self.schema['channels'][name].get('categories')
+        if categories is not None:
+            return pd.Categorical.from_codes(np.asarray(data, dtype=np.int16), categories)
+        return data
+
+    def frame(self, columns: Optional[Sequence[str]] = None, setup: Optional[str] = None,
+              lap: Optional[int] = None) -> pd.DataFrame:
+        """
+        DataFrame of some channels and rows, over the mapped arrays.
+
+        With one contiguous row range (whole store, one setup laid out
+        contiguously, one lap) numeric columns are not copied; text columns
+        come back as Categorical. Only the requested channels are opened.
+        """
+        rows = self.row_ranges(setup, lap)
+        names = list(columns) if columns is not None else self.columns
+        if not rows:
+            return pd.DataFrame({name: [] for name in names})
+        return pd.DataFrame({name: self.column(name, rows) for name in names}, copy=False)
+
+
+def as_frame(source: Union[pd.DataFrame, ChannelStore, Path, str],
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """DataFrame of a dataset given as a DataFrame, a ChannelStore or a store directory."""
+    if isinstance(source, (str, Path)):
+        source = ChannelStore(Path(source))
+    if isinstance(source, ChannelStore):
+        return source.frame(columns)
+    return source if columns is None else source[list(columns)]
+
+
+# ========================
+# MAIN EXECUTION
+# ========================
+def main() -> int:
+    parser = argparse.ArgumentParser(description="CSV → memory-mapped channel store")
+    parser.add_argument('source', type=Path, nargs='?', help="Dataset CSV to convert")
+    parser.add_argument('store', type=Path, nargs='?', help="Store directory to write")
+    parser.add_argument('--info', type=Path, help="Print the schema summary of a store")
+    args = parser.parse_args()
+
+    if args.info:
+        store = ChannelStore(args.info)
+        print(f"\n📦 {store.path}: {len(store):,} rows, {len(store.columns)} channels, "
+              f"{len(store.laps)} laps, {store.nbytes / 1024**2:.1f} MB")
+        for name in store.columns:
+            entry = store.schema['channels'][name]
+            print(f"   {name:<32} {entry['dtype']:>8}  {entry['unit']}")
+        return 0
+
+    if args.source is None or args.store is None:
+        parser.error("source and store are required (or --info STORE)")
+    df = pd.read_csv(args.source)
+    write_store(df, args.store)
+    print(f"✅ {args.source.name} → {args.store} ({len(df):,} rows, {len(df.columns)} channels)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
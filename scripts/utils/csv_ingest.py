@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Chunked, Column-Projected CSV Ingestion
+
+Streams a telemetry CSV (raw Turn 5 logs, the industrial all-channels
+dataset, data/versioned/*.csv, the v4 dataset) to a consumer callback
+instead of loading it whole:
+
+  • projection: only the requested columns are parsed
+  • explicit dtypes: no inference pass; columns not given get the repo
+    default (setup/Setup_Type → str, lap/gear → int64, rest → float64)
+  • fixed-size chunks of chunk_rows rows, handed to the consumer as a
+    numpy block {column: 1-D array}; memory is bounded by the chunk size
+    whatever the file size
+  • engine: pyarrow's streaming CSV reader when installed (multithreaded
+    parse), otherwise pandas' C parser
+
+ingest_csv() returns rows, chunks, bytes, seconds and MB/s of the pass;
+bench_csv_ingest.py compares it with a whole-file pd.read_csv.
+
+Uso:
+  python scripts/utils/csv_ingest.py data/raw/NLA_CaseStudy_Turn5_Jerez.csv --columns Speed_kmh Engine_RPM
+  python scripts/utils/csv_ingest.py data/datasets/NLA_CaseStudy_Jerez_Industrial_AllChannels.csv --chunk-rows 50000
+
+  from csv_ingest import ingest_csv, ColumnSummary
+  summary = ColumnSummary()
+  stats = ingest_csv(path, summary, columns=['time', 'engine_rpm'])   # summary.table(), stats['mb_per_s']
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from lazy_import import lazy_import, module_available
+
+pd = lazy_import('pandas')
+
+# ========================
+# CONSTANTS
+# ========================
+CHUNK_ROWS = 100_000
+ENGINES = ('pyarrow', 'c')
+SAMPLE_BYTES = 64 * 1024   # header + rows read to size pyarrow blocks
+
+# Columns that are not float64, by name across the repo's CSV schemas
+TEXT_COLUMNS = {'setup', 'Setup_Type', 'data_type', 'label1', 'label2', 'label3'}
+INT_COLUMNS = {'lap', 'Lap_ID', 'gear', 'Gear', 'gear_position'}
+
+Block = Dict[str, np.ndarray]
+
+
+def default_dtype(column: str) -> str:
+    if column in TEXT_COLUMNS:
+        return 'str'
+    if column in INT_COLUMNS:
+        return 'int64'
+    return 'float64'
+
+
+def fastest_engine() -> str:
+    """'pyarrow' if installed, else pandas' 'c' parser."""
+    return 'pyarrow' if module_available('pyarrow') else 'c'
+
+
+def csv_header(path: Path) -> List[str]:
+    with open(path, encoding='utf-8') as handle:
+        return handle.readline().rstrip('\r\n').split(',')
+
+
+def resolve_dtypes(path: Path, columns: Optional[Sequence[str]] = None,
+                   dtypes: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Column → dtype of the projection, in file order.
+
+    Raises:
+        KeyError: A requested column is not in the header
+    """
+    header = csv_header(path)
+    wanted = header if columns is None else list(columns)
+    missing = [c for c in wanted if c not in header]
+    if missing:
+        raise KeyError(f"Columns not in {Path(path).name}: {missing}")
+    dtypes = dtypes or {}
+    return {c: dtypes.get(c, default_dtype(c)) for c in header if c in wanted}
+
+
+# ========================
+# ENGINES
+# ========================
+def _blocks_c(path: Path, dtypes: Dict[str, str], chunk_rows: int) -> Iterator[Block]:
+    reader = pd.read_csv(path, usecols=list(dtypes), dtype=dtypes, engine='c', chunksize=chunk_rows)
+    with reader:
+        for chunk in reader:
+            yield {c: chunk[c].to_numpy() for c in dtypes}
+
+
+def _blocks_pyarrow(path: Path, dtypes: Dict[str, str], chunk_rows: int) -> Iterator[Block]:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    # pyarrow blocks are sized in bytes: chunk_rows × bytes per row of the first rows
+    with open(path, 'rb') as handle:
+        sample = handle.read(SAMPLE_BYTES)
+    bytes_per_row = len(sample) / max(1, sample.count(b'\n'))
+    types = {c: pa.string() if d == 'str' else pa.from_numpy_dtype(np.dtype(d)) for c, d in dtypes.items()}
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=max(SAMPLE_BYTES, int(chunk_rows * bytes_per_row))),
+        convert_options=pa_csv.ConvertOptions(include_columns=list(dtypes), column_types=types),
+    )
+    for batch in reader:
+        yield {c: batch.column(c).to_numpy(zero_copy_only=False) for c in dtypes}
+
+
+def iter_csv_blocks(path: Path, columns: Optional[Sequence[str]] = None,
+                    dtypes: Optional[Dict[str, str]] = None, chunk_rows: int = CHUNK_ROWS,
+                    engine: Optional[str] = None) -> Iterator[Block]:
+    """
+    Numpy blocks of a CSV, chunk by chunk.
+
+    Args:
+        path: CSV file with a header row
+        columns: Columns to parse (None = all)
+        dtypes: Explicit dtypes {column: dtype}; others from default_dtype()
+        chunk_rows: Rows per block (pyarrow: approximate, blocks are sized in bytes)
+        engine: 'pyarrow' or 'c'; None = fastest_engine()
+
+    Yields:
+        {column: 1-D array}, columns in file order
+    """
+    engine = engine or fastest_engine()
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+    resolved = resolve_dtypes(Path(path), columns, dtypes)
+    blocks = _blocks_pyarrow if engine == 'pyarrow' else _blocks_c
+    yield from blocks(Path(path), resolved, chunk_rows)
+
+
+def ingest_csv(path: Path, consumer: Callable[[Block], None], columns: Optional[Sequence[str]] = None,
+               dtypes: Optional[Dict[str, str]] = None, chunk_rows: int = CHUNK_ROWS,
+               engine: Optional[str] = None) -> Dict:
+    """
+    Stream a CSV to consumer(block), one block at a time.
+
+    Only one block is alive at a time (the consumer must copy what it
+    keeps), so peak memory is set by chunk_rows, not the file size.
+
+    Returns:
+        Dict with 'rows', 'chunks', 'bytes' (file size), 'seconds',
+        'mb_per_s' and 'engine'
+    """
+    engine = engine or fastest_engine()
+    __import__('pyarrow.csv' if engine == 'pyarrow' else 'pandas')   # import time is not parse time
+    rows = chunks = 0
+    start = time.perf_counter()
+    for block in iter_csv_blocks(path, columns, dtypes, chunk_rows, engine):
+        consumer(block)
+        rows += len(next(iter(block.values()))) if block else 0
+        chunks += 1
+        del block
+    seconds = time.perf_counter() - start
+    size = Path(path).stat().st_size
+    return {'rows': rows, 'chunks': chunks, 'bytes': size, 'seconds': seconds,
+            'mb_per_s': size / (1024 * 1024) / seconds if seconds > 0 else float('inf'),
+            'engine': engine}
+
+
+# ========================
+# CONSUMERS
+# ========================
+class ColumnSummary:
+    """Consumer: running count/min/max/mean/std of every numeric column."""
+
+    def __init__(self):
+        self.stats: Dict[str, list] = {}
+
+    def __call__(self, block: Block) -> None:
+        for name, values in block.items():
+            if values.dtype.kind not in 'iuf':
+                continue
+            values = values.astype(np.float64, copy=False)
+            entry = self.stats.setdefault(name, [0, 0.0, 0.0, np.inf, -np.inf])
+            entry[0] += values.size
+            entry[1] += values.sum()
+            entry[2] += np.dot(values, values)
+            entry[3] = min(entry[3], values.min(initial=np.inf))
+            entry[4] = max(entry[4], values.max(initial=-np.inf))
+
+    def table(self) -> pd.DataFrame:
+        rows = []
+        for name, (count, total, squares, low, high) in self.stats.items():
+            mean = total / count if count else np.nan
+            var = squares / count - mean * mean if count else np.nan
+            rows.append({'column': name, 'count': count, 'min': low, 'max': high,
+                         'mean': mean, 'std': np.sqrt(max(var, 0.0))})
+        return pd.DataFrame(rows)
+
+
+# ========================
+# MAIN EXECUTION
+# ========================
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Chunked, column-projected CSV ingestion")
+    parser.add_argument('csv', type=Path, help="CSV file with a header row")
+    parser.add_argument('--columns', nargs='+', help="Columns to read (default: all)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--engine', choices=ENGINES, help="Default: pyarrow if installed, else c")
+    args = parser.parse_args()
+
+    if not args.csv.exists():
+        print(f"❌ File not found: {args.csv}")
+        return 1
+    summary = ColumnSummary()
+    try:
+        result = ingest_csv(args.csv, summary, args.columns, chunk_rows=args.chunk_rows, engine=args.engine)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        return 1
+
+    print(f"\n📥 {args.csv.name}: {result['rows']:,} rows in {result['chunks']} chunks, "
+          f"{result['bytes'] / 1024**2:.1f} MB in {result['seconds']:.3f} s "
+          f"({result['mb_per_s']:.1f} MB/s, engine {result['engine']})\n")
+    print(summary.table().to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
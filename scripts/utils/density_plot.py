@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Density Rendering for Dense Scatter Figures
+
+Replaces per-sample scatter markers by 2D histograms, so the figure cost
+(vector paths in the PDF, render time) depends on the bin grid and not
+on the number of samples:
+
+  • shared_edges(): one set of bin edges for every setup of a panel, so
+    the histograms are directly comparable
+  • density_counts(): np.histogram2d on those edges
+  • draw_density(): a rasterized pcolormesh (one embedded image inside
+    the vector PDF), transparent→setup color with log-scaled counts
+  • RegressionStats: least-squares line from accumulated sufficient
+    statistics (count, means, co-moments), mergeable across chunks, so
+    no per-panel linregress pass over the raw samples is needed
+
+Uso:
+  from density_plot import RegressionStats, density_counts, draw_density, shared_edges
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from lazy_import import lazy_import
+
+colors = lazy_import('matplotlib.colors')
+
+# ========================
+# CONSTANTS
+# ========================
+DEFAULT_BINS = (160, 120)   # (x, y) bins per panel
+MIN_ALPHA = 0.3            # alpha of a one-sample bin
+MAX_ALPHA = 0.85
+
+
+def shared_edges(xs: Sequence[np.ndarray], ys: Sequence[np.ndarray],
+                 bins: Tuple[int, int] = DEFAULT_BINS) -> Tuple[np.ndarray, np.ndarray]:
+    """Bin edges covering the union of several (x, y) samples."""
+    def edges(arrays, count):
+        lo = min(float(np.min(a)) for a in arrays)
+        hi = max(float(np.max(a)) for a in arrays)
+        if hi <= lo:
+            lo, hi = lo - 0.5, hi + 0.5
+        return np.linspace(lo, hi, count + 1)
+    return edges(xs, bins[0]), edges(ys, bins[1])
+
+
+def density_counts(x: np.ndarray, y: np.ndarray, x_edges: np.ndarray, y_edges: np.ndarray) -> np.ndarray:
+    """Sample counts per (x, y) bin, shape (len(x_edges) - 1, len(y_edges) - 1)."""
+    counts, _, _ = np.histogram2d(np.asarray(x, dtype=float), np.asarray(y, dtype=float),
+                                  bins=(x_edges, y_edges))
+    return counts
+
+
+def density_cmap(color) -> colors.LinearSegmentedColormap:
+    """Colormap from transparent to color, so several setups can overlay."""
+    rgb = colors.to_rgb(color)
+    return colors.LinearSegmentedColormap.from_list(f'density_{color}', [(*rgb, MIN_ALPHA), (*rgb, MAX_ALPHA)])
+
+
+def draw_density(ax, x_edges: np.ndarray, y_edges: np.ndarray, counts: np.ndarray,
+                 color, label: str = None, zorder: int = 1):
+    """
+    Draw a 2D histogram as one rasterized, log-scaled mesh.
+
+    Empty bins stay transparent. The label goes on an empty proxy artist so
+    the legend shows a plain color swatch.
+    """
+    masked = np.ma.masked_less_equal(counts.T, 0)
+    vmax = max(float(masked.max()), 2.0) if masked.count() else 2.0
+    mesh = ax.pcolormesh(x_edges, y_edges, masked, cmap=density_cmap(color),
+                         norm=colors.LogNorm(vmin=1.0, vmax=vmax),
+                         shading='flat', rasterized=True, zorder=zorder, linewidth=0)
+    if label is not None:
+        ax.scatter([], [], marker='s', s=40, color=color, alpha=MAX_ALPHA, label=label)
+    return mesh
+
+
+# ========================
+# REGRESSION FROM SUFFICIENT STATISTICS
+# ========================
+class RegressionStats:
+    """
+    Running least-squares statistics of (x, y) pairs.
+
+    Keeps count, means and centered co-moments (Chan et al. merge), so
+    chunks or setups can be accumulated in any order without revisiting
+    samples.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    @classmethod
+    def from_samples(cls, x, y) -> 'RegressionStats':
+        return cls().update(x, y)
+
+    def update(self, x, y) -> 'RegressionStats':
+        """Accumulate a chunk of samples."""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(x) == 0:
+            return self
+        chunk = RegressionStats()
+        chunk.n = len(x)
+        chunk.mean_x, chunk.mean_y = float(x.mean()), float(y.mean())
+        dx, dy = x - chunk.mean_x, y - chunk.mean_y
+        chunk.m2_x, chunk.m2_y, chunk.c_xy = float(dx @ dx), float(dy @ dy), float(dx @ dy)
+        return self.merge(chunk)
+
+    def merge(self, other: 'RegressionStats') -> 'RegressionStats':
+        """Combine with the statistics of another set of samples (in place)."""
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+        self.m2_x += other.m2_x + delta_x * delta_x * weight
+        self.m2_y += other.m2_y + delta_y * delta_y * weight
+        self.c_xy += other.c_xy + delta_x * delta_y * weight
+        self.mean_x += delta_x * other.n / n
+        self.mean_y += delta_y * other.n / n
+        self.n = n
+        return self
+
+    def fit(self) -> Tuple[float, float, float]:
+        """
+        Returns:
+            Tuple of (slope, intercept, r); NaN when x or y is constant
+        """
+        if self.n < 2 or self.m2_x <= 0:
+            return np.nan, np.nan, np.nan
+        slope = self.c_xy / self.m2_x
+        r = self.c_xy / np.sqrt(self.m2_x * self.m2_y) if self.m2_y > 0 else np.nan
+        return slope, self.mean_y - slope * self.mean_x, r
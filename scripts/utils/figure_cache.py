@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+On-Disk Cache of Figure Payloads
+
+A figure is split in two steps:
+  1. payload: the compact data it draws (decimated series, histograms,
+     KDE curves, regression coefficients, test statistics...), computed
+     from the raw telemetry
+  2. render: matplotlib styling of that payload
+
+Payloads are stored under a key made of the figure name, the version of
+its payload function and the dataset fingerprint, so re-running with the
+same dataset (e.g. after a styling-only change) skips the raw telemetry
+altogether. Bump the payload version whenever what a figure computes
+changes; render-only changes keep the version.
+
+Storage per key: `<key>.npz` with the arrays and `<key>.json` with the
+scalars, strings and lists (written last, so it marks a complete entry).
+
+Uso:
+  from figure_cache import FigureCache, dataset_fingerprint
+  cache = FigureCache(BASE_DIR / "outputs" / "cache" / "figures")
+  payload = cache.get_or_compute('figure_8', 1, dataset_fingerprint(csv), compute)
+  fingerprint = frame_fingerprint(df)       # dataset already in memory
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+
+# ========================
+# CONSTANTS
+# ========================
+FINGERPRINT_BLOCK = 1 << 20     # bytes hashed at the head and tail of the file
+FINGERPRINT_CHARS = 16          # hex digits of the fingerprint used in keys
+
+Payload = Dict[str, object]
+
+
+def dataset_fingerprint(path: Path) -> str:
+    """
+    Cheap content fingerprint of a dataset file.
+
+    Hashes size, mtime (ns) and the first/last FINGERPRINT_BLOCK bytes, so
+    it costs two small reads whatever the file size. Regenerating the
+    dataset changes mtime and therefore the fingerprint.
+    """
+    path = Path(path)
+    stat = path.stat()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(path, 'rb') as handle:
+        digest.update(handle.read(FINGERPRINT_BLOCK))
+        if stat.st_size > FINGERPRINT_BLOCK:
+            handle.seek(max(FINGERPRINT_BLOCK, stat.st_size - FINGERPRINT_BLOCK))
+            digest.update(handle.read(FINGERPRINT_BLOCK))
+    return digest.hexdigest()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Content fingerprint of an in-memory dataset.
+
+    Hashes column names, dtypes and every row (pd.util.hash_pandas_object),
+    so it is independent of where the frame came from; costs one pass.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _scalar(value):
+    """JSON-friendly version of a numpy scalar / list value."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_scalar(v) for v in value]
+    return value
+
+
+class FigureCache:
+    """Directory of figure payloads keyed by (name, version, fingerprint)."""
+
+    def __init__(self, cache_dir: Path, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(name: str, version: int, fingerprint: str) -> str:
+        return f"{name}-v{version}-{fingerprint[:FINGERPRINT_CHARS]}"
+
+    def load(self, key: str) -> Optional[Payload]:
+        """Payload stored under key, or None if missing or incomplete."""
+        meta_file = self.cache_dir / f"{key}.json"
+        if not self.enabled or not meta_file.exists():
+            return None
+        try:
+            with open(meta_file, encoding='utf-8') as handle:
+                payload = json.load(handle)
+            array_file = self.cache_dir / f"{key}.npz"
+            if array_file.exists():
+                with np.load(array_file, allow_pickle=False) as arrays:
+                    payload.update({name: arrays[name] for name in arrays.files})
+        except (OSError, ValueError):
+            return None
+        return payload
+
+    def store(self, key: str, payload: Payload) -> None:
+        """Write arrays to <key>.npz, then everything else to <key>.json."""
+        if not self.enabled:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        arrays = {k: v for k, v in payload.items() if isinstance(v, np.ndarray)}
+        meta = {k: _scalar(v) for k, v in payload.items() if k not in arrays}
+        if arrays:
+            np.savez(self.cache_dir / f"{key}.npz", **arrays)
+        with open(self.cache_dir / f"{key}.json", 'w', encoding='utf-8') as handle:
+            json.dump(meta, handle)
+
+    def get_or_compute(self, name: str, version: int, fingerprint: str,
+                       compute: Callable[[], Payload]) -> Payload:
+        """Cached payload of a figure, computing and storing it on a miss."""
+        key = self.key(name, version, fingerprint)
+        payload = self.load(key)
+        if payload is not None:
+            self.hits += 1
+            return payload
+        self.misses += 1
+        payload = compute()
+        self.store(key, payload)
+        return payload
+
+    def clear(self) -> int:
+        """Delete every cached payload; returns the number of files removed."""
+        removed = 0
+        for pattern in ('*.npz', '*.json'):
+            for file in self.cache_dir.glob(pattern):
+                file.unlink()
+                removed += 1
+        return removed
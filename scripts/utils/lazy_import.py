@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Deferred Imports for Heavy Optional Modules
+
+pandas, scipy, matplotlib.pyplot, seaborn and asammdf cost from 0.5 s to
+over 2 s each to import. Scripts bind them at module level with
+lazy_import(), so `--help`, argument errors and code paths that never
+touch a module do not pay for it:
+
+  • lazy_import(name): module placeholder; the real import runs on the
+    first attribute access (pd.DataFrame, plt.subplots...) and the
+    placeholder forwards to it from then on. A module that is already
+    imported is returned as is.
+  • module_available(name): whether a top-level package is installed,
+    without importing it (importlib.util.find_spec)
+
+Modules that use a lazy name in annotations add
+`from __future__ import annotations`, so `df: pd.DataFrame` in a
+signature does not trigger the import at definition time.
+
+Uso:
+  from lazy_import import lazy_import, module_available
+  pd = lazy_import('pandas')
+  stats = lazy_import('scipy.stats')
+  ASAMMDF_AVAILABLE = module_available('asammdf')
+"""
+
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Placeholder that imports the named module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_target']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_target'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.__dict__['_lazy_target'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Module bound now, imported on first use.
+
+    Raises:
+        ModuleNotFoundError: On first attribute access, if the module is missing
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def module_available(name: str) -> bool:
+    """True if a top-level package can be imported (nothing is executed)."""
+    return importlib.util.find_spec(name) is not None
@@ -10,6 +10,8 @@ This script simulates:
 
 import math
 import csv
+import time
+from functools import lru_cache
 from typing import List, Dict, Tuple
 
 try:
@@ -19,21 +21,92 @@ except ImportError:
     NUMPY_AVAILABLE = False
     print("Warning: numpy not available. Using basic Python for calculations.")
 
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    print("Warning: pandas not available. Using basic CSV for output.")
+from lazy_import import module_available
 
-try:
-    from asammdf import MDF, Signal
-    ASAMMDF_AVAILABLE = True
-except ImportError:
-    ASAMMDF_AVAILABLE = False
+# asammdf is only imported by write_mf4(); CSV-only runs never load it
+ASAMMDF_AVAILABLE = module_available('asammdf')
+if not ASAMMDF_AVAILABLE:
     print("Warning: asammdf not available. MF4 output will be skipped.")
 
 
+TORQUE_LUT_POINTS = 4097
+ACCELERATION_TIME_CONSTANT = 3.0
+
+
+def _torque_shape(normalized_rpm):
+    """Torque curve as a fraction of max torque (same formula as calculate_torque)."""
+    return 0.3 + 0.7 * np.sin(normalized_rpm * np.pi) * np.exp(-((normalized_rpm - 0.5) ** 2) / 0.3)
+
+
+@lru_cache(maxsize=None)
+def _normalized_torque_lut(points: int = TORQUE_LUT_POINTS):
+    """Cached (rpm/max_rpm, torque/max_torque) lookup table on [0, 1]."""
+    grid = np.linspace(0.0, 1.0, points)
+    shape = np.maximum(_torque_shape(grid), 0.0)
+    grid.flags.writeable = False
+    shape.flags.writeable = False
+    return grid, shape
+
+
+@lru_cache(maxsize=256)
+def torque_lut(max_rpm: float, max_torque: float, points: int = TORQUE_LUT_POINTS):
+    """
+    Cached torque lookup table for one motor configuration.
+
+    Args:
+        max_rpm: Maximum RPM of the motor
+        max_torque: Maximum torque in Nm
+        points: Number of table points between 0 and max_rpm
+
+    Returns:
+        Tuple of read-only (rpm_grid, torque_grid) arrays
+    """
+    grid, shape = _normalized_torque_lut(points)
+    rpm_grid = grid * max_rpm
+    torque_grid = shape * max_torque
+    rpm_grid.flags.writeable = False
+    torque_grid.flags.writeable = False
+    return rpm_grid, torque_grid
+
+
+def acceleration_time_grid(duration: float = 10.0, time_step: float = 0.1):
+    """Time grid of simulate_acceleration (0 ... duration, both ends included)."""
+    steps = int(math.floor(duration / time_step + 1e-9)) + 1
+    return np.arange(steps) * time_step
+
+
+def simulate_acceleration_batch(max_rpms, max_torques, duration: float = 10.0,
+                                time_step: float = 0.1) -> Dict[str, 'np.ndarray']:
+    """
+    Simulate the acceleration run of many motor configurations at once.
+
+    The exponential approach to max RPM makes rpm/max_rpm identical for every
+    motor, so the normalized torque is looked up once on the shared time grid
+    and scaled per configuration.
+
+    Args:
+        max_rpms: Array (motors,) of maximum RPM
+        max_torques: Array (motors,) of maximum torque in Nm
+        duration: Total simulation time in seconds
+        time_step: Time step for simulation in seconds
+
+    Returns:
+        Dict with 'time' (steps,) and 'rpm', 'torque', 'power_kw'
+        (motors x steps) arrays
+    """
+    max_rpms = np.asarray(max_rpms, dtype=float)
+    max_torques = np.asarray(max_torques, dtype=float)
+    t = acceleration_time_grid(duration, time_step)
+    normalized_rpm = 1 - np.exp(-t / ACCELERATION_TIME_CONSTANT)
+    grid, shape = _normalized_torque_lut()
+    normalized_torque = np.interp(normalized_rpm, grid, shape)
+
+    rpm = max_rpms[:, None] * normalized_rpm
+    torque = max_torques[:, None] * normalized_torque
+    power = torque * rpm / 9549.0
+    return {'time': t, 'rpm': rpm, 'torque': torque, 'power_kw': power}
+
+
 class MotorPhysicsSimulator:
     """Simulates motor physics including torque, RPM, and power."""
     
@@ -117,6 +190,218 @@ class MotorPhysicsSimulator:
         
         return data
 
+    def torque_curve(self, rpm):
+        """
+        Vectorized torque lookup for an array of RPM values.
+
+        Interpolates the cached lookup table of this (max_rpm, max_torque)
+        configuration; RPM outside [0, max_rpm] gives zero torque, as in
+        calculate_torque.
+
+        Args:
+            rpm: Array of RPM values
+
+        Returns:
+            Array of torque in Nm
+        """
+        rpm = np.asarray(rpm, dtype=float)
+        rpm_grid, torque_grid = torque_lut(float(self.max_rpm), float(self.max_torque))
+        return np.interp(rpm, rpm_grid, torque_grid, left=0.0, right=0.0)
+
+    def simulate_acceleration_array(self, duration: float = 10.0, time_step: float = 0.1) -> Dict[str, 'np.ndarray']:
+        """
+        Array version of simulate_acceleration: the whole time grid at once.
+
+        Values are not rounded.
+
+        Args:
+            duration: Total simulation time in seconds
+            time_step: Time step for simulation in seconds
+
+        Returns:
+            Dict with 'time', 'rpm', 'torque' and 'power_kw' arrays
+        """
+        t = acceleration_time_grid(duration, time_step)
+        rpm = self.max_rpm * (1 - np.exp(-t / ACCELERATION_TIME_CONSTANT))
+        torque = self.torque_curve(rpm)
+        power = np.where(rpm > 0, torque * rpm / 9549.0, 0.0)
+        return {'time': t, 'rpm': rpm, 'torque': torque, 'power_kw': power}
+
+
+class SwissPairingScheduler:
+    """
+    Swiss-style pairing scheduler for large rating simulations.
+
+    Players are sorted by rating and paired with their neighbour, so most
+    matches are between players of similar strength. Played pairs are kept
+    as int64 keys (low_id * num_players + high_id) appended to one
+    preallocated buffer, as a few sorted runs of geometrically decreasing
+    size: rematch lookups are one binary search per run (O(log rounds)
+    runs), and recording a round never copies the whole history.
+    """
+
+    def __init__(self, num_players: int, max_swap_passes: int = 4):
+        """
+        Initialize pairing scheduler.
+
+        Args:
+            num_players: Number of players in the pool
+            max_swap_passes: Maximum number of rematch-resolution passes per round
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("SwissPairingScheduler requires numpy")
+        self.num_players = num_players
+        self.max_swap_passes = max_swap_passes
+        self._played = np.empty(max(num_players, 16), dtype=np.int64)
+        self._size = 0
+        self._runs = []  # [start, stop) of the sorted runs in _played, oldest first
+
+    def _pair_keys(self, players_a, players_b):
+        """Encode unordered player pairs as int64 keys."""
+        low = np.minimum(players_a, players_b).astype(np.int64)
+        high = np.maximum(players_a, players_b).astype(np.int64)
+        return low * self.num_players + high
+
+    def has_played(self, players_a, players_b):
+        """
+        Check which pairs have already met.
+
+        Args:
+            players_a: Array of player indices
+            players_b: Array of opponent indices (same length)
+
+        Returns:
+            Boolean array, True where the pair is a rematch
+        """
+        keys = self._pair_keys(players_a, players_b)
+        if not self._runs:
+            return np.zeros(keys.shape, dtype=bool)
+        # Sorted queries keep the binary searches cache-friendly
+        query_order = np.argsort(keys)
+        sorted_keys = keys[query_order]
+        hit = np.zeros(keys.shape, dtype=bool)
+        for start, stop in self._runs:
+            run = self._played[start:stop]
+            pos = np.minimum(np.searchsorted(run, sorted_keys), run.size - 1)
+            hit |= run[pos] == sorted_keys
+        found = np.empty(keys.shape, dtype=bool)
+        found[query_order] = hit
+        return found
+
+    def pair(self, ratings, rng=None):
+        """
+        Compute the pairings for one round.
+
+        Players are ordered by descending rating (ties broken randomly) and
+        paired as (1st, 2nd), (3rd, 4th), ... A pair that already met swaps
+        its second player with the first player of the next pair; a few
+        vectorized passes resolve almost all rematches. With an odd number
+        of players the lowest-rated one gets a bye.
+
+        Args:
+            ratings: Array of current ratings, indexed by player id
+            rng: Optional numpy Generator used for tie-breaking
+
+        Returns:
+            Tuple of (players_a, players_b) index arrays
+        """
+        ratings = np.asarray(ratings, dtype=float)
+        rng = rng if rng is not None else np.random.default_rng()
+
+        # Sub-rating jitter breaks ties randomly (all players start equal)
+        order = np.argsort(-(ratings + rng.random(len(ratings)) * 1e-6))
+        order = order[:len(order) - len(order) % 2]
+        num_pairs = len(order) // 2
+
+        for _ in range(self.max_swap_passes):
+            clash = np.flatnonzero(self.has_played(order[0::2], order[1::2]))
+            clash = clash[clash < num_pairs - 1]
+            # Swaps of adjacent pairs would overlap; defer them to the next pass
+            clash = clash[~np.isin(clash - 1, clash)]
+            if clash.size == 0:
+                break
+            second, next_first = 2 * clash + 1, 2 * clash + 2
+            order[second], order[next_first] = order[next_first], order[second]
+
+        return order[0::2], order[1::2]
+
+    def record(self, players_a, players_b):
+        """
+        Register played pairs so later rounds avoid them.
+
+        Args:
+            players_a: Array of player indices
+            players_b: Array of opponent indices (same length)
+        """
+        keys = np.sort(self._pair_keys(players_a, players_b))
+        end = self._size + keys.size
+        if end > self._played.size:
+            # Capacity doubling: amortized O(1) copies per key
+            grown = np.empty(max(end, 2 * self._played.size), dtype=np.int64)
+            grown[:self._size] = self._played[:self._size]
+            self._played = grown
+        self._played[self._size:end] = keys
+        self._runs.append((self._size, end))
+        self._size = end
+        # Merge the newest run into the previous one while it is not smaller
+        # (binary counter): each key is merged O(log rounds) times in total
+        while len(self._runs) > 1 and (self._runs[-1][1] - self._runs[-1][0]
+                                       >= self._runs[-2][1] - self._runs[-2][0]):
+            stop = self._runs.pop()[1]
+            start = self._runs[-1][0]
+            self._runs[-1] = (start, stop)
+            # Stable sort of two sorted runs is a linear merge (timsort)
+            self._played[start:stop] = np.sort(self._played[start:stop], kind='stable')
+
+
+def pad_finishing_orders(races):
+    """
+    Pack ragged race results into a (races x max_riders) array padded with -1.
+
+    Args:
+        races: Sequence of 1D arrays of rider ids in finishing order
+
+    Returns:
+        2D int64 array of finishing orders
+    """
+    lengths = np.array([len(race) for race in races], dtype=np.int64)
+    orders = np.full((len(races), lengths.max(initial=0)), -1, dtype=np.int64)
+    rows = np.repeat(np.arange(len(races)), lengths)
+    cols = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    orders[rows, cols] = np.concatenate(races) if len(races) else []
+    return orders
+
+
+def iter_race_pairs(finishing_orders, max_pairs_per_chunk: int = 2_000_000):
+    """
+    Expand race finishing orders into pairwise results, one chunk at a time.
+
+    Args:
+        finishing_orders: 2D int array padded with -1, or list of 1D arrays
+        max_pairs_per_chunk: Upper bound on pairs yielded per chunk
+
+    Yields:
+        Tuples of (players, opponents, scores) arrays; score is 1.0 when the
+        player finished ahead of the opponent and 0.0 otherwise
+    """
+    if not isinstance(finishing_orders, np.ndarray):
+        finishing_orders = pad_finishing_orders(finishing_orders)
+    num_races, max_riders = finishing_orders.shape
+    if num_races == 0 or max_riders < 2:
+        return
+
+    # All ordered position pairs (i, j), i != j, shared by every race
+    pos_i, pos_j = np.nonzero(~np.eye(max_riders, dtype=bool))
+    pair_scores = (pos_i < pos_j).astype(float)
+    races_per_chunk = max(1, max_pairs_per_chunk // len(pos_i))
+
+    for start in range(0, num_races, races_per_chunk):
+        block = finishing_orders[start:start + races_per_chunk]
+        players, opponents = block[:, pos_i], block[:, pos_j]
+        valid = (players >= 0) & (opponents >= 0)
+        yield (players[valid], opponents[valid],
+               np.broadcast_to(pair_scores, players.shape)[valid])
+
 
 class GlickoRatingSystem:
     """
@@ -216,15 +501,167 @@ class GlickoRatingSystem:
         new_rating = rating + rating_change
         
         return new_rating, max(self.MIN_RD, new_rd)
-    
-    def simulate_matches(self, num_players: int = 10, num_rounds: int = 20) -> List[Dict]:
+
+    def _period_sums(self, ratings, rds, players, opponents, scores):
+        """
+        Accumulate the per-player Glicko sums of one batch of games.
+
+        Returns:
+            Tuple of (d_squared_inv, score_delta) arrays, one entry per player
+        """
+        g_rd = 1 / np.sqrt(1 + 3 * (self.Q ** 2) * rds[opponents] ** 2 / (math.pi ** 2))
+        e_score = 1 / (1 + 10 ** (-g_rd * (ratings[players] - ratings[opponents]) / 400))
+
+        n = len(ratings)
+        d_squared_inv = np.bincount(players, weights=(g_rd ** 2) * e_score * (1 - e_score),
+                                    minlength=n) * (self.Q ** 2)
+        score_delta = np.bincount(players, weights=g_rd * (np.asarray(scores) - e_score), minlength=n)
+        return d_squared_inv, score_delta
+
+    def _apply_period(self, ratings, rds, d_squared_inv, score_delta):
+        """Turn accumulated period sums into new ratings and RDs."""
+        played = d_squared_inv > 0
+        precision = 1 / rds ** 2 + d_squared_inv
+        new_ratings = np.where(played, ratings + (self.Q / precision) * score_delta, ratings)
+        new_rds = np.where(played, np.maximum(self.MIN_RD, np.sqrt(1 / precision)), rds)
+        return new_ratings, new_rds
+
+    def update_rating_period(self, ratings, rds, players, opponents, scores):
+        """
+        Vectorized rating-period update for many players at once.
+
+        Equivalent to calling update_rating for every player with all of
+        their games of the period, using pre-period opponent ratings.
+
+        Args:
+            ratings: Array of current ratings, indexed by player id
+            rds: Array of current rating deviations
+            players: Array of player indices, one entry per game and side
+            opponents: Array of opponent indices (same length)
+            scores: Array of scores from the player's side (1, 0.5, 0)
+
+        Returns:
+            Tuple of (new_ratings, new_rds) arrays
+        """
+        ratings = np.asarray(ratings, dtype=float)
+        rds = np.asarray(rds, dtype=float)
+        sums = self._period_sums(ratings, rds, np.asarray(players), np.asarray(opponents), scores)
+        return self._apply_period(ratings, rds, *sums)
+
+    def update_from_races(self, ratings, rds, finishing_orders, max_pairs_per_chunk: int = 2_000_000):
+        """
+        Rating-period update from a batch of multi-competitor race results.
+
+        Each race is decomposed into its implied head-to-head results (every
+        rider beats everyone who finished behind), and all races of the
+        period feed a single update. Races are expanded chunk by chunk with
+        array indexing, so memory stays proportional to riders x races plus
+        one bounded chunk of pairs.
+
+        Args:
+            ratings: Array of current ratings, indexed by rider id
+            rds: Array of current rating deviations
+            finishing_orders: 2D int array (races x max_riders) of rider ids
+                              in finishing order, padded with -1, or a list of
+                              1D arrays (see pad_finishing_orders)
+            max_pairs_per_chunk: Upper bound on pairs materialized at once
+
+        Returns:
+            Tuple of (new_ratings, new_rds) arrays
+        """
+        ratings = np.asarray(ratings, dtype=float)
+        rds = np.asarray(rds, dtype=float)
+        d_squared_inv = np.zeros(len(ratings))
+        score_delta = np.zeros(len(ratings))
+
+        for players, opponents, scores in iter_race_pairs(finishing_orders, max_pairs_per_chunk):
+            chunk_d, chunk_delta = self._period_sums(ratings, rds, players, opponents, scores)
+            d_squared_inv += chunk_d
+            score_delta += chunk_delta
+
+        return self._apply_period(ratings, rds, d_squared_inv, score_delta)
+
+    def simulate_rating_rounds(self, true_ratings, num_rounds: int = 20,
+                               pairing: str = 'swiss', seed: int = None) -> List[Dict]:
+        """
+        Simulate rating periods against hidden true skills (vectorized).
+
+        Every round pairs all players once, draws win/loss outcomes from the
+        true-skill expected score and applies one update_rating_period.
+        Intended for convergence studies with 10k-1M players.
+
+        Args:
+            true_ratings: Array of hidden true ratings, one per player
+            num_rounds: Number of rounds (rating periods) to simulate
+            pairing: 'swiss' (SwissPairingScheduler) or 'random'
+            seed: Optional seed for reproducibility
+
+        Returns:
+            List of per-round dicts with rating error and timing data
+        """
+        true_ratings = np.asarray(true_ratings, dtype=float)
+        num_players = len(true_ratings)
+        rng = np.random.default_rng(seed)
+        scheduler = SwissPairingScheduler(num_players) if pairing == 'swiss' else None
+
+        ratings = np.full(num_players, float(self.initial_rating))
+        rds = np.full(num_players, float(self.initial_rd))
+        matches = 0
+        history = []
+
+        for round_num in range(num_rounds):
+            start = time.perf_counter()
+            if scheduler is not None:
+                players_a, players_b = scheduler.pair(ratings, rng)
+                rematches = int(scheduler.has_played(players_a, players_b).sum())
+                scheduler.record(players_a, players_b)
+            else:
+                order = rng.permutation(num_players)[:num_players - num_players % 2]
+                players_a, players_b = order[0::2], order[1::2]
+                rematches = 0
+            pairing_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            p_win = 1 / (1 + 10 ** (-(true_ratings[players_a] - true_ratings[players_b]) / 400))
+            score_a = (rng.random(len(players_a)) < p_win).astype(float)
+            ratings, rds = self.update_rating_period(
+                ratings, rds,
+                np.concatenate([players_a, players_b]),
+                np.concatenate([players_b, players_a]),
+                np.concatenate([score_a, 1 - score_a]),
+            )
+            update_seconds = time.perf_counter() - start
+            matches += len(players_a)
+
+            history.append({
+                'round': round_num + 1,
+                'pairing': pairing,
+                'matches': matches,
+                'rmse': float(np.sqrt(np.mean((ratings - true_ratings) ** 2))),
+                'mean_rd': float(rds.mean()),
+                'mean_abs_rating_gap': float(np.mean(np.abs(
+                    true_ratings[players_a] - true_ratings[players_b]))),
+                'rematches': rematches,
+                'pairing_seconds': pairing_seconds,
+                'update_seconds': update_seconds,
+            })
+
+        return history
+
+    def simulate_matches(self, num_players: int = 10, num_rounds: int = 20,
+                         pairing: str = 'random', seed: int = None) -> List[Dict]:
         """
         Simulate a series of competitive matches.
-        
+
         Args:
             num_players: Number of players in the simulation
             num_rounds: Number of match rounds to simulate
-            
+            pairing: 'random' (shuffle) or 'swiss' (pair by sorted rating,
+                     avoiding rematches; requires numpy)
+            seed: Optional seed of the global RNG (None keeps its state); the
+                  Swiss tie-breaking is drawn from it too, so np.random.seed()
+                  or seed makes every pairing reproducible
+
         Returns:
             List of rating history data
         """
@@ -241,19 +678,32 @@ class GlickoRatingSystem:
                 'draws': 0
             })
         
+        if seed is not None:
+            if NUMPY_AVAILABLE:
+                np.random.seed(seed)
+            else:
+                import random
+                random.seed(seed)
+
         history = []
-        
+        scheduler = SwissPairingScheduler(num_players) if pairing == 'swiss' else None
+        swiss_rng = np.random.default_rng(np.random.randint(2**31)) if scheduler is not None else None
+
         for round_num in range(num_rounds):
             # Shuffle and pair players
-            if NUMPY_AVAILABLE:
+            if scheduler is not None:
+                players_a, players_b = scheduler.pair([p['rating'] for p in players], swiss_rng)
+                scheduler.record(players_a, players_b)
+                indices = np.column_stack([players_a, players_b]).ravel()
+            elif NUMPY_AVAILABLE:
                 indices = np.random.permutation(num_players)
             else:
                 import random
                 indices = list(range(num_players))
                 random.shuffle(indices)
-            
+
             # Process matches in pairs
-            for i in range(0, num_players - 1, 2):
+            for i in range(0, len(indices) - 1, 2):
                 player1_idx = indices[i]
                 player2_idx = indices[i + 1]
                 
@@ -370,6 +820,8 @@ def write_mf4(filename: str, motor_data: List[Dict], glicko_data: List[Dict]):
         return
     
     try:
+        from asammdf import MDF, Signal
+
         signals = []
         
         # Add motor physics signals
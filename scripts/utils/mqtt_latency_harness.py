@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Local Publish/Subscribe Latency Harness (H1)
+
+Replaces the gamma-distribution MQTT draws with real transport: an asyncio
+stand-in broker on localhost (gateway) relays 37-channel v4 telemetry frames
+(telemetry_codec binary frames) from an edge publisher to a cloud subscriber over TCP, and every sample's
+latency is measured end to end:
+
+  edge (publisher) ──TCP──▶ gateway (broker) ──TCP──▶ cloud (subscriber)
+        ◀── PUBACK (QoS 1) ──┘         ◀── PUBACK ──┘
+
+  • edge_to_gateway_ms: sample creation → broker receipt (includes the
+    time a sample waits for its batch to fill)
+  • gateway_to_cloud_ms: broker receipt → subscriber receipt
+  • QoS 1: unacknowledged frames are retransmitted after ack_timeout_s;
+    a sample is lost when every retry expires (packet_lost = 1)
+
+All clocks are the same process' perf_counter_ns, so no synchronization is
+needed. Output keeps the Table_v4_MQTT_Latency.csv schema (one row per
+sample; message_size_bytes is the sample's share of its frame on the wire,
+headers included).
+
+Uso:
+  python scripts/utils/mqtt_latency_harness.py --rate 100 --batch 1 10
+  python scripts/utils/mqtt_latency_harness.py --rate 100 400 1600 --messages 4000
+"""
+
+from __future__ import annotations
+
+import time
+import struct
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from lazy_import import lazy_import
+from telemetry_codec import (CHANNELS, HEADER as FRAME_HEADER, QUANTIZED_DTYPE, SAMPLE_DTYPE,
+                             FrameDecoder, FrameEncoder, channel_matrix, records_from_dataframe)
+
+pd = lazy_import('pandas')
+
+# ========================
+# CONSTANTS
+# ========================
+SEED = 1854652912
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_DIR = BASE_DIR / "data" / "datasets"
+TABLES_DIR = BASE_DIR / "data" / "tables"
+
+BASE_RATE_HZ = 100.0
+
+# Wire format: 4-byte length prefix, then 1-byte packet type
+LENGTH = struct.Struct('<I')
+PUBLISH, PUBACK = 1, 2
+# PUBLISH header: type, packet id (first sample id), sample count,
+# gateway receipt time (ns, stamped by the broker)
+PUBLISH_HEADER = struct.Struct('<BQIq')
+PUBACK_PACKET = struct.Struct('<BQ')
+
+TABLE_COLUMNS = ['message_id', 'timestamp_s', 'edge_to_gateway_ms', 'gateway_to_cloud_ms',
+                 'total_latency_ms', 'packet_lost', 'message_size_bytes', 'qos_level']
+
+
+# ========================
+# TELEMETRY FRAMES
+# ========================
+def load_telemetry_frames(dataset_file: Path = None, num_samples: int = None) -> np.ndarray:
+    """
+    Load the 37 v4 channels (35 channels + lap + setup) as codec records.
+
+    Derived glicko2_* columns are not part of the transported channel set.
+    """
+    dataset_file = dataset_file or DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
+    df = pd.read_csv(dataset_file, nrows=num_samples, usecols=CHANNELS)
+    return records_from_dataframe(df)
+
+
+def _tile_samples(frames: np.ndarray, num_messages: int) -> np.ndarray:
+    """Repeat the source records until num_messages samples are available."""
+    reps = -(-num_messages // len(frames))
+    return np.tile(frames, reps)[:num_messages]
+
+
+async def _read_packet(reader: asyncio.StreamReader) -> bytes:
+    (size,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return await reader.readexactly(size)
+
+
+def _write_packet(writer: asyncio.StreamWriter, *parts: bytes):
+    writer.write(LENGTH.pack(sum(len(p) for p in parts)))
+    for part in parts:
+        writer.write(part)
+
+
+# ========================
+# BROKER (GATEWAY)
+# ========================
+class LocalBroker:
+    """
+    Minimal single-topic broker on localhost.
+
+    Clients announce their role with one byte (b'P' publisher, b'S'
+    subscriber). PUBLISH packets are stamped with the receipt time, acked to
+    the publisher (QoS 1) and forwarded to the subscriber. drop_rate drops
+    incoming PUBLISH packets before the ack (fault injection for the QoS
+    retry path).
+    """
+
+    def __init__(self, drop_rate: float = 0.0, seed: int = SEED):
+        self.drop_rate = drop_rate
+        self.rng = np.random.default_rng(seed)
+        self.subscriber = None
+        self.subscribed = asyncio.Event()
+        self.server = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        role = await reader.readexactly(1)
+        if role == b'S':
+            self.subscriber = writer
+            self.subscribed.set()
+            try:
+                while True:
+                    await _read_packet(reader)  # subscriber PUBACKs
+            except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+                return
+
+        try:
+            while True:
+                packet = await _read_packet(reader)
+                received_ns = time.perf_counter_ns()
+                if self.drop_rate and self.rng.random() < self.drop_rate:
+                    continue
+                _, packet_id, count, _ = PUBLISH_HEADER.unpack_from(packet)
+                _write_packet(writer, PUBACK_PACKET.pack(PUBACK, packet_id))
+                _write_packet(self.subscriber,
+                              PUBLISH_HEADER.pack(PUBLISH, packet_id, count, received_ns),
+                              memoryview(packet)[PUBLISH_HEADER.size:])
+                await self.subscriber.drain()
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            writer.close()
+
+
+# ========================
+# HARNESS
+# ========================
+async def _subscribe(port: int, results: Dict, expected: int, done: asyncio.Event, qos: int):
+    decoder = FrameDecoder()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b'S')
+    await writer.drain()
+    received = 0
+    try:
+        while received < expected:
+            packet = await _read_packet(reader)
+            cloud_ns = time.perf_counter_ns()
+            _, packet_id, count, gateway_ns = PUBLISH_HEADER.unpack_from(packet)
+            if packet_id in results['gateway_ns']:
+                continue  # duplicate delivery of a retransmitted frame
+            results['gateway_ns'][packet_id] = gateway_ns
+            results['cloud_ns'][packet_id] = cloud_ns
+            # Decoding is part of the hop (zero-copy view for RAW frames)
+            results['samples'][packet_id] = decoder.decode(packet, PUBLISH_HEADER.size)
+            received += count
+            if qos:
+                _write_packet(writer, PUBACK_PACKET.pack(PUBACK, packet_id))
+    finally:
+        done.set()
+        writer.close()
+
+
+async def _run(samples: np.ndarray, rate_hz: float, batch_size: int, qos: int, quantize: bool,
+               ack_timeout_s: float, max_retries: int, drop_rate: float, seed: int):
+    num_messages = len(samples)
+    encoder = FrameEncoder(quantize=quantize)
+    broker = LocalBroker(drop_rate=drop_rate, seed=seed)
+    port = await broker.start()
+
+    results = {'gateway_ns': {}, 'cloud_ns': {}, 'samples': {}}
+    done = asyncio.Event()
+    subscriber = asyncio.create_task(_subscribe(port, results, num_messages, done, qos))
+    await broker.subscribed.wait()
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b'P')
+
+    pending = {}  # packet id → (payload, retries left, deadline)
+    acked = asyncio.Event()
+
+    async def read_acks():
+        try:
+            while True:
+                _, packet_id = PUBACK_PACKET.unpack(await _read_packet(reader))
+                pending.pop(packet_id, None)
+                if not pending:
+                    acked.set()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+
+    ack_task = asyncio.create_task(read_acks())
+    loop = asyncio.get_running_loop()
+
+    def retransmit(now):
+        for packet_id, (payload, retries, deadline) in list(pending.items()):
+            if now < deadline:
+                continue
+            if retries == 0:
+                pending.pop(packet_id)
+                continue
+            _write_packet(writer, payload)
+            pending[packet_id] = (payload, retries - 1, now + ack_timeout_s)
+
+    period_ns = int(1e9 / rate_hz)
+    start_ns = time.perf_counter_ns() + 10_000_000
+    created_ns = start_ns + np.arange(num_messages, dtype=np.int64) * period_ns
+
+    for first in range(0, num_messages, batch_size):
+        last = min(first + batch_size, num_messages)
+        # The frame leaves once its last sample exists
+        wait_s = (created_ns[last - 1] - time.perf_counter_ns()) / 1e9
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+        payload = (PUBLISH_HEADER.pack(PUBLISH, first, last - first, 0)
+                   + encoder.encode(samples[first:last]))
+        _write_packet(writer, payload)
+        if qos:
+            pending[first] = (payload, max_retries, loop.time() + ack_timeout_s)
+            acked.clear()
+            retransmit(loop.time())
+        await writer.drain()
+
+    # Drain: wait for acks (with retries) and for the subscriber
+    if qos:
+        while pending:
+            try:
+                await asyncio.wait_for(acked.wait(), timeout=ack_timeout_s)
+            except asyncio.TimeoutError:
+                pass
+            retransmit(loop.time())
+            await writer.drain()
+    try:
+        await asyncio.wait_for(done.wait(), timeout=max(1.0, ack_timeout_s * (max_retries + 1)))
+    except asyncio.TimeoutError:
+        subscriber.cancel()
+
+    ack_task.cancel()
+    writer.close()
+    await broker.close()
+    return created_ns, results
+
+
+def run_latency_benchmark(samples: np.ndarray, rate_hz: float = BASE_RATE_HZ, batch_size: int = 1,
+                          qos: int = 1, quantize: bool = False, num_messages: int = 1000,
+                          ack_timeout_s: float = 0.2,
+                          max_retries: int = 3, drop_rate: float = 0.0, seed: int = SEED) -> pd.DataFrame:
+    """
+    Publish telemetry samples through the local broker and measure latency.
+
+    Args:
+        samples: Telemetry records (telemetry_codec.SAMPLE_DTYPE)
+        rate_hz: Sample rate of the publisher (100 Hz and multiples)
+        batch_size: Samples per PUBLISH frame
+        qos: 0 (fire and forget) or 1 (PUBACK + retransmission)
+        quantize: Send QUANTIZED codec frames instead of RAW float32 ones
+                  (DELTA frames are not used: retransmissions reorder them)
+        num_messages: Samples to publish (source rows are tiled if needed)
+        ack_timeout_s: QoS 1 retransmission timeout
+        max_retries: QoS 1 retransmissions before a frame counts as lost
+        drop_rate: Fraction of PUBLISH packets dropped by the broker
+        seed: Seed of the broker's drop decisions
+
+    Returns:
+        DataFrame with the Table_v4_MQTT_Latency.csv schema, one row per sample
+    """
+    samples = _tile_samples(np.asarray(samples, dtype=SAMPLE_DTYPE), num_messages)
+    created_ns, results = asyncio.run(_run(samples, rate_hz, batch_size, qos, quantize,
+                                           ack_timeout_s, max_retries, drop_rate, seed))
+
+    first_ids = np.arange(0, num_messages, batch_size)
+    counts = np.minimum(batch_size, num_messages - first_ids)
+    gateway_ns = np.array([results['gateway_ns'].get(i, -1) for i in first_ids], dtype=np.int64)
+    cloud_ns = np.array([results['cloud_ns'].get(i, -1) for i in first_ids], dtype=np.int64)
+    tolerance = FrameEncoder(quantize=True).steps if quantize else 0.0
+    for first, received in results['samples'].items():
+        sent = channel_matrix(samples[first:first + len(received)])
+        if np.any(np.abs(channel_matrix(received) - sent) > tolerance):
+            raise RuntimeError(f"Frame {first} corrupted in transit")
+
+    lost = np.repeat(cloud_ns < 0, counts)
+    edge_to_gateway = (np.repeat(gateway_ns, counts) - created_ns) / 1e6
+    gateway_to_cloud = np.repeat((cloud_ns - gateway_ns) / 1e6, counts)
+    edge_to_gateway[lost] = np.nan
+    gateway_to_cloud[lost] = np.nan
+
+    record_bytes = (QUANTIZED_DTYPE if quantize else SAMPLE_DTYPE).itemsize
+    frame_bytes = LENGTH.size + PUBLISH_HEADER.size + FRAME_HEADER.size + counts * record_bytes
+    message_size = np.repeat(frame_bytes / counts, counts)
+    return pd.DataFrame({
+        'message_id': np.arange(num_messages),
+        'timestamp_s': np.arange(num_messages) / rate_hz,
+        'edge_to_gateway_ms': edge_to_gateway,
+        'gateway_to_cloud_ms': gateway_to_cloud,
+        'total_latency_ms': edge_to_gateway + gateway_to_cloud,
+        'packet_lost': lost.astype(int),
+        'message_size_bytes': np.round(message_size).astype(int),
+        'qos_level': qos,
+    })[TABLE_COLUMNS]
+
+
+def summarize_latency(df_mqtt: pd.DataFrame) -> pd.DataFrame:
+    """Per-hop p50/p95/p99/max latency and packet loss (Table_v4_MQTT_Summary.csv)."""
+    hops = [('Edge→Gateway', 'edge_to_gateway_ms'), ('Gateway→Cloud', 'gateway_to_cloud_ms'),
+            ('End-to-End', 'total_latency_ms')]
+    loss_pct = df_mqtt['packet_lost'].mean() * 100
+    return pd.DataFrame({
+        'metric': [name for name, _ in hops],
+        'p50_latency_ms': [df_mqtt[col].quantile(0.50) for _, col in hops],
+        'p95_latency_ms': [df_mqtt[col].quantile(0.95) for _, col in hops],
+        'p99_latency_ms': [df_mqtt[col].quantile(0.99) for _, col in hops],
+        'max_latency_ms': [df_mqtt[col].max() for _, col in hops],
+        'packet_loss_pct': [loss_pct] * len(hops),
+    })
+
+
+# ========================
+# MAIN EXECUTION
+# ========================
+def main():
+    parser = argparse.ArgumentParser(description="Local pub/sub latency harness (H1)")
+    parser.add_argument('--dataset', type=Path, default=None)
+    parser.add_argument('--rate', type=float, nargs='+', default=[100, 400, 1600])
+    parser.add_argument('--batch', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--messages', type=int, default=1000)
+    parser.add_argument('--qos', type=int, choices=[0, 1], default=1)
+    parser.add_argument('--quantize', action='store_true')
+    parser.add_argument('--drop-rate', type=float, default=0.0)
+    parser.add_argument('--output', type=Path, default=None,
+                        help="Write the first configuration to this CSV")
+    args = parser.parse_args()
+
+    samples = load_telemetry_frames(args.dataset)
+
+    print("\n" + "="*80)
+    print(f"📡 LOCAL PUB/SUB LATENCY HARNESS - {len(CHANNELS)} channels, QoS {args.qos}")
+    print("="*80)
+    print(f"   {'rate Hz':>8} | {'batch':>5} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | "
+          f"{'bytes/sample':>12} | {'lost %':>6}")
+    print("   " + "-"*72)
+
+    first = None
+    for rate in args.rate:
+        for batch in args.batch:
+            df = run_latency_benchmark(samples, rate_hz=rate, batch_size=batch, qos=args.qos,
+                                       quantize=args.quantize,
+                                       num_messages=args.messages, drop_rate=args.drop_rate)
+            first = df if first is None else first
+            e2e = df['total_latency_ms']
+            print(f"   {rate:>8.0f} | {batch:>5} | {e2e.quantile(0.5):>8.3f} | {e2e.quantile(0.95):>8.3f} | "
+                  f"{e2e.quantile(0.99):>8.3f} | {df['message_size_bytes'].mean():>12.1f} | "
+                  f"{df['packet_lost'].mean() * 100:>6.2f}")
+
+    if args.output:
+        first.to_csv(args.output, index=False)
+        print(f"\n✅ Saved: {args.output}")
+    print("\n" + "="*80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
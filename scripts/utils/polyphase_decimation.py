@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Streaming Polyphase Decimation of Multi-Channel Blocks
+
+Decimating telemetry by taking every q-th sample folds everything above
+the new Nyquist frequency (engine vibration, road noise) back into the
+band that is kept. resample_poly avoids that with a low-pass FIR applied
+in polyphase form: only the kept outputs are computed, so the cost per
+input sample is len(taps) / q multiply-adds instead of len(taps).
+
+This module applies the same filter:
+  • to all channels at once: blocks are (samples, channels) arrays and
+    the FIR runs along axis 0 (one scipy.signal.upfirdn call per block)
+  • in overlapping chunks: PolyphaseDecimator keeps the last 2*half_len
+    input samples between process() calls, so a recording of any length
+    decimates in memory bounded by the chunk size, and the result equals
+    resample_poly(x, 1, q, axis=0, padtype='edge') over the whole recording
+  • in cascade: DecimationCascade feeds each product to the next stage
+    (e.g. 10 kHz → 100 Hz → 10 Hz), so lower rates cost a fraction of
+    the first stage instead of another pass over the raw samples
+
+Uso:
+  from polyphase_decimation import DecimationCascade
+  cascade = DecimationCascade(10_000, (100, 10), n_channels=12)
+  for block in blocks:                    # (samples, 12) at 10 kHz
+      products = cascade.process(block)   # {100: (k, 12), 10: (m, 12)}
+  tails = cascade.flush()
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from lazy_import import lazy_import
+
+signal = lazy_import('scipy.signal')
+
+# ========================
+# CONSTANTS
+# ========================
+HALF_LEN_PER_FACTOR = 10    # Taps on each side per unit of q (resample_poly default)
+KAISER_BETA = 5.0           # Window of the low-pass design (resample_poly default)
+PADTYPES = ('edge', 'constant')
+DEFAULT_PADTYPE = 'edge'
+
+
+def lowpass_taps(down: int, half_len: Optional[int] = None, beta: float = KAISER_BETA) -> np.ndarray:
+    """
+    Anti-aliasing FIR for decimation by down, as designed by resample_poly.
+
+    Args:
+        down: Integer decimation factor
+        half_len: Taps on each side of the center (default 10 * down)
+        beta: Kaiser window beta
+
+    Returns:
+        2*half_len + 1 linear-phase taps with cutoff at the new Nyquist
+    """
+    half_len = HALF_LEN_PER_FACTOR * down if half_len is None else half_len
+    return signal.firwin(2 * half_len + 1, 1.0 / down, window=('kaiser', beta))
+
+
+# ========================
+# STREAMING DECIMATION
+# ========================
+class PolyphaseDecimator:
+    """
+    Decimate (samples, channels) blocks by an integer factor, chunk by chunk.
+
+    Output k is the filter centered on input sample k*down. Inputs
+    outside the recording repeat the first/last sample ('edge'), so a
+    channel sitting at 12,000 rpm does not ramp from zero at the ends;
+    'constant' pads with zeros like resample_poly's default.
+
+    Args:
+        down: Integer decimation factor
+        n_channels: Columns of every block
+        half_len: Taps on each side of the center; rounded up to a
+                  multiple of down so outputs line up with upfirdn's
+        padtype: 'edge' or 'constant'
+    """
+
+    def __init__(self, down: int, n_channels: int, half_len: Optional[int] = None,
+                 padtype: str = DEFAULT_PADTYPE):
+        if down < 2:
+            raise ValueError(f"down must be an integer >= 2, got {down}")
+        if padtype not in PADTYPES:
+            raise ValueError(f"padtype must be one of {PADTYPES}, got {padtype!r}")
+        half_len = HALF_LEN_PER_FACTOR * down if half_len is None else half_len
+        self.down = down
+        self.half_len = -(-half_len // down) * down
+        self.taps = lowpass_taps(down, self.half_len)
+        self.n_channels = n_channels
+        self.padtype = padtype
+        self.samples_in = 0
+        self.samples_out = 0
+        # Padded input not yet consumed, starting at padded index _base
+        self._pending: Optional[np.ndarray] = None
+        self._base = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Every output whose window is complete after adding block."""
+        block = np.asarray(block, dtype=np.float64).reshape(-1, self.n_channels)
+        if self._pending is None:
+            if not len(block):
+                return np.empty((0, self.n_channels))
+            self._pending = self._padding(block[:1])
+        self._pending = np.concatenate([self._pending, block])
+        self.samples_in += len(block)
+        return self._emit(None)
+
+    def flush(self) -> np.ndarray:
+        """Remaining outputs, with padding after the last input sample."""
+        if self._pending is None:
+            return np.empty((0, self.n_channels))
+        self._pending = np.concatenate([self._pending, self._padding(self._pending[-1:])])
+        return self._emit(-(-self.samples_in // self.down))
+
+    def _padding(self, edge: np.ndarray) -> np.ndarray:
+        if self.padtype == 'constant':
+            return np.zeros((self.half_len, self.n_channels))
+        return np.repeat(edge, self.half_len, axis=0)
+
+    def _emit(self, total: Optional[int]) -> np.ndarray:
+        q, span = self.down, 2 * self.half_len
+        # Output k reads padded inputs [k*q, k*q + span]
+        last = (self._base + len(self._pending) - 1 - span) // q
+        if total is not None:
+            last = min(last, total - 1)
+        count = last - self.samples_out + 1
+        if count <= 0:
+            return np.empty((0, self.n_channels))
+
+        start = self.samples_out * q - self._base
+        segment = self._pending[start:start + (count - 1) * q + span + 1]
+        # upfirdn's full convolution at multiples of q: the first span/q
+        # outputs still overlap the segment start
+        out = signal.upfirdn(self.taps, segment, 1, q, axis=0)[span // q:span // q + count]
+
+        self.samples_out += count
+        drop = self.samples_out * q - self._base
+        self._pending = self._pending[drop:]
+        self._base += drop
+        return out
+
+
+class DecimationCascade:
+    """
+    Several lower-rate products of one high-rate stream, in one pass.
+
+    Each stage decimates the output of the previous one, so the rates
+    must divide each other (e.g. 10,000 → 100 → 10 Hz).
+
+    Args:
+        rate_hz: Input sample rate
+        targets: Output rates, any order
+        n_channels: Columns of every block
+        padtype: Padding at both ends of every stage ('edge' or 'constant')
+    """
+
+    def __init__(self, rate_hz: int, targets: Iterable[int], n_channels: int,
+                 padtype: str = DEFAULT_PADTYPE):
+        self.rate_hz = rate_hz
+        self.targets: List[int] = sorted(set(targets), reverse=True)
+        self.stages: Dict[int, PolyphaseDecimator] = {}
+        source = rate_hz
+        for target in self.targets:
+            if target <= 0 or target >= source or source % target:
+                raise ValueError(f"{target} Hz is not an integer division of {source} Hz")
+            self.stages[target] = PolyphaseDecimator(source // target, n_channels, padtype=padtype)
+            source = target
+
+    def process(self, block: np.ndarray) -> Dict[int, np.ndarray]:
+        """{rate: new output rows} after adding one block at rate_hz."""
+        products = {}
+        for target in self.targets:
+            block = products[target] = self.stages[target].process(block)
+        return products
+
+    def flush(self) -> Dict[int, np.ndarray]:
+        """{rate: last output rows}; each stage's tail also goes through the next one."""
+        products = {}
+        tail = None
+        for target in self.targets:
+            stage = self.stages[target]
+            head = stage.process(tail) if tail is not None and len(tail) else np.empty((0, stage.n_channels))
+            tail = products[target] = np.concatenate([head, stage.flush()])
+        return products
+
+
+def decimate_block(block: np.ndarray, down: int, padtype: str = DEFAULT_PADTYPE) -> np.ndarray:
+    """One-shot equivalent of PolyphaseDecimator over a whole (samples, channels) block."""
+    return signal.resample_poly(np.asarray(block, dtype=np.float64), 1, down, axis=0, padtype=padtype)
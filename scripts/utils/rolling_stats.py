@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Sliding-Window Statistics Engine
+
+Computes any set of trailing-window statistics (quantiles, median, mean,
+sum, var, std) for any set of window sizes over one or many channels,
+with pandas `rolling(w, min_periods=1)` semantics:
+
+  • quantiles: order statistics from scipy.ndimage's 1-D rank filter
+    (an O(log w) per-sample sorted window in C), linear interpolation
+    between ranks k and k+1 as pandas does (or lower/higher/nearest/
+    midpoint); q = 0 / 1 use the O(1)
+    van Herk min/max filters. The first w-1 samples (shrinking windows)
+    are filled by insertion into a sorted list.
+  • moments: one pair of cumulative sums per channel (shifted by the
+    channel mean for precision), shared by every window size
+
+All requested statistics are computed from one call per channel block:
+    stats = rolling_stats(X, [(0.5, 80), (0.1, 160), (0.9, 160), ('std', 60)])
+    stats[(0.1, 160)]  # same shape as X
+
+Values are assumed finite (no NaN handling, unlike pandas).
+
+Uso:
+  from rolling_stats import rolling_stats
+"""
+
+from bisect import insort
+from typing import Dict, Hashable, Iterable, Tuple, Union
+
+import numpy as np
+
+from lazy_import import lazy_import
+
+ndimage = lazy_import('scipy.ndimage')
+
+# ========================
+# CONSTANTS
+# ========================
+MOMENTS = ('mean', 'sum', 'var', 'std')
+QUANTILE_ALIASES = {'median': 0.5, 'min': 0.0, 'max': 1.0}
+
+Stat = Union[float, str]
+
+
+def _quantile_value(stat: Stat):
+    q = QUANTILE_ALIASES.get(stat, stat)
+    return q if isinstance(q, (int, float)) and not isinstance(q, bool) else None
+
+
+# ========================
+# QUANTILES
+# ========================
+def _rank_weights(pos: float, interpolation: str) -> Tuple[int, int, float]:
+    """Ranks (lo, hi) and weight of hi for a fractional rank, as pandas does."""
+    lo = int(np.floor(pos))
+    frac = pos - lo
+    if interpolation == 'linear':
+        weight = frac
+    elif interpolation == 'lower':
+        weight = 0.0
+    elif interpolation == 'higher':
+        weight = 1.0 if frac > 0 else 0.0
+    elif interpolation == 'nearest':
+        weight = float(np.rint(pos) > lo)
+    elif interpolation == 'midpoint':
+        weight = 0.5 if frac > 0 else 0.0
+    else:
+        raise ValueError(f"Unknown interpolation: {interpolation}")
+    return lo, lo + 1 if weight > 0 else lo, weight
+
+
+def _head_quantile(x: np.ndarray, window: int, q: float, interpolation: str) -> np.ndarray:
+    """Quantile of the shrinking windows x[:i + 1] for i < window - 1."""
+    head = x[:min(window - 1, len(x))].tolist()
+    ordered = []
+    out = np.empty(len(head))
+    for i, value in enumerate(head):
+        insort(ordered, value)
+        lo, hi, weight = _rank_weights(q * i, interpolation)
+        out[i] = ordered[lo] + weight * (ordered[hi] - ordered[lo]) if weight else ordered[lo]
+    return out
+
+
+def rolling_quantile(x: np.ndarray, window: int, q: float, interpolation: str = 'linear') -> np.ndarray:
+    """
+    Trailing-window quantile of a 1-D array (pandas
+    rolling(window, min_periods=1).quantile(q, interpolation)).
+
+    'linear' and 'midpoint' need two rank passes where the rank is
+    fractional; 'lower', 'higher' and 'nearest' always need one.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n == 0:
+        return x.copy()
+    w = min(window, n)
+    origin = (w - 1) // 2  # window [i - w + 1, i]
+
+    if q <= 0.0:
+        out = ndimage.minimum_filter1d(x, w, origin=origin)
+    elif q >= 1.0:
+        out = ndimage.maximum_filter1d(x, w, origin=origin)
+    else:
+        lo, hi, weight = _rank_weights(q * (w - 1), interpolation)
+        rank = hi if weight == 1.0 else lo
+        out = ndimage.rank_filter(x, rank=rank, size=w, origin=origin)
+        if 0.0 < weight < 1.0:
+            upper = ndimage.rank_filter(x, rank=hi, size=w, origin=origin)
+            out += weight * (upper - out)
+
+    if w > 1:
+        out[:w - 1] = _head_quantile(x, w, q, interpolation)
+    return out
+
+
+# ========================
+# MOMENTS
+# ========================
+def _window_sums(x: np.ndarray, window: int, prefix: Tuple[np.ndarray, np.ndarray]):
+    c1, c2 = prefix
+    n = len(x)
+    end = np.arange(1, n + 1)
+    start = np.maximum(end - window, 0)
+    count = (end - start).astype(float)
+    if x.ndim > 1:
+        count = count[:, None]
+    return count, c1[end] - c1[start], c2[end] - c2[start]
+
+
+def _prefix_sums(x: np.ndarray, shift: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    centered = x - shift
+    zero = np.zeros((1,) + x.shape[1:])
+    return (np.concatenate([zero, np.cumsum(centered, axis=0)]),
+            np.concatenate([zero, np.cumsum(centered * centered, axis=0)]))
+
+
+def _moment(name: str, count, s1, s2, shift) -> np.ndarray:
+    if name == 'mean':
+        return s1 / count + shift
+    if name == 'sum':
+        return s1 + shift * count
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = np.clip((s2 - s1 * s1 / count) / (count - 1), 0.0, None)
+    var = np.where(count > 1, var, np.nan)
+    return var if name == 'var' else np.sqrt(var)
+
+
+# ========================
+# ENGINE
+# ========================
+def rolling_stats(values, stats: Iterable[Tuple[Stat, int]], min_periods: int = 1,
+                  interpolation: str = 'linear') -> Dict[Hashable, np.ndarray]:
+    """
+    Compute several trailing-window statistics of one or many channels.
+
+    Args:
+        values: (samples,) or (samples x channels) array-like
+        stats: (stat, window) pairs; stat is a quantile in [0, 1], one of
+               'median'/'min'/'max', or a moment in MOMENTS
+        min_periods: Observations required for a value (else NaN)
+        interpolation: Quantile interpolation between ranks (pandas names,
+                       'median' always interpolates linearly)
+
+    Returns:
+        Dict {(stat, window): array shaped like values}
+    """
+    x = np.asarray(values, dtype=float)
+    stats = list(dict.fromkeys(stats))
+    matrix = x.reshape(len(x), -1)
+    results = {}
+
+    moment_stats = [(s, w) for s, w in stats if _quantile_value(s) is None]
+    for stat, _ in moment_stats:
+        if stat not in MOMENTS:
+            raise ValueError(f"Unknown rolling statistic: {stat}")
+    if moment_stats:
+        shift = matrix.mean(axis=0) if len(matrix) else np.zeros(matrix.shape[1])
+        prefix = _prefix_sums(matrix, shift)
+        by_window = {}
+        for stat, window in moment_stats:
+            if window not in by_window:
+                by_window[window] = _window_sums(matrix, window, prefix)
+            results[(stat, window)] = _moment(stat, *by_window[window], shift)
+
+    for stat, window in stats:
+        q = _quantile_value(stat)
+        if q is None:
+            continue
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"Quantile out of range: {stat}")
+        out = np.empty_like(matrix)
+        for channel in range(matrix.shape[1]):
+            # 'median' is always the linear midpoint, as pandas .median()
+            out[:, channel] = rolling_quantile(matrix[:, channel], window, q,
+                                               'linear' if stat == 'median' else interpolation)
+        results[(stat, window)] = out
+
+    count = np.arange(1, len(x) + 1)
+    for (stat, window), out in results.items():
+        if min_periods > 1:
+            out[np.minimum(count, window) < min_periods] = np.nan
+        results[(stat, window)] = out.reshape(x.shape)
+    return {key: results[key] for key in stats}
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Distance-Based Sector Timing Engine
+
+Replaces sample-slice "sectors" with real distance-based timing, vectorized
+across all laps:
+
+  • Distance per lap: cumulative trapezoid of speed over time
+  • Sector crossings: one searchsorted on the laps' distances (made globally
+    monotone with a per-lap offset), interpolated between samples
+  • Delta-time channel: time of each lap minus the reference lap's time at
+    the same distance (np.interp on the reference)
+  • Attribution: the delta-time rate is regressed (least squares, all laps
+    and samples) on channel differences vs the reference at the same
+    distance: engine RPM + wheel slip (setup) and throttle (rider); the
+    unexplained remainder is "other"
+
+Output keeps the Table_v4_Time_Loss_Attribution.csv schema.
+
+Uso:
+  python scripts/utils/sector_timing.py [dataset.csv]
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from lazy_import import lazy_import
+from turn_rating_pipeline import DATA_DIR, lap_layout, lap_matrix
+
+pd = lazy_import('pandas')
+
+# ========================
+# CONSTANTS
+# ========================
+NUM_SECTORS = 4
+SETUP_CHANNELS = ['engine_rpm', 'wheel_slip_percent']
+RIDER_CHANNELS = ['throttle_position']
+
+
+# ========================
+# DISTANCE & CROSSINGS
+# ========================
+def lap_distance(speed_kmh: np.ndarray, time_s: np.ndarray) -> np.ndarray:
+    """
+    Distance covered (m) at every sample: cumulative trapezoid per lap.
+
+    Args:
+        speed_kmh, time_s: (laps x samples) matrices
+
+    Returns:
+        (laps x samples) distance matrix starting at 0 for every lap
+    """
+    v = speed_kmh / 3.6
+    steps = 0.5 * (v[:, 1:] + v[:, :-1]) * np.diff(time_s, axis=1)
+    distance = np.zeros_like(v)
+    np.cumsum(steps, axis=1, out=distance[:, 1:])
+    return distance
+
+
+def crossing_times(distance: np.ndarray, time_s: np.ndarray, boundaries) -> np.ndarray:
+    """
+    Time at which every lap first reaches each boundary distance.
+
+    All laps are searched in one searchsorted call: lap k's distances are
+    shifted by k * span so the flattened array stays sorted. Crossings are
+    interpolated linearly between the two bracketing samples; boundaries a
+    lap never reaches give NaN.
+
+    Returns:
+        (laps x boundaries) matrix of crossing times
+    """
+    boundaries = np.asarray(boundaries, dtype=float)
+    num_laps, num_samples = distance.shape
+    span = max(distance.max(), boundaries.max()) + 1.0
+    offsets = np.arange(num_laps)[:, None] * span
+
+    flat = (distance + offsets).ravel()
+    targets = boundaries[None, :] + offsets
+    idx = np.searchsorted(flat, targets.ravel(), side='left').reshape(targets.shape)
+    idx -= np.arange(num_laps)[:, None] * num_samples
+
+    reached = idx < num_samples
+    hi = np.clip(idx, 1, num_samples - 1)
+    lo = hi - 1
+    d_lo = np.take_along_axis(distance, lo, axis=1)
+    d_hi = np.take_along_axis(distance, hi, axis=1)
+    t_lo = np.take_along_axis(time_s, lo, axis=1)
+    t_hi = np.take_along_axis(time_s, hi, axis=1)
+    frac = np.divide(boundaries - d_lo, d_hi - d_lo, out=np.zeros_like(d_lo), where=d_hi > d_lo)
+    times = np.where(idx == 0, time_s[:, :1], t_lo + np.clip(frac, 0, 1) * (t_hi - t_lo))
+    return np.where(reached, times, np.nan)
+
+
+def _reference_grid(distance_ref: np.ndarray):
+    """Samples where the reference distance strictly increases (valid for np.interp)."""
+    keep = np.concatenate([[True], np.diff(distance_ref) > 0])
+    return np.flatnonzero(keep)
+
+
+def delta_time_channel(distance: np.ndarray, time_s: np.ndarray, reference: int) -> np.ndarray:
+    """
+    Continuous delta-time vs the reference lap at equal distance.
+
+    Positive values: the lap is behind the reference. Samples beyond the
+    reference lap's distance are NaN.
+    """
+    grid = _reference_grid(distance[reference])
+    ref_distance, ref_time = distance[reference, grid], time_s[reference, grid]
+    at_ref = np.interp(distance, ref_distance, ref_time)
+    return np.where(distance <= ref_distance[-1], time_s - at_ref, np.nan)
+
+
+def reference_channels_at_distance(distance: np.ndarray, channels: Dict[str, np.ndarray],
+                                   reference: int) -> Dict[str, np.ndarray]:
+    """Reference lap channel values interpolated at every lap's distances."""
+    grid = _reference_grid(distance[reference])
+    return {name: np.interp(distance, distance[reference, grid], values[reference, grid])
+            for name, values in channels.items()}
+
+
+# ========================
+# ATTRIBUTION
+# ========================
+def attribute_time_loss(delta: np.ndarray, distance: np.ndarray, channels: Dict[str, np.ndarray],
+                        reference: int, sector_index: np.ndarray, num_sectors: int) -> Dict[str, np.ndarray]:
+    """
+    Split every lap's per-sector delta time into setup/rider/other parts.
+
+    The per-sample increment of the delta-time channel is regressed on the
+    channel differences vs the reference (no intercept, one least-squares
+    fit over all laps and samples); each group's fitted increments are
+    summed per sector.
+
+    Returns:
+        Dict of (laps x sectors) arrays: 'setup', 'rider', 'other'
+    """
+    names = SETUP_CHANNELS + RIDER_CHANNELS
+    ref_values = reference_channels_at_distance(distance, {n: channels[n] for n in names}, reference)
+    increments = np.diff(delta, axis=1, prepend=0.0)
+    features = np.stack([channels[n] - ref_values[n] for n in names], axis=-1)
+
+    valid = np.isfinite(increments) & np.all(np.isfinite(features), axis=-1) & (sector_index >= 0)
+    valid[reference] = False
+    x, y = features[valid], increments[valid]
+    scale = np.where(x.std(axis=0) > 0, x.std(axis=0), 1.0) if len(x) else np.ones(len(names))
+    beta = np.linalg.lstsq(x / scale, y, rcond=None)[0] / scale if len(x) else np.zeros(len(names))
+
+    fitted = np.where(valid[..., None], features * beta, 0.0)
+    groups = {'setup': fitted[..., :len(SETUP_CHANNELS)].sum(axis=-1),
+              'rider': fitted[..., len(SETUP_CHANNELS):].sum(axis=-1)}
+
+    num_laps = delta.shape[0]
+    flat_sector = np.where(sector_index >= 0, sector_index + np.arange(num_laps)[:, None] * num_sectors, -1)
+    keep = flat_sector >= 0
+    out = {}
+    for name, values in groups.items():
+        out[name] = np.bincount(flat_sector[keep], weights=values[keep],
+                                minlength=num_laps * num_sectors).reshape(num_laps, num_sectors)
+    return out
+
+
+# ========================
+# PIPELINE
+# ========================
+def sector_timing(df: pd.DataFrame, num_sectors: int = NUM_SECTORS, reference=None,
+                  boundaries: List[float] = None) -> Dict:
+    """
+    Sector times, delta-time channel and attribution for every lap.
+
+    Args:
+        df: Telemetry with 'time', 'speed_kmh', 'lap', 'setup' and the
+            attribution channels, rows grouped by lap
+        num_sectors: Equal-distance sectors over the shortest lap distance
+        reference: Reference lap row, or a setup name for that setup's
+                   fastest lap (default: fastest lap over the course)
+        boundaries: Optional sector boundary distances (m), including 0
+                    and the finish
+
+    Returns:
+        Dict with 'boundaries', 'sector_times' (laps x sectors), 'delta'
+        (laps x samples), 'sector_delta', 'setup', 'rider', 'other',
+        'reference', 'setups', 'laps' and the lap matrices
+    """
+    lap_starts, spl, setups, laps = lap_layout(df)
+    time_s = lap_matrix(df, 'time', lap_starts, spl)
+    time_s = time_s - time_s[:, :1]
+    speed = lap_matrix(df, 'speed_kmh', lap_starts, spl)
+    distance = lap_distance(speed, time_s)
+
+    if boundaries is None:
+        boundaries = np.linspace(0.0, distance[:, -1].min(), num_sectors + 1)
+    boundaries = np.asarray(boundaries, dtype=float)
+    num_sectors = len(boundaries) - 1
+
+    crossings = crossing_times(distance, time_s, boundaries)
+    sector_times = np.diff(crossings, axis=1)
+    if reference is None or isinstance(reference, str):
+        candidates = np.arange(len(setups)) if reference is None else np.flatnonzero(setups == reference)
+        reference = int(candidates[np.nanargmin(crossings[candidates, -1])])
+
+    delta = delta_time_channel(distance, time_s, reference)
+    sector_index = np.searchsorted(boundaries, distance, side='right') - 1
+    sector_index = np.where((sector_index < num_sectors) & (distance > 0), sector_index, -1)
+
+    channels = {name: lap_matrix(df, name, lap_starts, spl)
+                for name in SETUP_CHANNELS + RIDER_CHANNELS}
+    parts = attribute_time_loss(delta, distance, channels, reference, sector_index, num_sectors)
+    sector_delta = sector_times - sector_times[reference]
+    parts['other'] = sector_delta - parts['setup'] - parts['rider']
+
+    return {
+        'boundaries': boundaries, 'crossings': crossings, 'sector_times': sector_times,
+        'sector_delta': sector_delta, 'delta': delta, 'distance': distance,
+        'sector_index': sector_index, 'speed': speed, 'channels': channels,
+        'reference': reference, 'setups': setups, 'laps': laps, **parts,
+    }
+
+
+def delta_time_series(df: pd.DataFrame, timing: Dict = None) -> np.ndarray:
+    """Delta-time vs the reference lap aligned to the dataset rows (NaN past the last lap)."""
+    timing = timing or sector_timing(df)
+    out = np.full(len(df), np.nan)
+    out[: timing['delta'].size] = timing['delta'].ravel()
+    return out
+
+
+def time_loss_table(df: pd.DataFrame, baseline: str = 'baseline', optimized: str = 'optimized',
+                    num_sectors: int = NUM_SECTORS) -> pd.DataFrame:
+    """
+    Table_v4_Time_Loss_Attribution: baseline vs optimized per sector.
+
+    The reference is the fastest optimized lap; baseline values are the
+    mean over the baseline laps. time_delta_s > 0 means the optimized
+    setup is faster.
+    """
+    timing = sector_timing(df, num_sectors=num_sectors, reference=optimized)
+    setups, reference = timing['setups'], timing['reference']
+    base_rows = setups == baseline
+    sector_index = timing['sector_index']
+
+    def sector_mean(matrix, rows):
+        index = sector_index[rows]
+        keep = index >= 0
+        sums = np.bincount(index[keep], weights=matrix[rows][keep], minlength=num_sectors)
+        counts = np.bincount(index[keep], minlength=num_sectors)
+        return sums / np.maximum(counts, 1)
+
+    ref_row = np.arange(len(setups)) == reference
+    rpm, slip = timing['channels']['engine_rpm'], timing['channels']['wheel_slip_percent']
+    boundaries = timing['boundaries']
+    table = pd.DataFrame({
+        'sector': [f"Sector_{k + 1}" for k in range(num_sectors)],
+        'sector_start_m': boundaries[:-1],
+        'sector_end_m': boundaries[1:],
+        'baseline_time_s': timing['sector_times'][base_rows].mean(axis=0),
+        'optimized_time_s': timing['sector_times'][reference],
+        'time_delta_s': timing['sector_delta'][base_rows].mean(axis=0),
+        'setup_contribution_s': timing['setup'][base_rows].mean(axis=0),
+        'rider_contribution_s': timing['rider'][base_rows].mean(axis=0),
+        'other_contribution_s': timing['other'][base_rows].mean(axis=0),
+        'baseline_avg_speed_kmh': sector_mean(timing['speed'], base_rows),
+        'optimized_avg_speed_kmh': sector_mean(timing['speed'], ref_row),
+        'rpm_delta': sector_mean(rpm, base_rows) - sector_mean(rpm, ref_row),
+        'slip_delta_pct': sector_mean(slip, base_rows) - sector_mean(slip, ref_row),
+    })
+
+    total = table.select_dtypes('number').sum().to_dict()
+    for column in ['baseline_avg_speed_kmh', 'optimized_avg_speed_kmh', 'rpm_delta', 'slip_delta_pct']:
+        total[column] = table[column].mean()
+    total.update({'sector': 'Total', 'sector_start_m': boundaries[0], 'sector_end_m': boundaries[-1]})
+    return pd.concat([table, pd.DataFrame([total])], ignore_index=True)
+
+
+# ========================
+# MAIN EXECUTION
+# ========================
+if __name__ == '__main__':
+    dataset_file = Path(sys.argv[1]) if len(sys.argv) > 1 else DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
+    print("\n" + "="*80)
+    print("🏁 DISTANCE-BASED SECTOR TIMING")
+    print("="*80)
+
+    df = pd.read_csv(dataset_file, usecols=['time', 'speed_kmh', 'lap', 'setup']
+                     + SETUP_CHANNELS + RIDER_CHANNELS)
+    table = time_loss_table(df)
+    print(table[['sector', 'sector_end_m', 'baseline_time_s', 'optimized_time_s', 'time_delta_s',
+                 'setup_contribution_s', 'rider_contribution_s', 'other_contribution_s']].to_string(index=False))
+    print()
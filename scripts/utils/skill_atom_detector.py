@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Skill-Atom Segmentation Detector (H2)
+
+Finds Apex Steering (AS) and Controlled Exit (CE) boundaries in every turn
+traversal of the telemetry, instead of drawing them at random:
+
+  • CE: throttle hysteresis (on ≥ 0.60, off < 0.55), i.e. the rider is
+    back on the throttle and stays there
+  • AS: cornering-load hysteresis, where the load is the smaller of
+    |lateral g| and the steering proxy (gyro_yaw_dps, v4 has no steering
+    angle channel), each normalized by its peak in the traversal
+    (on ≥ 0.85, off < 0.75); AS ends at the CE onset at the latest
+
+Ground truth comes from the known phase layout of the v4 generator
+(generate_circuit_profile): entry 0-30% of the turn, apex 30-70% (AS),
+exit 70-100% (CE, throttle step).
+
+Each turn is processed as one (laps x samples) matrix: hysteresis, run
+extraction, temporal IoU and precision/recall/F1 are array operations over
+all laps at once.
+
+Uso:
+  python scripts/utils/skill_atom_detector.py [dataset.csv]
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+from lazy_import import lazy_import
+from turn_rating_pipeline import TURN_SAMPLE_WINDOWS, DATA_DIR, lap_layout, lap_matrix
+
+pd = lazy_import('pandas')
+
+# ========================
+# CONSTANTS
+# ========================
+THROTTLE_ON = 0.60
+THROTTLE_OFF = 0.55
+LOAD_ON = 0.85
+LOAD_OFF = 0.75
+IOU_THRESHOLD = 0.5
+
+# Phase layout of generate_circuit_profile, as fractions of the turn
+GROUND_TRUTH_PHASES = {
+    'AS': (0.3, 0.7),
+    'CE': (0.7, 1.0),
+}
+SKILL_ATOMS = list(GROUND_TRUTH_PHASES)
+
+
+# ========================
+# VECTORIZED PRIMITIVES
+# ========================
+def hysteresis(x: np.ndarray, on, off) -> np.ndarray:
+    """
+    Two-threshold state machine along the last axis, for all rows at once.
+
+    The state switches on where x >= on, off where x < off and otherwise
+    holds its previous value (initially off).
+
+    Returns:
+        Boolean array with the shape of x
+    """
+    event = np.where(x >= on, 1, np.where(x < off, 0, -1))
+    columns = np.arange(x.shape[-1])
+    last_event = np.maximum.accumulate(np.where(event >= 0, columns, -1), axis=-1)
+    state = np.take_along_axis(event, np.maximum(last_event, 0), axis=-1) == 1
+    return state & (last_event >= 0)
+
+
+def first_run(state: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Start/end (exclusive) of the first True run of every row.
+
+    Returns:
+        Tuple of (start, end, found) arrays; rows without a run get (0, 0)
+    """
+    found = state.any(axis=-1)
+    start = np.argmax(state, axis=-1)
+    after = ~state & (np.arange(state.shape[-1]) > start[:, None])
+    end = np.where(after.any(axis=-1), np.argmax(after, axis=-1), state.shape[-1])
+    return np.where(found, start, 0), np.where(found, end, 0), found
+
+
+def temporal_iou(gt_start, gt_end, pred_start, pred_end) -> np.ndarray:
+    """Interval IoU for arrays of [start, end) intervals (0 when the union is empty)."""
+    intersection = np.clip(np.minimum(gt_end, pred_end) - np.maximum(gt_start, pred_start), 0, None)
+    union = (gt_end - gt_start) + (pred_end - pred_start) - intersection
+    return np.divide(intersection, union, out=np.zeros(np.shape(union)), where=union > 0)
+
+
+def _normalized(matrix: np.ndarray) -> np.ndarray:
+    peak = np.max(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, peak, out=np.zeros_like(matrix), where=peak > 0)
+
+
+# ========================
+# DETECTOR
+# ========================
+def detect_turn_atoms(throttle: np.ndarray, accel_lat: np.ndarray, steering: np.ndarray) -> Dict:
+    """
+    Detect AS and CE in (traversals x samples) matrices of one turn.
+
+    Returns:
+        Dict {atom: (start, end, found)} with sample indices from turn start
+    """
+    ce = first_run(hysteresis(throttle, THROTTLE_ON, THROTTLE_OFF))
+
+    load = np.minimum(_normalized(np.abs(accel_lat)), _normalized(np.abs(steering)))
+    as_start, as_end, as_found = first_run(hysteresis(load, LOAD_ON, LOAD_OFF))
+    ce_start, _, ce_found = ce
+    cut = ce_found & (ce_start > as_start)
+    as_end = np.where(cut, np.minimum(as_end, ce_start), as_end)
+    return {'AS': (as_start, as_end, as_found), 'CE': ce}
+
+
+def ground_truth_bounds(turn_length: int) -> Dict[str, Tuple[int, int]]:
+    """Ground-truth [start, end) samples of each atom in a turn of turn_length."""
+    return {atom: (int(turn_length * lo), int(turn_length * hi))
+            for atom, (lo, hi) in GROUND_TRUTH_PHASES.items()}
+
+
+def segment_skill_atoms(df: pd.DataFrame, turn_windows: Dict = None) -> pd.DataFrame:
+    """
+    Detect skill atoms in every (lap, turn) and score them against ground truth.
+
+    Args:
+        df: Telemetry with 'throttle_position', 'accel_lat_g', 'gyro_yaw_dps',
+            'time', 'lap' and 'setup', rows grouped by lap
+        turn_windows: Optional {turn: (start_sample, end_sample)} mapping
+
+    Returns:
+        DataFrame with one row per (lap, turn, atom); times in seconds from
+        the turn start
+    """
+    turn_windows = turn_windows or TURN_SAMPLE_WINDOWS
+    lap_starts, spl, setups, laps = lap_layout(df)
+    dt = np.median(np.diff(df['time'].to_numpy()[:spl]))
+    channels = {name: lap_matrix(df, name, lap_starts, spl)
+                for name in ('throttle_position', 'accel_lat_g', 'gyro_yaw_dps')}
+
+    tables = []
+    for turn_index, (turn, (start, end)) in enumerate(turn_windows.items()):
+        window = slice(start, end)
+        detected = detect_turn_atoms(channels['throttle_position'][:, window],
+                                     channels['accel_lat_g'][:, window],
+                                     channels['gyro_yaw_dps'][:, window])
+        truth = ground_truth_bounds(end - start)
+        for atom in SKILL_ATOMS:
+            pred_start, pred_end, found = detected[atom]
+            gt_start, gt_end = truth[atom]
+            iou = np.where(found, temporal_iou(gt_start, gt_end, pred_start, pred_end), 0.0)
+            tables.append(pd.DataFrame({
+                'sample_id': np.arange(len(laps)) * len(turn_windows) + turn_index,
+                'setup': setups,
+                'lap': laps,
+                'turn': turn,
+                'skill_atom': atom,
+                'gt_start_time_s': gt_start * dt,
+                'gt_end_time_s': gt_end * dt,
+                'pred_start_time_s': np.where(found, pred_start * dt, np.nan),
+                'pred_end_time_s': np.where(found, pred_end * dt, np.nan),
+                'temporal_iou': iou,
+                'detected': found.astype(int),
+                'detection_correct': (iou > IOU_THRESHOLD).astype(int),
+                'expert_validated': 0,
+            }))
+
+    return (pd.concat(tables, ignore_index=True)
+            .sort_values(['sample_id', 'skill_atom'], kind='stable', ignore_index=True))
+
+
+def summarize_segmentation(df_segmentation: pd.DataFrame) -> pd.DataFrame:
+    """
+    Precision, recall, F1 and IoU per skill atom.
+
+    A detection is a true positive when its IoU exceeds IOU_THRESHOLD;
+    precision is over detections, recall over ground-truth atoms.
+    """
+    grouped = df_segmentation.groupby('skill_atom', sort=False)
+    true_positives = grouped['detection_correct'].sum()
+    detections = grouped['detected'].sum()
+    ground_truth = grouped.size()
+
+    precision = (true_positives / detections.where(detections > 0)).fillna(0.0)
+    recall = true_positives / ground_truth
+    f1 = (2 * precision * recall / (precision + recall).where(precision + recall > 0)).fillna(0.0)
+    return pd.DataFrame({
+        'skill_atom': true_positives.index,
+        'precision': precision.to_numpy(),
+        'recall': recall.to_numpy(),
+        'f1_score': f1.to_numpy(),
+        'mean_temporal_iou': grouped['temporal_iou'].mean().to_numpy(),
+        'std_temporal_iou': grouped['temporal_iou'].std().to_numpy(),
+        'samples': ground_truth.to_numpy(),
+    })
+
+
+# ========================
+# MAIN EXECUTION
+# ========================
+if __name__ == '__main__':
+    dataset_file = Path(sys.argv[1]) if len(sys.argv) > 1 else DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
+    print("\n" + "="*80)
+    print("🏁 SKILL-ATOM SEGMENTATION DETECTOR (AS / CE)")
+    print("="*80)
+
+    df = pd.read_csv(dataset_file, usecols=['time', 'throttle_position', 'accel_lat_g',
+                                            'gyro_yaw_dps', 'lap', 'setup'])
+    df_segmentation = segment_skill_atoms(df)
+    print(summarize_segmentation(df_segmentation).to_string(index=False))
+    print()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Batched Spectral Analysis of Suspension and IMU Channels
+
+Suspension travel, damper velocity and gyro channels differ between
+setups in frequency content more than in their means. This module gives
+Welch PSDs per (setup, turn) and spectrograms per setup for many
+channels and laps without looping over channels:
+
+  • the windows of a turn (one per lap) are gathered into a
+    (windows, samples, channels) block; its Welch segments are a strided
+    view, so ONE rfft over a (windows, channels, segments, nperseg)
+    array gives every periodogram of the batch
+  • whole laps go through the same path with longer segments for the
+    spectrograms, in batches of laps so memory stays bounded
+  • damper velocity is derived per window (gradient of travel x fs), so
+    lap boundaries never enter the derivative
+
+welch_block() equals scipy.signal.welch() with window='hann' and
+detrend='constant' along axis 1. spectrogram_block() equals
+scipy.signal.spectrogram() with the same window and detrend only for the
+same noverlap: its default is nperseg // 2 (as Welch), scipy's is
+nperseg // 8, so pass noverlap=nperseg // 8 to reproduce scipy's default
+segments. spectral_analysis() reduces a dataset to the mean PSD of
+every (setup, turn), the band energies and the mean lap spectrogram of
+every setup; cached_spectral_analysis() stores that payload in a
+FigureCache keyed by the dataset fingerprint, the one entry that
+Figure 13 and Table_v4_Spectral_Band_Energy both read.
+
+Uso:
+  from spectral_analysis import spectral_analysis, band_energy_table
+  payload = spectral_analysis(df)                 # DataFrame(s) or ChannelStore(s)
+  table = band_energy_table(payload)              # Table_v4_Spectral_Band_Energy
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from figure_cache import FigureCache
+from lazy_import import lazy_import
+from telemetry_query import TelemetryIndex
+from turn_rating_pipeline import TURN_SAMPLE_WINDOWS
+
+pd = lazy_import('pandas')
+
+# ========================
+# CONSTANTS
+# ========================
+TRAVEL_CHANNELS = ['suspension_fl_travel_mm', 'suspension_fr_travel_mm',
+                   'suspension_rl_travel_mm', 'suspension_rr_travel_mm']
+IMU_CHANNELS = ['gyro_roll_dps', 'gyro_pitch_dps', 'gyro_yaw_dps', 'accel_vert_g']
+# Derived from each travel channel: d(travel)/dt
+DAMPER_CHANNELS = [name.replace('suspension_', 'damper_velocity_').replace('_travel_mm', '_mm_s')
+                   for name in TRAVEL_CHANNELS]
+
+TURN_NPERSEG = 64               # Welch segment within a turn (shortest turn: 120 samples)
+LAP_NPERSEG = 256               # Spectrogram segment over a whole lap
+BANDS_HZ = ((0, 25), (25, 100), (100, 250), (250, 500))   # at 1 kHz; see bands_for_rate()
+BATCH_WINDOWS = 64              # Laps per FFT call for the spectrograms
+
+SPECTRAL_NAME = 'spectral'
+SPECTRAL_VERSION = 2            # bump when spectral_analysis() changes what it computes
+
+
+def band_label(band: Tuple[float, float]) -> str:
+    return f"{band[0]:g}-{band[1]:g} Hz"
+
+
+def bands_for_rate(fs: float, bands=BANDS_HZ) -> List[Tuple[float, float]]:
+    """Bands clipped to Nyquist (fs / 2); bands entirely above it are dropped."""
+    nyquist = fs / 2
+    return [(low, min(high, nyquist)) for low, high in bands if low < nyquist]
+
+
+# ========================
+# STACKED FFT
+# ========================
+def _periodograms(block: np.ndarray, fs: float, nperseg: int, noverlap: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One-sided PSD of every segment of every window and channel.
+
+    Args:
+        block: (windows, samples, channels) array
+
+    Returns:
+        (freqs, (windows, channels, segments, freqs) array)
+    """
+    step = nperseg - noverlap
+    # Channel-major so every segment is contiguous (no copy if block is such a view)
+    series = np.ascontiguousarray(np.moveaxis(block, 1, -1))
+    segments = np.lib.stride_tricks.sliding_window_view(series, nperseg, axis=-1)[..., ::step, :]
+    window = np.hanning(nperseg + 1)[:-1]           # periodic Hann, as scipy.signal.get_window
+    # Detrending is linear: rfft((x - mean) * w) = rfft(x * w) - mean * rfft(w)
+    spectrum = np.fft.rfft(segments * window, axis=-1)
+    spectrum -= segments.mean(axis=-1, keepdims=True) * np.fft.rfft(window)
+    power = spectrum.real**2
+    power += spectrum.imag**2
+    power *= 1.0 / (fs * (window**2).sum())
+    power[..., 1:-1 if nperseg % 2 == 0 else None] *= 2
+    return np.fft.rfftfreq(nperseg, 1.0 / fs), power
+
+
+def welch_block(block: np.ndarray, fs: float, nperseg: int, noverlap: Optional[int] = None
+                ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Welch PSD of every window and channel of a block in one FFT call.
+
+    Args:
+        block: (windows, samples, channels) array
+        fs: Sample rate (Hz)
+        nperseg: Segment length (<= samples)
+        noverlap: Segment overlap (default nperseg // 2)
+
+    Returns:
+        (freqs, (windows, freqs, channels) PSD)
+    """
+    noverlap = nperseg // 2 if noverlap is None else noverlap
+    freqs, power = _periodograms(block, fs, nperseg, noverlap)
+    return freqs, np.moveaxis(power.mean(axis=2), -1, 1)
+
+
+def spectrogram_block(block: np.ndarray, fs: float, nperseg: int, noverlap: Optional[int] = None
+                      ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Spectrogram of every window and channel of a block in one FFT call.
+
+    noverlap defaults to nperseg // 2, not scipy.signal.spectrogram's
+    nperseg // 8; segment count and times follow the overlap used.
+
+    Returns:
+        (freqs, segment center times, (windows, freqs, channels, times) PSD)
+    """
+    noverlap = nperseg // 2 if noverlap is None else noverlap
+    freqs, power = _periodograms(block, fs, nperseg, noverlap)
+    times = (nperseg / 2 + np.arange(power.shape[2]) * (nperseg - noverlap)) / fs
+    return freqs, times, np.transpose(power, (0, 3, 1, 2))
+
+
+def band_energy(freqs: np.ndarray, psd: np.ndarray, bands=BANDS_HZ, axis: int = -2) -> np.ndarray:
+    """
+    Energy (PSD integrated over frequency) of each band.
+
+    The last band includes its upper edge, so Nyquist is counted once.
+
+    Returns:
+        psd with the frequency axis replaced by one entry per band (moved last)
+    """
+    df = freqs[1] - freqs[0]
+    psd = np.moveaxis(psd, axis, -1)
+    energies = []
+    for i, (low, high) in enumerate(bands):
+        inside = (freqs >= low) & ((freqs <= high) if i == len(bands) - 1 else (freqs < high))
+        energies.append(psd[..., inside].sum(axis=-1) * df)
+    return np.stack(energies, axis=-1)
+
+
+# ========================
+# DATASET
+# ========================
+def _sources(sources) -> List[TelemetryIndex]:
+    return [s if isinstance(s, TelemetryIndex) else TelemetryIndex(s) for s in sources]
+
+
+def sample_rate(index: TelemetryIndex) -> float:
+    """Rate of the first lap, from its median time step."""
+    time = index.column('time')[index.run_start[0]:index.run_stop[0]]
+    return float(1.0 / np.median(np.diff(time)))
+
+
+def spectral_channels(index: TelemetryIndex) -> List[str]:
+    """Channels analysed: travel present in the source, its damper velocity, then the IMU."""
+    travel = [name for name in TRAVEL_CHANNELS if name in index.source.columns]
+    damper = [DAMPER_CHANNELS[TRAVEL_CHANNELS.index(name)] for name in travel]
+    return travel + damper + [name for name in IMU_CHANNELS if name in index.source.columns]
+
+
+def iter_windows(index: TelemetryIndex, starts: np.ndarray, length: int, fs: float,
+                 batch: int = BATCH_WINDOWS) -> Iterator[np.ndarray]:
+    """
+    (windows, length, channels) blocks of spectral_channels(), batch windows at a time.
+
+    Rows are gathered once per channel with one fancy index; damper
+    velocities are np.gradient of the gathered travel windows. Blocks
+    are channel-major views, which is the layout the FFT wants.
+    """
+    travel = [name for name in TRAVEL_CHANNELS if name in index.source.columns]
+    imu = [name for name in IMU_CHANNELS if name in index.source.columns]
+    columns = [index.column(name) for name in travel + imu]
+    offsets = np.arange(length)
+    for first in range(0, len(starts), batch):
+        rows = starts[first:first + batch, None] + offsets
+        block = np.stack([np.asarray(column[rows], dtype=np.float64) for column in columns], axis=1)
+        damper = np.gradient(block[:, :len(travel)], axis=-1) * fs
+        block = np.concatenate([block[:, :len(travel)], damper, block[:, len(travel):]], axis=1)
+        yield np.moveaxis(block, 1, -1)
+
+
+def spectral_analysis(*sources, turn_windows: Optional[Dict[str, tuple]] = None,
+                      turn_nperseg: int = TURN_NPERSEG, lap_nperseg: int = LAP_NPERSEG,
+                      batch: int = BATCH_WINDOWS) -> dict:
+    """
+    Mean turn PSDs, band energies and lap spectrograms of each setup.
+
+    Args:
+        *sources: DataFrames, ChannelStores or TelemetryIndexes (e.g. one
+                  frame per setup); runs of the same setup are pooled
+        turn_windows: {turn: (start_sample, end_sample)} from each lap start
+        turn_nperseg: Welch segment length within a turn
+        lap_nperseg: Spectrogram segment length over a lap
+        batch: Laps per FFT call for the spectrograms
+
+    Returns:
+        Payload dict (arrays + lists, FigureCache-ready):
+          setups, turns, channels, bands, laps (per setup), fs,
+          freqs, psd (setup, turn, freq, channel),
+          energy (setup, turn, channel, band),
+          spec_freqs, spec_times, spectrogram (setup, freq, channel, time)
+    """
+    indexes = _sources(sources)
+    turn_windows = dict(turn_windows or TURN_SAMPLE_WINDOWS)
+    turns = list(turn_windows)
+    fs = sample_rate(indexes[0])
+    bands = bands_for_rate(fs)
+    channels = spectral_channels(indexes[0])
+    lap_length = int(np.median(np.concatenate([ix.run_stop - ix.run_start for ix in indexes])))
+
+    # (index, run start) of the complete laps of every setup, in source order
+    setups: Dict[str, List[Tuple[TelemetryIndex, np.ndarray]]] = {}
+    for ix in indexes:
+        complete = (ix.run_stop - ix.run_start) >= lap_length
+        for code, name in enumerate(ix.setups):
+            runs = np.flatnonzero(complete & (ix.run_setup == code))
+            if len(runs):
+                setups.setdefault(name, []).append((ix, ix.run_start[runs]))
+
+    psd_sum = spec_sum = freqs = spec_freqs = spec_times = None
+    names = list(setups)
+    laps = [int(sum(len(starts) for _, starts in setups[name])) for name in names]
+    for s, name in enumerate(names):
+        for ix, starts in setups[name]:
+            for t, turn in enumerate(turns):
+                start, end = turn_windows[turn]
+                for block in iter_windows(ix, starts + start, end - start, fs, batch):
+                    freqs, psd = welch_block(block, fs, min(turn_nperseg, end - start))
+                    if psd_sum is None:
+                        psd_sum = np.zeros((len(names), len(turns)) + psd.shape[1:])
+                    psd_sum[s, t] += psd.sum(axis=0)
+            for block in iter_windows(ix, starts, lap_length, fs, batch):
+                spec_freqs, spec_times, spec = spectrogram_block(block, fs, lap_nperseg)
+                if spec_sum is None:
+                    spec_sum = np.zeros((len(names),) + spec.shape[1:])
+                spec_sum[s] += spec.sum(axis=0)
+
+    counts = np.asarray(laps, dtype=np.float64)
+    psd = psd_sum / counts[:, None, None, None]
+    return {
+        'setups': names, 'turns': turns, 'channels': channels,
+        'bands': [band_label(b) for b in bands], 'laps': laps, 'fs': fs,
+        'freqs': freqs, 'psd': psd,
+        'energy': band_energy(freqs, psd, bands, axis=2),
+        'spec_freqs': spec_freqs, 'spec_times': spec_times,
+        'spectrogram': spec_sum / counts[:, None, None, None],
+    }
+
+
+def cached_spectral_analysis(cache: FigureCache, fingerprint: str, load: Callable[[], Sequence],
+                             **kwargs) -> dict:
+    """
+    spectral_analysis() of a dataset, stored in cache under its fingerprint.
+
+    Args:
+        cache: Shared payload cache (visualize_results_v4_advanced's for
+               Figure 13 and the band energy table alike)
+        fingerprint: Dataset fingerprint (figure_cache.dataset_fingerprint
+                     for a CSV, ChannelStore.fingerprint, frame_fingerprint)
+        load: Returns the sources of spectral_analysis(); only called on a miss
+    """
+    return cache.get_or_compute(SPECTRAL_NAME, SPECTRAL_VERSION, fingerprint,
+                                lambda: spectral_analysis(*load(), **kwargs))
+
+
+def band_energy_table(payload: dict) -> pd.DataFrame:
+    """One row per (turn, setup, channel): energy of each band and in total."""
+    rows = []
+    energy = np.asarray(payload['energy'])
+    for t, turn in enumerate(payload['turns']):
+        for s, setup in enumerate(payload['setups']):
+            for c, channel in enumerate(payload['channels']):
+                row = {'turn': turn, 'setup': setup, 'channel': channel, 'laps': payload['laps'][s]}
+                row.update(zip(payload['bands'], energy[s, t, c].tolist()))
+                row['total'] = float(energy[s, t, c].sum())
+                rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Packed Binary Telemetry Frame Codec (v4 channel set)
+
+Fixed binary layout for edge-to-gateway transport of the 37 v4 channels
+(35 channels + lap + setup). One frame carries a batch of samples:
+
+  ┌──────────────── header (12 B) ────────────────┐┌── count × record ──┐
+  magic 'N4' | version | flags | sequence | count    packed samples
+
+Record layouts (little endian, no padding):
+  • RAW:       34 float32 channels + gear u1 + lap u2 + setup u1 = 140 B
+  • QUANTIZED: float channels as int32 multiples of a per-channel step
+  • DELTA:     quantized float channels as int16 differences against the
+               previous sample (the first against the previous frame);
+               frames whose differences overflow int16 are sent QUANTIZED,
+               and frames whose steps overflow int32 (or are not finite) RAW
+
+RAW frames decode zero-copy: the structured array returned by decode() is
+an np.frombuffer view on the received bytes, and channel_matrix() gives a
+(samples x channels) strided view on it. QUANTIZED/DELTA frames decode with
+one vectorized multiply (and cumulative sum) per frame.
+
+Uso:
+  from telemetry_codec import FrameEncoder, FrameDecoder, records_from_dataframe
+  frame = FrameEncoder(delta=True).encode(records)
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+
+# ========================
+# CHANNEL LAYOUT
+# ========================
+FLOAT_CHANNELS = [
+    'time', 'engine_rpm', 'engine_torque_nm', 'throttle_position', 'speed_kmh',
+    'accel_lon_g', 'accel_lat_g', 'wheel_slip_percent', 'brake_pressure_bar',
+    'brake_temperature_c', 'brake_balance_percent',
+    'suspension_fl_travel_mm', 'suspension_fr_travel_mm',
+    'suspension_rl_travel_mm', 'suspension_rr_travel_mm',
+    'tire_temp_fl_c', 'tire_temp_fr_c', 'tire_temp_rl_c', 'tire_temp_rr_c',
+    'tire_pressure_fl_bar', 'tire_pressure_fr_bar', 'tire_pressure_rl_bar', 'tire_pressure_rr_bar',
+    'accel_vert_g', 'gyro_roll_dps', 'gyro_pitch_dps', 'gyro_yaw_dps',
+    'aero_downforce_n', 'aero_drag_n', 'glicko_volatility_sigma',
+    'gear_ratio_efficiency_percent', 'engine_efficiency_percent',
+    'battery_voltage_v', 'battery_current_a',
+]
+DISCRETE_CHANNELS = [('gear_position', '<u1'), ('lap', '<u2'), ('setup', '<u1')]
+CHANNELS = FLOAT_CHANNELS + [name for name, _ in DISCRETE_CHANNELS]
+SETUP_CODES = {'baseline': 0, 'optimized': 1}
+
+# Quantization step per float channel (sensor resolution); others use 1e-3
+QUANT_STEPS = {
+    'time': 1e-4,
+    'engine_rpm': 1.0,
+    'engine_torque_nm': 0.01,
+    'throttle_position': 0.01,
+    'speed_kmh': 0.01,
+    'brake_pressure_bar': 0.01,
+    'brake_temperature_c': 0.1,
+    'brake_balance_percent': 0.01,
+    'suspension_fl_travel_mm': 0.01,
+    'suspension_fr_travel_mm': 0.01,
+    'suspension_rl_travel_mm': 0.01,
+    'suspension_rr_travel_mm': 0.01,
+    'tire_temp_fl_c': 0.1,
+    'tire_temp_fr_c': 0.1,
+    'tire_temp_rl_c': 0.1,
+    'tire_temp_rr_c': 0.1,
+    'gyro_roll_dps': 0.01,
+    'gyro_pitch_dps': 0.01,
+    'gyro_yaw_dps': 0.01,
+    'aero_downforce_n': 0.1,
+    'aero_drag_n': 0.1,
+    'gear_ratio_efficiency_percent': 0.01,
+    'engine_efficiency_percent': 0.01,
+    'battery_voltage_v': 0.01,
+    'battery_current_a': 0.01,
+    'wheel_slip_percent': 0.01,
+}
+DEFAULT_QUANT_STEP = 1e-3
+
+MAGIC = b'N4'
+VERSION = 1
+FLAG_QUANTIZED = 0x01
+FLAG_DELTA = 0x02
+HEADER = struct.Struct('<2sBBIH2x')
+
+
+def _record_dtype(value_type: str) -> np.dtype:
+    return np.dtype([(name, value_type) for name in FLOAT_CHANNELS] + DISCRETE_CHANNELS)
+
+
+SAMPLE_DTYPE = _record_dtype('<f4')
+QUANTIZED_DTYPE = _record_dtype('<i4')
+DELTA_DTYPE = _record_dtype('<i2')
+_FRAME_DTYPES = {0: SAMPLE_DTYPE, FLAG_QUANTIZED: QUANTIZED_DTYPE,
+                 FLAG_QUANTIZED | FLAG_DELTA: DELTA_DTYPE}
+
+
+# ========================
+# RECORDS
+# ========================
+def channel_matrix(records: np.ndarray) -> np.ndarray:
+    """(samples x float channels) strided view on the float fields of records."""
+    value_dtype = records.dtype[FLOAT_CHANNELS[0]]
+    return np.ndarray(shape=(len(records), len(FLOAT_CHANNELS)), dtype=value_dtype,
+                      buffer=records, offset=0,
+                      strides=(records.dtype.itemsize, value_dtype.itemsize))
+
+
+def records_from_dataframe(df: pd.DataFrame) -> np.ndarray:
+    """Pack the v4 channels of a dataset into SAMPLE_DTYPE records."""
+    records = np.empty(len(df), dtype=SAMPLE_DTYPE)
+    channel_matrix(records)[:] = df[FLOAT_CHANNELS].to_numpy(dtype=np.float32)
+    records['gear_position'] = df['gear_position'].to_numpy()
+    records['lap'] = df['lap'].to_numpy()
+    setup = df['setup']
+    records['setup'] = setup if pd.api.types.is_numeric_dtype(setup) else setup.map(SETUP_CODES)
+    return records
+
+
+def records_to_dataframe(records: np.ndarray) -> pd.DataFrame:
+    """Unpack records into a DataFrame with setup names restored."""
+    df = pd.DataFrame({name: records[name] for name in CHANNELS})
+    names = {code: name for name, code in SETUP_CODES.items()}
+    df['setup'] = df['setup'].map(names)
+    return df
+
+
+def _quant_steps(steps: Dict[str, float] = None) -> np.ndarray:
+    steps = {**QUANT_STEPS, **(steps or {})}
+    return np.array([steps.get(name, DEFAULT_QUANT_STEP) for name in FLOAT_CHANNELS])
+
+
+def _copy_discrete(dst: np.ndarray, src: np.ndarray):
+    for name, _ in DISCRETE_CHANNELS:
+        dst[name] = src[name]
+
+
+# ========================
+# ENCODER / DECODER
+# ========================
+class FrameEncoder:
+    """
+    Stateful frame encoder.
+
+    Args:
+        quantize: Send float channels as int32 multiples of their step
+        delta: Send quantized int16 differences against the previous
+               sample (implies quantize; the state spans frames)
+        steps: Optional {channel: step} overrides of QUANT_STEPS
+    """
+
+    def __init__(self, quantize: bool = False, delta: bool = False, steps: Dict[str, float] = None):
+        self.quantize = quantize or delta
+        self.delta = delta
+        self.steps = _quant_steps(steps)
+        self.sequence = 0
+        self._previous = None  # last quantized sample sent
+
+    def encode(self, records: np.ndarray) -> bytes:
+        """Encode a batch of SAMPLE_DTYPE records into one frame."""
+        flags = 0
+        if self.quantize:
+            scaled = np.rint(channel_matrix(records) / self.steps)
+            # NaN compares False, so non-finite samples also fall back to RAW
+            if np.all(np.abs(scaled) <= np.iinfo(np.int32).max):
+                flags = FLAG_QUANTIZED
+            else:
+                self._previous = None  # the next frame cannot be a delta of this one
+        if flags & FLAG_QUANTIZED:
+            quantized = scaled.astype(np.int64)
+            if self.delta and self._previous is not None and len(records):
+                diffs = np.diff(quantized, axis=0, prepend=self._previous[None, :])
+                if np.all(np.abs(diffs) <= np.iinfo(np.int16).max):
+                    flags |= FLAG_DELTA
+            out = np.empty(len(records), dtype=_FRAME_DTYPES[flags])
+            channel_matrix(out)[:] = diffs if flags & FLAG_DELTA else quantized
+            _copy_discrete(out, records)
+            if len(records):
+                self._previous = quantized[-1]
+        else:
+            out = np.ascontiguousarray(records, dtype=SAMPLE_DTYPE)
+
+        header = HEADER.pack(MAGIC, VERSION, flags, self.sequence, len(records))
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        return header + out.tobytes()
+
+
+class FrameDecoder:
+    """
+    Stateful frame decoder (DELTA frames need the previous frame).
+
+    Args:
+        steps: Same quantization overrides as the encoder
+    """
+
+    def __init__(self, steps: Dict[str, float] = None):
+        self.steps = _quant_steps(steps)
+        self.sequence = None
+        self._previous = None
+
+    def decode(self, frame, offset: int = 0) -> np.ndarray:
+        """
+        Decode one frame starting at offset.
+
+        Returns:
+            SAMPLE_DTYPE records (a zero-copy view for RAW frames)
+        """
+        magic, version, flags, sequence, count = HEADER.unpack_from(frame, offset)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a v{VERSION} telemetry frame")
+        body = np.frombuffer(frame, dtype=_FRAME_DTYPES[flags], count=count,
+                             offset=offset + HEADER.size)
+
+        expected = None if self.sequence is None else (self.sequence + 1) & 0xFFFFFFFF
+        if flags & FLAG_DELTA and (self._previous is None or sequence != expected):
+            raise ValueError(f"Delta frame {sequence} without its reference frame")
+        self.sequence = sequence
+
+        if not flags & FLAG_QUANTIZED:
+            return body
+        quantized = channel_matrix(body).astype(np.int64)
+        if flags & FLAG_DELTA and count:
+            quantized[0] += self._previous
+            np.cumsum(quantized, axis=0, out=quantized)
+        if count:
+            self._previous = quantized[-1]
+        records = np.empty(count, dtype=SAMPLE_DTYPE)
+        channel_matrix(records)[:] = quantized * self.steps
+        _copy_discrete(records, body)
+        return records
+
+
+def frame_size(frame, offset: int = 0) -> int:
+    """Total size in bytes of the frame starting at offset."""
+    _, _, flags, _, count = HEADER.unpack_from(frame, offset)
+    return HEADER.size + count * _FRAME_DTYPES[flags].itemsize
+
+
+def iter_frames(stream) -> Iterator[int]:
+    """Offsets of the frames in a buffer of back-to-back frames."""
+    offset = 0
+    while offset < len(stream):
+        yield offset
+        offset += frame_size(stream, offset)
+
+
+def decode_stream(stream, decoder: FrameDecoder = None) -> List[np.ndarray]:
+    """Decode every frame of a buffer of back-to-back frames."""
+    decoder = decoder or FrameDecoder()
+    return [decoder.decode(stream, offset) for offset in iter_frames(stream)]
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Indexed Telemetry Queries Returning Views
+
+`df[(df['setup'] == 'baseline') & ...]` builds a mask over every row and
+copies every column it keeps. Telemetry rows are grouped by lap, so
+setup, lap and turn selections are row ranges, and time is sorted within
+a lap: all of them can be answered from offsets instead.
+
+TelemetryIndex scans the dataset once and keeps, per (setup, lap) run:
+  • start/stop row offsets, setup code and lap number (sorted by row)
+  • turn windows as offsets from the lap start (TURN_SAMPLE_WINDOWS)
+  • the time channel, searched with searchsorted (globally when it is
+    monotonic, else within each run)
+
+A Query is a set of (run, lo, hi) row ranges; setup(), lap(), turn()
+and time() narrow it with array operations over the runs (O(laps), not
+O(rows)), select() projects channels. Results are slices of the source
+arrays: views() never copies, array()/frame() only copy when the rows
+span more than one range (e.g. one setup over alternating laps).
+
+Uso:
+  from telemetry_query import TelemetryIndex
+  index = TelemetryIndex(df)                              # or a ChannelStore
+  q = index.setup('baseline').lap(3).turn('Turn5').select('speed_kmh', 'engine_rpm')
+  speed = q.array('speed_kmh')                            # view of the source column
+  df_t5 = q.frame()                                       # DataFrame over views
+  q.time(1.0, 2.5).slices()                               # [slice(start, stop), ...]
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from channel_store import ChannelStore
+from lazy_import import lazy_import
+from turn_rating_pipeline import TURN_SAMPLE_WINDOWS
+
+pd = lazy_import('pandas')
+
+
+class TelemetryIndex:
+    """
+    Offset indexes of a dataset whose rows are grouped by (setup, lap).
+
+    Args:
+        source: DataFrame or ChannelStore with 'lap', 'setup' and 'time'
+        turn_windows: {turn: (start_sample, end_sample)} from each lap start
+    """
+
+    def __init__(self, source, turn_windows: Optional[Dict[str, tuple]] = None):
+        self.source = source
+        self.turn_windows = dict(turn_windows or TURN_SAMPLE_WINDOWS)
+        self._columns: Dict[str, np.ndarray] = {}
+        self.rows = len(source)
+
+        if isinstance(source, ChannelStore):
+            setup_codes = source.channel('setup')
+            self.setups = list(source.schema['channels']['setup']['categories'])
+        else:
+            codes, categories = pd.factorize(source['setup'], sort=True)
+            setup_codes = codes
+            self.setups = [str(c) for c in categories]
+        laps = self.column('lap')
+
+        change = np.flatnonzero((laps[1:] != laps[:-1]) | (setup_codes[1:] != setup_codes[:-1])) + 1
+        self.run_start = np.concatenate([[0], change]).astype(np.int64)
+        self.run_stop = np.append(change, self.rows).astype(np.int64)
+        self.run_setup = np.asarray(setup_codes[self.run_start], dtype=np.int64)
+        self.run_lap = np.asarray(laps[self.run_start], dtype=np.int64)
+
+        time = self.column('time')
+        self.time_sorted = bool(np.all(time[1:] >= time[:-1]))
+
+    def column(self, name: str) -> np.ndarray:
+        """Whole channel as an array sharing memory with the source."""
+        if name not in self._columns:
+            if isinstance(self.source, ChannelStore):
+                self._columns[name] = self.source.channel(name)
+            else:
+                self._columns[name] = self.source[name].to_numpy()
+        return self._columns[name]
+
+    def query(self) -> 'Query':
+        """Every row."""
+        runs = np.arange(len(self.run_start))
+        return Query(self, runs, np.zeros(len(runs), dtype=np.int64), self.run_stop - self.run_start)
+
+    def setup(self, *names: str) -> 'Query':
+        return self.query().setup(*names)
+
+    def lap(self, *laps: int) -> 'Query':
+        return self.query().lap(*laps)
+
+    def turn(self, name: str) -> 'Query':
+        return self.query().turn(name)
+
+    def time(self, t_start: float, t_end: float) -> 'Query':
+        return self.query().time(t_start, t_end)
+
+
+class Query:
+    """Row ranges [run_start + lo, run_start + hi) of some runs, plus a channel projection."""
+
+    def __init__(self, index: TelemetryIndex, runs: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+                 channels: Optional[List[str]] = None):
+        keep = hi > lo
+        self.index = index
+        self.runs = runs[keep]
+        self.lo = lo[keep]
+        self.hi = hi[keep]
+        self.channels = channels
+
+    def _narrow(self, keep: Optional[np.ndarray] = None, lo: Optional[np.ndarray] = None,
+                hi: Optional[np.ndarray] = None) -> 'Query':
+        lo = self.lo if lo is None else np.maximum(self.lo, lo)
+        hi = self.hi if hi is None else np.minimum(self.hi, hi)
+        if keep is None:
+            return Query(self.index, self.runs, lo, hi, self.channels)
+        return Query(self.index, self.runs[keep], lo[keep], hi[keep], self.channels)
+
+    # ========================
+    # FILTERS
+    # ========================
+    def setup(self, *names: str) -> 'Query':
+        codes = [self.index.setups.index(n) for n in names if n in self.index.setups]
+        return self._narrow(keep=np.isin(self.index.run_setup[self.runs], codes))
+
+    def lap(self, *laps: int) -> 'Query':
+        return self._narrow(keep=np.isin(self.index.run_lap[self.runs], laps))
+
+    def laps(self, first: int, last: int) -> 'Query':
+        """Laps first..last inclusive."""
+        lap = self.index.run_lap[self.runs]
+        return self._narrow(keep=(lap >= first) & (lap <= last))
+
+    def turn(self, name: str) -> 'Query':
+        """Rows of one turn window of each lap."""
+        if name not in self.index.turn_windows:
+            raise KeyError(f"Unknown turn {name!r}; expected one of {list(self.index.turn_windows)}")
+        start, end = self.index.turn_windows[name]
+        return self._narrow(lo=np.full(len(self.runs), start), hi=np.full(len(self.runs), end))
+
+    def time(self, t_start: float, t_end: float) -> 'Query':
+        """Rows with t_start <= time < t_end."""
+        time = self.index.column('time')
+        starts = self.index.run_start[self.runs]
+        if self.index.time_sorted:
+            first, last = np.searchsorted(time, [t_start, t_end])
+            return self._narrow(lo=first - starts, hi=last - starts)
+        stops = self.index.run_stop[self.runs]
+        lo = np.array([np.searchsorted(time[a:b], t_start) for a, b in zip(starts, stops)], dtype=np.int64)
+        hi = np.array([np.searchsorted(time[a:b], t_end) for a, b in zip(starts, stops)], dtype=np.int64)
+        return self._narrow(lo=lo, hi=hi)
+
+    def select(self, *channels: str) -> 'Query':
+        """Project the results onto some channels."""
+        return Query(self.index, self.runs, self.lo, self.hi, list(channels))
+
+    # ========================
+    # RESULTS
+    # ========================
+    def __len__(self) -> int:
+        return int((self.hi - self.lo).sum())
+
+    def slices(self) -> List[slice]:
+        """Row ranges of the result, adjacent ranges merged."""
+        starts = self.index.run_start[self.runs] + self.lo
+        stops = self.index.run_start[self.runs] + self.hi
+        if len(starts) == 0:
+            return []
+        breaks = np.flatnonzero(starts[1:] != stops[:-1]) + 1
+        firsts = starts[np.concatenate([[0], breaks])].tolist()
+        lasts = stops[np.append(breaks - 1, len(stops) - 1)].tolist()
+        return list(map(slice, firsts, lasts))
+
+    def views(self, channel: str) -> List[np.ndarray]:
+        """One view of the channel per row range (never copies)."""
+        values = self.index.column(channel)
+        return [values[s] for s in self.slices()]
+
+    def array(self, channel: str) -> np.ndarray:
+        """The channel over the result rows: a view if they are one range."""
+        parts = self.views(channel)
+        if not parts:
+            return self.index.column(channel)[:0]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: self.array(name) for name in self._channel_names()}
+
+    def frame(self) -> pd.DataFrame:
+        """DataFrame of the projected channels (over views when the rows are one range)."""
+        source = self.index.source
+        slices = self.slices()
+        if isinstance(source, ChannelStore) and slices:
+            # The store decodes its text columns (setup) back to categories
+            return pd.DataFrame({name: source.column(name, slices) for name in self._channel_names()},
+                                copy=False)
+        return pd.DataFrame(self.arrays(), copy=False)
+
+    def _channel_names(self) -> List[str]:
+        return self.channels if self.channels is not None else list(self.index.source.columns)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Partitioned Telemetry Warehouse
+
+Many sessions stored as one channel store (channel_store.py: a `.npy`
+per channel, memory-mapped on read) per lap, in a Hive-style tree:
+
+  <root>/circuit=Jerez/date=2026-01-21/session=Q1/setup=optimized/lap=0003/
+
+plus a SQLite catalog (<root>/catalog.sqlite) with:
+  • partitions: circuit, date, session, setup, lap, path, rows
+  • channel_stats: min/max of every numeric channel per partition, for
+    the whole lap (turn '') and for each turn window of the lap
+    (TURN_SAMPLE_WINDOWS, the layout the turn ratings use)
+
+A query prunes partitions in SQL from the keys and those statistics
+before touching any channel file: "Turn5, optimized, tire_temp_fl_c > 110"
+only opens the laps whose Turn5 maximum of tire_temp_fl_c exceeds 110,
+and of those only the Turn5 rows of the requested channels are read.
+
+Uso:
+  python scripts/utils/telemetry_warehouse.py ingest data/datasets/NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv --circuit Jerez --date 2026-01-21 --session Q1
+  python scripts/utils/telemetry_warehouse.py query --setup optimized --turn Turn5 --where "tire_temp_fl_c > 110"
+  python scripts/utils/telemetry_warehouse.py list
+
+  from telemetry_warehouse import Warehouse
+  wh = Warehouse(Path('data/warehouse'))
+  wh.ingest_session(df, circuit='Jerez', date='2026-01-21', session='Q1')
+  df_hot = wh.query(setup='optimized', turn='Turn5', where=[('tire_temp_fl_c', '>', 110)])
+  wh.last_scan   # {'partitions_total': ..., 'partitions_read': ..., 'rows_read': ..., 'rows': ...}
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import shutil
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from channel_store import ChannelStore, write_store
+from lazy_import import lazy_import
+from turn_rating_pipeline import TURN_SAMPLE_WINDOWS
+
+pd = lazy_import('pandas')
+
+# ========================
+# CONSTANTS
+# ========================
+BASE_DIR = Path(__file__).resolve().parents[2]
+WAREHOUSE_DIR = BASE_DIR / "data" / "warehouse"
+CATALOG_FILE = 'catalog.sqlite'
+PARTITION_KEYS = ('circuit', 'date', 'session', 'setup', 'lap')
+WHOLE_LAP = ''
+
+# Predicate → (row test, SQL test on the partition's [min, max] that can hold a match)
+OPERATORS = {
+    '>': (np.greater, 's.max > ?'),
+    '>=': (np.greater_equal, 's.max >= ?'),
+    '<': (np.less, 's.min < ?'),
+    '<=': (np.less_equal, 's.min <= ?'),
+    '==': (np.equal, 's.min <= ?1 AND s.max >= ?1'),
+}
+WHERE_PATTERN = re.compile(r'^\s*(\w+)\s*(>=|<=|==|>|<)\s*(\S+)\s*$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS partitions (
+    id INTEGER PRIMARY KEY,
+    circuit TEXT NOT NULL,
+    date TEXT NOT NULL,
+    session TEXT NOT NULL,
+    setup TEXT NOT NULL,
+    lap INTEGER NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    rows INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS partitions_keys ON partitions (circuit, date, session, setup, lap);
+CREATE TABLE IF NOT EXISTS channel_stats (
+    partition_id INTEGER NOT NULL REFERENCES partitions (id) ON DELETE CASCADE,
+    turn TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    min REAL,
+    max REAL,
+    PRIMARY KEY (partition_id, turn, channel)
+);
+"""
+
+Predicate = Tuple[str, str, float]
+
+
+def parse_where(text: str) -> Predicate:
+    """'tire_temp_fl_c > 110' → ('tire_temp_fl_c', '>', 110.0)."""
+    match = WHERE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Cannot parse predicate {text!r} (expected '<channel> <op> <number>')")
+    return match.group(1), match.group(2), float(match.group(3))
+
+
+def partition_path(circuit: str, date: str, session: str, setup: str, lap: int) -> str:
+    return f"circuit={circuit}/date={date}/session={session}/setup={setup}/lap={lap:04d}"
+
+
+def turn_windows(rows: int) -> Dict[str, Tuple[int, int]]:
+    """Turn row windows that fit in a lap of `rows` samples, plus the whole lap."""
+    windows = {WHOLE_LAP: (0, rows)}
+    windows.update({turn: w for turn, w in TURN_SAMPLE_WINDOWS.items() if w[1] <= rows})
+    return windows
+
+
+class Warehouse:
+    """
+    Lap partitions of many sessions with a SQLite catalog for pruning.
+
+    Args:
+        root: Warehouse directory (created with its catalog on first use)
+    """
+
+    def __init__(self, root: Path = WAREHOUSE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.catalog = sqlite3.connect(self.root / CATALOG_FILE)
+        self.catalog.execute('PRAGMA foreign_keys = ON')
+        self.catalog.executescript(SCHEMA)
+        self.last_scan: Dict[str, int] = {}
+
+    def close(self) -> None:
+        self.catalog.close()
+
+    # ========================
+    # INGESTION
+    # ========================
+    def ingest_session(self, df: pd.DataFrame, circuit: str, date: str, session: str) -> int:
+        """
+        Store a session (rows grouped by lap, 'lap' and 'setup' columns) as lap partitions.
+
+        Partitions of the same keys are replaced, so re-ingesting a session
+        is idempotent.
+
+        Returns:
+            Number of partitions written
+        """
+        laps = df['lap'].to_numpy()
+        setups = df['setup'].to_numpy()
+        change = np.flatnonzero((laps[1:] != laps[:-1]) | (setups[1:] != setups[:-1])) + 1
+        bounds = zip(np.concatenate([[0], change]), np.append(change, len(df)))
+        numeric = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c].dtype)]
+
+        written = 0
+        for start, stop in bounds:
+            lap_df = df.iloc[start:stop].reset_index(drop=True)
+            setup, lap = str(setups[start]), int(laps[start])
+            relative = partition_path(circuit, date, session, setup, lap)
+            store_dir = self.root / relative
+            if store_dir.exists():
+                shutil.rmtree(store_dir)
+            write_store(lap_df, store_dir)
+
+            values = {c: lap_df[c].to_numpy() for c in numeric}
+            stats = [(turn, c, float(np.nanmin(v[a:b])), float(np.nanmax(v[a:b])))
+                     for turn, (a, b) in turn_windows(len(lap_df)).items() for c, v in values.items()]
+            with self.catalog:
+                self.catalog.execute('DELETE FROM partitions WHERE path = ?', (relative,))
+                cursor = self.catalog.execute(
+                    'INSERT INTO partitions (circuit, date, session, setup, lap, path, rows) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)', (circuit, date, session, setup, lap, relative, len(lap_df)))
+                self.catalog.executemany(
+                    'INSERT INTO channel_stats (partition_id, turn, channel, min, max) VALUES (?, ?, ?, ?, ?)',
+                    [(cursor.lastrowid, *entry) for entry in stats])
+            written += 1
+        return written
+
+    # ========================
+    # QUERIES
+    # ========================
+    def partitions(self, turn: Optional[str] = None, where: Sequence[Predicate] = (),
+                   **keys) -> pd.DataFrame:
+        """
+        Catalog rows of the partitions a query has to read.
+
+        Args:
+            turn: Turn name (TURN_SAMPLE_WINDOWS) whose statistics are tested; None = whole lap
+            where: Predicates (channel, op, value); a partition is kept only if
+                   its [min, max] for that channel can satisfy every one
+            **keys: Equality filters on circuit, date, session, setup, lap
+
+        Returns:
+            DataFrame with id, partition keys, path and rows
+        """
+        unknown = set(keys) - set(PARTITION_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown partition keys {sorted(unknown)}; expected {PARTITION_KEYS}")
+        clauses, params = [], []
+        for key, value in keys.items():
+            if value is not None:
+                clauses.append(f"p.{key} = ?")
+                params.append(value)
+        for channel, op, value in where:
+            if op not in OPERATORS:
+                raise ValueError(f"Unsupported operator {op!r}; expected one of {list(OPERATORS)}")
+            test = OPERATORS[op][1].replace('?1', '?')
+            clauses.append('EXISTS (SELECT 1 FROM channel_stats s WHERE s.partition_id = p.id '
+                           f'AND s.turn = ? AND s.channel = ? AND {test})')
+            params += [turn or WHOLE_LAP, channel] + [value] * test.count('?')
+        sql = f"SELECT p.id, {', '.join('p.' + k for k in PARTITION_KEYS)}, p.path, p.rows FROM partitions p"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY ' + ', '.join('p.' + k for k in PARTITION_KEYS)
+        return pd.read_sql_query(sql, self.catalog, params=params)
+
+    def channels(self) -> List[str]:
+        """Channels of the catalog (numeric, partition keys excluded) in ingestion order."""
+        rows = self.catalog.execute(
+            'SELECT channel FROM channel_stats WHERE turn = ? GROUP BY channel ORDER BY MIN(rowid)',
+            (WHOLE_LAP,)).fetchall()
+        return [channel for channel, in rows if channel not in ('lap', 'setup')]
+
+    def query(self, columns: Optional[Sequence[str]] = None, turn: Optional[str] = None,
+              where: Sequence[Predicate] = (), **keys) -> pd.DataFrame:
+        """
+        Rows matching the keys, turn and predicates, reading only pruned partitions.
+
+        Only the turn's rows of the requested channels (plus the predicate
+        channels) are read from each partition; the partition keys are
+        added as columns. Scan counts are left in self.last_scan. An empty
+        result has the same columns (all catalog channels if columns is None).
+        """
+        total = self.catalog.execute('SELECT COUNT(*) FROM partitions').fetchone()[0]
+        plan = self.partitions(turn=turn, where=where, **keys)
+        frames, rows_read, partitions_read = [], 0, 0
+        for entry in plan.itertuples(index=False):
+            store = ChannelStore(self.root / entry.path)
+            names = list(columns) if columns is not None else [c for c in store.columns
+                                                               if c not in ('lap', 'setup')]
+            window = turn_windows(len(store)).get(turn or WHOLE_LAP)
+            if window is None:
+                continue
+            a, b = window
+            rows = [slice(a, b)]
+            partitions_read += 1
+            rows_read += b - a
+            mask = np.ones(b - a, dtype=bool)
+            for channel, op, value in where:
+                mask &= OPERATORS[op][0](store.column(channel, rows), value)
+            if not mask.any():
+                continue
+            part = pd.DataFrame({name: np.asarray(store.column(name, rows))[mask] for name in names})
+            for key in PARTITION_KEYS:
+                part[key] = getattr(entry, key)
+            frames.append(part)
+
+        result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=list(columns if columns is not None else self.channels()) + list(PARTITION_KEYS))
+        self.last_scan = {'partitions_total': total, 'partitions_read': partitions_read,
+                          'rows_read': rows_read, 'rows': len(result)}
+        return result
+
+
+# ========================
+# MAIN EXECUTION
+# ========================
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Partitioned telemetry warehouse")
+    parser.add_argument('--root', type=Path, default=WAREHOUSE_DIR, help="Warehouse directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help="Store a session CSV as lap partitions")
+    ingest.add_argument('csv', type=Path)
+    ingest.add_argument('--circuit', required=True)
+    ingest.add_argument('--date', required=True, help="YYYY-MM-DD")
+    ingest.add_argument('--session', required=True)
+
+    query = commands.add_parser('query', help="Rows matching keys, turn and predicates")
+    for key in PARTITION_KEYS:
+        query.add_argument(f'--{key}', type=int if key == 'lap' else str)
+    query.add_argument('--turn', choices=list(TURN_SAMPLE_WINDOWS))
+    query.add_argument('--where', action='append', default=[], help="e.g. 'tire_temp_fl_c > 110' (repeatable)")
+    query.add_argument('--columns', nargs='+')
+
+    commands.add_parser('list', help="Partitions in the catalog")
+    args = parser.parse_args()
+
+    warehouse = Warehouse(args.root)
+    try:
+        if args.command == 'ingest':
+            if not args.csv.exists():
+                print(f"❌ File not found: {args.csv}")
+                return 1
+            written = warehouse.ingest_session(pd.read_csv(args.csv), args.circuit, args.date, args.session)
+            print(f"✅ {args.csv.name} → {written} partitions in {warehouse.root}")
+        elif args.command == 'query':
+            try:
+                where = [parse_where(text) for text in args.where]
+            except ValueError as e:
+                print(f"❌ {e}")
+                return 1
+            keys = {key: getattr(args, key) for key in PARTITION_KEYS}
+            result = warehouse.query(args.columns, turn=args.turn, where=where, **keys)
+            scan = warehouse.last_scan
+            print(f"\n🔎 {scan['partitions_read']}/{scan['partitions_total']} partitions read "
+                  f"({scan['rows_read']:,} rows scanned) → {scan['rows']:,} matching rows\n")
+            print(result.head(20).to_string(index=False))
+        else:
+            print(warehouse.partitions().drop(columns='id').to_string(index=False))
+    finally:
+        warehouse.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
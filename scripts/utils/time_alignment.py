@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Multi-Rate Resampling and Time Alignment
+
+Real recordings mix time bases: 100 Hz engine/IMU channels, slower GPS
+with jitter and dropouts, and asynchronous events such as Glicko-2
+volatility updates (the "asynchronous event markers" of the MDF4 v1
+file). This module brings such channels onto one target grid:
+
+  • resample(), vectorized per method:
+      - 'zoh': last sample at or before t (events, states, gear)
+      - 'linear': np.interp between the samples around t
+      - 'nearest': closest sample (ties go to the later one)
+    Sample indexes come from np.searchsorted, or for channels much
+    sparser than the grid, from placing the samples in the grid and
+    counting (O(samples log grid + grid) instead of O(grid log samples)).
+    Grid points before the first sample, after the last (linear) or
+    across a gap longer than max_gap get `fill` (NaN): a dropout stays a
+    dropout instead of a straight line or a stale value
+  • iter_aligned(): the grid in chunks; each channel only contributes
+    the samples around the chunk (one searchsorted per chunk), so long
+    recordings align in bounded memory with results equal to one pass
+  • MDF4: read_mdf_channels() gives every channel of every channel group
+    with its own master time; write_mdf_groups() writes one group per
+    time base; write_mdf_aligned() writes the aligned blocks as one
+    group, extended chunk by chunk
+
+Outputs are float64 (gaps need NaN).
+
+Uso:
+  python scripts/utils/time_alignment.py --demo data/mdf4/NLA_CaseStudy_Jerez_v4_MultiRate.mf4
+  python scripts/utils/time_alignment.py data/mdf4/NLA_CaseStudy_Jerez_v4_MultiRate.mf4 aligned_100Hz.mf4 \\
+      --rate 100 --max-gap 0.5 --zoh gear_position glicko2_rating glicko2_rd glicko2_sigma
+
+  from time_alignment import TimedChannel, uniform_grid, align
+  grid = uniform_grid(0.0, 20.0, rate_hz=100)
+  df = align([TimedChannel('gps_speed_kmh', t_gps, v_gps, max_gap=0.5),
+              TimedChannel('glicko2_rating', t_events, ratings, method='zoh')], grid)
+"""
+
+from __future__ import annotations
+
+import sys
+import argparse
+import warnings
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from lazy_import import lazy_import, module_available
+
+pd = lazy_import('pandas')
+
+# ========================
+# CONSTANTS
+# ========================
+METHODS = ('zoh', 'linear', 'nearest')
+CHUNK_SAMPLES = 1_000_000
+ASAMMDF_AVAILABLE = module_available('asammdf')
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATASET_FILE = BASE_DIR / "data" / "datasets" / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
+
+# Demo layout (multi_rate_channels): channel → rate of its group
+ENGINE_CHANNELS = ['engine_rpm', 'throttle_position', 'gear_position', 'accel_lat_g',
+                   'accel_lon_g', 'gyro_yaw_dps', 'wheel_slip_percent']
+EVENT_CHANNELS = ['glicko2_rating', 'glicko2_rd', 'glicko2_sigma']
+ENGINE_RATE_HZ = 100
+GPS_RATE_HZ = 10
+GPS_JITTER_S = 0.002
+GPS_DROPOUT_S = (6.0, 7.2)
+
+
+class TimedChannel:
+    """
+    Samples of one channel on its own time base.
+
+    Args:
+        name: Channel name
+        timestamps: Increasing times (s)
+        samples: Values, same length
+        method: 'zoh', 'linear' or 'nearest'
+        max_gap: Longest stretch (s) bridged by interpolation or a held
+                 value; None = no limit
+        unit: Physical unit (kept when writing MDF4)
+    """
+
+    def __init__(self, name: str, timestamps: np.ndarray, samples: np.ndarray, method: str = 'linear',
+                 max_gap: Optional[float] = None, unit: str = ''):
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+        if len(timestamps) != len(samples):
+            raise ValueError(f"{name}: {len(timestamps)} timestamps for {len(samples)} samples")
+        self.name = name
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.samples = np.asarray(samples)
+        self.method = method
+        self.max_gap = max_gap
+        self.unit = unit
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+def uniform_grid(t_start: float, t_end: float, rate_hz: float) -> np.ndarray:
+    """t_start, t_start + 1/rate, ... up to t_end inclusive (no float drift from cumulative steps)."""
+    n = int(np.floor((t_end - t_start) * rate_hz + 1e-6)) + 1
+    return t_start + np.arange(n) / rate_hz
+
+
+# ========================
+# RESAMPLING
+# ========================
+def _samples_at_or_before(t: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """np.searchsorted(t, grid, side='right'), searched from the cheaper side."""
+    if len(t) * 8 < len(grid):
+        # Few samples (events, GPS): place each in the grid and count, O(m log n + n)
+        counts = np.bincount(np.searchsorted(grid, t, side='left'), minlength=len(grid) + 1)
+        return np.cumsum(counts[:len(grid)])
+    return np.searchsorted(t, grid, side='right')
+
+
+def _inside_gaps(t: np.ndarray, grid: np.ndarray, max_gap: float) -> np.ndarray:
+    """Grid points strictly between two samples more than max_gap apart."""
+    gaps = np.flatnonzero(np.diff(t) > max_gap)
+    inside = np.zeros(len(grid), dtype=bool)
+    if len(gaps):
+        edges = np.zeros(len(grid) + 1, dtype=np.int64)
+        np.add.at(edges, np.searchsorted(grid, t[gaps], side='right'), 1)
+        np.add.at(edges, np.searchsorted(grid, t[gaps + 1], side='left'), -1)
+        inside = np.cumsum(edges[:-1]) > 0
+    return inside
+
+
+def resample(timestamps: np.ndarray, samples: np.ndarray, grid: np.ndarray, method: str = 'linear',
+             max_gap: Optional[float] = None, fill: float = np.nan) -> np.ndarray:
+    """
+    Values of a channel at the grid times.
+
+    Args:
+        timestamps: Increasing sample times (s)
+        samples: Sample values
+        grid: Target times (s), increasing
+        method: 'zoh', 'linear' or 'nearest'
+        max_gap: Gap (s) beyond which grid points get `fill` instead of a
+                 held/interpolated value; None = no limit
+        fill: Value of grid points with no valid sample
+
+    Returns:
+        float64 array, one value per grid point
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    t = np.asarray(timestamps, dtype=np.float64)
+    v = np.asarray(samples, dtype=np.float64)
+    if len(t) == 0:
+        return np.full(len(grid), fill, dtype=np.float64)
+
+    if method == 'linear':
+        # np.interp walks the sorted grid with a cached bracket; only the
+        # validity mask (range, gaps) is added on top
+        out = np.interp(grid, t, v)
+        invalid = (grid < t[0]) | (grid > t[-1])
+        if max_gap is not None:
+            invalid |= _inside_gaps(t, grid, max_gap)
+        out[invalid] = fill
+        return out
+
+    if method == 'zoh':
+        right = _samples_at_or_before(t, grid)   # index of the first sample after each grid point
+        held = np.maximum(right - 1, 0)
+        valid = right > 0
+        if max_gap is not None:
+            valid &= grid - t[held] <= max_gap
+    else:
+        # Nearest sample = number of midpoints between samples at or before the grid point
+        held = _samples_at_or_before((t[:-1] + t[1:]) * 0.5, grid)
+        valid = np.ones(len(grid), dtype=bool) if max_gap is None else np.abs(grid - t[held]) <= max_gap
+    out = v[held]
+    out[~valid] = fill
+    return out
+
+
+def iter_aligned(channels: Sequence[TimedChannel], grid: np.ndarray,
+                 chunk_samples: int = CHUNK_SAMPLES) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Aligned blocks {'time': grid chunk, channel: values} over the grid, chunk by chunk.
+
+    Each channel is cut to the samples that bracket the chunk (one before
+    its start, one after its end), which is all resample() looks at, so
+    the blocks equal a single pass; with memory-mapped sources only those
+    pages are read.
+    """
+    for start in range(0, len(grid), chunk_samples):
+        times = grid[start:start + chunk_samples]
+        block = {'time': times}
+        for channel in channels:
+            t = channel.timestamps
+            lo = max(0, int(np.searchsorted(t, times[0], side='right')) - 1)
+            hi = min(len(t), int(np.searchsorted(t, times[-1], side='left')) + 1)
+            block[channel.name] = resample(t[lo:hi], channel.samples[lo:hi], times,
+                                           channel.method, channel.max_gap)
+        yield block
+
+
+def align(channels: Sequence[TimedChannel], grid: np.ndarray,
+          chunk_samples: int = CHUNK_SAMPLES) -> pd.DataFrame:
+    """All channels on the grid as one DataFrame ('time' first)."""
+    blocks = list(iter_aligned(channels, grid, chunk_samples))
+    if not blocks:
+        return pd.DataFrame({'time': grid, **{c.name: np.empty(0) for c in channels}})
+    return pd.DataFrame({name: np.concatenate([b[name] for b in blocks]) for name in blocks[0]})
+
+
+# ========================
+# MDF4
+# ========================
+def read_mdf_channels(path: Path, names: Optional[Sequence[str]] = None, method: str = 'linear',
+                      methods: Optional[Dict[str, str]] = None,
+                      max_gap: Optional[float] = None) -> List[TimedChannel]:
+    """
+    Channels of an MDF4 file, each with the master time of its channel group.
+
+    Args:
+        path: .mf4 file
+        names: Channels to read (None = all but the masters)
+        method: Default resampling method
+        methods: Per-channel overrides {name: method}
+        max_gap: Gap limit of the interpolated channels; 'zoh' channels
+                 (events, states) hold their value until the next sample
+    """
+    from asammdf import MDF
+
+    methods = methods or {}
+    channels = []
+    with MDF(path) as mdf:
+        for signal in mdf.iter_channels(skip_master=True):
+            if names is not None and signal.name not in names:
+                continue
+            channel_method = methods.get(signal.name, method)
+            channels.append(TimedChannel(signal.name, signal.timestamps, signal.samples, channel_method,
+                                         None if channel_method == 'zoh' else max_gap, signal.unit or ''))
+    return channels
+
+
+def write_mdf_groups(path: Path, channels: Sequence[TimedChannel], comment: str = '') -> Path:
+    """Write channels to MDF4, one channel group per distinct time base."""
+    from asammdf import MDF, Signal
+
+    groups: Dict[bytes, List[TimedChannel]] = {}
+    for channel in channels:
+        groups.setdefault(channel.timestamps.tobytes(), []).append(channel)
+
+    mdf = MDF(version='4.10')
+    mdf.header.comment = comment
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for members in groups.values():
+            mdf.append([Signal(c.samples, c.timestamps, name=c.name, unit=c.unit) for c in members],
+                       comment=', '.join(c.name for c in members))
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        mdf.save(path, overwrite=True)
+    mdf.close()
+    return path
+
+
+def write_mdf_aligned(path: Path, blocks: Iterable[Dict[str, np.ndarray]],
+                      units: Optional[Dict[str, str]] = None, comment: str = '') -> int:
+    """
+    Write aligned blocks (iter_aligned) as one MDF4 channel group.
+
+    The group is created from the first block and extended with the
+    others, so the blocks do not have to fit in memory together.
+
+    Returns:
+        Number of grid samples written
+    """
+    from asammdf import MDF, Signal
+
+    units = units or {}
+    mdf = MDF(version='4.10')
+    mdf.header.comment = comment
+    rows = 0
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for block in blocks:
+            times = block['time']
+            names = [name for name in block if name != 'time']
+            if rows == 0:
+                mdf.append([Signal(block[n], times, name=n, unit=units.get(n, '')) for n in names],
+                           comment=comment)
+            else:
+                mdf.extend(0, [(times, None)] + [(block[n], None) for n in names])
+            rows += len(times)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        mdf.save(path, overwrite=True)
+    mdf.close()
+    return rows
+
+
+# ========================
+# DEMO SESSION
+# ========================
+def multi_rate_channels(df: pd.DataFrame, seed: int = 0) -> List[TimedChannel]:
+    """
+    Heterogeneous channels from a v4 dataset (1 kHz common base):
+    engine/IMU at 100 Hz, GPS speed at 10 Hz with timestamp jitter and a
+    dropout, Glicko-2 channels as events at the samples where they change.
+    """
+    from channel_store import channel_unit
+
+    rng = np.random.default_rng(seed)
+    time = df['time'].to_numpy()
+    dt = float(np.median(np.diff(time)))
+    step = max(1, int(round(1.0 / (ENGINE_RATE_HZ * dt))))
+    channels = [TimedChannel(name, time[::step], df[name].to_numpy()[::step],
+                             'zoh' if name == 'gear_position' else 'linear', unit=channel_unit(name))
+                for name in ENGINE_CHANNELS if name in df.columns]
+
+    gps_step = max(1, int(round(1.0 / (GPS_RATE_HZ * dt))))
+    gps_t = time[::gps_step] + rng.uniform(-GPS_JITTER_S, GPS_JITTER_S, len(time[::gps_step]))
+    keep = (gps_t < GPS_DROPOUT_S[0]) | (gps_t >= GPS_DROPOUT_S[1])
+    order = np.argsort(gps_t[keep], kind='stable')
+    channels.append(TimedChannel('gps_speed_kmh', gps_t[keep][order],
+                                 df['speed_kmh'].to_numpy()[::gps_step][keep][order], unit='km/h'))
+
+    for name in EVENT_CHANNELS:
+        if name in df.columns:
+            values = df[name].to_numpy()
+            events = np.concatenate([[0], np.flatnonzero(np.diff(values) != 0) + 1])
+            channels.append(TimedChannel(name, time[events], values[events], 'zoh', unit='-'))
+    return channels
+
+
+# ========================
+# MAIN EXECUTION
+# ========================
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Align multi-rate MDF4 channels onto one time grid")
+    parser.add_argument('source', type=Path, nargs='?', help="Multi-rate .mf4 file")
+    parser.add_argument('target', type=Path, nargs='?', help="Aligned .mf4 file to write")
+    parser.add_argument('--rate', type=float, default=ENGINE_RATE_HZ, help="Target grid rate (Hz)")
+    parser.add_argument('--method', choices=METHODS, default='linear', help="Default method")
+    parser.add_argument('--zoh', nargs='+', default=[], help="Channels aligned by zero-order hold")
+    parser.add_argument('--nearest', nargs='+', default=[], help="Channels aligned to the nearest sample")
+    parser.add_argument('--max-gap', type=float,
+                        help="Gap (s) left as NaN instead of interpolated (zoh channels always hold)")
+    parser.add_argument('--chunk-samples', type=int, default=CHUNK_SAMPLES)
+    parser.add_argument('--demo', type=Path, metavar='MF4',
+                        help="Write a multi-rate MDF4 built from the v4 dataset and exit")
+    args = parser.parse_args()
+
+    if not ASAMMDF_AVAILABLE:
+        print("❌ asammdf not installed (pip install asammdf)")
+        return 1
+
+    if args.demo:
+        channels = multi_rate_channels(pd.read_csv(DATASET_FILE))
+        write_mdf_groups(args.demo, channels,
+                         comment='NLA v4 multi-rate session (engine/IMU, GPS, Glicko events)')
+        print(f"✅ {args.demo}: {len(channels)} channels in "
+              f"{len({c.timestamps.tobytes() for c in channels})} time bases")
+        return 0
+
+    if args.source is None or args.target is None:
+        parser.error("source and target are required (or --demo MF4)")
+    if not args.source.exists():
+        print(f"❌ File not found: {args.source}")
+        return 1
+
+    methods = {**{n: 'zoh' for n in args.zoh}, **{n: 'nearest' for n in args.nearest}}
+    channels = read_mdf_channels(args.source, method=args.method, methods=methods, max_gap=args.max_gap)
+    # Grid on multiples of 1/rate covering every channel
+    t_start = np.floor(min(c.timestamps[0] for c in channels if len(c)) * args.rate) / args.rate
+    t_end = max(c.timestamps[-1] for c in channels if len(c))
+    grid = uniform_grid(t_start, t_end, args.rate)
+    rows = write_mdf_aligned(args.target, iter_aligned(channels, grid, args.chunk_samples),
+                             {c.name: c.unit for c in channels},
+                             comment=f"Aligned to {args.rate:g} Hz from {args.source.name}")
+
+    print(f"\n⏱️  {args.source.name}: {len(channels)} channels → {rows:,} samples at {args.rate:g} Hz")
+    for channel in channels:
+        print(f"   {channel.name:<28} {len(channel):>9,} samples  {channel.method:<8}")
+    print(f"✅ {args.target}\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Turn-as-Match Glicko-2 Rating Pipeline
+
+Treats every turn traversal as a "match" of the rider against a reference
+lap, scored on exit speed, wheel slip and time loss, and runs a Glicko-2
+update sequence (Glickman, 2012) over all laps. The result is a real rating
+process instead of the hand-written volatility formula:
+
+  • Per (setup, lap, turn) table: metrics, score, rating, RD and σ
+  • Rating, RD and σ channels aligned to the telemetry time base
+    (zero-order hold from the end of each lap's rating period)
+
+Each lap is one rating period whose games are its turn traversals.
+Per-turn metrics are computed for all laps at once on (laps x samples)
+arrays; the Glicko-2 sequence loops over laps only and is vectorized
+across setups (rating tracks) and turns, including the Illinois
+iteration for the volatility update.
+
+Uso:
+  python scripts/utils/turn_rating_pipeline.py [dataset.csv]
+"""
+
+from __future__ import annotations
+
+import sys
+import math
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+
+# ========================
+# CONSTANTS
+# ========================
+# Turn windows in samples from lap start (generate_circuit_profile layout,
+# FS = 100 → t_start * FS ... t_end * FS)
+TURN_SAMPLE_WINDOWS = {
+    'Turn1': (0, 120),
+    'Turn2': (120, 320),
+    'Turn3': (320, 470),
+    'Turn4': (470, 650),
+    'Turn5': (650, 820),
+    'Turn6': (820, 950),
+}
+
+# Score scales: a difference of one scale unit vs the reference maps to
+# a score of 0.5 + 0.5*tanh(1) ≈ 0.88
+SCORE_SCALES = {
+    'exit_speed_kmh': 5.0,
+    'slip_percent': 2.0,
+    'time_loss_s': 0.005,
+}
+SCORE_WEIGHTS = {
+    'exit_speed_kmh': 1/3,
+    'slip_percent': 1/3,
+    'time_loss_s': 1/3,
+}
+
+GLICKO2_SCALE = 173.7178
+INITIAL_RATING = 1500.0
+INITIAL_RD = 350.0
+INITIAL_SIGMA = 0.06
+TAU = 0.5
+REFERENCE_RATING = 1500.0
+REFERENCE_RD = 30.0
+CONVERGENCE_EPS = 1e-6
+EXIT_WINDOW = 5  # samples averaged for exit speed
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_DIR = BASE_DIR / "data" / "datasets"
+TABLES_DIR = BASE_DIR / "data" / "tables"
+
+
+# ========================
+# GLICKO-2 (VECTORIZED)
+# ========================
+def _g(phi):
+    return 1 / np.sqrt(1 + 3 * phi ** 2 / math.pi ** 2)
+
+
+def glicko2_update(mu, phi, sigma, opp_mu, opp_phi, scores, tau: float = TAU):
+    """
+    One Glicko-2 rating period for many independent players at once.
+
+    Each player plays the games in the last axis of opp_mu/opp_phi/scores
+    (on the Glicko-2 scale). Volatility uses the Illinois algorithm,
+    iterated on all players simultaneously until every one has converged.
+
+    Args:
+        mu, phi, sigma: Arrays (players,) of rating, deviation, volatility
+        opp_mu, opp_phi: Arrays (players, games) of opponent rating/deviation
+        scores: Array (players, games) of scores in [0, 1]
+        tau: System constant constraining volatility change
+
+    Returns:
+        Tuple of (mu, phi, sigma) arrays after the period
+    """
+    g = _g(opp_phi)
+    expected = 1 / (1 + np.exp(-g * (mu[:, None] - opp_mu)))
+    v = 1 / np.sum(g ** 2 * expected * (1 - expected), axis=-1)
+    score_sum = np.sum(g * (scores - expected), axis=-1)
+    delta = v * score_sum
+
+    phi2 = phi ** 2
+    a = np.log(sigma ** 2)
+
+    def f(x):
+        ex = np.exp(x)
+        return ex * (delta ** 2 - phi2 - v - ex) / (2 * (phi2 + v + ex) ** 2) - (x - a) / tau ** 2
+
+    big = delta ** 2 > phi2 + v
+    upper = np.where(big, np.log(np.where(big, delta ** 2 - phi2 - v, 1.0)), a - tau)
+    pending = ~big & (f(upper) < 0)
+    while pending.any():
+        upper = np.where(pending, upper - tau, upper)
+        pending &= f(upper) < 0
+
+    lower = a
+    f_lower, f_upper = f(lower), f(upper)
+    active = np.abs(upper - lower) > CONVERGENCE_EPS
+    while active.any():
+        new = lower + (lower - upper) * f_lower / (f_upper - f_lower)
+        f_new = f(new)
+        swap = f_new * f_upper <= 0
+        lower = np.where(active & swap, upper, lower)
+        f_lower = np.where(active, np.where(swap, f_upper, f_lower / 2), f_lower)
+        upper = np.where(active, new, upper)
+        f_upper = np.where(active, f_new, f_upper)
+        active &= np.abs(upper - lower) > CONVERGENCE_EPS
+
+    new_sigma = np.exp(lower / 2)
+    phi_star = np.sqrt(phi2 + new_sigma ** 2)
+    new_phi = 1 / np.sqrt(1 / phi_star ** 2 + 1 / v)
+    new_mu = mu + new_phi ** 2 * score_sum
+    return new_mu, new_phi, new_sigma
+
+
+# ========================
+# TURN METRICS
+# ========================
+def lap_matrix(df: pd.DataFrame, column: str, lap_starts, samples_per_lap: int):
+    """Reshape one channel into a (laps x samples_per_lap) view."""
+    values = df[column].to_numpy(dtype=float)
+    return values[: len(lap_starts) * samples_per_lap].reshape(len(lap_starts), samples_per_lap)
+
+
+def lap_layout(df: pd.DataFrame):
+    """Lap start rows, samples per lap and (setup, lap) labels."""
+    # Lap boundaries from the numeric lap column only; the setup labels are
+    # checked at the boundaries instead of comparing every string row
+    lap_ids = df['lap'].to_numpy()
+    lap_starts = np.concatenate([[0], np.flatnonzero(lap_ids[1:] != lap_ids[:-1]) + 1])
+    lengths = np.diff(np.append(lap_starts, len(df)))
+    if np.any(lengths != lengths[0]):
+        raise ValueError("All laps must have the same number of samples")
+    # Only the boundary rows are converted: to_numpy() on a whole string
+    # column costs more than the rest of the pipeline
+    setup_column = df['setup']
+    setups = setup_column.iloc[lap_starts].to_numpy()
+    if np.any(setup_column.iloc[lap_starts + lengths - 1].to_numpy() != setups):
+        raise ValueError("Setup changes inside a lap")
+    return lap_starts, int(lengths[0]), setups, lap_ids[lap_starts]
+
+
+def compute_turn_metrics(df: pd.DataFrame, turn_windows: Dict = None) -> Dict[str, np.ndarray]:
+    """
+    Per-lap, per-turn metrics computed on (laps x samples) arrays.
+
+    Args:
+        df: Telemetry with 'setup', 'lap', 'time', 'speed_kmh' and
+            'wheel_slip_percent', rows grouped by lap
+        turn_windows: Optional {turn: (start_sample, end_sample)} mapping
+
+    Returns:
+        Dict of (laps x turns) arrays: exit_speed_kmh, slip_percent,
+        distance_m (turn distance covered) and mean_speed_kmh
+    """
+    turn_windows = turn_windows or TURN_SAMPLE_WINDOWS
+    lap_starts, spl, _, _ = lap_layout(df)
+    dt = np.median(np.diff(df['time'].to_numpy()[:spl]))
+
+    starts = np.array([w[0] for w in turn_windows.values()])
+    ends = np.array([w[1] for w in turn_windows.values()])
+    # Only the samples up to the last turn exit take part in the sums
+    speed = lap_matrix(df, 'speed_kmh', lap_starts, spl)[:, :ends.max()]
+    slip = lap_matrix(df, 'wheel_slip_percent', lap_starts, spl)[:, :ends.max()]
+
+    # Segment sums through cumulative sums: one pass per channel for all turns
+    def segment_mean(matrix, seg_start, seg_end):
+        csum = np.concatenate([np.zeros((matrix.shape[0], 1)), np.cumsum(matrix, axis=1)], axis=1)
+        return (csum[:, seg_end] - csum[:, seg_start]) / (seg_end - seg_start)
+
+    exit_speed = segment_mean(speed, ends - EXIT_WINDOW, ends)
+    mean_speed = segment_mean(speed, starts, ends)
+    mean_slip = segment_mean(slip, starts, ends)
+
+    # Distance of each turn on the lap itself → time at the lap's mean speed
+    distance_m = mean_speed / 3.6 * (ends - starts) * dt
+    return {
+        'exit_speed_kmh': exit_speed,
+        'slip_percent': mean_slip,
+        'distance_m': distance_m,
+        'mean_speed_kmh': mean_speed,
+    }
+
+
+def score_against_reference(metrics: Dict[str, np.ndarray], reference='median') -> Tuple[np.ndarray, Dict]:
+    """
+    Score every turn traversal against the reference lap.
+
+    Args:
+        metrics: Output of compute_turn_metrics
+        reference: 'median' (per-turn median lap), 'best' (lap with the best
+                   total turn time) or an integer lap row index
+
+    Returns:
+        Tuple of (scores (laps x turns) in [0, 1], per-component deltas)
+    """
+    mean_speed = metrics['mean_speed_kmh']
+    if isinstance(reference, str) and reference == 'median':
+        ref = {k: np.median(v, axis=0) for k, v in metrics.items()}
+    else:
+        if isinstance(reference, str) and reference == 'best':
+            # Turn windows have fixed duration: most distance covered = fastest
+            reference = int(np.argmax(np.sum(metrics['distance_m'], axis=1)))
+        ref = {k: v[reference] for k, v in metrics.items()}
+
+    # Time loss: time to cover the reference turn distance vs reference time
+    ref_time = ref['distance_m'] / np.maximum(ref['mean_speed_kmh'] / 3.6, 1e-6)
+    lap_time = ref['distance_m'] / np.maximum(mean_speed / 3.6, 1e-6)
+
+    deltas = {
+        'exit_speed_kmh': metrics['exit_speed_kmh'] - ref['exit_speed_kmh'],
+        'slip_percent': ref['slip_percent'] - metrics['slip_percent'],
+        'time_loss_s': ref_time - lap_time,
+    }
+    scores = sum(SCORE_WEIGHTS[k] * (0.5 + 0.5 * np.tanh(deltas[k] / SCORE_SCALES[k]))
+                 for k in deltas)
+    return np.clip(scores, 0.0, 1.0), deltas
+
+
+# ========================
+# PIPELINE
+# ========================
+def run_turn_ratings(df: pd.DataFrame, reference='median', tau: float = TAU,
+                     turn_windows: Dict = None) -> pd.DataFrame:
+    """
+    Run the Glicko-2 sequence over all laps.
+
+    Each setup is one rating track and each lap one rating period whose
+    games are the lap's turn traversals, all played against the reference
+    (rating 1500, RD 30). Laps of a setup are played in dataset order; the
+    periods of all tracks advance together.
+
+    Args:
+        df: Telemetry dataset (rows grouped by lap)
+        reference: Reference lap selection (see score_against_reference)
+        tau: Glicko-2 system constant
+        turn_windows: Optional {turn: (start_sample, end_sample)} mapping
+
+    Returns:
+        DataFrame with one row per (setup, lap, turn); rating, rd and sigma
+        are the values after the lap's rating period
+    """
+    turn_windows = turn_windows or TURN_SAMPLE_WINDOWS
+    metrics = compute_turn_metrics(df, turn_windows)
+    scores, deltas = score_against_reference(metrics, reference)
+    _, _, setups, laps = lap_layout(df)
+
+    turn_names = list(turn_windows)
+    num_laps, num_turns = scores.shape
+    tracks, track_of_lap = np.unique(setups, return_inverse=True)
+
+    # (tracks x periods x turns) score grid; shorter tracks are masked
+    order = np.argsort(track_of_lap, kind='stable')
+    counts = np.bincount(track_of_lap, minlength=len(tracks))
+    position = np.empty(num_laps, dtype=int)
+    position[order] = np.arange(num_laps) - np.repeat(np.cumsum(counts) - counts, counts)
+    score_grid = np.full((len(tracks), counts.max(), num_turns), np.nan)
+    score_grid[track_of_lap, position] = scores
+
+    mu = np.zeros(len(tracks))
+    phi = np.full(len(tracks), INITIAL_RD / GLICKO2_SCALE)
+    sigma = np.full(len(tracks), INITIAL_SIGMA)
+    opp_mu = np.full((len(tracks), num_turns), (REFERENCE_RATING - INITIAL_RATING) / GLICKO2_SCALE)
+    opp_phi = np.full((len(tracks), num_turns), REFERENCE_RD / GLICKO2_SCALE)
+
+    history = np.empty((3, len(tracks), counts.max()))
+    for k in range(counts.max()):
+        played = k < counts
+        if played.all():
+            mu, phi, sigma = glicko2_update(mu, phi, sigma, opp_mu, opp_phi, score_grid[:, k], tau)
+        else:
+            new_mu, new_phi, new_sigma = glicko2_update(
+                mu, phi, sigma, opp_mu, opp_phi, np.nan_to_num(score_grid[:, k]), tau)
+            mu = np.where(played, new_mu, mu)
+            phi = np.where(played, new_phi, phi)
+            sigma = np.where(played, new_sigma, sigma)
+        history[:, :, k] = mu, phi, sigma
+
+    per_lap = history[:, track_of_lap, position]
+    return pd.DataFrame({
+        'setup': np.repeat(setups, num_turns),
+        'lap': np.repeat(laps, num_turns),
+        'turn': np.tile(turn_names, num_laps),
+        'exit_speed_kmh': metrics['exit_speed_kmh'].ravel(),
+        'slip_percent': metrics['slip_percent'].ravel(),
+        'time_loss_s': -deltas['time_loss_s'].ravel(),
+        'score': scores.ravel(),
+        'rating': np.repeat(per_lap[0] * GLICKO2_SCALE + INITIAL_RATING, num_turns),
+        'rd': np.repeat(per_lap[1] * GLICKO2_SCALE, num_turns),
+        'sigma': np.repeat(per_lap[2], num_turns),
+    })
+
+
+def rating_channels(df: pd.DataFrame, turn_ratings: pd.DataFrame,
+                    turn_windows: Dict = None) -> Dict[str, np.ndarray]:
+    """
+    Align per-lap ratings to the telemetry time base.
+
+    Samples carry the rating entering the lap until the exit of its last
+    turn (when the lap's period is complete) and the updated rating from
+    then on (zero-order hold).
+
+    Returns:
+        Dict with 'glicko2_rating', 'glicko2_rd', 'glicko2_sigma' arrays
+    """
+    turn_windows = turn_windows or TURN_SAMPLE_WINDOWS
+    lap_starts, spl, setups, _ = lap_layout(df)
+    num_laps, num_turns = len(lap_starts), len(turn_windows)
+    period_done = np.arange(spl) >= max(w[1] for w in turn_windows.values()) - 1
+
+    channels = {}
+    for name, column, initial in [('glicko2_rating', 'rating', INITIAL_RATING),
+                                  ('glicko2_rd', 'rd', INITIAL_RD),
+                                  ('glicko2_sigma', 'sigma', INITIAL_SIGMA)]:
+        after = turn_ratings[column].to_numpy()[::num_turns]
+        before = np.full(num_laps, initial)
+        for setup in np.unique(setups):
+            lap_rows = np.flatnonzero(setups == setup)
+            before[lap_rows[1:]] = after[lap_rows[:-1]]
+        channels[name] = np.full(len(df), np.nan)
+        channels[name][: num_laps * spl] = np.where(
+            period_done, after[:, None], before[:, None]).ravel()
+    return channels
+
+
+def add_rating_channels(df: pd.DataFrame, reference='median', tau: float = TAU):
+    """
+    Run the pipeline and append the aligned rating channels to a dataset.
+
+    Returns:
+        Tuple of (dataset with glicko2_* columns, per-turn rating table)
+    """
+    turn_ratings = run_turn_ratings(df, reference=reference, tau=tau)
+    out = df.copy()
+    for name, values in rating_channels(df, turn_ratings).items():
+        out[name] = values
+    return out, turn_ratings
+
+
+# ========================
+# MAIN EXECUTION
+# ========================
+if __name__ == '__main__':
+    dataset_file = Path(sys.argv[1]) if len(sys.argv) > 1 else DATA_DIR / "NLA_CaseStudy_Jerez_Q1_v4_MEGA.csv"
+    print("\n" + "="*80)
+    print("🏁 TURN-AS-MATCH GLICKO-2 RATING PIPELINE")
+    print("="*80)
+
+    df = pd.read_csv(dataset_file)
+    turn_ratings = run_turn_ratings(df)
+
+    TABLES_DIR.mkdir(parents=True, exist_ok=True)
+    output_file = TABLES_DIR / 'Table_v4_Turn_Ratings.csv'
+    turn_ratings.to_csv(output_file, index=False)
+
+    final = turn_ratings.groupby('setup').tail(1)
+    print(final[['setup', 'lap', 'turn', 'rating', 'rd', 'sigma']].to_string(index=False))
+    print(f"\n✅ Turn ratings exported: {output_file.name} ({len(turn_ratings)} traversals)\n")